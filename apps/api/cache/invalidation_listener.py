@@ -4,6 +4,11 @@ F1 Search - Cache Invalidation Listener
 
 Listens to pg_notify('f1_cache_invalidate') and evicts Redis keys.
 
+Also forwards pg_notify('tenant_cache_invalidate', user_id) — raised by the
+auth_users_roles trigger when a role changes — to the API workers: the
+shared tenant entry is deleted and the user_id is published on the Redis
+channel every worker's tenant cache listens to (middleware/auth.py).
+
 Usage:
     READ_DB_DSN=... REDIS_URL=... python -m cache.invalidation_listener
 
@@ -29,6 +34,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 READ_DSN = os.getenv("READ_DB_DSN") or os.getenv("DATABASE_URL")
+TENANT_INVALIDATE_CHANNEL = "tenant_cache_invalidate"  # pg_notify and Redis pub/sub channel
+TENANT_REDIS_PREFIX = "tenant:"
 REDIS_URL = os.getenv("REDIS_URL")
 
 # Global state for graceful shutdown
@@ -141,6 +148,28 @@ async def handle_notification(conn, pid, channel, payload):
         logger.error(f"Error handling notification: {e}")
 
 
+async def handle_tenant_notification(conn, pid, channel, payload):
+    """
+    Handle a tenant role change.
+
+    Deletes the shared tenant entry and tells every API worker to drop its
+    local copy, so the next request re-resolves the role.
+    """
+    if _redis is None or not await ensure_redis_connected():
+        logger.error("Cannot invalidate tenant cache: Redis unavailable")
+        return
+
+    user_id = (payload or "").strip()
+    if not user_id:
+        return
+    try:
+        await _redis.delete(f"{TENANT_REDIS_PREFIX}{user_id}")
+        await _redis.publish(TENANT_INVALIDATE_CHANNEL, user_id)
+        logger.info(f"Tenant cache invalidated for user={user_id[:8]}...")
+    except Exception as e:
+        logger.error(f"Error invalidating tenant cache: {e}")
+
+
 async def listen_and_evict():
     """
     Main listener loop.
@@ -182,7 +211,8 @@ async def listen_and_evict():
 
     # Register notification listener
     await conn.add_listener('f1_cache_invalidate', handle_notification)
-    logger.info("✅ Listening for f1_cache_invalidate events...")
+    await conn.add_listener(TENANT_INVALIDATE_CHANNEL, handle_tenant_notification)
+    logger.info("✅ Listening for f1_cache_invalidate and tenant_cache_invalidate events...")
 
     # Keep connection alive until shutdown (10s interval for faster detection)
     try:
@@ -201,6 +231,7 @@ async def listen_and_evict():
     # Cleanup
     logger.info("Shutting down...")
     await conn.remove_listener('f1_cache_invalidate', handle_notification)
+    await conn.remove_listener(TENANT_INVALIDATE_CHANNEL, handle_tenant_notification)
     await conn.close()
     await _redis.close()
     logger.info("Shutdown complete")
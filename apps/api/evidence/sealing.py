@@ -49,6 +49,20 @@ Environment
     CELESTE_SIGNING_KEY_VERSION — e.g. "v1" — rotated on key change
     CELESTE_TSA_PRIMARY         — default: https://freetsa.org/tsr
     CELESTE_TSA_FALLBACK        — default: http://timestamp.digicert.com
+    CELESTE_SIGNING_CA_CHAIN_PATH — optional PEM bundle (issuing CA chain + TSA
+                                  roots). When set, signatures embed OCSP/CRL
+                                  validation info (true PAdES-B-LT); unset for
+                                  the self-signed staging cert.
+
+Warm context
+------------
+Everything that does not depend on the document — config, signer, cert
+fingerprint, timestamper, validation roots, the sRGB profile — lives in a
+process-wide SealingContext built on first use (get_sealing_context()).
+OCSP responses and CRLs are cached until their nextUpdate, and the selected
+TSA is remembered for CELESTE_TSA_HEALTH_TTL seconds instead of being probed
+before every seal. Long-running sealing belongs in workers/sealing_worker.py,
+fed by the evidence_seal_jobs queue (services/seal_queue.py).
 
 Dependencies
 ------------
@@ -61,19 +75,28 @@ import hashlib
 import io
 import logging
 import os
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import pikepdf
 import requests
+from asn1crypto import x509 as asn1_x509
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.serialization import Encoding
+from cryptography.x509 import ocsp
+from cryptography.x509.oid import AuthorityInformationAccessOID, ExtensionOID
 from pyhanko.sign import signers, timestamps
 from pyhanko.sign.fields import SigFieldSpec, SigSeedSubFilter, append_signature_field
 from pyhanko.sign.signers.pdf_signer import PdfSignatureMetadata, PdfSigner
-from pyhanko.sign.timestamps import HTTPTimeStamper
+from pyhanko.sign.timestamps import HTTPTimeStamper, TimestampRequestError
 from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+from pyhanko_certvalidator import ValidationContext
 
 log = logging.getLogger(__name__)
 
@@ -117,15 +140,20 @@ class SealingInfo:
     pdfa_conformance: str   # "3B"
 
 
-def seal_export(pdf_bytes: bytes) -> tuple[bytes, SealingInfo]:
+def seal_export(
+    pdf_bytes: bytes,
+    context: Optional["SealingContext"] = None,
+) -> tuple[bytes, SealingInfo]:
     """
     Seal a PyMuPDF-rendered export into a v1.0 evidence artifact.
 
     This function is the atomic unit of sealing. It either produces a fully
     sealed, verifiable PDF — or it raises. There is no half-sealed state.
     A caller must never persist or return the input bytes if this fails.
+
+    ``context`` defaults to the process-wide warm context.
     """
-    config = _load_config()
+    context = context or get_sealing_context()
 
     # 1. Preconditions — fail fast with a loud reason, not a vague 500
     _validate_input(pdf_bytes)
@@ -138,15 +166,15 @@ def seal_export(pdf_bytes: bytes) -> tuple[bytes, SealingInfo]:
     log.info("evidence.sealing.hashed", extra={"sha256": pdf_sha256})
 
     # 4. Sign — PAdES-B-LT with embedded RFC 3161 TSA token
-    signed_bytes, signed_at, tsa_used = _sign_pades_b_lt(pdfa3_bytes, config)
+    signed_bytes, signed_at, tsa_used = _sign_pades_b_lt(pdfa3_bytes, context)
 
     # 5. Return sealed artifact + provenance record
     info = SealingInfo(
         pdf_sha256=pdf_sha256,
         signed_at=signed_at,
         tsa_authority=tsa_used,
-        cert_fingerprint=_cert_fingerprint(config.cert_path),
-        key_version=config.key_version,
+        cert_fingerprint=context.cert_fingerprint,
+        key_version=context.config.key_version,
         pdfa_conformance="3B",
     )
     return signed_bytes, info
@@ -163,6 +191,7 @@ class _SealingConfig:
     key_version: str
     tsa_primary: str
     tsa_fallback: str
+    ca_chain_path: Optional[Path] = None
 
 
 def _load_config() -> _SealingConfig:
@@ -199,6 +228,7 @@ def _load_config() -> _SealingConfig:
         key_version=os.environ.get("CELESTE_SIGNING_KEY_VERSION", "v1"),
         tsa_primary=os.environ.get("CELESTE_TSA_PRIMARY", "https://freetsa.org/tsr"),
         tsa_fallback=os.environ.get("CELESTE_TSA_FALLBACK", "http://timestamp.digicert.com"),
+        ca_chain_path=Path(ca_chain) if (ca_chain := os.environ.get("CELESTE_SIGNING_CA_CHAIN_PATH")) else None,
     )
 
 
@@ -385,17 +415,21 @@ def _upgrade_to_pdfa3(pdf_bytes: bytes) -> bytes:
         raise ConformanceError(f"pikepdf failed during PDF/A-3 upgrade: {e}") from e
 
 
-def _add_srgb_output_intent(pdf: pikepdf.Pdf) -> None:
-    """Add sRGB OutputIntent. Required for PDF/A conformance."""
+@lru_cache(maxsize=1)
+def _srgb_icc_bytes() -> bytes:
+    """The sRGB ICC profile, read once per process."""
     srgb_icc_path = Path(__file__).parent / "icc" / "sRGB_v4_ICC_preference.icc"
     if not srgb_icc_path.exists():
         raise ConformanceError(
             f"sRGB ICC profile missing at {srgb_icc_path}. "
             f"Download from https://www.color.org/profiles2.xalter and commit to repo."
         )
+    return srgb_icc_path.read_bytes()
+
 
-    icc_bytes = srgb_icc_path.read_bytes()
-    icc_stream = pikepdf.Stream(pdf, icc_bytes)
+def _add_srgb_output_intent(pdf: pikepdf.Pdf) -> None:
+    """Add sRGB OutputIntent. Required for PDF/A conformance."""
+    icc_stream = pikepdf.Stream(pdf, _srgb_icc_bytes())
     icc_stream["/N"] = 3  # RGB has 3 components
 
     output_intent = pikepdf.Dictionary(
@@ -441,7 +475,7 @@ SIG_FIELD_NAME = "CelesteOSEvidenceSeal"
 
 def _sign_pades_b_lt(
     pdfa3_bytes: bytes,
-    config: _SealingConfig,
+    context: "SealingContext",
 ) -> tuple[bytes, datetime, str]:
     """
     Apply a PAdES-B-LT signature with an embedded RFC 3161 timestamp.
@@ -453,60 +487,54 @@ def _sign_pades_b_lt(
     Returns:
         (signed_pdf_bytes, signed_at_utc, tsa_authority_url_used)
     """
-    # Load signer — self-signed today, CA-issued at v1.1
-    try:
-        signer = signers.SimpleSigner.load(
-            key_file=str(config.key_path),
-            cert_file=str(config.cert_path),
-            ca_chain_files=(),  # self-signed: no chain
-            key_passphrase=_load_passphrase_from_secrets_manager(),
-        )
-    except Exception as e:
-        raise SigningError(f"Could not load signing key/cert: {e}") from e
-
-    # RFC 3161 timestamper — FreeTSA primary, DigiCert fallback
-    timestamper = _make_timestamper(config)
+    # RFC 3161 timestamper — FreeTSA primary, DigiCert fallback (kept warm)
+    timestamper, tsa_url = context.get_timestamper()
 
     # Append an empty signature field at a well-known name,
     # then sign into it. This keeps the field name stable across
     # all CelesteOS exports — verifiers can assert on it.
-    with pikepdf.open(io.BytesIO(pdfa3_bytes)) as pdf:
-        writer_buf = io.BytesIO()
-        pdf.save(writer_buf)
-    writer = IncrementalPdfFileWriter(io.BytesIO(writer_buf.getvalue()))
+    # The PDF/A-3 upgrade already wrote a clean pikepdf file, so the
+    # incremental writer can start from it directly.
+    writer = IncrementalPdfFileWriter(io.BytesIO(pdfa3_bytes))
 
     append_signature_field(
         writer,
         sig_field_spec=SigFieldSpec(sig_field_name=SIG_FIELD_NAME),
     )
 
+    # Self-signed staging cert: no OCSP/CRL exists, and pyHanko cannot build
+    # the FreeTSA root chain without its CA in the trust store, so validation
+    # info is only embedded once a CA chain is configured (v1.1).
+    validation_context = context.validation_context()
+
     sig_meta = PdfSignatureMetadata(
         field_name=SIG_FIELD_NAME,
         reason="CelesteOS evidence seal",
         location="verify.celeste7.ai",
         subfilter=SigSeedSubFilter.PADES,
         use_pades_lta=False,          # LTA archive-timestamp: v1.1
-        # embed_validation_info=False for self-signed staging cert:
-        # no OCSP/CRL exists for self-signed, and pyHanko cannot build the
-        # FreeTSA root chain without its CA in the trust store.
-        # Re-enable with allow_fetching=True when switched to CA-issued cert (v1.1).
-        embed_validation_info=False,
+        embed_validation_info=validation_context is not None,
+        validation_context=validation_context,
     )
 
     pdf_signer = PdfSigner(
         sig_meta,
-        signer=signer,
+        signer=context.signer,
         timestamper=timestamper,
     )
 
     out_buf = io.BytesIO()
     try:
         pdf_signer.sign_pdf(writer, output=out_buf)
+    except TimestampRequestError as e:
+        # Forget the selected TSA so the next attempt probes again
+        context.invalidate_timestamper()
+        raise TimestampError(f"TSA {tsa_url} failed during signing: {e}") from e
     except Exception as e:
         raise SigningError(f"pyHanko signing failed: {e}") from e
 
     signed_at = datetime.now(timezone.utc)
-    return out_buf.getvalue(), signed_at, timestamper.url
+    return out_buf.getvalue(), signed_at, tsa_url
 
 
 def _make_timestamper(config: _SealingConfig) -> HTTPTimeStamper:
@@ -566,6 +594,247 @@ def _cert_fingerprint(cert_path: Path) -> str:
     return hashlib.sha256(cert_path.read_bytes()).hexdigest()
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Warm signing context
+# ──────────────────────────────────────────────────────────────────────────────
+
+TSA_HEALTH_TTL_SECONDS = int(os.environ.get("CELESTE_TSA_HEALTH_TTL", "300"))
+# Revocation data without a nextUpdate is refreshed after this long
+REVOCATION_DEFAULT_TTL_SECONDS = 3600
+
+
+def _http_fetch(url: str, ocsp_request: Optional[bytes] = None) -> bytes:
+    """GET a CRL, or POST an OCSP request, returning the DER response."""
+    if ocsp_request is None:
+        r = requests.get(url, timeout=10)
+    else:
+        r = requests.post(url, data=ocsp_request, timeout=10,
+                          headers={"Content-Type": "application/ocsp-request"})
+    r.raise_for_status()
+    return r.content
+
+
+def _is_self_signed(cert: x509.Certificate) -> bool:
+    return cert.issuer == cert.subject
+
+
+def _extension_urls(cert: x509.Certificate, kind: str) -> list[str]:
+    """OCSP responder (kind="ocsp") or CRL distribution point (kind="crl") URLs."""
+    try:
+        if kind == "ocsp":
+            aia = cert.extensions.get_extension_for_oid(ExtensionOID.AUTHORITY_INFORMATION_ACCESS).value
+            return [d.access_location.value for d in aia
+                    if d.access_method == AuthorityInformationAccessOID.OCSP]
+        points = cert.extensions.get_extension_for_oid(ExtensionOID.CRL_DISTRIBUTION_POINTS).value
+        return [name.value for point in points for name in (point.full_name or [])
+                if isinstance(name, x509.UniformResourceIdentifier)]
+    except x509.ExtensionNotFound:
+        return []
+
+
+class RevocationCache:
+    """
+    OCSP responses and CRLs for the signing chain, each held until its
+    nextUpdate. A B-LT signature embeds them, so without the cache every
+    seal paid a responder round-trip per certificate.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Optional[bytes]], bytes] = _http_fetch,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._fetch = fetch
+        self._clock = clock
+        self._entries: dict[tuple, tuple[bytes, float]] = {}
+        self._lock = threading.Lock()  # guards _entries and _key_locks only
+        self._key_locks: dict[tuple, threading.Lock] = {}
+
+    def _expiry(self, next_update: Optional[datetime]) -> float:
+        if next_update is None:
+            return self._clock() + REVOCATION_DEFAULT_TTL_SECONDS
+        return next_update.timestamp()
+
+    def _cached(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[1] > self._clock():
+            return entry[0]
+        return None
+
+    def _get(self, key: tuple, load: Callable[[], tuple[bytes, Optional[datetime]]]) -> Optional[bytes]:
+        der = self._cached(key)
+        if der is not None:
+            return der
+        # One fetch per key at a time; other keys are not held up by it
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            der = self._cached(key)
+            if der is not None:
+                return der
+            try:
+                der, next_update = load()
+            except Exception as e:
+                # Expired revocation data is not evidence — drop it
+                log.warning("evidence.sealing.revocation_fetch_failed", extra={"key": str(key[:2]), "error": str(e)})
+                with self._lock:
+                    self._entries.pop(key, None)
+                return None
+            with self._lock:
+                self._entries[key] = (der, self._expiry(next_update))
+            return der
+
+    def crl(self, url: str) -> Optional[bytes]:
+        def load():
+            der = self._fetch(url, None)
+            return der, x509.load_der_x509_crl(der).next_update_utc
+        return self._get(("crl", url), load)
+
+    def ocsp(self, url: str, cert: x509.Certificate, issuer: x509.Certificate) -> Optional[bytes]:
+        def load():
+            request = ocsp.OCSPRequestBuilder().add_certificate(cert, issuer, hashes.SHA1()).build()
+            der = self._fetch(url, request.public_bytes(Encoding.DER))
+            response = ocsp.load_der_ocsp_response(der)
+            if response.response_status != ocsp.OCSPResponseStatus.SUCCESSFUL:
+                raise ValueError(f"OCSP responder returned {response.response_status.name}")
+            return der, response.next_update_utc
+        return self._get(("ocsp", url, cert.serial_number), load)
+
+    def collect(self, chain: list[x509.Certificate]) -> tuple[list[bytes], list[bytes]]:
+        """
+        (crls, ocsps) covering every non-root certificate in ``chain``.
+        OCSP is preferred; the issuer's CRL is the fallback.
+        """
+        by_subject = {cert.subject: cert for cert in chain}
+        crls: list[bytes] = []
+        ocsps: list[bytes] = []
+        for cert in chain:
+            issuer = by_subject.get(cert.issuer)
+            if _is_self_signed(cert) or issuer is None:
+                continue
+            response = next(filter(None, (self.ocsp(url, cert, issuer) for url in _extension_urls(cert, "ocsp"))), None)
+            if response is not None:
+                ocsps.append(response)
+                continue
+            for url in _extension_urls(cert, "crl"):
+                crl = self.crl(url)
+                if crl is not None and crl not in crls:
+                    crls.append(crl)
+                    break
+        return crls, ocsps
+
+
+@dataclass
+class SealingContext:
+    """
+    Document-independent sealing state, built once and reused for every seal.
+
+    ``timestamper`` pins a TSA (tests, private TSA); otherwise the configured
+    primary/fallback TSAs are probed and the healthy one is remembered for
+    TSA_HEALTH_TTL_SECONDS. Reusing the HTTPTimeStamper also keeps pyHanko's
+    size-estimation token, which otherwise costs an extra TSA round-trip.
+    """
+    config: _SealingConfig
+    signer: signers.SimpleSigner
+    cert_fingerprint: str
+    chain: list[x509.Certificate] = field(default_factory=list)
+    revocation: RevocationCache = field(default_factory=RevocationCache)
+    timestamper: Optional[timestamps.TimeStamper] = None
+    _tsa: Optional[tuple[HTTPTimeStamper, str, float]] = field(default=None, repr=False)
+    _tsa_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def get_timestamper(self) -> tuple[timestamps.TimeStamper, str]:
+        """(timestamper, authority label), probing TSAs at most once per TTL."""
+        if self.timestamper is not None:
+            return self.timestamper, getattr(self.timestamper, "url", type(self.timestamper).__name__)
+        with self._tsa_lock:
+            if self._tsa is None or self._tsa[2] < time.time():
+                tsa = _make_timestamper(self.config)
+                self._tsa = (tsa, tsa.url, time.time() + TSA_HEALTH_TTL_SECONDS)
+            return self._tsa[0], self._tsa[1]
+
+    def invalidate_timestamper(self) -> None:
+        self._tsa = None
+
+    def validation_context(self) -> Optional[ValidationContext]:
+        """
+        Validation context for embedding LTV data, or None for a self-signed
+        cert. Revocation info comes from the cache; nothing is fetched while
+        signing.
+        """
+        roots = [cert for cert in self.chain if _is_self_signed(cert)]
+        if not roots:
+            return None
+        crls, ocsps = self.revocation.collect(self.chain)
+        return ValidationContext(
+            trust_roots=_to_asn1(roots),
+            other_certs=_to_asn1([cert for cert in self.chain if not _is_self_signed(cert)]),
+            crls=crls,
+            ocsps=ocsps,
+            allow_fetching=False,
+        )
+
+
+def _to_asn1(certs: list[x509.Certificate]) -> list[asn1_x509.Certificate]:
+    return [asn1_x509.Certificate.load(cert.public_bytes(Encoding.DER)) for cert in certs]
+
+
+def build_sealing_context(
+    config: Optional[_SealingConfig] = None,
+    timestamper: Optional[timestamps.TimeStamper] = None,
+    revocation: Optional[RevocationCache] = None,
+) -> SealingContext:
+    """Load cert, key and chain once and return a ready-to-use context."""
+    config = config or _load_config()
+    chain_files = (str(config.ca_chain_path),) if config.ca_chain_path else ()
+    # Load signer — self-signed today, CA-issued at v1.1
+    try:
+        signer = signers.SimpleSigner.load(
+            key_file=str(config.key_path),
+            cert_file=str(config.cert_path),
+            ca_chain_files=chain_files,
+            key_passphrase=_load_passphrase_from_secrets_manager(),
+        )
+    except Exception as e:
+        raise SigningError(f"Could not load signing key/cert: {e}") from e
+
+    chain = x509.load_pem_x509_certificates(config.cert_path.read_bytes())[:1]
+    if config.ca_chain_path:
+        chain += x509.load_pem_x509_certificates(config.ca_chain_path.read_bytes())
+
+    log.info("evidence.sealing.context_ready", extra={"key_version": config.key_version, "ltv": len(chain) > 1})
+    return SealingContext(
+        config=config,
+        signer=signer,
+        cert_fingerprint=_cert_fingerprint(config.cert_path),
+        chain=chain,
+        revocation=revocation or RevocationCache(),
+        timestamper=timestamper,
+    )
+
+
+_context: Optional[SealingContext] = None
+_context_lock = threading.Lock()
+
+
+def get_sealing_context() -> SealingContext:
+    """The process-wide warm context (built on first use)."""
+    global _context
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                _context = build_sealing_context()
+    return _context
+
+
+def reset_sealing_context() -> None:
+    """Drop the warm context (key rotation, tests)."""
+    global _context
+    with _context_lock:
+        _context = None
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # CLI / smoke test
 # ──────────────────────────────────────────────────────────────────────────────
@@ -16,8 +16,8 @@ from fastapi import HTTPException
 
 from action_router.entity_actions import get_available_actions
 from integrations.supabase import get_supabase_client
-from lib.entity_helpers import _sign_url, _get_attachments, _nav, ATTACHMENT_BUCKET
-from lib.user_resolver import resolve_users, resolve_yacht_name, resolve_equipment_batch
+from lib.entity_helpers import _sign_url, _get_attachments, _query_attachments, _build_attachments, _nav, ATTACHMENT_BUCKET
+from lib.dataloader import RequestLoader
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +58,10 @@ class EntityLensHandlers:
             except Exception:
                 properties = {}
 
-        attachments = _get_attachments(supabase, "certificate", certificate_id, yacht_id)
+        loader = RequestLoader(supabase, yacht_id)
+        attachment_rows = _query_attachments(supabase, "certificate", certificate_id, yacht_id)
+        loader.prime_users(r.get("uploaded_by") for r in attachment_rows)
+        doc_attachment = None
         doc_id = data.get("document_id")
         if doc_id:
             try:
@@ -71,13 +74,13 @@ class EntityLensHandlers:
                     bucket = dm.get("storage_bucket") or "pms-certificate-documents"
                     url = _sign_url(supabase, bucket, dm.get("storage_path"))
                     if url:
-                        attachments.append({
+                        doc_attachment = {
                             "id": dm.get("id") or doc_id,
                             "filename": dm.get("filename") or "Certificate Document",
                             "url": url,
                             "mime_type": dm.get("mime_type") or "application/octet-stream",
                             "size_bytes": dm.get("file_size") or 0,
-                        })
+                        }
             except Exception as e:
                 logger.warning(f"Failed to resolve document_id {doc_id} for cert {certificate_id}: {e}")
 
@@ -165,7 +168,7 @@ class EntityLensHandlers:
         equipment_ids_raw = properties.get("equipment_ids") or []
         if not isinstance(equipment_ids_raw, list):
             equipment_ids_raw = []
-        related_equipment = resolve_equipment_batch(supabase, yacht_id, equipment_ids_raw)
+        related_equipment = loader.equipment(equipment_ids_raw)
 
         if domain == "vessel":
             for _eq in related_equipment[:3]:
@@ -173,7 +176,7 @@ class EntityLensHandlers:
                 if _eq_n:
                     nav.append(_eq_n)
 
-        yacht_name = resolve_yacht_name(supabase, yacht_id)
+        yacht_name = loader.yacht_name()
 
         _DELETE_ACTIONS = {
             "archive_certificate",
@@ -196,7 +199,13 @@ class EntityLensHandlers:
         if data.get("deleted_by"):
             user_ids_to_resolve.add(data["deleted_by"])
 
-        user_map = resolve_users(supabase, yacht_id, user_ids_to_resolve)
+        # One round-trip for uploaders, audit actors, note authors and period actors
+        loader.prime_users(user_ids_to_resolve)
+        user_map = loader.users()
+
+        attachments = _build_attachments(supabase, "certificate", attachment_rows, user_map)
+        if doc_attachment:
+            attachments.append(doc_attachment)
 
         for e in cert_audit:
             uid = e.get("user_id")
@@ -308,9 +317,10 @@ class EntityLensHandlers:
                 if uid:
                     user_ids_needed.append(uid)
 
-        resolved_users = resolve_users(supabase, yacht_id, user_ids_needed)
-        yacht_name = resolve_yacht_name(supabase, yacht_id)
-        related_equipment = resolve_equipment_batch(supabase, yacht_id, equipment_ids)
+        loader = RequestLoader(supabase, yacht_id)
+        resolved_users = loader.users(user_ids_needed)
+        yacht_name = loader.yacht_name()
+        related_equipment = loader.equipment(equipment_ids)
 
         def _user_name(uid: Optional[str]) -> Optional[str]:
             if not uid:
@@ -864,7 +874,13 @@ class EntityLensHandlers:
                 data.get("deleted_by"),
             ) if uid
         ]
-        actor_map = resolve_users(supabase, yacht_id, actor_ids) if actor_ids else {}
+        attachment_rows = _query_attachments(supabase, "purchase_order", po_id, yacht_id)
+
+        # One round-trip for actors and attachment uploaders
+        loader = RequestLoader(supabase, yacht_id)
+        loader.prime_users(actor_ids)
+        loader.prime_users(r.get("uploaded_by") for r in attachment_rows)
+        actor_map = loader.users()
 
         def _actor(uid: Optional[str]) -> Dict[str, Optional[str]]:
             entry = actor_map.get(uid) if uid else None
@@ -903,7 +919,7 @@ class EntityLensHandlers:
         notes_text = meta.get("notes")
         deletion_reason = meta.get("deletion_reason")
 
-        attachments = _get_attachments(supabase, "purchase_order", po_id, yacht_id)
+        attachments = _build_attachments(supabase, "purchase_order", attachment_rows, actor_map)
 
         nav = []
         if data.get("source_shopping_list_id"):
@@ -1121,16 +1137,21 @@ class EntityLensHandlers:
             if not any((a.get('action') or '').startswith(p) for p in _read_prefixes)
         ]
         _audit_user_ids = list({a['user_id'] for a in audit_history if a.get('user_id')})
-        if _audit_user_ids:
-            _audit_actor_map = resolve_users(supabase, yacht_id, _audit_user_ids)
-            for _a in audit_history:
-                _uid = _a.get('user_id')
-                if _uid and _uid in _audit_actor_map:
-                    _a['actor'] = _audit_actor_map[_uid]
+        attachment_rows = _query_attachments(supabase, "work_order", wo_id, yacht_id)
+
+        # One round-trip for audit actors and attachment uploaders
+        loader = RequestLoader(supabase, yacht_id)
+        loader.prime_users(_audit_user_ids)
+        loader.prime_users(r.get("uploaded_by") for r in attachment_rows)
+        _user_map = loader.users()
+        for _a in audit_history:
+            _uid = _a.get('user_id')
+            if _uid and _uid in _user_map:
+                _a['actor'] = _user_map[_uid]
 
         is_hod = await self._is_user_hod(user_id, yacht_id)
 
-        attachments = _get_attachments(supabase, "work_order", wo_id, yacht_id)
+        attachments = _build_attachments(supabase, "work_order", attachment_rows, _user_map)
         nav = [n for n in [
             _nav("equipment", data.get("equipment_id"), "Equipment"),
             _nav("fault", data.get("fault_id"), "Fault"),
@@ -42,6 +42,8 @@ from schemas.action_response_schema import (
     AvailableAction,
 )
 
+from lib.pagination import InvalidCursor, PageRequest, total_count_key
+
 from .schema_mapping import (
     get_table,
     map_work_order_select,
@@ -168,9 +170,11 @@ class ListHandlers:
 
         Params:
         - limit: max results (default 50)
-        - offset: pagination offset
+        - cursor: opaque ``next_cursor`` from the previous page (keyset)
+        - offset: legacy pagination offset (ignored when cursor is set)
         - order_by: field to sort by
         - order_dir: asc/desc
+        - include_total: set False to skip the (estimated) total count
 
         Conjunction handling (from classification):
         - CONTRADICTION: "pending completed" → return empty immediately
@@ -185,10 +189,13 @@ class ListHandlers:
             return contradiction_response
 
         try:
+            page = PageRequest.from_params(params, default_order="created_at", default_dir="desc")
+            count_key = total_count_key(get_table("work_orders"), yacht_id, filters)
+
             # Start query
             query = self.db.table(get_table("work_orders")).select(
                 map_work_order_select(),
-                count="exact"
+                count=page.count_method(count_key)
             ).eq("yacht_id", yacht_id)
 
             # Apply filters
@@ -216,19 +223,13 @@ class ListHandlers:
                 if type_val:
                     query = query.eq("type", type_val)
 
-            # Pagination
-            limit = params.get("limit", 50)
-            offset = params.get("offset", 0)
-            order_by = params.get("order_by", "created_at")
-            order_dir = params.get("order_dir", "desc")
-
-            query = query.order(order_by, desc=(order_dir == "desc"))
-            query = query.range(offset, offset + limit - 1)
+            # Pagination: keyset when a cursor is supplied, offset otherwise
+            query = page.apply(query)
 
             # Execute
             result = query.execute()
             rows = result.data or []
-            total_count = result.count or len(rows)
+            total_count = page.total(count_key, result, rows)
 
             # Normalize and enrich
             work_orders = []
@@ -241,8 +242,9 @@ class ListHandlers:
             response_data = {
                 "items": work_orders,
                 "total_count": total_count,
-                "limit": limit,
-                "offset": offset,
+                "limit": page.limit,
+                "offset": page.offset,
+                **page.meta(rows),
                 "filters_applied": list(filters.keys()),
             }
 
@@ -272,6 +274,9 @@ class ListHandlers:
 
             return builder.build()
 
+        except InvalidCursor as e:
+            builder.set_error("VALIDATION_ERROR", str(e))
+            return builder.build()
         except Exception as e:
             logger.error(f"list_work_orders failed: {e}", exc_info=True)
             builder.set_error("INTERNAL_ERROR", str(e))
@@ -329,10 +334,13 @@ class ListHandlers:
             return contradiction_response
 
         try:
+            page = PageRequest.from_params(params, default_order="name", default_dir="asc")
+            count_key = total_count_key(get_table("parts"), yacht_id, filters)
+
             # Start query
             query = self.db.table(get_table("parts")).select(
                 map_parts_select(),
-                count="exact"
+                count=page.count_method(count_key)
             ).eq("yacht_id", yacht_id)
 
             # Apply filters
@@ -377,19 +385,13 @@ class ListHandlers:
             # Note: quantity filtering would require the column to exist
             # For now, we return all and filter in Python if needed
 
-            # Pagination
-            limit = params.get("limit", 50)
-            offset = params.get("offset", 0)
-            order_by = params.get("order_by", "name")
-            order_dir = params.get("order_dir", "asc")
-
-            query = query.order(order_by, desc=(order_dir == "desc"))
-            query = query.range(offset, offset + limit - 1)
+            # Pagination: keyset when a cursor is supplied, offset otherwise
+            query = page.apply(query)
 
             # Execute
             result = query.execute()
             rows = result.data or []
-            total_count = result.count or len(rows)
+            total_count = page.total(count_key, result, rows)
 
             # Normalize
             parts = [normalize_part(row) for row in rows]
@@ -408,8 +410,9 @@ class ListHandlers:
             response_data = {
                 "items": parts,
                 "total_count": total_count,
-                "limit": limit,
-                "offset": offset,
+                "limit": page.limit,
+                "offset": page.offset,
+                **page.meta(rows),
                 "filters_applied": list(filters.keys()),
             }
 
@@ -448,6 +451,9 @@ class ListHandlers:
 
             return builder.build()
 
+        except InvalidCursor as e:
+            builder.set_error("VALIDATION_ERROR", str(e))
+            return builder.build()
         except Exception as e:
             logger.error(f"list_parts failed: {e}", exc_info=True)
             builder.set_error("INTERNAL_ERROR", str(e))
@@ -486,10 +492,13 @@ class ListHandlers:
             return contradiction_response
 
         try:
+            page = PageRequest.from_params(params, default_order="detected_at", default_dir="desc")
+            count_key = total_count_key(get_table("faults"), yacht_id, filters)
+
             # Start query
             query = self.db.table(get_table("faults")).select(
                 map_faults_select(),
-                count="exact"
+                count=page.count_method(count_key)
             ).eq("yacht_id", yacht_id)
 
             # Apply filters
@@ -511,19 +520,13 @@ class ListHandlers:
             if "equipment_id" in filters:
                 query = query.eq("equipment_id", filters["equipment_id"])
 
-            # Pagination
-            limit = params.get("limit", 50)
-            offset = params.get("offset", 0)
-            order_by = params.get("order_by", "detected_at")
-            order_dir = params.get("order_dir", "desc")
-
-            query = query.order(order_by, desc=(order_dir == "desc"))
-            query = query.range(offset, offset + limit - 1)
+            # Pagination: keyset when a cursor is supplied, offset otherwise
+            query = page.apply(query)
 
             # Execute
             result = query.execute()
             rows = result.data or []
-            total_count = result.count or len(rows)
+            total_count = page.total(count_key, result, rows)
 
             # Normalize
             faults = [normalize_fault(row) for row in rows]
@@ -532,8 +535,9 @@ class ListHandlers:
             response_data = {
                 "items": faults,
                 "total_count": total_count,
-                "limit": limit,
-                "offset": offset,
+                "limit": page.limit,
+                "offset": page.offset,
+                **page.meta(rows),
                 "filters_applied": list(filters.keys()),
             }
 
@@ -558,6 +562,9 @@ class ListHandlers:
 
             return builder.build()
 
+        except InvalidCursor as e:
+            builder.set_error("VALIDATION_ERROR", str(e))
+            return builder.build()
         except Exception as e:
             logger.error(f"list_faults failed: {e}", exc_info=True)
             builder.set_error("INTERNAL_ERROR", str(e))
@@ -598,10 +605,13 @@ class ListHandlers:
             return contradiction_response
 
         try:
+            page = PageRequest.from_params(params, default_order="name", default_dir="asc")
+            count_key = total_count_key(get_table("equipment"), yacht_id, filters)
+
             # Start query
             query = self.db.table(get_table("equipment")).select(
                 map_equipment_select(),
-                count="exact"
+                count=page.count_method(count_key)
             ).eq("yacht_id", yacht_id)
 
             # Apply filters
@@ -639,19 +649,13 @@ class ListHandlers:
                 normalized_loc = self._normalize_location(not_loc)
                 query = query.not_.ilike("location", f"%{normalized_loc}%")
 
-            # Pagination
-            limit = params.get("limit", 50)
-            offset = params.get("offset", 0)
-            order_by = params.get("order_by", "name")
-            order_dir = params.get("order_dir", "asc")
-
-            query = query.order(order_by, desc=(order_dir == "desc"))
-            query = query.range(offset, offset + limit - 1)
+            # Pagination: keyset when a cursor is supplied, offset otherwise
+            query = page.apply(query)
 
             # Execute
             result = query.execute()
             rows = result.data or []
-            total_count = result.count or len(rows)
+            total_count = page.total(count_key, result, rows)
 
             # Normalize
             equipment = [normalize_equipment(row) for row in rows]
@@ -660,8 +664,9 @@ class ListHandlers:
             response_data = {
                 "items": equipment,
                 "total_count": total_count,
-                "limit": limit,
-                "offset": offset,
+                "limit": page.limit,
+                "offset": page.offset,
+                **page.meta(rows),
                 "filters_applied": list(filters.keys()),
             }
 
@@ -694,6 +699,9 @@ class ListHandlers:
 
             return builder.build()
 
+        except InvalidCursor as e:
+            builder.set_error("VALIDATION_ERROR", str(e))
+            return builder.build()
         except Exception as e:
             logger.error(f"list_equipment failed: {e}", exc_info=True)
             builder.set_error("INTERNAL_ERROR", str(e))
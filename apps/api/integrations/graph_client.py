@@ -18,10 +18,16 @@ import os
 import random
 import asyncio
 import time
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 from datetime import datetime, timedelta, timezone
 from supabase import Client
 
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Graph API base URL
@@ -95,6 +101,160 @@ class GraphApiError(GraphClientError):
         self.status_code = status_code
 
 
+# ============================================================================
+# SHARED HTTP CLIENT & JSON $BATCH
+# ============================================================================
+
+GRAPH_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Graph JSON batching accepts at most 20 sub-requests per $batch call
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_BATCH_MAX_RETRIES = int(os.getenv('GRAPH_BATCH_MAX_RETRIES', '3'))
+GRAPH_BATCH_MAX_RETRY_WAIT_SECONDS = float(os.getenv('GRAPH_BATCH_MAX_RETRY_WAIT_SECONDS', '30'))
+
+# Sub-request statuses worth retrying on their own (throttled / transient)
+_BATCH_RETRY_STATUSES = {429, 503, 504}
+
+# One pool per event loop — httpx connections are loop-bound (see
+# services.document_proxy._get_http_client for the same pattern).
+_graph_http_clients: Dict[Optional[int], httpx.AsyncClient] = {}
+
+
+def get_graph_http_client() -> httpx.AsyncClient:
+    """
+    Shared keep-alive client for Graph calls (HTTP/2 when h2 is installed).
+
+    Reusing one client keeps the TLS connection to graph.microsoft.com warm
+    across requests instead of paying a handshake per call.
+    """
+    try:
+        loop_id = id(asyncio.get_running_loop())
+    except RuntimeError:
+        loop_id = None
+    client = _graph_http_clients.get(loop_id)
+    if client is None:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=GRAPH_HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+        _graph_http_clients[loop_id] = client
+    return client
+
+
+async def close_graph_http_clients() -> None:
+    """Close pooled Graph connections (call on shutdown)."""
+    clients = list(_graph_http_clients.values())
+    _graph_http_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[GraphClient] Close failed: {e}")
+
+
+def _retry_after_seconds(headers: Optional[Dict[str, Any]], attempt: int) -> float:
+    """Retry-After (delta-seconds) from a response, else exponential backoff."""
+    for key, value in (headers or {}).items():
+        if key.lower() == 'retry-after':
+            try:
+                return max(0.0, float(value))
+            except (TypeError, ValueError):
+                break
+    return float(2 ** attempt)
+
+
+async def graph_batch(
+    post: Callable[[Dict[str, Any]], Awaitable[httpx.Response]],
+    requests: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Run Graph sub-requests through JSON $batch, 20 per call.
+
+    Args:
+        post: Sends one $batch payload and returns the HTTP response
+              (the caller owns auth and the rate-limit accounting)
+        requests: Sub-requests as {'method': 'GET', 'url': '/me/...'}; 'url'
+                  is relative to the API version root
+
+    Returns:
+        One {'status', 'headers', 'body'} per request, in request order.
+        Sub-requests throttled or failing transiently (429/503/504) are
+        retried on their own after their Retry-After, up to
+        GRAPH_BATCH_MAX_RETRIES times; after that their last status is
+        returned. A non-retryable failure of the $batch call itself raises
+        GraphApiError.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    pending = list(range(len(requests)))
+    attempt = 0
+
+    while pending:
+        retry: List[int] = []
+        wait = 0.0
+        final = attempt >= GRAPH_BATCH_MAX_RETRIES
+
+        for start in range(0, len(pending), GRAPH_BATCH_MAX_REQUESTS):
+            chunk = pending[start:start + GRAPH_BATCH_MAX_REQUESTS]
+            payload = {'requests': [{**requests[i], 'id': str(i)} for i in chunk]}
+            response = await post(payload)
+
+            if response.status_code in _BATCH_RETRY_STATUSES and not final:
+                retry.extend(chunk)
+                wait = max(wait, _retry_after_seconds(response.headers, attempt))
+                continue
+            if not response.is_success:
+                raise GraphApiError(
+                    f"Graph $batch failed: {response.status_code} {response.text[:200]}",
+                    response.status_code,
+                )
+
+            for sub in response.json().get('responses', []):
+                i = int(sub['id'])
+                status = sub.get('status', 0)
+                if status in _BATCH_RETRY_STATUSES and not final:
+                    retry.append(i)
+                    wait = max(wait, _retry_after_seconds(sub.get('headers'), attempt))
+                    continue
+                results[i] = {
+                    'status': status,
+                    'headers': sub.get('headers') or {},
+                    'body': sub.get('body'),
+                }
+
+        if not retry:
+            break
+        attempt += 1
+        logger.info(f"[GraphBatch] Retrying {len(retry)} sub-request(s) after {wait:.0f}s")
+        await asyncio.sleep(min(wait, GRAPH_BATCH_MAX_RETRY_WAIT_SECONDS))
+        pending = sorted(retry)
+
+    # Sub-requests Graph never answered count as failed
+    return [r or {'status': 0, 'headers': {}, 'body': None} for r in results]
+
+
+async def batch_attachment_metadata(
+    post: Callable[[Dict[str, Any]], Awaitable[httpx.Response]],
+    message_ids: List[str],
+    select: str = 'id,name,contentType,size,isInline',
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Attachment metadata (not content) for many messages via $batch.
+
+    Returns {message_id: [attachment, ...]} for the messages Graph answered
+    with 200; callers fall back to a single request for any id missing.
+    """
+    responses = await graph_batch(post, [
+        {'method': 'GET', 'url': f"/me/messages/{message_id}/attachments?$select={select}"}
+        for message_id in message_ids
+    ])
+    return {
+        message_id: (response['body'] or {}).get('value', [])
+        for message_id, response in zip(message_ids, responses)
+        if response['status'] == 200
+    }
+
+
 # ============================================================================
 # M6: RATE LIMITER & EXPONENTIAL BACKOFF
 # ============================================================================
@@ -551,28 +711,41 @@ class GraphReadClient:
         3. Retry request once
         4. If still 401, raise GraphApiError
         """
-        async with httpx.AsyncClient() as client:
-            headers = await self._headers()
-            response = await client.request(method, url, headers=headers, timeout=30.0, **kwargs)
+        client = get_graph_http_client()
+        headers = await self._headers()
+        response = await client.request(method, url, headers=headers, timeout=30.0, **kwargs)
+
+        # If 401 and haven't retried yet, attempt refresh and retry
+        if response.status_code == 401 and not self._refresh_attempted:
+            logger.info("[GraphRead] Got 401, attempting token refresh and retry")
+            self._refresh_attempted = True
+            self._token = None
+
+            try:
+                # Get fresh token (will trigger refresh)
+                headers = await self._headers()
+                response = await client.request(method, url, headers=headers, timeout=30.0, **kwargs)
+            except TokenRefreshError as e:
+                raise GraphApiError(f"Token refresh failed: {e}", 401)
 
-            # If 401 and haven't retried yet, attempt refresh and retry
-            if response.status_code == 401 and not self._refresh_attempted:
-                logger.info("[GraphRead] Got 401, attempting token refresh and retry")
-                self._refresh_attempted = True
-                self._token = None
+        # Reset refresh flag on success
+        if response.is_success:
+            self._refresh_attempted = False
 
-                try:
-                    # Get fresh token (will trigger refresh)
-                    headers = await self._headers()
-                    response = await client.request(method, url, headers=headers, timeout=30.0, **kwargs)
-                except TokenRefreshError as e:
-                    raise GraphApiError(f"Token refresh failed: {e}", 401)
+        return response
 
-            # Reset refresh flag on success
-            if response.is_success:
-                self._refresh_attempted = False
+    async def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run read sub-requests through Graph JSON $batch (see graph_batch).
+
+        Only GET sub-requests are allowed on the READ client.
+        """
+        if any(r.get('method', 'GET').upper() != 'GET' for r in requests):
+            raise TokenPurposeMismatchError("READ client $batch only allows GET sub-requests.")
+        return await graph_batch(self._post_batch, requests)
 
-            return response
+    async def _post_batch(self, payload: Dict[str, Any]) -> httpx.Response:
+        return await self._request_with_retry('POST', f"{GRAPH_API_BASE}/$batch", json=payload)
 
     async def list_messages(
         self,
@@ -653,6 +826,10 @@ class GraphReadClient:
         response.raise_for_status()
         return response.json()
 
+    async def list_attachments(self, message_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Attachment metadata for many messages, 20 per $batch call."""
+        return await batch_attachment_metadata(self._post_batch, message_ids)
+
     async def get_attachment(self, message_id: str, attachment_id: str) -> Dict[str, Any]:
         """Get attachment content."""
         url = f"{GRAPH_API_BASE}/me/messages/{message_id}/attachments/{attachment_id}"
@@ -763,11 +940,10 @@ class GraphWriteClient:
 
         url = f"{GRAPH_API_BASE}/me/sendMail"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url, headers=self._headers(), json=message, timeout=30.0
-            )
-            response.raise_for_status()
+        response = await get_graph_http_client().post(
+            url, headers=self._headers(), json=message, timeout=30.0
+        )
+        response.raise_for_status()
 
         return {'sent': True}
 
@@ -792,12 +968,11 @@ class GraphWriteClient:
 
         url = f"{GRAPH_API_BASE}/me/messages"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url, headers=self._headers(), json=draft, timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await get_graph_http_client().post(
+            url, headers=self._headers(), json=draft, timeout=30.0
+        )
+        response.raise_for_status()
+        return response.json()
 
     # FORBIDDEN OPERATIONS - raise hard errors
 
@@ -161,6 +161,128 @@ def get_tenant_client(tenant_key_alias: str) -> Client:
         raise
 
 
+# ============================================================================
+# ASYNC TENANT CLIENT (PostgREST over pooled httpx.AsyncClient, HTTP/2)
+# ============================================================================
+# The sync supabase-py client blocks the event loop for the full duration of
+# every .execute(). AsyncPostgrestClient exposes the same builder API
+# (.table().select().eq()...) but .execute() is awaitable, so independent
+# queries can run under asyncio.gather. Handlers migrate one at a time:
+#
+#     db = get_async_tenant_client(tenant_key)
+#     wo, faults = await asyncio.gather(
+#         db.table("pms_work_orders").select("id").eq("yacht_id", y).execute(),
+#         db.table("pms_faults").select("id").eq("yacht_id", y).execute(),
+#     )
+#
+# Code that must accept either client (e.g. shared helpers) should call
+# aexecute(query) instead of query.execute().
+
+ASYNC_POSTGREST_TIMEOUT = float(os.getenv('ASYNC_POSTGREST_TIMEOUT', '5'))
+
+# Keyed by (tenant_key_alias, id(loop)): httpx.AsyncClient connections are
+# bound to the loop that opened them, so tests/workers running their own
+# loop get their own pool instead of a client that fails on first use.
+_async_tenant_clients: Dict[tuple, Any] = {}
+
+
+def get_tenant_credentials(tenant_key_alias: str) -> tuple:
+    """
+    Return ``(supabase_url, service_key)`` for a tenant.
+
+    For callers that talk to tenant services directly over HTTP (async
+    PostgREST, storage streaming) rather than through supabase-py.
+
+    Raises:
+        ValueError: If tenant credentials not found in environment
+    """
+    tenant_url = os.getenv(f'{tenant_key_alias}_SUPABASE_URL')
+    tenant_service_key = os.getenv(f'{tenant_key_alias}_SUPABASE_SERVICE_KEY')
+
+    if not tenant_url or not tenant_service_key:
+        logger.error(f"[TenantCredentials] Missing credentials for {tenant_key_alias}")
+        raise ValueError(f'Missing credentials for tenant {tenant_key_alias}')
+
+    return tenant_url, tenant_service_key
+
+
+def _create_async_postgrest_client(url: str, service_key: str):
+    from postgrest import AsyncPostgrestClient
+
+    return AsyncPostgrestClient(
+        f"{url.rstrip('/')}/rest/v1",
+        headers={
+            'apikey': service_key,
+            'Authorization': f'Bearer {service_key}',
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+        },
+        timeout=ASYNC_POSTGREST_TIMEOUT,
+    )
+
+
+def get_async_tenant_client(tenant_key_alias: str):
+    """
+    Get or create an async PostgREST client for a specific tenant.
+
+    Same credential lookup as get_tenant_client(). One pooled HTTP/2
+    connection set is kept per tenant per event loop.
+
+    Args:
+        tenant_key_alias: e.g., 'yTEST_YACHT_001'
+
+    Returns:
+        postgrest.AsyncPostgrestClient for the tenant's database
+
+    Raises:
+        ValueError: If tenant credentials not found in environment
+    """
+    import asyncio
+
+    try:
+        loop_id = id(asyncio.get_running_loop())
+    except RuntimeError:
+        loop_id = None
+
+    cache_key = (tenant_key_alias, loop_id)
+    client = _async_tenant_clients.get(cache_key)
+    if client is not None:
+        return client
+
+    tenant_url, tenant_service_key = get_tenant_credentials(tenant_key_alias)
+    client = _create_async_postgrest_client(tenant_url, tenant_service_key)
+    _async_tenant_clients[cache_key] = client
+    logger.info(f"[AsyncTenantClient] Created client for {tenant_key_alias}")
+    return client
+
+
+async def aexecute(query):
+    """
+    Execute a PostgREST query builder without blocking the event loop.
+
+    Async builders (from get_async_tenant_client) are awaited directly.
+    Sync supabase-py builders are run in the default thread pool, so
+    not-yet-migrated callers still stop freezing the loop.
+    """
+    import asyncio
+    import inspect
+
+    if inspect.iscoroutinefunction(query.execute):
+        return await query.execute()
+    return await asyncio.to_thread(query.execute)
+
+
+async def close_async_clients() -> None:
+    """Close pooled async PostgREST sessions (call on app shutdown)."""
+    clients = list(_async_tenant_clients.values())
+    _async_tenant_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[AsyncTenantClient] Close failed: {e}")
+
+
 # ============================================================================
 # VECTOR SEARCH
 # ============================================================================
@@ -0,0 +1,168 @@
+"""
+Request-scoped batch loader for display-name resolution.
+
+A single entity view or list page resolves user / equipment / yacht names
+from several places — attachment uploaders, audit actors, note authors,
+``created_by`` / ``assigned_to`` on every row. Each of those used to call the
+``lib.user_resolver`` functions on its own, so one response cost one
+``auth_users_profiles`` + ``auth_users_roles`` round-trip *per call site*.
+
+``RequestLoader`` is the dataloader pattern on top of those resolvers:
+
+    * **Collect, then resolve once.** Call sites ``prime_*()`` the ids they
+      will need while building the response; the first ``users()`` /
+      ``equipment()`` read resolves every primed id of that kind with a
+      single ``in_()`` query (via the existing resolvers).
+
+    * **Memoized for the request.** Ids already resolved — or resolved and
+      found missing — are never queried again on the same loader. Create one
+      loader per request; do not share it across requests.
+
+    * **Short cross-request TTL for users.** Profiles and roles change
+      rarely, so resolved users are also kept in a process-wide TTL cache
+      (``USER_CACHE_TTL_S``, default 60s) keyed by ``(yacht_id, user_id)``.
+      A hot list page then costs zero name look-ups on repeat loads.
+
+Semantics match ``lib.user_resolver`` exactly (yacht-scoped, null-safe,
+unknown ids simply absent from the result) so call sites swap over 1:1.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from cachetools import TTLCache
+
+from lib.user_resolver import resolve_equipment_batch, resolve_users, resolve_yacht_name
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TTL_S = int(os.getenv("USER_CACHE_TTL_S", "60"))
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", "5000"))
+
+# (yacht_id, user_id) -> {"name", "role"}
+_user_cache: TTLCache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL_S)
+_user_cache_lock = threading.Lock()
+
+_MISSING = object()
+
+
+def invalidate_user_cache(yacht_id: Optional[str] = None, user_id: Optional[str] = None) -> None:
+    """
+    Drop cached user profiles. No arguments clears everything; otherwise
+    entries matching the given yacht and/or user are removed. Call after a
+    profile rename or role change so the next request sees it immediately.
+    """
+    with _user_cache_lock:
+        if yacht_id is None and user_id is None:
+            _user_cache.clear()
+            return
+        for key in list(_user_cache.keys()):
+            y, u = key
+            if (yacht_id is None or y == yacht_id) and (user_id is None or u == user_id):
+                _user_cache.pop(key, None)
+
+
+class RequestLoader:
+    """
+    Per-request batch resolver for users, equipment and the yacht name.
+
+    Usage::
+
+        loader = RequestLoader(supabase, yacht_id)
+        loader.prime_users(r.get("created_by") for r in rows)
+        loader.prime_users(r.get("assigned_to") for r in rows)
+        users = loader.users()          # one round-trip for both fields
+        users.get(row["created_by"])    # {"name": ..., "role": ...} or None
+    """
+
+    def __init__(self, supabase, yacht_id: str):
+        self.supabase = supabase
+        self.yacht_id = yacht_id
+        self._users: Dict[str, Optional[dict]] = {}
+        self._pending_users: Set[str] = set()
+        self._equipment: Dict[str, Optional[dict]] = {}
+        self._pending_equipment: Set[str] = set()
+        self._yacht_name = _MISSING
+
+    # ── Users ────────────────────────────────────────────────────────────
+
+    def prime_users(self, user_ids: Iterable[Optional[str]]) -> None:
+        """Queue user ids for the next batch resolve."""
+        for uid in user_ids:
+            if uid and uid not in self._users:
+                self._pending_users.add(uid)
+
+    def users(self, user_ids: Iterable[Optional[str]] = ()) -> Dict[str, dict]:
+        """
+        Resolve ``user_ids`` plus everything primed so far; return
+        ``{uid: {name, role}}`` for the requested ids (or for every id this
+        loader knows about when called with no arguments).
+        """
+        requested = [uid for uid in user_ids if uid]
+        self.prime_users(requested)
+        self._flush_users()
+        keys = requested if requested else list(self._users)
+        return {uid: self._users[uid] for uid in keys if self._users.get(uid)}
+
+    def user(self, user_id: Optional[str]) -> Optional[dict]:
+        if not user_id:
+            return None
+        return self.users([user_id]).get(user_id)
+
+    def _flush_users(self) -> None:
+        if not self._pending_users:
+            return
+        pending = self._pending_users
+        self._pending_users = set()
+
+        misses: List[str] = []
+        with _user_cache_lock:
+            for uid in pending:
+                cached = _user_cache.get((self.yacht_id, uid), _MISSING)
+                if cached is _MISSING:
+                    misses.append(uid)
+                else:
+                    self._users[uid] = cached
+
+        if not misses:
+            return
+
+        resolved = resolve_users(self.supabase, self.yacht_id, misses)
+        with _user_cache_lock:
+            for uid in misses:
+                value = resolved.get(uid)
+                self._users[uid] = value
+                # Only hits go cross-request: resolve_users() degrades to {}
+                # on a transient error, which must not blank names for a TTL.
+                if value:
+                    _user_cache[(self.yacht_id, uid)] = value
+
+    # ── Equipment ────────────────────────────────────────────────────────
+
+    def prime_equipment(self, equipment_ids: Iterable[Optional[str]]) -> None:
+        for eid in equipment_ids:
+            if eid and eid not in self._equipment:
+                self._pending_equipment.add(eid)
+
+    def equipment(self, equipment_ids: Iterable[Optional[str]]) -> List[dict]:
+        """Equipment rows in the caller's order; unknown/deleted ids dropped."""
+        ids = [eid for eid in equipment_ids if eid]
+        self.prime_equipment(ids)
+        if self._pending_equipment:
+            pending = list(self._pending_equipment)
+            self._pending_equipment = set()
+            rows = {row["id"]: row for row in resolve_equipment_batch(self.supabase, self.yacht_id, pending)}
+            for eid in pending:
+                self._equipment[eid] = rows.get(eid)
+        return [self._equipment[eid] for eid in ids if self._equipment.get(eid)]
+
+    # ── Yacht ────────────────────────────────────────────────────────────
+
+    def yacht_name(self) -> Optional[str]:
+        if self._yacht_name is _MISSING:
+            self._yacht_name = resolve_yacht_name(self.supabase, self.yacht_id)
+        return self._yacht_name
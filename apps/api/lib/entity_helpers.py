@@ -41,8 +41,8 @@ def _sign_url(supabase, bucket: str, path: str, expires_in: int = 3600):
         return None
 
 
-def _get_attachments(supabase, entity_type: str, entity_id: str, yacht_id: str) -> list:
-    """Query pms_attachments, sign each, return list matching frontend Attachment shape."""
+def _query_attachments(supabase, entity_type: str, entity_id: str, yacht_id: str) -> list:
+    """Fetch live pms_attachments rows for an entity. Returns [] on failure."""
     try:
         result = supabase.table("pms_attachments").select(
             "id, filename, mime_type, storage_path, file_size, category, storage_bucket, "
@@ -50,19 +50,20 @@ def _get_attachments(supabase, entity_type: str, entity_id: str, yacht_id: str)
         ).eq("entity_type", entity_type).eq("entity_id", entity_id).eq(
             "yacht_id", yacht_id
         ).is_("deleted_at", "null").execute()
+        return result.data or []
+    except Exception as e:
+        logger.warning(f"Failed to get attachments for {entity_type}/{entity_id}: {e}")
+        return []
 
-        rows = result.data or []
 
-        user_ids = list({r.get("uploaded_by") for r in rows if r.get("uploaded_by")})
-        user_map: Dict[str, Dict[str, Optional[str]]] = {}
-        if user_ids:
-            try:
-                user_map = resolve_users(supabase, yacht_id, user_ids)
-            except Exception as exc:
-                logger.warning(
-                    f"_get_attachments: uploader resolve failed for {entity_type}/{entity_id}: {exc}"
-                )
+def _build_attachments(supabase, entity_type: str, rows: list, user_map: Dict[str, Dict[str, Optional[str]]]) -> list:
+    """Sign each attachment row and shape it like the frontend Attachment type.
 
+    ``user_map`` is ``{uid: {name, role}}`` for the uploaders; handlers with a
+    ``RequestLoader`` prime ``uploaded_by`` and resolve it with the rest of
+    the view's users, then pass ``loader.users()`` here.
+    """
+    try:
         attachments = []
         fallback_bucket = ATTACHMENT_BUCKET.get(entity_type, "attachments")
         for att in rows:
@@ -93,10 +94,27 @@ def _get_attachments(supabase, entity_type: str, entity_id: str, yacht_id: str)
             })
         return attachments
     except Exception as e:
-        logger.warning(f"Failed to get attachments for {entity_type}/{entity_id}: {e}")
+        logger.warning(f"Failed to build attachments for {entity_type}: {e}")
         return []
 
 
+def _get_attachments(supabase, entity_type: str, entity_id: str, yacht_id: str) -> list:
+    """Query pms_attachments, sign each, return list matching frontend Attachment shape."""
+    rows = _query_attachments(supabase, entity_type, entity_id, yacht_id)
+
+    user_ids = list({r.get("uploaded_by") for r in rows if r.get("uploaded_by")})
+    user_map: Dict[str, Dict[str, Optional[str]]] = {}
+    if user_ids:
+        try:
+            user_map = resolve_users(supabase, yacht_id, user_ids)
+        except Exception as exc:
+            logger.warning(
+                f"_get_attachments: uploader resolve failed for {entity_type}/{entity_id}: {exc}"
+            )
+
+    return _build_attachments(supabase, entity_type, rows, user_map)
+
+
 def _nav(entity_type: str, entity_id, label: str):
     """Return nav link dict or None if entity_id is falsy."""
     if not entity_id:
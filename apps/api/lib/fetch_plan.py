@@ -0,0 +1,125 @@
+"""
+Concurrent fetch plan for multi-section dashboard endpoints.
+
+The vessel surface and attention feed are each built from ~10 independent
+queries. Run serially, page latency is the *sum* of every section; run as a
+fetch plan, it is the *slowest* section, capped by a per-section timeout.
+
+Contract:
+
+    * **Independent sections run concurrently.** Each section is a zero-arg
+      coroutine factory; the plan starts them all under ``asyncio.gather``.
+
+    * **Per-section timeout.** A section that overruns its budget is
+      cancelled and replaced by its default — one slow table cannot hold the
+      landing page hostage.
+
+    * **Partial results, never a 500.** A section that raises is logged and
+      replaced by its default, exactly as the old per-section ``try/except``
+      blocks did. ``PlanMeta.failed`` lists which sections degraded so the
+      response can flag itself as partial.
+
+    * **Declared order preserved.** Results are returned in the order the
+      sections were declared, so callers that merge sections (e.g. the
+      attention feed's stable score sort) stay deterministic.
+
+Usage::
+
+    values, meta = await run_fetch_plan(
+        {
+            "faults": (lambda: _fetch_faults(db, yacht_ids), []),
+            "work_orders": (lambda: _fetch_work_orders(db, yacht_ids), []),
+        },
+        log_prefix="[Attention]",
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SECTION_TIMEOUT_S = float(os.getenv("FETCH_PLAN_SECTION_TIMEOUT_S", "4"))
+
+SectionFactory = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class PlanMeta:
+    """Per-request diagnostics for a fetch plan run."""
+    failed: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    timings_ms: Dict[str, int] = field(default_factory=dict)
+    total_ms: int = 0
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.failed)
+
+
+async def _run_section(
+    name: str,
+    factory: SectionFactory,
+    timeout_s: float,
+) -> Tuple[str, Any, Optional[BaseException], int]:
+    start = time.monotonic()
+    try:
+        value = await asyncio.wait_for(factory(), timeout=timeout_s)
+        return name, value, None, int((time.monotonic() - start) * 1000)
+    except Exception as e:  # includes asyncio.TimeoutError
+        return name, None, e, int((time.monotonic() - start) * 1000)
+
+
+async def run_fetch_plan(
+    sections: Dict[str, Tuple[SectionFactory, Any]],
+    timeout_s: Optional[float] = None,
+    log_prefix: str = "[FetchPlan]",
+) -> Tuple[Dict[str, Any], PlanMeta]:
+    """
+    Run independent sections concurrently with per-section timeouts.
+
+    Parameters
+    ----------
+    sections:
+        ``{name: (factory, default)}``. ``factory()`` must return a fresh
+        coroutine; ``default`` is used when the section fails or times out.
+    timeout_s:
+        Budget per section. Defaults to ``FETCH_PLAN_SECTION_TIMEOUT_S``.
+    log_prefix:
+        Prefix for degraded-section log lines (matches the caller's tag).
+
+    Returns
+    -------
+    ``(values, meta)`` where ``values`` maps every section name to its
+    result or default, in declaration order.
+    """
+    budget = SECTION_TIMEOUT_S if timeout_s is None else timeout_s
+    start = time.monotonic()
+
+    outcomes = await asyncio.gather(
+        *(_run_section(name, factory, budget) for name, (factory, _) in sections.items())
+    )
+
+    values: Dict[str, Any] = {}
+    meta = PlanMeta()
+    for name, value, error, elapsed_ms in outcomes:
+        meta.timings_ms[name] = elapsed_ms
+        if error is None:
+            values[name] = value
+            continue
+        values[name] = sections[name][1]
+        meta.failed.append(name)
+        if isinstance(error, asyncio.TimeoutError):
+            meta.timed_out.append(name)
+            logger.error(f"{log_prefix} {name} timed out after {budget:.1f}s")
+        else:
+            logger.error(f"{log_prefix} {name} query failed: {error}")
+
+    meta.total_ms = int((time.monotonic() - start) * 1000)
+    return values, meta
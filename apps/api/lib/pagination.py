@@ -0,0 +1,208 @@
+"""
+Keyset (cursor) pagination for PostgREST list queries.
+
+``.range(offset, offset + limit - 1)`` makes Postgres walk and discard
+``offset`` rows on every page, and ``count="exact"`` re-counts the whole
+filtered set each time — deep pages of a years-old ledger get slower the
+further you scroll. Keyset pagination instead seeks straight to the last row
+of the previous page using a composite ``(sort_col, id)`` key, so every page
+costs the same index range scan.
+
+Contract:
+
+    * **Opaque cursors.** ``next_cursor`` is a base64url token carrying the
+      sort column, direction and the last row's ``(sort value, id)``. Clients
+      pass it back verbatim; a cursor minted for a different sort order is
+      rejected with ``InvalidCursor``.
+
+    * **Stable tie-break.** Pages are ordered by ``(sort_col, id)`` in the
+      same direction so rows sharing a timestamp are never skipped or
+      repeated. Backed by ``(yacht_id, sort_col, id)`` composite indexes
+      (``supabase/migrations/20261018_keyset_pagination_indexes.sql``).
+
+    * **Optional, estimated, cached totals.** The first page asks PostgREST
+      for ``count=estimated`` (planner estimate on big tables, exact on small
+      ones) and caches it for ``PAGE_COUNT_TTL_S``. Cursor pages reuse the
+      cached total instead of counting again; ``include_total=False`` skips
+      counting entirely.
+
+    * **Offset still works.** Callers that send ``offset`` without a cursor
+      keep the old behaviour (with an estimated count), so existing clients
+      are unaffected while they migrate to ``cursor``.
+
+Usage::
+
+    page = PageRequest.from_params(params, default_order="created_at")
+    count_key = total_count_key("pms_work_orders", yacht_id, filters)
+    query = db.table("pms_work_orders").select("*", count=page.count_method(count_key))
+    query = page.apply(query.eq("yacht_id", yacht_id))
+    result = query.execute()
+    rows = result.data or []
+    total = page.total(count_key, result, rows)
+    response.update(page.meta(rows))
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+
+from cachetools import TTLCache
+
+PAGE_COUNT_TTL_S = int(os.getenv("PAGE_COUNT_TTL_S", "60"))
+
+_count_cache: TTLCache = TTLCache(maxsize=2048, ttl=PAGE_COUNT_TTL_S)
+_count_cache_lock = threading.Lock()
+
+
+class InvalidCursor(ValueError):
+    """Cursor could not be decoded or does not match the requested ordering."""
+
+
+# ── Cursor encoding ──────────────────────────────────────────────────────────
+
+
+def encode_cursor(sort_col: str, desc: bool, value: Any, row_id: Any) -> str:
+    payload = json.dumps(
+        {"c": sort_col, "d": bool(desc), "v": value, "id": str(row_id)},
+        separators=(",", ":"),
+        default=str,
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception as e:
+        raise InvalidCursor("Malformed pagination cursor") from e
+    if not isinstance(data, dict) or not {"c", "d", "v", "id"} <= data.keys() or data["v"] is None:
+        raise InvalidCursor("Malformed pagination cursor")
+    return data
+
+
+def _quote(value: Any) -> str:
+    # PostgREST logic trees split on "," "." ":" "(" ")" — quote the value.
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def keyset_filter(sort_col: str, desc: bool, value: Any, row_id: Any) -> str:
+    """``or=`` expression selecting rows strictly after ``(value, row_id)``."""
+    op = "lt" if desc else "gt"
+    v = _quote(value)
+    return f"{sort_col}.{op}.{v},and({sort_col}.eq.{v},id.{op}.{_quote(row_id)})"
+
+
+# ── Estimated total cache ────────────────────────────────────────────────────
+
+
+def total_count_key(table: str, yacht_id: str, filters: Optional[Dict] = None) -> Hashable:
+    return (table, yacht_id, json.dumps(filters or {}, sort_keys=True, default=str))
+
+
+def get_cached_count(key: Hashable) -> Optional[int]:
+    with _count_cache_lock:
+        return _count_cache.get(key)
+
+
+def set_cached_count(key: Hashable, count: Optional[int]) -> None:
+    if count is None:
+        return
+    with _count_cache_lock:
+        _count_cache[key] = count
+
+
+def clear_count_cache() -> None:
+    with _count_cache_lock:
+        _count_cache.clear()
+
+
+# ── Page request ─────────────────────────────────────────────────────────────
+
+
+@dataclass
+class PageRequest:
+    """Parsed pagination params for one list request."""
+    limit: int
+    order_by: str
+    desc: bool
+    offset: int = 0
+    cursor: Optional[Dict[str, Any]] = None
+    include_total: bool = True
+
+    @classmethod
+    def from_params(
+        cls,
+        params: Optional[Dict],
+        default_order: str = "created_at",
+        default_dir: str = "desc",
+        default_limit: int = 50,
+    ) -> "PageRequest":
+        params = params or {}
+        order_by = params.get("order_by") or default_order
+        desc = (params.get("order_dir") or default_dir) == "desc"
+        raw_cursor = params.get("cursor")
+        cursor = None
+        if raw_cursor:
+            cursor = decode_cursor(raw_cursor)
+            if cursor["c"] != order_by or cursor["d"] != desc:
+                raise InvalidCursor("Cursor does not match the requested sort order")
+        include_total = params.get("include_total")
+        if include_total is None:
+            include_total = True
+        return cls(
+            limit=int(params.get("limit") or default_limit),
+            order_by=order_by,
+            desc=desc,
+            offset=0 if cursor else int(params.get("offset") or 0),
+            cursor=cursor,
+            include_total=bool(include_total),
+        )
+
+    def count_method(self, count_key: Hashable) -> Optional[str]:
+        """``count=`` argument for ``.select()``; None when no count is needed."""
+        if not self.include_total or get_cached_count(count_key) is not None:
+            return None
+        return "estimated"
+
+    def apply(self, query):
+        """Order by ``(order_by, id)`` and seek past the cursor (or offset)."""
+        query = query.order(self.order_by, desc=self.desc).order("id", desc=self.desc)
+        if self.cursor:
+            query = query.or_(keyset_filter(self.order_by, self.desc, self.cursor["v"], self.cursor["id"]))
+            return query.limit(self.limit)
+        return query.range(self.offset, self.offset + self.limit - 1)
+
+    def total(self, count_key: Hashable, result, rows: List[Dict]) -> Optional[int]:
+        """Estimated total (fresh or cached); None when totals were not requested."""
+        if not self.include_total:
+            return None
+        count = getattr(result, "count", None)
+        if count is not None:
+            set_cached_count(count_key, count)
+            return count
+        cached = get_cached_count(count_key)
+        if cached is not None:
+            return cached
+        return len(rows) + self.offset
+
+    def next_cursor(self, rows: List[Dict]) -> Optional[str]:
+        if len(rows) < self.limit or not rows:
+            return None
+        last = rows[-1]
+        value = last.get(self.order_by)
+        if value is None or last.get("id") is None:
+            # NULL sort keys can't be sought past; caller falls back to offset.
+            return None
+        return encode_cursor(self.order_by, self.desc, value, last["id"])
+
+    def meta(self, rows: List[Dict]) -> Dict[str, Any]:
+        return {
+            "next_cursor": self.next_cursor(rows),
+            "has_more": len(rows) == self.limit,
+        }
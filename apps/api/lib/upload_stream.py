@@ -0,0 +1,355 @@
+"""
+Chunked upload helpers: incremental hash + MIME sniff + size gate.
+
+The attachment, document and receiving upload routes used to
+``await file.read()`` the whole part into a bytes object before hashing,
+validating and forwarding it. A few simultaneous 30 MB phone photos were
+enough to spike the worker's RSS.
+
+``spool_upload()`` reads the part in ``UPLOAD_CHUNK_BYTES`` chunks instead:
+
+    * **Incremental.** SHA-256 and size are updated per chunk; the MIME type
+      is sniffed from the first chunk's magic bytes.
+
+    * **Early rejection.** The size cap is enforced as bytes arrive — the
+      read stops at the first chunk past the limit (413), and an executable
+      disguised as an image stops at the first chunk (415).
+
+    * **Retryable forwarding.** Bytes land in a temp file, so storage
+      uploads stream from disk and can be retried without re-reading the
+      request. Memory stays O(chunk).
+
+``ResumableUploadStore`` adds offset-based resumable sessions (``create`` →
+``append`` at ``Upload-Offset`` … → complete) for clients on poor satellite
+links: an interrupted transfer resumes from the last committed byte instead
+of restarting. Sessions live under ``UPLOAD_SESSION_DIR`` and expire after
+``UPLOAD_SESSION_TTL_S``.
+
+Usage::
+
+    spooled = await spool_upload(file, max_bytes=MAX_UPLOAD_BYTES)
+    try:
+        with spooled.open() as fh:
+            supabase.storage.from_(bucket).upload(path=..., file=fh, ...)
+    finally:
+        spooled.cleanup()
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, BinaryIO, Dict, Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(256 * 1024)))
+UPLOAD_SESSION_DIR = os.getenv("UPLOAD_SESSION_DIR", os.path.join(tempfile.gettempdir(), "celeste-upload-sessions"))
+UPLOAD_SESSION_TTL_S = int(os.getenv("UPLOAD_SESSION_TTL_S", str(24 * 3600)))
+
+# Magic-byte prefixes → MIME. Office Open XML files are zips; legacy Office
+# files are OLE2 compound documents — both are reported as their container.
+_MAGIC = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),
+    (b"MZ", "application/x-msdownload"),
+    (b"\x7fELF", "application/x-executable"),
+)
+_HEIF_BRANDS = {b"heic", b"heix", b"hevc", b"heim", b"heis", b"mif1", b"msf1"}
+
+# Never accepted, whatever the client declares.
+BLOCKED_SNIFFED_TYPES = {"application/x-msdownload", "application/x-executable"}
+
+
+def sniff_mime(head: bytes) -> Optional[str]:
+    """Best-effort MIME type from the first bytes of a file; None if unknown."""
+    for magic, mime in _MAGIC:
+        if head.startswith(magic):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in _HEIF_BRANDS:
+        return "image/heic"
+    return None
+
+
+@dataclass
+class SpooledUpload:
+    """An upload fully received to a temp file, with its digest and sniffed type."""
+    path: str
+    size: int
+    sha256: str
+    sniffed_type: Optional[str]
+
+    def open(self) -> BinaryIO:
+        return open(self.path, "rb")
+
+    def cleanup(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def resolve_content_type(declared: Optional[str], sniffed: Optional[str], accepted: set) -> str:
+    """
+    Reconcile the client-declared type with the sniffed one.
+
+    Executables are rejected outright. A generic declared type is upgraded to
+    the sniffed type when that is acceptable (browsers often send
+    ``application/octet-stream`` for HEIC and CAD files).
+    """
+    content_type = (declared or "application/octet-stream").lower()
+    if sniffed in BLOCKED_SNIFFED_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Executable content is not accepted",
+        )
+    if content_type == "application/octet-stream" and sniffed in accepted:
+        return sniffed
+    return content_type
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds maximum size of {max_bytes // (1024 * 1024)} MB",
+    )
+
+
+async def spool_chunks(chunks: AsyncIterator[bytes], max_bytes: int, prefix: str = "upload-") -> SpooledUpload:
+    """
+    Drain ``chunks`` to a temp file, hashing and size-checking as they arrive.
+
+    Raises HTTPException(413) at the first chunk past ``max_bytes``,
+    (415) if the first chunk sniffs as an executable, (400) if empty.
+    """
+    fd, path = tempfile.mkstemp(prefix=prefix)
+    digest = hashlib.sha256()
+    size = 0
+    sniffed: Optional[str] = None
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                if size == 0:
+                    sniffed = sniff_mime(chunk[:64])
+                    if sniffed in BLOCKED_SNIFFED_TYPES:
+                        raise HTTPException(
+                            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail="Executable content is not accepted",
+                        )
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty")
+    except BaseException:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        raise
+    return SpooledUpload(path=path, size=size, sha256=digest.hexdigest(), sniffed_type=sniffed)
+
+
+async def _iter_upload_file(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def spool_upload(file: UploadFile, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_BYTES) -> SpooledUpload:
+    """Chunked replacement for ``await file.read()`` + len/hash checks."""
+    try:
+        return await spool_chunks(_iter_upload_file(file, chunk_size), max_bytes)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[upload_stream] Failed to read upload stream: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to read uploaded file")
+
+
+# ── Resumable sessions ───────────────────────────────────────────────────────
+
+_SESSION_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    owner: str
+    size: int
+    filename: str
+    content_type: str
+    metadata: Dict[str, str] = field(default_factory=dict)
+    offset: int = 0
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def complete(self) -> bool:
+        return self.offset >= self.size
+
+
+class ResumableUploadStore:
+    """
+    Offset-based resumable upload sessions on local disk.
+
+    ``<id>.part`` accumulates bytes; ``<id>.json`` holds the session. An
+    ``append`` must start at the session's current offset (409 otherwise), so
+    a client that lost its connection asks for the offset and continues.
+    """
+
+    def __init__(self, directory: str = UPLOAD_SESSION_DIR, ttl_s: int = UPLOAD_SESSION_TTL_S):
+        self.directory = directory
+        self.ttl_s = ttl_s
+        os.makedirs(directory, exist_ok=True)
+
+    def _part(self, upload_id: str) -> str:
+        return os.path.join(self.directory, f"{upload_id}.part")
+
+    def _meta(self, upload_id: str) -> str:
+        return os.path.join(self.directory, f"{upload_id}.json")
+
+    def _save(self, session: UploadSession) -> None:
+        tmp = self._meta(session.upload_id) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(asdict(session), f)
+        os.replace(tmp, self._meta(session.upload_id))
+
+    def create(self, owner: str, size: int, filename: str, content_type: str,
+               metadata: Optional[Dict[str, str]] = None, max_bytes: Optional[int] = None) -> UploadSession:
+        if size <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload size must be positive")
+        if max_bytes is not None and size > max_bytes:
+            raise _too_large(max_bytes)
+        self.purge_expired()
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            owner=owner,
+            size=size,
+            filename=filename,
+            content_type=content_type,
+            metadata=dict(metadata or {}),
+        )
+        open(self._part(session.upload_id), "wb").close()
+        self._save(session)
+        return session
+
+    def get(self, upload_id: str, owner: str) -> UploadSession:
+        if not _SESSION_ID_RE.match(upload_id or ""):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+        try:
+            with open(self._meta(upload_id)) as f:
+                session = UploadSession(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+        if session.owner != owner or time.time() - session.created_at > self.ttl_s:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+        # The part file is the source of truth if a previous append died mid-write.
+        session.offset = min(os.path.getsize(self._part(upload_id)), session.size)
+        return session
+
+    async def append(self, session: UploadSession, offset: int, chunks: AsyncIterator[bytes]) -> UploadSession:
+        if offset != session.offset:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"error": "offset_mismatch", "offset": session.offset},
+            )
+        with open(self._part(session.upload_id), "r+b") as out:
+            out.truncate(session.offset)
+            out.seek(session.offset)
+            try:
+                async for chunk in chunks:
+                    if session.offset + len(chunk) > session.size:
+                        raise _too_large(session.size)
+                    out.write(chunk)
+                    session.offset += len(chunk)
+            finally:
+                out.flush()
+                self._save(session)
+        return session
+
+    def finish(self, session: UploadSession) -> SpooledUpload:
+        """Hash the completed part file and hand it over as a SpooledUpload."""
+        digest = hashlib.sha256()
+        path = self._part(session.upload_id)
+        with open(path, "rb") as f:
+            head = f.read(64)
+            f.seek(0)
+            for chunk in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        try:
+            os.remove(self._meta(session.upload_id))
+        except FileNotFoundError:
+            pass
+        return SpooledUpload(path=path, size=session.size, sha256=digest.hexdigest(), sniffed_type=sniff_mime(head))
+
+    def purge_expired(self) -> None:
+        cutoff = time.time() - self.ttl_s
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+# ── Storage forwarding ───────────────────────────────────────────────────────
+
+STORAGE_UPLOAD_ATTEMPTS = int(os.getenv("STORAGE_UPLOAD_ATTEMPTS", "2"))
+
+
+def upload_spooled_to_storage(
+    supabase,
+    bucket: str,
+    storage_path: str,
+    spooled: SpooledUpload,
+    content_type: str,
+    attempts: int = STORAGE_UPLOAD_ATTEMPTS,
+) -> None:
+    """
+    Stream a spooled upload to Supabase Storage from disk, retrying transient
+    failures. A retry that hits "already exists" means the previous attempt
+    landed but its response was lost — treated as success.
+
+    Blocking — call via ``asyncio.to_thread``.
+    """
+    last_error: Optional[Exception] = None
+    for attempt in range(1, max(1, attempts) + 1):
+        try:
+            with spooled.open() as fh:
+                supabase.storage.from_(bucket).upload(
+                    path=storage_path,
+                    file=fh,
+                    file_options={"content-type": content_type, "upsert": "false"},
+                )
+            return
+        except Exception as e:
+            if attempt > 1 and ("Duplicate" in str(e) or "already exists" in str(e)):
+                return
+            last_error = e
+            logger.warning(f"[upload_stream] Storage upload attempt {attempt} failed: path={storage_path} err={e}")
+    raise last_error
@@ -6,6 +6,10 @@ Maps source column names to CelesteOS field names using:
 2. Fuzzy matching via rapidfuzz (for unknown sources or unmatched columns)
 
 Returns a list of ColumnMapping with suggested_target and confidence score.
+
+Fuzzy scoring is done once per file: every still-unmatched column against
+the normalised vocabulary in a single rapidfuzz.process.cdist matrix
+(multi-threaded, needs numpy), falling back to one extractOne per column.
 """
 
 import re
@@ -23,6 +27,14 @@ except ImportError:
     RAPIDFUZZ_AVAILABLE = False
     logger.warning("rapidfuzz not installed — using basic string matching only")
 
+try:
+    import numpy  # noqa: F401 — process.cdist returns a numpy matrix
+    CDIST_AVAILABLE = RAPIDFUZZ_AVAILABLE
+except ImportError:
+    CDIST_AVAILABLE = False
+
+FUZZY_SCORE_CUTOFF = 50  # minimum 50% to consider
+
 from mappers.source_profiles import get_profile_mapping, FILE_REF_COLUMN_HINTS
 from parsers.base_parser import looks_like_file_ref
 
@@ -65,6 +77,31 @@ def _is_file_ref_column_name(col_name: str) -> bool:
     }
 
 
+def _fuzzy_best_matches(
+    names: list[str],
+    vocabulary: list[str],
+) -> list[Optional[tuple[int, float]]]:
+    """(vocabulary index, score 0-100) of the best WRatio match per name, or None."""
+    choices = [normalize_column_name(v) for v in vocabulary]
+    queries = [normalize_column_name(n) for n in names]
+    if CDIST_AVAILABLE:
+        matrix = process.cdist(
+            queries, choices, scorer=fuzz.WRatio,
+            score_cutoff=FUZZY_SCORE_CUTOFF, workers=-1,
+        )
+        best = []
+        for row in matrix:
+            idx = int(row.argmax())  # first maximum, like extractOne
+            best.append((idx, float(row[idx])) if row[idx] >= FUZZY_SCORE_CUTOFF else None)
+        return best
+
+    best = []
+    for query in queries:
+        match = process.extractOne(query, choices, scorer=fuzz.WRatio, score_cutoff=FUZZY_SCORE_CUTOFF)
+        best.append((match[2], match[1]) if match else None)
+    return best
+
+
 def match_columns(
     source_columns: list[str],
     domain: str,
@@ -92,7 +129,12 @@ def match_columns(
 
     # 1. Try known profile first (deterministic)
     profile = get_profile_mapping(source, domain)
-    results = []
+    profile_ci = {}
+    if profile:
+        for pkey, pval in profile.items():
+            profile_ci.setdefault(pkey.lower(), pval)
+    results: list[Optional[ColumnMapping]] = []
+    fuzzy_slots: list[int] = []  # positions in results awaiting the fuzzy pass
 
     for col_name in source_columns:
         # Check known profile (case-insensitive)
@@ -101,10 +143,7 @@ def match_columns(
             profile_match = profile.get(col_name)
             if profile_match is None:
                 # Try case-insensitive
-                for pkey, pval in profile.items():
-                    if pkey.lower() == col_name.lower():
-                        profile_match = pval
-                        break
+                profile_match = profile_ci.get(col_name.lower())
 
             if profile_match is not None:
                 target, confidence = profile_match
@@ -169,27 +208,11 @@ def match_columns(
             ))
             continue
 
-        # 2. Fuzzy match against vocabulary
+        # 2. Fuzzy match against vocabulary (scored in one pass below)
         if vocabulary and RAPIDFUZZ_AVAILABLE:
-            normalized = normalize_column_name(col_name)
-            match = process.extractOne(
-                normalized,
-                [normalize_column_name(v) for v in vocabulary],
-                scorer=fuzz.WRatio,
-                score_cutoff=50,  # minimum 50% to consider
-            )
-            if match:
-                matched_normalized, score, idx = match
-                target = vocabulary[idx]
-                confidence = score / 100.0  # rapidfuzz returns 0-100
-
-                results.append(ColumnMapping(
-                    source_name=col_name,
-                    suggested_target=target,
-                    confidence=confidence,
-                    action="map" if confidence >= CONFIDENCE_AMBER else "skip",
-                ))
-                continue
+            fuzzy_slots.append(len(results))
+            results.append(None)
+            continue
 
         # 3. No match found
         results.append(ColumnMapping(
@@ -199,6 +222,26 @@ def match_columns(
             action="skip",
         ))
 
+    if fuzzy_slots:
+        names = [source_columns[i] for i in fuzzy_slots]
+        for slot, col_name, best in zip(fuzzy_slots, names, _fuzzy_best_matches(names, vocabulary)):
+            if best is None:
+                results[slot] = ColumnMapping(
+                    source_name=col_name,
+                    suggested_target=None,
+                    confidence=0.0,
+                    action="skip",
+                )
+                continue
+            idx, score = best
+            confidence = score / 100.0  # rapidfuzz returns 0-100
+            results[slot] = ColumnMapping(
+                source_name=col_name,
+                suggested_target=vocabulary[idx],
+                confidence=confidence,
+                action="map" if confidence >= CONFIDENCE_AMBER else "skip",
+            )
+
     # Log summary
     mapped = sum(1 for r in results if r.action == "map")
     skipped = sum(1 for r in results if r.action == "skip")
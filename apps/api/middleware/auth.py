@@ -16,8 +16,15 @@ Handles:
 """
 
 from typing import Optional, Callable, Dict
+from collections import OrderedDict
 from functools import wraps
+import asyncio
+import hashlib
+import hmac as _hmac
+import json
 import jwt
+from jwt.utils import base64url_decode
+import threading
 import time
 from fastapi import HTTPException, Header, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -251,13 +258,71 @@ def check_incident_mode_for_action(action_group: str, is_streaming: bool = False
 # TTL of 900s (15 min) balances freshness vs performance:
 #   - Role changes propagate within 15 minutes
 #   - Most requests hit cache (expect 95%+ hit rate)
-#   - Cache survives across requests but not restarts
+#
+# Tiers, checked in order by resolve_tenant_for_user():
+#   1. This worker: _tenant_cache, plus _tenant_negative_cache for users with
+#      no tenant (short TTL, so a new assignment is picked up quickly)
+#   2. Redis (REDIS_URL): shared by every API worker, survives deploys, so
+#      one worker's lookup warms all of them
+#   3. MASTER + TENANT queries, in a thread, at most one in flight per user —
+#      concurrent requests for the same user await the same lookup
+# Transient failures (DB errors, failed bootstrap) are never cached.
+#
+# Role changes: a trigger on auth_users_roles notifies
+# 'tenant_cache_invalidate'; cache/invalidation_listener.py drops the Redis
+# entry and publishes on TENANT_INVALIDATE_CHANNEL, which every worker's
+# listen_for_tenant_invalidations() task applies to its local cache.
+TENANT_CACHE_TTL = int(os.getenv("TENANT_CACHE_TTL", "900"))
+TENANT_NEGATIVE_CACHE_TTL = int(os.getenv("TENANT_NEGATIVE_CACHE_TTL", "60"))
+TENANT_REDIS_PREFIX = "tenant:"
+TENANT_INVALIDATE_CHANNEL = "tenant_cache_invalidate"
+
 if HAS_CACHETOOLS:
-    _tenant_cache = TTLCache(maxsize=1000, ttl=900)  # 1000 users, 15 min TTL
+    _tenant_cache = TTLCache(maxsize=1000, ttl=TENANT_CACHE_TTL)  # 1000 users, 15 min TTL
+    _tenant_negative_cache = TTLCache(maxsize=5000, ttl=TENANT_NEGATIVE_CACHE_TTL)
 else:
     _tenant_cache: Dict[str, Dict] = {}  # Fallback to simple dict
+    _tenant_negative_cache: Dict[str, float] = {}
+
+_tenant_cache_stats = {"hits": 0, "misses": 0, "errors": 0, "redis_hits": 0, "coalesced": 0}
+
+# user_id -> lookup task (single-flight, per event loop)
+_tenant_inflight: Dict[str, "asyncio.Task"] = {}
+
+# Bumped on every invalidation; a lookup that overlapped one is not cached
+_tenant_cache_generation = 0
+
+_MISSING = object()
+
+
+def _cached_tenant(user_id: str):
+    """Local tier: tenant dict, None (known to have no tenant) or _MISSING."""
+    tenant = _tenant_cache.get(user_id)
+    if tenant is not None:
+        _tenant_cache_stats["hits"] += 1
+        return tenant
+    expires = _tenant_negative_cache.get(user_id)
+    if expires is not None:
+        if expires > time.monotonic():
+            _tenant_cache_stats["hits"] += 1
+            return None
+        _tenant_negative_cache.pop(user_id, None)
+    return _MISSING
+
+
+def _remember_tenant(user_id: str, tenant: Optional[Dict], generation: int) -> None:
+    if generation != _tenant_cache_generation:
+        return  # invalidated while the lookup ran
+    if tenant is not None:
+        _tenant_cache[user_id] = tenant
+        _tenant_negative_cache.pop(user_id, None)
+    else:
+        _tenant_negative_cache[user_id] = time.monotonic() + TENANT_NEGATIVE_CACHE_TTL
+
+
+class TenantLookupError(Exception):
+    """Transient failure while resolving a tenant — the result is not cached."""
 
-_tenant_cache_stats = {"hits": 0, "misses": 0, "errors": 0}
 
 def _bootstrap_tenant_user(
     user_id: str,
@@ -314,12 +379,35 @@ def _bootstrap_tenant_user(
 
 
 def lookup_tenant_for_user(user_id: str, user_metadata: Optional[Dict] = None, email: Optional[str] = None) -> Optional[Dict]:
+    """
+    Synchronous tenant lookup for callers outside the event loop.
+
+    Shares the local cache with resolve_tenant_for_user(); async code must use
+    that instead, which also consults Redis and coalesces concurrent misses.
+    """
+    cached = _cached_tenant(user_id)
+    if cached is not _MISSING:
+        return cached
+
+    _tenant_cache_stats["misses"] += 1
+    generation = _tenant_cache_generation
+    try:
+        tenant = _lookup_tenant_uncached(user_id, user_metadata, email)
+    except Exception as e:
+        _tenant_cache_stats["errors"] += 1
+        logger.error(f"[Auth] Tenant lookup failed for {user_id[:8]}...: {e}")
+        return None
+    _remember_tenant(user_id, tenant, generation)
+    return tenant
+
+
+def _lookup_tenant_uncached(user_id: str, user_metadata: Optional[Dict] = None, email: Optional[str] = None) -> Optional[Dict]:
     """
     Look up tenant info from MASTER DB for a user, then get yacht-specific role from TENANT DB.
 
-    Uses TTLCache to reduce database queries:
-    - Cache HIT: <1ms (95%+ of requests after warmup)
-    - Cache MISS: 200-600ms (MASTER + TENANT DB queries)
+    Blocking, 200-600ms (MASTER + TENANT DB queries); callers cache the result.
+    Raises TenantLookupError (or the client's exception) on transient failures
+    so they are never cached as "no tenant".
 
     Returns:
         {
@@ -331,190 +419,177 @@ def lookup_tenant_for_user(user_id: str, user_metadata: Optional[Dict] = None, e
         }
     Or None if user has no tenant assignment.
     """
-    # Check cache first (fast path - <1ms)
-    if user_id in _tenant_cache:
-        _tenant_cache_stats["hits"] += 1
-        logger.debug(f"[Auth] Tenant cache HIT for user {user_id[:8]}... (hits: {_tenant_cache_stats['hits']})")
-        return _tenant_cache[user_id]
-
-    # Cache MISS - query databases (slow path - 200-600ms)
-    _tenant_cache_stats["misses"] += 1
-    logger.debug(f"[Auth] Tenant cache MISS for user {user_id[:8]}... (misses: {_tenant_cache_stats['misses']})")
-
     client = get_master_client()
     if not client:
-        logger.error("[Auth] Cannot lookup tenant - no MASTER client")
-        _tenant_cache_stats["errors"] += 1
-        return None
+        raise TenantLookupError("no MASTER client")
 
-    try:
-        # Query user_accounts - PK column is 'id' in production schema
-        result = client.table('user_accounts').select(
-            'yacht_id, status, fleet_vessel_ids'
-        ).eq('id', user_id).single().execute()
+    # Query user_accounts - PK column is 'id' in production schema
+    result = client.table('user_accounts').select(
+        'yacht_id, status, fleet_vessel_ids'
+    ).eq('id', user_id).maybe_single().execute()
 
-        if not result.data:
-            logger.warning(f"[Auth] No user_accounts row for user {user_id[:8]}...")
-            return None
+    if not result or not result.data:
+        logger.warning(f"[Auth] No user_accounts row for user {user_id[:8]}...")
+        return None
 
-        user_account = result.data
+    user_account = result.data
 
-        # Check account status
-        if user_account.get('status') != 'active':
-            logger.warning(f"[Auth] User {user_id[:8]}... status is {user_account.get('status')}")
-            return None
+    # Check account status
+    if user_account.get('status') != 'active':
+        logger.warning(f"[Auth] User {user_id[:8]}... status is {user_account.get('status')}")
+        return None
 
-        # Get yacht info from fleet_registry (including tenant_key_alias + subscription)
-        fleet_result = client.table('fleet_registry').select(
-            'yacht_name, active, tenant_key_alias, subscription_status, subscription_plan, subscription_expires_at'
-        ).eq('yacht_id', user_account['yacht_id']).single().execute()
+    # Get yacht info from fleet_registry (including tenant_key_alias + subscription)
+    fleet_result = client.table('fleet_registry').select(
+        'yacht_name, active, tenant_key_alias, subscription_status, subscription_plan, subscription_expires_at'
+    ).eq('yacht_id', user_account['yacht_id']).maybe_single().execute()
 
-        if not fleet_result.data:
-            logger.warning(f"[Auth] No fleet_registry for yacht {user_account['yacht_id']}")
-            return None
+    if not fleet_result or not fleet_result.data:
+        logger.warning(f"[Auth] No fleet_registry for yacht {user_account['yacht_id']}")
+        return None
 
-        fleet = fleet_result.data
+    fleet = fleet_result.data
 
-        if not fleet.get('active'):
-            logger.warning(f"[Auth] Yacht {user_account['yacht_id']} is inactive")
-            return None
+    if not fleet.get('active'):
+        logger.warning(f"[Auth] Yacht {user_account['yacht_id']} is inactive")
+        return None
 
-        # Get tenant_key_alias from fleet_registry (already fetched above)
-        yacht_id = user_account['yacht_id']
-        tenant_key_alias = fleet.get('tenant_key_alias') or f"y{yacht_id}"
+    # Get tenant_key_alias from fleet_registry (already fetched above)
+    yacht_id = user_account['yacht_id']
+    tenant_key_alias = fleet.get('tenant_key_alias') or f"y{yacht_id}"
 
-        # SECURITY: Query tenant DB for yacht-specific role from auth_users_roles
-        # DENY-BY-DEFAULT: If tenant role lookup fails, return None (block all access)
-        # The master DB user_accounts.role is not yacht-specific and MUST NOT be trusted
-        tenant_role = None
-        try:
-            from integrations.supabase import get_tenant_client
-            tenant_client = get_tenant_client(tenant_key_alias)
-            if not tenant_client:
-                logger.error(f"[Auth] SECURITY: Failed to get tenant client for {tenant_key_alias}")
-                return None
-
-            role_result = tenant_client.table('auth_users_roles').select(
-                'role, department, valid_from, valid_until'
-            ).eq('user_id', user_id).eq('yacht_id', yacht_id).eq('is_active', True).execute()
-
-            if role_result.data and len(role_result.data) > 0:
-                # If multiple active roles exist, take the most recent one
-                # Sort by valid_from descending to get latest assignment
-                sorted_roles = sorted(
-                    role_result.data,
-                    key=lambda r: r.get('valid_from', ''),
-                    reverse=True
+    # SECURITY: Query tenant DB for yacht-specific role from auth_users_roles
+    # DENY-BY-DEFAULT: If tenant role lookup fails, return None (block all access)
+    # The master DB user_accounts.role is not yacht-specific and MUST NOT be trusted
+    tenant_role = None
+    try:
+        from integrations.supabase import get_tenant_client
+        tenant_client = get_tenant_client(tenant_key_alias)
+        if not tenant_client:
+            logger.error(f"[Auth] SECURITY: Failed to get tenant client for {tenant_key_alias}")
+            raise TenantLookupError(f"no tenant client for {tenant_key_alias}")
+
+        role_result = tenant_client.table('auth_users_roles').select(
+            'role, department, valid_from, valid_until'
+        ).eq('user_id', user_id).eq('yacht_id', yacht_id).eq('is_active', True).execute()
+
+        if role_result.data and len(role_result.data) > 0:
+            # If multiple active roles exist, take the most recent one
+            # Sort by valid_from descending to get latest assignment
+            sorted_roles = sorted(
+                role_result.data,
+                key=lambda r: r.get('valid_from', ''),
+                reverse=True
+            )
+            tenant_role = sorted_roles[0]['role']
+            tenant_dept = sorted_roles[0].get('department') or ''
+            logger.info(f"[Auth] Found yacht-specific role: {tenant_role} (dept: {tenant_dept}) for user {user_id[:8]}... on yacht {yacht_id}")
+        else:
+            # No role found — attempt first-login bootstrap if this is an
+            # invited user (JWT user_metadata carries yacht_id + rank).
+            invite_rank = (user_metadata or {}).get('rank')
+            invite_name = (user_metadata or {}).get('name') or email or user_id
+            invite_yacht = (user_metadata or {}).get('yacht_id')
+
+            if invite_rank and invite_yacht and invite_yacht == yacht_id:
+                logger.info(
+                    "[Auth] No tenant role found — attempting invite bootstrap for %s", user_id[:8]
                 )
-                tenant_role = sorted_roles[0]['role']
-                tenant_dept = sorted_roles[0].get('department') or ''
-                logger.info(f"[Auth] Found yacht-specific role: {tenant_role} (dept: {tenant_dept}) for user {user_id[:8]}... on yacht {yacht_id}")
-            else:
-                # No role found — attempt first-login bootstrap if this is an
-                # invited user (JWT user_metadata carries yacht_id + rank).
-                invite_rank = (user_metadata or {}).get('rank')
-                invite_name = (user_metadata or {}).get('name') or email or user_id
-                invite_yacht = (user_metadata or {}).get('yacht_id')
-
-                if invite_rank and invite_yacht and invite_yacht == yacht_id:
-                    logger.info(
-                        "[Auth] No tenant role found — attempting invite bootstrap for %s", user_id[:8]
-                    )
-                    bootstrapped = _bootstrap_tenant_user(
-                        user_id=user_id,
-                        email=email or '',
-                        name=invite_name,
-                        rank=invite_rank,
-                        yacht_id=yacht_id,
-                        tenant_client=tenant_client,
-                    )
-                    if bootstrapped:
-                        # Re-query to get the row we just wrote
-                        role_result = tenant_client.table('auth_users_roles').select(
-                            'role, department, valid_from, valid_until'
-                        ).eq('user_id', user_id).eq('yacht_id', yacht_id).eq('is_active', True).execute()
-
-                        if role_result.data:
-                            tenant_role = role_result.data[0]['role']
-                            tenant_dept = role_result.data[0].get('department') or ''
-                        else:
-                            logger.error("[Auth] Bootstrap succeeded but re-query returned empty for %s", user_id[:8])
-                            return None
+                bootstrapped = _bootstrap_tenant_user(
+                    user_id=user_id,
+                    email=email or '',
+                    name=invite_name,
+                    rank=invite_rank,
+                    yacht_id=yacht_id,
+                    tenant_client=tenant_client,
+                )
+                if bootstrapped:
+                    # Re-query to get the row we just wrote
+                    role_result = tenant_client.table('auth_users_roles').select(
+                        'role, department, valid_from, valid_until'
+                    ).eq('user_id', user_id).eq('yacht_id', yacht_id).eq('is_active', True).execute()
+
+                    if role_result.data:
+                        tenant_role = role_result.data[0]['role']
+                        tenant_dept = role_result.data[0].get('department') or ''
                     else:
-                        return None
+                        logger.error("[Auth] Bootstrap succeeded but re-query returned empty for %s", user_id[:8])
+                        raise TenantLookupError("bootstrap re-query returned no role")
                 else:
-                    logger.error(f"[Auth] SECURITY: No active role in auth_users_roles for user {user_id[:8]}... on yacht {yacht_id}")
-                    return None
-
-        except Exception as role_err:
-            logger.error(f"[Auth] SECURITY: Failed to query tenant DB for role: {role_err}")
-            return None
+                    raise TenantLookupError("invite bootstrap failed")
+            else:
+                logger.error(f"[Auth] SECURITY: No active role in auth_users_roles for user {user_id[:8]}... on yacht {yacht_id}")
+                return None
 
-        # ── Multi-vessel / fleet support ────────────────────────────────────
-        # Fleet overview requires BOTH fleet_vessel_ids populated AND an
-        # authorized role. Only manager/owner get fleet access — captains,
-        # engineers, and crew are single-vessel even if fleet_vessel_ids exists.
-        FLEET_ROLES = {'manager', 'owner'}
-        raw_fleet_ids = user_account.get('fleet_vessel_ids')
-        if raw_fleet_ids and isinstance(raw_fleet_ids, list) and len(raw_fleet_ids) > 0 and tenant_role in FLEET_ROLES:
-            vessel_ids = raw_fleet_ids
-            # Ensure primary yacht_id is in the list
-            if yacht_id not in vessel_ids:
-                vessel_ids.insert(0, yacht_id)
-            is_fleet_user = True
-        else:
-            vessel_ids = [yacht_id]
-            is_fleet_user = False
+    except TenantLookupError:
+        raise
+    except Exception as role_err:
+        logger.error(f"[Auth] SECURITY: Failed to query tenant DB for role: {role_err}")
+        raise TenantLookupError(f"tenant role query failed: {role_err}") from role_err
+
+    # ── Multi-vessel / fleet support ────────────────────────────────────
+    # Fleet overview requires BOTH fleet_vessel_ids populated AND an
+    # authorized role. Only manager/owner get fleet access — captains,
+    # engineers, and crew are single-vessel even if fleet_vessel_ids exists.
+    FLEET_ROLES = {'manager', 'owner'}
+    raw_fleet_ids = user_account.get('fleet_vessel_ids')
+    if raw_fleet_ids and isinstance(raw_fleet_ids, list) and len(raw_fleet_ids) > 0 and tenant_role in FLEET_ROLES:
+        vessel_ids = raw_fleet_ids
+        # Ensure primary yacht_id is in the list
+        if yacht_id not in vessel_ids:
+            vessel_ids.insert(0, yacht_id)
+        is_fleet_user = True
+    else:
+        vessel_ids = [yacht_id]
+        is_fleet_user = False
 
-        # Resolve fleet vessel names from fleet_registry (for fleet users)
-        fleet_vessels = []
-        if is_fleet_user:
-            try:
-                fleet_names_result = client.table('fleet_registry').select(
-                    'yacht_id, yacht_name'
-                ).in_('yacht_id', vessel_ids).execute()
-                fleet_vessels = [
-                    {'yacht_id': v['yacht_id'], 'yacht_name': v.get('yacht_name', '')}
-                    for v in (fleet_names_result.data or [])
-                ]
-            except Exception as fleet_err:
-                logger.warning(f"[Auth] Fleet vessel name lookup failed: {fleet_err}")
-                fleet_vessels = [{'yacht_id': vid, 'yacht_name': ''} for vid in vessel_ids]
-
-        tenant_info = {
-            'yacht_id': yacht_id,
-            'vessel_ids': vessel_ids,
-            'is_fleet_user': is_fleet_user,
-            'fleet_vessels': fleet_vessels if is_fleet_user else None,
-            'tenant_key_alias': tenant_key_alias,
-            'role': tenant_role,
-            'department': tenant_dept,
-            'status': user_account['status'],
-            'yacht_name': fleet.get('yacht_name'),
-            'subscription_active': fleet.get('subscription_status') is None or fleet.get('subscription_status') in ('paid', 'trial'),
-            'subscription_status': fleet.get('subscription_status'),
-            'subscription_plan': fleet.get('subscription_plan'),
-            'subscription_expires_at': str(fleet['subscription_expires_at']) if fleet.get('subscription_expires_at') else None,
-        }
+    # Resolve fleet vessel names from fleet_registry (for fleet users)
+    fleet_vessels = []
+    if is_fleet_user:
+        try:
+            fleet_names_result = client.table('fleet_registry').select(
+                'yacht_id, yacht_name'
+            ).in_('yacht_id', vessel_ids).execute()
+            fleet_vessels = [
+                {'yacht_id': v['yacht_id'], 'yacht_name': v.get('yacht_name', '')}
+                for v in (fleet_names_result.data or [])
+            ]
+        except Exception as fleet_err:
+            logger.warning(f"[Auth] Fleet vessel name lookup failed: {fleet_err}")
+            fleet_vessels = [{'yacht_id': vid, 'yacht_name': ''} for vid in vessel_ids]
+
+    tenant_info = {
+        'yacht_id': yacht_id,
+        'vessel_ids': vessel_ids,
+        'is_fleet_user': is_fleet_user,
+        'fleet_vessels': fleet_vessels if is_fleet_user else None,
+        'tenant_key_alias': tenant_key_alias,
+        'role': tenant_role,
+        'department': tenant_dept,
+        'status': user_account['status'],
+        'yacht_name': fleet.get('yacht_name'),
+        'subscription_active': fleet.get('subscription_status') is None or fleet.get('subscription_status') in ('paid', 'trial'),
+        'subscription_status': fleet.get('subscription_status'),
+        'subscription_plan': fleet.get('subscription_plan'),
+        'subscription_expires_at': str(fleet['subscription_expires_at']) if fleet.get('subscription_expires_at') else None,
+    }
 
-        # Cache for future requests
-        _tenant_cache[user_id] = tenant_info
-        logger.info(f"[Auth] Tenant lookup success: user={user_id[:8]}... -> yacht={tenant_info['yacht_id']}, role={tenant_role}")
+    logger.info(f"[Auth] Tenant lookup success: user={user_id[:8]}... -> yacht={tenant_info['yacht_id']}, role={tenant_role}")
 
-        return tenant_info
+    return tenant_info
 
-    except Exception as e:
-        logger.error(f"[Auth] Tenant lookup failed for {user_id[:8]}...: {e}")
-        return None
 
 def clear_tenant_cache(user_id: str = None):
-    """Clear tenant cache (on logout or role change)."""
-    global _tenant_cache
+    """Clear this worker's tenant cache (on logout or role change)."""
+    global _tenant_cache_generation
+    _tenant_cache_generation += 1
     if user_id:
         _tenant_cache.pop(user_id, None)
+        _tenant_negative_cache.pop(user_id, None)
         logger.info(f"[Auth] Cleared tenant cache for user {user_id[:8]}...")
     else:
         _tenant_cache.clear()
+        _tenant_negative_cache.clear()
         logger.info("[Auth] Cleared entire tenant cache")
 
 
@@ -525,14 +600,19 @@ def get_tenant_cache_stats() -> dict:
     Returns:
         dict: Cache statistics including hits, misses, hit rate, cache size
     """
-    total = _tenant_cache_stats["hits"] + _tenant_cache_stats["misses"]
-    hit_rate = (_tenant_cache_stats["hits"] / total * 100) if total > 0 else 0
+    hits = _tenant_cache_stats["hits"] + _tenant_cache_stats["redis_hits"] + _tenant_cache_stats["coalesced"]
+    total = hits + _tenant_cache_stats["misses"]
+    hit_rate = (hits / total * 100) if total > 0 else 0
 
     stats = {
         "size": len(_tenant_cache),
+        "negative_size": len(_tenant_negative_cache),
         "hits": _tenant_cache_stats["hits"],
+        "redis_hits": _tenant_cache_stats["redis_hits"],
+        "coalesced": _tenant_cache_stats["coalesced"],
         "misses": _tenant_cache_stats["misses"],
         "errors": _tenant_cache_stats["errors"],
+        "in_flight": len(_tenant_inflight),
         "total_requests": total,
         "hit_rate": f"{hit_rate:.1f}%"
     }
@@ -540,13 +620,242 @@ def get_tenant_cache_stats() -> dict:
     if HAS_CACHETOOLS and hasattr(_tenant_cache, 'maxsize') and hasattr(_tenant_cache, 'ttl'):
         stats["max_size"] = _tenant_cache.maxsize
         stats["ttl_seconds"] = _tenant_cache.ttl
+        stats["negative_ttl_seconds"] = TENANT_NEGATIVE_CACHE_TTL
 
     return stats
 
+
+# ============================================================================
+# ASYNC TENANT RESOLUTION (shared Redis tier + single-flight)
+# ============================================================================
+
+REDIS_URL = os.getenv("REDIS_URL")
+_tenant_redis = None
+_tenant_listener_task: Optional["asyncio.Task"] = None
+
+
+async def _get_tenant_redis():
+    """Get or create the Redis connection (lazy, graceful degradation)."""
+    global _tenant_redis
+    if not REDIS_URL:
+        return None
+    if _tenant_redis is None:
+        try:
+            import redis.asyncio as redis_async
+            _tenant_redis = await redis_async.from_url(REDIS_URL, decode_responses=True, max_connections=10)
+            await _tenant_redis.ping()
+            logger.info("[Auth] Redis connected for tenant cache")
+        except Exception as e:
+            logger.warning(f"[Auth] Redis unavailable for tenant cache: {e}")
+            _tenant_redis = False  # Mark as failed, don't retry
+    return _tenant_redis if _tenant_redis else None
+
+
+async def resolve_tenant_for_user(user_id: str, user_metadata: Optional[Dict] = None, email: Optional[str] = None) -> Optional[Dict]:
+    """
+    Non-blocking tenant lookup for async callers (see TENANT LOOKUP CACHE).
+
+    Same result as lookup_tenant_for_user(); concurrent misses for one user
+    share a single lookup, and a caller that is cancelled does not cancel it
+    for the others.
+    """
+    cached = _cached_tenant(user_id)
+    if cached is not _MISSING:
+        return cached
+
+    task = _tenant_inflight.get(user_id)
+    if task is None:
+        task = asyncio.ensure_future(_resolve_tenant_miss(user_id, user_metadata, email))
+        _tenant_inflight[user_id] = task
+        task.add_done_callback(lambda _: _tenant_inflight.pop(user_id, None))
+    else:
+        _tenant_cache_stats["coalesced"] += 1
+    return await asyncio.shield(task)
+
+
+async def _resolve_tenant_miss(user_id: str, user_metadata: Optional[Dict], email: Optional[str]) -> Optional[Dict]:
+    generation = _tenant_cache_generation
+    key = f"{TENANT_REDIS_PREFIX}{user_id}"
+
+    redis_conn = await _get_tenant_redis()
+    if redis_conn:
+        try:
+            raw = await redis_conn.get(key)
+            if raw is not None:
+                _tenant_cache_stats["redis_hits"] += 1
+                tenant = json.loads(raw)
+                _remember_tenant(user_id, tenant, generation)
+                return tenant
+        except Exception as e:
+            logger.debug(f"[Auth] Redis tenant get error: {e}")
+
+    _tenant_cache_stats["misses"] += 1
+    try:
+        tenant = await asyncio.to_thread(_lookup_tenant_uncached, user_id, user_metadata, email)
+    except Exception as e:
+        _tenant_cache_stats["errors"] += 1
+        logger.error(f"[Auth] Tenant lookup failed for {user_id[:8]}...: {e}")
+        return None
+
+    _remember_tenant(user_id, tenant, generation)
+    if redis_conn and generation == _tenant_cache_generation:
+        try:
+            ttl = TENANT_CACHE_TTL if tenant is not None else TENANT_NEGATIVE_CACHE_TTL
+            await redis_conn.setex(key, ttl, json.dumps(tenant))
+        except Exception as e:
+            logger.debug(f"[Auth] Redis tenant set error: {e}")
+    return tenant
+
+
+async def invalidate_tenant_cache(user_id: Optional[str] = None) -> None:
+    """
+    Drop a user's tenant entry (or all entries) on every API worker.
+
+    Clears the local cache, the Redis entry, and publishes on
+    TENANT_INVALIDATE_CHANNEL for the other workers.
+    """
+    clear_tenant_cache(user_id)
+    redis_conn = await _get_tenant_redis()
+    if not redis_conn:
+        return
+    try:
+        if user_id:
+            await redis_conn.delete(f"{TENANT_REDIS_PREFIX}{user_id}")
+        else:
+            async for key in redis_conn.scan_iter(match=f"{TENANT_REDIS_PREFIX}*", count=100):
+                await redis_conn.delete(key)
+        await redis_conn.publish(TENANT_INVALIDATE_CHANNEL, user_id or "*")
+    except Exception as e:
+        logger.warning(f"[Auth] Tenant cache invalidation publish failed: {e}")
+
+
+async def listen_for_tenant_invalidations() -> None:
+    """Apply invalidations published by other workers / the DB listener to the local cache."""
+    reconnect_delay = 5
+    while True:
+        redis_conn = await _get_tenant_redis()
+        if not redis_conn:
+            return
+        pubsub = redis_conn.pubsub()
+        try:
+            await pubsub.subscribe(TENANT_INVALIDATE_CHANNEL)
+            reconnect_delay = 5
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = message.get("data")
+                clear_tenant_cache(None if data == "*" else data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Entries may be stale while disconnected; drop them all
+            logger.warning(f"[Auth] Tenant invalidation listener error: {e}, reconnecting in {reconnect_delay}s")
+            clear_tenant_cache()
+            await asyncio.sleep(reconnect_delay)
+            reconnect_delay = min(reconnect_delay * 2, 120)
+        finally:
+            try:
+                # aclose() is redis>=5.0.1; older clients only have close()
+                await getattr(pubsub, "aclose", pubsub.close)()
+            except Exception:
+                pass
+
+
+def start_tenant_invalidation_listener() -> None:
+    """Start the invalidation listener for this worker (app startup); no-op without REDIS_URL."""
+    global _tenant_listener_task
+    if REDIS_URL and _tenant_listener_task is None:
+        _tenant_listener_task = asyncio.get_running_loop().create_task(listen_for_tenant_invalidations())
+
+
+async def stop_tenant_invalidation_listener() -> None:
+    global _tenant_listener_task
+    if _tenant_listener_task is not None:
+        _tenant_listener_task.cancel()
+        try:
+            await _tenant_listener_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _tenant_listener_task = None
+
 # ============================================================================
 # JWT VALIDATION
 # ============================================================================
 
+# Verified tokens: sha256(token) -> (claims, expires_at). A session sends
+# the same token on every request (each SSE search keystroke included), so
+# signature + claim checks run once per token rather than once per request.
+JWT_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE", "4096"))
+JWT_CACHE_NO_EXP_TTL = 300  # tokens without exp are re-verified after 5 min
+
+_verified_tokens: "OrderedDict[bytes, tuple]" = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+def _jwt_secrets() -> list:
+    """(name, secret) pairs in priority order, duplicates removed."""
+    # MASTER first (frontend authenticates against MASTER Supabase)
+    secrets = []
+    if MASTER_SUPABASE_JWT_SECRET:
+        secrets.append(('MASTER', MASTER_SUPABASE_JWT_SECRET))
+    if TENANT_SUPABASE_JWT_SECRET and TENANT_SUPABASE_JWT_SECRET != MASTER_SUPABASE_JWT_SECRET:
+        secrets.append(('TENANT', TENANT_SUPABASE_JWT_SECRET))
+    if SUPABASE_JWT_SECRET and SUPABASE_JWT_SECRET not in [MASTER_SUPABASE_JWT_SECRET, TENANT_SUPABASE_JWT_SECRET]:
+        secrets.append(('SUPABASE', SUPABASE_JWT_SECRET))
+    return secrets
+
+
+def _matching_secret(token: str, secrets: list) -> list:
+    """
+    Put the secret whose HS256 signature matches first.
+
+    One HMAC per secret over the signing input is far cheaper than a full
+    jwt.decode per secret; the chosen secret is still fully verified by
+    jwt.decode. Malformed tokens keep the original order (and errors).
+    """
+    if len(secrets) < 2:
+        return secrets
+    signing_input, _, signature_b64 = token.rpartition('.')
+    try:
+        signature = base64url_decode(signature_b64)
+    except (ValueError, TypeError):
+        return secrets
+    message = signing_input.encode('utf-8')
+    for index, (_, secret) in enumerate(secrets):
+        expected = _hmac.digest(secret.encode('utf-8'), message, 'sha256')
+        if _hmac.compare_digest(expected, signature):
+            return [secrets[index]] + secrets[:index] + secrets[index + 1:]
+    return secrets
+
+
+def _cached_claims(digest: bytes) -> Optional[dict]:
+    with _verified_tokens_lock:
+        entry = _verified_tokens.get(digest)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del _verified_tokens[digest]
+            return None
+        _verified_tokens.move_to_end(digest)
+    return dict(payload)
+
+
+def _remember_claims(digest: bytes, payload: dict) -> None:
+    exp = payload.get('exp')
+    expires_at = exp if isinstance(exp, (int, float)) else time.time() + JWT_CACHE_NO_EXP_TTL
+    with _verified_tokens_lock:
+        _verified_tokens[digest] = (dict(payload), expires_at)
+        _verified_tokens.move_to_end(digest)
+        while len(_verified_tokens) > JWT_CACHE_MAX_SIZE:
+            _verified_tokens.popitem(last=False)
+
+
+def clear_jwt_cache() -> None:
+    """Forget verified tokens (secret rotation, tests)."""
+    with _verified_tokens_lock:
+        _verified_tokens.clear()
+
+
 def decode_jwt(token: str) -> dict:
     """
     Decode and validate JWT token using Supabase JWT secret.
@@ -555,28 +864,28 @@ def decode_jwt(token: str) -> dict:
     The frontend authenticates against MASTER, so use MASTER secret first.
     Falls back to TENANT secret if MASTER verification fails (handles both cases).
 
+    A verified token is cached (by SHA-256 digest) until its exp, and only
+    the secret whose signature matches is run through jwt.decode, so a repeat
+    token costs one hash and a new one a single verification.
+
     Returns decoded payload with:
     - sub (user_id)
     - email
     - role (from JWT, not authoritative - use tenant lookup)
     - exp (expiration)
     """
-    # Build list of secrets to try, in priority order
-    # MASTER first (frontend authenticates against MASTER Supabase)
-    secrets_to_try = []
-    if MASTER_SUPABASE_JWT_SECRET:
-        secrets_to_try.append(('MASTER', MASTER_SUPABASE_JWT_SECRET))
-    if TENANT_SUPABASE_JWT_SECRET and TENANT_SUPABASE_JWT_SECRET != MASTER_SUPABASE_JWT_SECRET:
-        secrets_to_try.append(('TENANT', TENANT_SUPABASE_JWT_SECRET))
-    if SUPABASE_JWT_SECRET and SUPABASE_JWT_SECRET not in [MASTER_SUPABASE_JWT_SECRET, TENANT_SUPABASE_JWT_SECRET]:
-        secrets_to_try.append(('SUPABASE', SUPABASE_JWT_SECRET))
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = _cached_claims(digest)
+    if payload is not None:
+        return payload
 
+    secrets_to_try = _jwt_secrets()
     if not secrets_to_try:
         logger.error('[Auth] No JWT secrets configured')
         raise HTTPException(status_code=500, detail='JWT secret not configured')
 
     last_error = None
-    for secret_name, secret in secrets_to_try:
+    for secret_name, secret in _matching_secret(token, secrets_to_try):
         try:
             payload = jwt.decode(
                 token,
@@ -586,6 +895,7 @@ def decode_jwt(token: str) -> dict:
                 options={'verify_exp': True}
             )
             logger.debug(f'[Auth] JWT verified with {secret_name} secret')
+            _remember_claims(digest, payload)
             return payload
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail='Token expired')
@@ -674,7 +984,7 @@ async def get_authenticated_user(
 
     # Look up tenant from MASTER DB
     user_metadata = payload.get('user_metadata') or {}
-    tenant = lookup_tenant_for_user(user_id, user_metadata=user_metadata, email=payload.get('email'))
+    tenant = await resolve_tenant_for_user(user_id, user_metadata=user_metadata, email=payload.get('email'))
 
     if not tenant:
         raise HTTPException(
@@ -910,13 +1220,18 @@ __all__ = [
     # JWT functions
     'decode_jwt',
     'extract_user_id',
+    'clear_jwt_cache',
     # Auth dependencies (get_authenticated_user is the single source of truth)
     'get_authenticated_user',
     'validate_agent_token',
     # Tenant lookup
     'lookup_tenant_for_user',
+    'resolve_tenant_for_user',
     'clear_tenant_cache',
+    'invalidate_tenant_cache',
     'get_tenant_cache_stats',
+    'start_tenant_invalidation_listener',
+    'stop_tenant_invalidation_listener',
     # Incident mode / kill switch
     'get_system_flags',
     'clear_system_flags_cache',
@@ -0,0 +1,119 @@
+"""
+Request-body size limits for upload endpoints (pure ASGI).
+
+FastAPI parses a multipart body completely before the route runs, so a
+route-level ``len(file) > MAX`` check only fires after the whole oversized
+upload has crossed the satellite link and been spooled. This middleware
+rejects earlier:
+
+    * ``Content-Length`` over the limit → 413 before any body is read.
+    * Chunked / unknown-length bodies are counted as they stream and the
+      request is cut off with 413 at the first byte past the limit.
+
+Limits are per path pattern and include slack for multipart framing; the
+routes still enforce the exact per-file cap on the decoded part.
+
+Usage:
+    from middleware.upload_limits import UploadSizeLimitMiddleware
+    app.add_middleware(UploadSizeLimitMiddleware)
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Optional, Sequence, Tuple
+
+from starlette.exceptions import HTTPException
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+MULTIPART_SLACK_BYTES = 1 * _MB
+
+DEFAULT_UPLOAD_LIMITS: Tuple[Tuple[str, int], ...] = (
+    (r"^/v1/attachments/upload$", 15 * _MB + MULTIPART_SLACK_BYTES),
+    (r"^/v1/attachments/upload/sessions/[^/]+$", 15 * _MB),
+    (r"^/v1/documents/upload$", 15 * _MB + MULTIPART_SLACK_BYTES),
+    (r"^/v1/documents/import$", 500 * _MB + MULTIPART_SLACK_BYTES),
+    (r"^/api/receiving/[^/]+/upload$", int(os.getenv("RECEIVING_MAX_UPLOAD_BYTES", str(30 * _MB))) + MULTIPART_SLACK_BYTES),
+)
+
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parser re-raises it as-is instead of
+    # converting it to "400 error parsing the body".
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=f"Request body exceeds maximum size of {limit // _MB} MB")
+
+
+class UploadSizeLimitMiddleware:
+    def __init__(self, app, limits: Sequence[Tuple[str, int]] = DEFAULT_UPLOAD_LIMITS):
+        self.app = app
+        self.limits = [(re.compile(pattern), limit) for pattern, limit in limits]
+
+    def _limit_for(self, path: str) -> Optional[int]:
+        for pattern, limit in self.limits:
+            if pattern.match(path):
+                return limit
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") not in ("POST", "PUT", "PATCH"):
+            return await self.app(scope, receive, send)
+
+        limit = self._limit_for(scope.get("path", ""))
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > limit:
+                    logger.warning(f"[UploadLimits] Rejected {scope['path']}: Content-Length {declared} > {limit}")
+                    return await _send_413(send, limit)
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _BodyTooLarge(limit)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            # Only reached when no exception handler rendered it (e.g. the
+            # body was read outside a route); otherwise FastAPI already sent 413.
+            logger.warning(f"[UploadLimits] Rejected {scope['path']}: body exceeded {limit} bytes mid-stream")
+            if not response_started:
+                await _send_413(send, limit)
+
+
+async def _send_413(send, limit: int) -> None:
+    body = json.dumps({"detail": f"Request body exceeds maximum size of {limit // _MB} MB"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"connection", b"close"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -15,9 +15,12 @@ This layer:
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import asyncio
 import logging
 import time
 
+from integrations.supabase import aexecute
+
 from .retrieval_plan import RetrievalPlan, RetrievalPath, ParameterizedQuery, VectorQuery
 from .ranking_recipes import get_ranking_recipe, calculate_recency_score
 
@@ -40,6 +43,10 @@ class ExecutionResult:
 class PlanExecutor:
     """
     Executes RetrievalPlan queries against Supabase.
+
+    Accepts either the sync supabase-py client or the async PostgREST
+    client from get_async_tenant_client(); queries go through aexecute()
+    so neither blocks the event loop.
     """
 
     def __init__(self, supabase_client, yacht_id: str):
@@ -73,36 +80,42 @@ class PlanExecutor:
         vector_results = []
         results_by_domain: Dict[str, List[Dict]] = {}
 
-        # Execute SQL queries
-        for sql_query in plan.sql_queries:
-            try:
-                domain_results = await self._execute_sql(sql_query)
-                sql_results.extend(domain_results)
-
-                # Group by domain
-                domain = sql_query.domain
-                if domain not in results_by_domain:
-                    results_by_domain[domain] = []
-                results_by_domain[domain].extend(domain_results)
+        # Plan queries are independent: issue them concurrently. Results are
+        # consumed in plan order so merge/ranking stay deterministic.
+        vector_queries = plan.vector_queries if plan.is_vector_involved() else []
+        outcomes = await asyncio.gather(
+            *(self._execute_sql(q) for q in plan.sql_queries),
+            *(self._execute_vector(q) for q in vector_queries),
+            return_exceptions=True,
+        )
+        sql_outcomes = outcomes[:len(plan.sql_queries)]
+        vector_outcomes = outcomes[len(plan.sql_queries):]
 
-            except Exception as e:
-                logger.error(f"SQL query failed for domain {sql_query.domain}: {e}")
+        # Execute SQL queries
+        for sql_query, domain_results in zip(plan.sql_queries, sql_outcomes):
+            if isinstance(domain_results, BaseException):
+                logger.error(f"SQL query failed for domain {sql_query.domain}: {domain_results}")
+                continue
+            sql_results.extend(domain_results)
+
+            # Group by domain
+            domain = sql_query.domain
+            if domain not in results_by_domain:
+                results_by_domain[domain] = []
+            results_by_domain[domain].extend(domain_results)
 
         # Execute vector queries (if path requires it)
-        if plan.is_vector_involved():
-            for vector_query in plan.vector_queries:
-                try:
-                    vr = await self._execute_vector(vector_query)
-                    vector_results.extend(vr)
-
-                    # Group by table as domain
-                    domain = vector_query.table
-                    if domain not in results_by_domain:
-                        results_by_domain[domain] = []
-                    results_by_domain[domain].extend(vr)
-
-                except Exception as e:
-                    logger.error(f"Vector query failed for {vector_query.table}: {e}")
+        for vector_query, vr in zip(vector_queries, vector_outcomes):
+            if isinstance(vr, BaseException):
+                logger.error(f"Vector query failed for {vector_query.table}: {vr}")
+                continue
+            vector_results.extend(vr)
+
+            # Group by table as domain
+            domain = vector_query.table
+            if domain not in results_by_domain:
+                results_by_domain[domain] = []
+            results_by_domain[domain].extend(vr)
 
         # Merge and deduplicate
         merged = self._merge_results(sql_results, vector_results)
@@ -195,7 +208,7 @@ class PlanExecutor:
 
             # LAW 21: Primary vector search against search_index table
             if query.table == 'search_index':
-                result = self.client.rpc(
+                result = await aexecute(self.client.rpc(
                     'match_search_index',
                     {
                         'p_yacht_id': self.yacht_id,
@@ -204,7 +217,7 @@ class PlanExecutor:
                         'p_match_count': query.top_k,
                         'p_object_type': query.filters.get('object_type'),
                     }
-                ).execute()
+                ))
 
                 # Transform results to include similarity score and standard fields
                 results = []
@@ -222,7 +235,7 @@ class PlanExecutor:
 
             # Use Supabase match function for legacy tables
             elif query.table == 'email_messages':
-                result = self.client.rpc(
+                result = await aexecute(self.client.rpc(
                     'match_email_messages',
                     {
                         'p_yacht_id': self.yacht_id,
@@ -232,11 +245,11 @@ class PlanExecutor:
                         'p_direction': query.filters.get('direction'),
                         'p_days_back': query.filters.get('days_back', 90),
                     }
-                ).execute()
+                ))
                 return result.data or []
 
             elif query.table == 'document_chunks':
-                result = self.client.rpc(
+                result = await aexecute(self.client.rpc(
                     'match_documents',
                     {
                         'query_embedding': embedding,
@@ -244,7 +257,7 @@ class PlanExecutor:
                         'match_count': query.top_k,
                         'filter_yacht_id': self.yacht_id,
                     }
-                ).execute()
+                ))
                 return result.data or []
 
             else:
@@ -262,8 +275,8 @@ class PlanExecutor:
         import os
         try:
             import openai
-            client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            response = client.embeddings.create(
+            client = openai.AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            response = await client.embeddings.create(
                 model="text-embedding-3-small",
                 input=text,
             )
@@ -361,7 +374,7 @@ class PlanExecutor:
             query = query.limit(params['limit'])
 
         query = query.order('sent_at', desc=True)
-        result = query.execute()
+        result = await aexecute(query)
         return result.data or []
 
     async def _query_email_thread(self, params: Dict) -> List[Dict]:
@@ -370,9 +383,9 @@ class PlanExecutor:
         if not thread_id:
             return []
 
-        result = self.client.table('email_messages').select(
+        result = await aexecute(self.client.table('email_messages').select(
             'id, thread_id, subject, from_display_name, direction, sent_at, has_attachments'
-        ).eq('thread_id', thread_id).order('sent_at', desc=True).limit(20).execute()
+        ).eq('thread_id', thread_id).order('sent_at', desc=True).limit(20))
 
         return result.data or []
 
@@ -382,13 +395,13 @@ class PlanExecutor:
         if not query_pattern:
             return []
 
-        result = self.client.table('email_messages').select(
+        result = await aexecute(self.client.table('email_messages').select(
             'id, thread_id, subject, attachments'
         ).eq('yacht_id', self.yacht_id).eq(
             'has_attachments', True
         ).ilike('attachments', query_pattern).limit(
             params.get('limit', 10)
-        ).execute()
+        ))
 
         return result.data or []
 
@@ -404,19 +417,19 @@ class PlanExecutor:
             query = query.or_(f"title.ilike.{params['query']},wo_number.ilike.{params['query']}")
 
         query = query.order('updated_at', desc=True).limit(params.get('limit', 30))
-        result = query.execute()
+        result = await aexecute(query)
         results = result.data or []
 
         # Phase 2: pg_trgm fuzzy search if ILIKE found few results
         # LAW 20: Universal trigram matching
         if len(results) < 5 and params.get('query') and not params.get('wo_ids'):
             try:
-                fuzzy_result = self.client.rpc('search_work_orders_fuzzy', {
+                fuzzy_result = await aexecute(self.client.rpc('search_work_orders_fuzzy', {
                     'p_yacht_id': self.yacht_id,
                     'p_query': params['query'].replace('%', ''),
                     'p_threshold': 0.3,
                     'p_limit': params.get('limit', 30)
-                }).execute()
+                }))
 
                 if fuzzy_result.data:
                     seen_ids = {r['id'] for r in results}
@@ -449,19 +462,19 @@ class PlanExecutor:
             query = query.or_(f"name.ilike.{params['query']},serial_number.ilike.{params['query']}")
 
         query = query.order('name').limit(params.get('limit', 30))
-        result = query.execute()
+        result = await aexecute(query)
         results = result.data or []
 
         # Phase 2: pg_trgm fuzzy search if ILIKE found few results
         # LAW 20: Universal trigram matching
         if len(results) < 5 and params.get('query') and not params.get('eq_ids'):
             try:
-                fuzzy_result = self.client.rpc('search_equipment_fuzzy', {
+                fuzzy_result = await aexecute(self.client.rpc('search_equipment_fuzzy', {
                     'p_yacht_id': self.yacht_id,
                     'p_query': params['query'].replace('%', ''),
                     'p_threshold': 0.3,
                     'p_limit': params.get('limit', 30)
-                }).execute()
+                }))
 
                 if fuzzy_result.data:
                     seen_ids = {r['id'] for r in results}
@@ -493,19 +506,19 @@ class PlanExecutor:
             query = query.or_(f"name.ilike.{params['query']},part_number.ilike.{params['query']}")
 
         query = query.order('name').limit(params.get('limit', 30))
-        result = query.execute()
+        result = await aexecute(query)
         results = result.data or []
 
         # Phase 2: pg_trgm fuzzy search if ILIKE found few results
         # LAW 20: Universal trigram matching for typo tolerance
         if len(results) < 5 and params.get('query'):
             try:
-                fuzzy_result = self.client.rpc('search_parts_fuzzy', {
+                fuzzy_result = await aexecute(self.client.rpc('search_parts_fuzzy', {
                     'p_yacht_id': self.yacht_id,
                     'p_query': params['query'].replace('%', ''),
                     'p_threshold': 0.3,
                     'p_limit': params.get('limit', 30)
-                }).execute()
+                }))
 
                 if fuzzy_result.data:
                     seen_ids = {r['id'] for r in results}
@@ -538,5 +551,5 @@ class PlanExecutor:
             query = query.or_(f"description.ilike.{params['query']},fault_code.ilike.{params['query']}")
 
         query = query.order('reported_at', desc=True).limit(params.get('limit', 20))
-        result = query.execute()
+        result = await aexecute(query)
         return result.data or []
@@ -1,11 +1,23 @@
 """
 Base parser types for the import pipeline.
 All parsers return ParseResult instances.
+
+Each parser also has a streaming entry point (stream_csv, stream_xlsx, ...)
+returning a RowStream: detection metadata computed from a sampled prefix
+plus a one-shot iterator of row batches, so large PMS exports are never
+materialised as one list of dicts.
 """
 
+import io
 import re
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+# Rows per batch yielded by the streaming parsers
+ROW_BATCH_SIZE = 5000
+
+RowBatch = list[dict[str, str]]
+Source = Union[bytes, bytearray, BinaryIO]
 
 
 # Regex to detect file references in column values
@@ -71,3 +83,67 @@ class DocumentInfo:
     content_type: str
     domain_hint: Optional[str] = None  # manuals, photos, certificates — inferred from folder
     data: Optional[bytes] = None
+    archive_path: Optional[str] = None  # member name when listed lazily from a ZIP
+
+
+class RowStream:
+    """
+    Streaming counterpart of ParseResult.
+
+    ``meta`` carries everything detection and column mapping need (columns
+    with sample values, header row, encoding, date format, domain hint),
+    computed from a sampled prefix; ``meta.rows`` stays empty. Iterating
+    yields row batches once. ``meta.row_count`` and warnings found mid-file
+    are final once the stream has been fully consumed.
+    """
+
+    def __init__(self, meta: ParseResult, batches: Iterable[RowBatch], spill_path: Optional[str] = None):
+        self.meta = meta
+        self.spill_path = spill_path  # set when the rows already live in a spill file
+        self._batches = batches
+        self._consumed = False
+
+    @property
+    def filename(self) -> str:
+        return self.meta.filename
+
+    def __iter__(self) -> Iterator[RowBatch]:
+        if self._consumed:
+            raise RuntimeError(f"RowStream for {self.meta.filename} already consumed")
+        self._consumed = True
+        count = 0
+        for batch in self._batches:
+            count += len(batch)
+            yield batch
+        self.meta.row_count = count
+
+    def rows(self) -> Iterator[dict[str, str]]:
+        for batch in self:
+            yield from batch
+
+    def collect(self) -> ParseResult:
+        """Materialise every row into ``meta.rows`` (legacy ParseResult API)."""
+        self.meta.rows = list(self.rows())
+        return self.meta
+
+
+def empty_stream(meta: ParseResult) -> RowStream:
+    return RowStream(meta, iter(()))
+
+
+def as_binary(source: Source) -> BinaryIO:
+    """Accept raw bytes or a seekable binary file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def iter_batches(rows: Iterable[dict[str, str]], batch_size: int = ROW_BATCH_SIZE) -> Iterator[RowBatch]:
+    batch: RowBatch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -8,15 +8,20 @@ Seahub (comma, snake_case, UTF-8), Sealogical (comma, Title Case, Windows-1252),
 and generic CSV files.
 """
 
+import codecs
 import csv
 import io
+import itertools
 import re
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 
 from charset_normalizer import from_bytes
 
-from parsers.base_parser import ParseResult, ColumnInfo, FileWarning
+from parsers.base_parser import (
+    ROW_BATCH_SIZE, ColumnInfo, FileWarning, ParseResult, RowBatch, RowStream, Source,
+    as_binary, empty_stream, iter_batches,
+)
 
 logger = logging.getLogger("import.csv_parser")
 
@@ -26,6 +31,9 @@ DETECTION_SAMPLE_SIZE = 16384
 # Maximum sample values to store per column
 MAX_SAMPLE_VALUES = 5
 
+# Leading rows scanned for the header (metadata rows above it are skipped)
+HEADER_SCAN_ROWS = 20
+
 # Date patterns to check (ordered by specificity)
 DATE_PATTERNS = [
     (r"\d{4}-\d{2}-\d{2}", "ISO"),                          # 2025-01-15
@@ -210,64 +218,89 @@ def infer_domain(headers: list[str]) -> Optional[str]:
     return None
 
 
-def parse_csv(raw_data: bytes, filename: str = "unknown.csv") -> ParseResult:
+def _decoded_lines(text_stream, on_null_bytes) -> Iterator[str]:
+    """Yield decoded lines with the BOM and null bytes stripped."""
+    first = True
+    for line in text_stream:
+        if first:
+            first = False
+            if line.startswith("\ufeff"):
+                line = line[1:]
+        if "\x00" in line:
+            line = line.replace("\x00", "")
+            on_null_bytes()
+        yield line
+
+
+def _row_to_dict(headers: list[str], row: list[str]) -> dict[str, str]:
+    row_dict = {}
+    for col_idx, header in enumerate(headers):
+        if not header:
+            continue
+        row_dict[header] = row[col_idx].strip() if col_idx < len(row) else ""
+    return row_dict
+
+
+def stream_csv(source: Source, filename: str = "unknown.csv", batch_size: int = ROW_BATCH_SIZE) -> RowStream:
     """
-    Parse a CSV file from raw bytes.
-    Returns a ParseResult with detected encoding, delimiter, headers, rows, and warnings.
+    Parse a CSV file incrementally from raw bytes or a seekable binary file.
+
+    Encoding and delimiter are detected from the first DETECTION_SAMPLE_SIZE
+    bytes; the header row, column samples, date format and domain from the
+    first HEADER_SCAN_ROWS + MAX_SAMPLE_VALUES rows. Data rows are decoded
+    and yielded in batches without holding the file in memory.
     """
     warnings: list[FileWarning] = []
+    fh = as_binary(source)
 
     # 1. Detect encoding
-    sample = raw_data[:DETECTION_SAMPLE_SIZE]
+    sample = fh.read(DETECTION_SAMPLE_SIZE)
     encoding = detect_encoding(sample)
 
     try:
-        text = raw_data.decode(encoding, errors="replace")
-    except (UnicodeDecodeError, LookupError):
+        codecs.lookup(encoding)
+    except LookupError:
         encoding = "utf-8"
-        text = raw_data.decode(encoding, errors="replace")
         warnings.append(FileWarning(
             field=None,
             message=f"Encoding detection failed, fell back to UTF-8",
             severity="amber",
         ))
 
-    # Strip BOM if present
-    if text.startswith("\ufeff"):
-        text = text[1:]
-
-    # Strip null bytes (corrupted files)
-    if "\x00" in text:
-        text = text.replace("\x00", "")
-        warnings.append(FileWarning(
-            field=None,
-            message="File contains null bytes (possible corruption). Null bytes stripped.",
-            severity="amber",
-        ))
+    # 2. Detect delimiter from the decoded sample
+    sample_text = sample.decode(encoding, errors="replace").lstrip("\ufeff").replace("\x00", "")
+    delimiter = detect_delimiter(sample_text)
 
-    # 2. Detect delimiter
-    delimiter = detect_delimiter(text)
+    # Strip null bytes (corrupted files) — warned once, wherever they appear
+    def on_null_bytes():
+        if not any(w.message.startswith("File contains null bytes") for w in warnings):
+            warnings.append(FileWarning(
+                field=None,
+                message="File contains null bytes (possible corruption). Null bytes stripped.",
+                severity="amber",
+            ))
 
-    # 3. Parse all rows
-    reader = csv.reader(io.StringIO(text), delimiter=delimiter)
-    all_rows = []
-    for row in reader:
-        all_rows.append(row)
+    # 3. Read a prefix of rows for header and sample detection
+    fh.seek(0)
+    text_stream = io.TextIOWrapper(fh, encoding=encoding, errors="replace", newline="")
+    reader = csv.reader(_decoded_lines(text_stream, on_null_bytes), delimiter=delimiter)
+    prefix = list(itertools.islice(reader, HEADER_SCAN_ROWS + MAX_SAMPLE_VALUES))
 
-    if not all_rows:
-        return ParseResult(
+    if not prefix:
+        text_stream.detach()
+        return empty_stream(ParseResult(
             filename=filename,
             encoding_detected=encoding,
             delimiter_detected=delimiter,
             header_row=0,
             row_count=0,
             warnings=[FileWarning(field=None, message="File is empty", severity="red")],
-        )
+        ))
 
     # 4. Find header row (handles Sealogical metadata rows)
-    header_idx = find_header_row(all_rows)
-    headers = [h.strip() for h in all_rows[header_idx]]
-    data_rows = all_rows[header_idx + 1:]
+    header_idx = find_header_row(prefix, max_scan=HEADER_SCAN_ROWS)
+    headers = [h.strip() for h in prefix[header_idx]]
+    sample_rows = prefix[header_idx + 1:header_idx + 1 + MAX_SAMPLE_VALUES]
 
     if header_idx > 0:
         warnings.append(FileWarning(
@@ -283,7 +316,7 @@ def parse_csv(raw_data: bytes, filename: str = "unknown.csv") -> ParseResult:
         if not header:
             continue
         samples = []
-        for row in data_rows[:MAX_SAMPLE_VALUES]:
+        for row in sample_rows:
             if col_idx < len(row) and row[col_idx].strip():
                 samples.append(row[col_idx].strip())
         columns.append(ColumnInfo(
@@ -306,23 +339,10 @@ def parse_csv(raw_data: bytes, filename: str = "unknown.csv") -> ParseResult:
             severity="amber",
         ))
 
-    # 7. Convert data rows to dicts
-    row_dicts = []
-    for row_idx, row in enumerate(data_rows):
-        if not any(cell.strip() for cell in row):
-            continue  # skip empty rows
-        row_dict = {}
-        for col_idx, header in enumerate(headers):
-            if not header:
-                continue
-            value = row[col_idx].strip() if col_idx < len(row) else ""
-            row_dict[header] = value
-        row_dicts.append(row_dict)
-
-    # 8. Infer domain
+    # 7. Infer domain
     domain = infer_domain(headers)
 
-    # 9. Check for common issues
+    # 8. Check for common issues
     # Warn about empty required-looking columns
     for col in columns:
         if not col.sample_values:
@@ -332,21 +352,43 @@ def parse_csv(raw_data: bytes, filename: str = "unknown.csv") -> ParseResult:
                 severity="info",
             ))
 
-    logger.info(
-        f"Parsed {filename}: {encoding} encoding, "
-        f"{repr(delimiter)} delimiter, {len(row_dicts)} rows, "
-        f"{len(columns)} columns, domain={domain}"
-    )
-
-    return ParseResult(
+    meta = ParseResult(
         filename=filename,
         encoding_detected=encoding,
         delimiter_detected=delimiter,
         header_row=header_idx,
-        row_count=len(row_dicts),
+        row_count=0,
         columns=columns,
-        rows=row_dicts,
         date_format_detected=date_format,
         warnings=warnings,
         domain_hint=domain,
     )
+
+    # 9. Convert data rows to dicts, batch by batch
+    def batches() -> Iterator[RowBatch]:
+        count = 0
+        try:
+            data_rows = itertools.chain(prefix[header_idx + 1:], reader)
+            for batch in iter_batches(
+                (_row_to_dict(headers, row) for row in data_rows if any(cell.strip() for cell in row)),
+                batch_size,
+            ):
+                count += len(batch)
+                yield batch
+        finally:
+            text_stream.detach()
+        logger.info(
+            f"Parsed {filename}: {encoding} encoding, "
+            f"{repr(delimiter)} delimiter, {count} rows, "
+            f"{len(columns)} columns, domain={domain}"
+        )
+
+    return RowStream(meta, batches())
+
+
+def parse_csv(raw_data: bytes, filename: str = "unknown.csv") -> ParseResult:
+    """
+    Parse a CSV file from raw bytes.
+    Returns a ParseResult with detected encoding, delimiter, headers, rows, and warnings.
+    """
+    return stream_csv(raw_data, filename).collect()
@@ -0,0 +1,164 @@
+"""
+Row spill files for the import pipeline.
+
+A spill is the parsed, normalised rows of one source file (or one SQL
+table) written to local disk once, so dry-run and commit read rows back
+instead of re-downloading and re-parsing the original export.
+
+Format: gzip'd JSON lines. The first line is a header
+``{"v": 1, "filename": ...}``; every following line is one row batch stored
+column-major as ``[[col, ...], [[values of col 0], [values of col 1], ...]]``
+(``null`` where a row lacks the column). Column-major batches compress well
+and rebuild cheaply into row dicts.
+
+Spills are written to ``<path>.part`` and renamed on completion, so a
+reader never sees a half-written file. Session directories live under
+IMPORT_SPILL_DIR and are dropped after commit or once older than
+IMPORT_SPILL_TTL_S.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Iterable, Iterator, Optional
+
+from parsers.base_parser import ParseResult, RowBatch, RowStream
+
+logger = logging.getLogger("import.row_spill")
+
+IMPORT_SPILL_DIR = os.getenv("IMPORT_SPILL_DIR", os.path.join(tempfile.gettempdir(), "celeste-import-spill"))
+IMPORT_SPILL_TTL_S = int(os.getenv("IMPORT_SPILL_TTL_S", str(24 * 3600)))
+
+SPILL_FORMAT_VERSION = 1
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+_SESSION_ID = re.compile(r"^[0-9a-fA-F-]{8,64}$")
+
+
+def spill_path(directory: str, name: str) -> str:
+    """Stable, filesystem-safe spill path for a source name (e.g. "export.sql:equipment")."""
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+    safe = _SAFE_NAME.sub("_", name)[:80]
+    return os.path.join(directory, f"{safe}.{digest}.rows.jsonl.gz")
+
+
+def session_spill_dir(session_id: str, root: Optional[str] = None) -> str:
+    if not _SESSION_ID.match(session_id):
+        raise ValueError(f"Invalid import session id: {session_id!r}")
+    return os.path.join(root or IMPORT_SPILL_DIR, session_id)
+
+
+def drop_session_spill(session_id: str, root: Optional[str] = None) -> None:
+    shutil.rmtree(session_spill_dir(session_id, root), ignore_errors=True)
+
+
+def purge_expired_spills(root: Optional[str] = None, ttl_s: int = IMPORT_SPILL_TTL_S) -> None:
+    root = root or IMPORT_SPILL_DIR
+    cutoff = time.time() - ttl_s
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+class SpillWriter:
+    """Write row batches to a spill file; use as a context manager."""
+
+    def __init__(self, path: str, filename: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.row_count = 0
+        self._part = f"{path}.part"
+        self._fh = gzip.open(self._part, "wt", encoding="utf-8", compresslevel=1)
+        self._fh.write(json.dumps({"v": SPILL_FORMAT_VERSION, "filename": filename}) + "\n")
+
+    def write_batch(self, batch: RowBatch) -> None:
+        if not batch:
+            return
+        columns: dict[str, None] = {}
+        for row in batch:
+            for key in row:
+                columns.setdefault(key, None)
+        names = list(columns)
+        values = [[row.get(name) for row in batch] for name in names]
+        self._fh.write(json.dumps([names, values], ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.row_count += len(batch)
+
+    def commit(self) -> None:
+        self._fh.close()
+        os.replace(self._part, self.path)
+
+    def abort(self) -> None:
+        self._fh.close()
+        try:
+            os.remove(self._part)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "SpillWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+def _read_batches(path: str) -> Iterator[RowBatch]:
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        header = json.loads(fh.readline())
+        if header.get("v") != SPILL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported spill format {header.get('v')!r} in {path}")
+        for line in fh:
+            names, values = json.loads(line)
+            yield [
+                {name: value for name, value in zip(names, row) if value is not None}
+                for row in zip(*values)
+            ]
+
+
+def read_spill(path: str, meta: Optional[ParseResult] = None) -> Optional[RowStream]:
+    """Open a completed spill as a RowStream, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    if meta is None:
+        meta = ParseResult(
+            filename=os.path.basename(path), encoding_detected="utf-8",
+            delimiter_detected=None, header_row=0, row_count=0,
+        )
+    return RowStream(meta, _read_batches(path), spill_path=path)
+
+
+def spill_stream(stream: RowStream, path: str) -> int:
+    """Drain ``stream`` into a spill at ``path``; returns the row count."""
+    if stream.spill_path == path:
+        return stream.meta.row_count  # parser already spilled here (SQL tables)
+    with SpillWriter(path, stream.filename) as writer:
+        for batch in stream:
+            writer.write_batch(batch)
+    return writer.row_count
+
+
+def tee_to_spill(batches: Iterable[RowBatch], path: str, filename: str) -> Iterator[RowBatch]:
+    """Yield ``batches`` while spilling them; the spill only lands if fully consumed."""
+    writer = SpillWriter(path, filename)
+    try:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield batch
+    except BaseException:
+        writer.abort()
+        raise
+    writer.commit()
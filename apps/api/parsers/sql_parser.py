@@ -9,24 +9,26 @@ Two formats supported:
    \.
 """
 
-import re
+import codecs
 import io
 import logging
-from typing import Optional
+import re
+import tempfile
+from typing import Iterator, Optional
 
-from parsers.base_parser import ParseResult, ColumnInfo, FileWarning
-from parsers.csv_parser import infer_domain
+from parsers.base_parser import (
+    ROW_BATCH_SIZE, ColumnInfo, FileWarning, ParseResult, RowBatch, RowStream, Source,
+    as_binary, empty_stream,
+)
+from parsers.csv_parser import detect_date_format, infer_domain
+from parsers.row_spill import SpillWriter, read_spill, spill_path
 
 logger = logging.getLogger("import.sql_parser")
 
 MAX_SAMPLE_VALUES = 5
 
-# Regex for CREATE TABLE
-RE_CREATE_TABLE = re.compile(
-    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:public\.)?"
-    r"[\"']?(\w+)[\"']?\s*\((.*?)\);",
-    re.DOTALL | re.IGNORECASE,
-)
+# Leading rows kept per table for samples and date-format detection
+SQL_HEAD_ROWS = 20
 
 # Regex for INSERT INTO
 RE_INSERT = re.compile(
@@ -38,12 +40,6 @@ RE_INSERT = re.compile(
 # Regex for individual VALUES tuple
 RE_VALUES_TUPLE = re.compile(r"\(([^)]+)\)")
 
-# Regex for COPY blocks
-RE_COPY_BLOCK = re.compile(
-    r"COPY\s+(?:public\.)?[\"']?(\w+)[\"']?\s*\(([^)]+)\)\s+FROM\s+stdin;\n(.*?)\n\\.",
-    re.DOTALL | re.IGNORECASE,
-)
-
 
 def _parse_sql_value(raw: str) -> str:
     """Clean a SQL value: strip quotes, handle NULL."""
@@ -85,120 +81,209 @@ def _split_values(values_str: str) -> list[str]:
     return result
 
 
-def _extract_create_tables(sql_text: str) -> dict[str, list[str]]:
-    """Extract table schemas from CREATE TABLE statements.
-    Returns {table_name: [column_names]}."""
-    tables = {}
-    for match in RE_CREATE_TABLE.finditer(sql_text):
-        table_name = match.group(1).lower()
-        body = match.group(2)
-        # Extract column names (first word of each line before type)
-        columns = []
-        for line in body.split(","):
-            line = line.strip()
-            if not line or line.upper().startswith(("CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN", "INDEX")):
-                continue
-            # Column name is the first word
-            col_match = re.match(r"[\"']?(\w+)[\"']?", line)
-            if col_match:
-                columns.append(col_match.group(1))
-        if columns:
-            tables[table_name] = columns
-    return tables
-
-
-def _extract_inserts(sql_text: str) -> dict[str, dict]:
-    """Extract INSERT INTO statements.
-    Returns {table_name: {"columns": [...], "rows": [...]}}."""
-    results = {}
-
-    for match in RE_INSERT.finditer(sql_text):
-        table_name = match.group(1).lower()
-        columns = [c.strip().strip('"').strip("'") for c in match.group(2).split(",")]
-
-        # Find all VALUES tuples after this INSERT
-        rest = sql_text[match.end():]
-        rows = []
-        for val_match in RE_VALUES_TUPLE.finditer(rest):
-            values = _split_values(val_match.group(1))
-            cleaned = [_parse_sql_value(v) for v in values]
-            if len(cleaned) == len(columns):
-                rows.append(dict(zip(columns, cleaned)))
-            # Stop if we hit another SQL statement
-            if ";" in rest[val_match.end():val_match.end() + 5]:
-                break
-
-        if table_name not in results:
-            results[table_name] = {"columns": columns, "rows": []}
-        results[table_name]["rows"].extend(rows)
-
-    return results
+# Statement scanner tokens: quotes, statement terminator, line comment
+_SCAN_TOKEN = re.compile(r"['\";]|--")
 
+# COPY header once split into its own statement (data lines follow)
+RE_COPY_HEADER = re.compile(
+    r"COPY\s+(?:public\.)?[\"']?(\w+)[\"']?\s*\(([^)]+)\)\s+FROM\s+stdin\s*$",
+    re.IGNORECASE,
+)
 
-def _extract_copy_blocks(sql_text: str) -> dict[str, dict]:
-    """Extract COPY ... FROM stdin blocks (pg_dump format).
-    Returns {table_name: {"columns": [...], "rows": [...]}}."""
-    results = {}
 
-    for match in RE_COPY_BLOCK.finditer(sql_text):
-        table_name = match.group(1).lower()
-        columns = [c.strip().strip('"') for c in match.group(2).split(",")]
-        data_block = match.group(3)
+def _iter_statements(lines: Iterator[str]) -> Iterator[tuple[str, Optional[Iterator[str]]]]:
+    """
+    Split SQL text into statements without loading it whole.
 
-        rows = []
-        for line in data_block.split("\n"):
-            line = line.rstrip()
-            if not line:
+    Yields (statement, None) for ordinary statements and
+    (copy_header, data_lines) for ``COPY ... FROM stdin`` — the caller must
+    drain ``data_lines`` (which stops at the ``\\.`` terminator) before
+    advancing. Semicolons inside quoted values and ``--`` comments are
+    ignored.
+    """
+    buf: list[str] = []
+    quote: Optional[str] = None
+
+    def copy_lines() -> Iterator[str]:
+        for data_line in lines:
+            data_line = data_line.rstrip("\r\n")
+            if data_line == "\\.":
+                return
+            yield data_line
+
+    for line in lines:
+        start = pos = 0
+        while True:
+            if quote is not None:
+                idx = line.find(quote, pos)
+                if idx < 0:
+                    break
+                quote = None
+                pos = idx + 1
+                continue
+            m = _SCAN_TOKEN.search(line, pos)
+            if m is None:
+                break
+            token = m.group()
+            if token == "--":
+                buf.append(line[start:m.start()] + "\n")
+                start = pos = len(line)
+                break
+            if token != ";":
+                quote = token
+                pos = m.end()
                 continue
-            values = line.split("\t")
-            cleaned = [("" if v == "\\N" else v) for v in values]
-            if len(cleaned) == len(columns):
-                rows.append(dict(zip(columns, cleaned)))
+            statement = "".join(buf) + line[start:m.start()]
+            buf = []
+            start = pos = m.end()
+            copy_match = RE_COPY_HEADER.search(statement.strip())
+            if copy_match:
+                yield statement, copy_lines()
+                start = pos = len(line)  # data starts on the next line
+                break
+            yield statement, None
+        buf.append(line[start:])
+    if buf and "".join(buf).strip():
+        yield "".join(buf), None
+
+
+class _TableSpill:
+    """Accumulates one table's rows into its spill file while scanning."""
+
+    def __init__(self, path: str, name: str, batch_size: int):
+        self.path = path
+        self.name = name
+        self.batch_size = batch_size
+        self.columns: list[str] = []
+        self.from_copy = False
+        self.writer: Optional[SpillWriter] = None
+        self.batch: RowBatch = []
+        self.head: RowBatch = []
+        self.row_count = 0
+
+    def reset(self, columns: list[str], from_copy: bool) -> None:
+        if self.writer is not None:
+            self.writer.abort()
+        self.columns = columns
+        self.from_copy = from_copy
+        self.writer = SpillWriter(self.path, self.name)
+        self.batch, self.head, self.row_count = [], [], 0
+
+    def add(self, row: dict[str, str]) -> None:
+        if len(self.head) < SQL_HEAD_ROWS:
+            self.head.append(row)
+        self.batch.append(row)
+        self.row_count += 1
+        if len(self.batch) >= self.batch_size:
+            self.writer.write_batch(self.batch)
+            self.batch = []
+
+    def finish(self) -> None:
+        self.writer.write_batch(self.batch)
+        self.batch = []
+        self.writer.commit()
+
+    def abort(self) -> None:
+        if self.writer is not None:
+            self.writer.abort()
+
+
+def _scan_into_spills(lines: Iterator[str], filename: str, spill_dir: str, batch_size: int) -> dict[str, _TableSpill]:
+    tables: dict[str, _TableSpill] = {}
+
+    def table(name: str) -> _TableSpill:
+        if name not in tables:
+            tables[name] = _TableSpill(spill_path(spill_dir, f"{filename}:{name}"), f"{filename}:{name}", batch_size)
+        return tables[name]
 
-        results[table_name] = {"columns": columns, "rows": rows}
+    try:
+        for statement, copy_lines in _iter_statements(lines):
+            if copy_lines is not None:
+                # COPY takes precedence (more data-dense) — replaces any INSERT rows
+                copy_match = RE_COPY_HEADER.search(statement.strip())
+                spill = table(copy_match.group(1).lower())
+                columns = [c.strip().strip('"') for c in copy_match.group(2).split(",")]
+                spill.reset(columns, from_copy=True)
+                for data_line in copy_lines:
+                    if not data_line.strip():
+                        continue
+                    values = data_line.split("\t")
+                    cleaned = [("" if v == "\\N" else v) for v in values]
+                    if len(cleaned) == len(columns):
+                        spill.add(dict(zip(columns, cleaned)))
+                continue
 
-    return results
+            match = RE_INSERT.search(statement)
+            if not match:
+                continue  # CREATE TABLE, SET, comments, ...
+            spill = table(match.group(1).lower())
+            if spill.from_copy:
+                continue
+            columns = [c.strip().strip('"').strip("'") for c in match.group(2).split(",")]
+            if spill.writer is None:
+                spill.reset(columns, from_copy=False)
+            for val_match in RE_VALUES_TUPLE.finditer(statement, match.end()):
+                values = _split_values(val_match.group(1))
+                cleaned = [_parse_sql_value(v) for v in values]
+                if len(cleaned) == len(columns):
+                    spill.add(dict(zip(columns, cleaned)))
+        for spill in tables.values():
+            spill.finish()
+    except BaseException:
+        for spill in tables.values():
+            spill.abort()
+        raise
+    return tables
 
 
-def parse_sql(raw_data: bytes, filename: str = "unknown.sql") -> list[ParseResult]:
+def stream_sql(
+    source: Source,
+    filename: str = "unknown.sql",
+    spill_dir: Optional[str] = None,
+    batch_size: int = ROW_BATCH_SIZE,
+) -> list[RowStream]:
     """
-    Parse a SQL dump file. Returns a list of ParseResult (one per table found).
+    Parse a SQL dump in one streaming pass. Returns one RowStream per table.
     Handles both INSERT INTO and COPY FROM stdin formats.
+
+    Tables in a dump are interleaved, so each table's rows are written to
+    its own spill file in ``spill_dir`` as the file is scanned; the returned
+    streams read those spills (``RowStream.spill_path``). Pass the import
+    session's spill directory so dry-run and commit reuse them.
     """
     warnings: list[FileWarning] = []
+    fh = as_binary(source)
+    spill_dir = spill_dir or tempfile.mkdtemp(prefix="sql-spill-")
 
     # Detect encoding
     from charset_normalizer import from_bytes
-    sample = raw_data[:16384]
+    sample = fh.read(16384)
     result = from_bytes(sample).best()
     encoding = result.encoding if result else "utf-8"
-
     try:
-        sql_text = raw_data.decode(encoding, errors="replace")
-    except (UnicodeDecodeError, LookupError):
+        codecs.lookup(encoding)
+    except LookupError:
         encoding = "utf-8"
-        sql_text = raw_data.decode(encoding, errors="replace")
-
-    # Strip BOM
-    if sql_text.startswith("\ufeff"):
-        sql_text = sql_text[1:]
+    fh.seek(0)
 
-    # Extract schemas
-    schemas = _extract_create_tables(sql_text)
+    text_stream = io.TextIOWrapper(fh, encoding=encoding, errors="replace", newline="")
 
-    # Extract data from both formats
-    insert_data = _extract_inserts(sql_text)
-    copy_data = _extract_copy_blocks(sql_text)
+    def lines() -> Iterator[str]:
+        first = True
+        for line in text_stream:
+            # Strip BOM
+            if first:
+                first = False
+                line = line.lstrip("\ufeff")
+            yield line
 
-    # Merge — COPY takes precedence (more data-dense)
-    all_tables = {}
-    for table_name, data in insert_data.items():
-        all_tables[table_name] = data
-    for table_name, data in copy_data.items():
-        all_tables[table_name] = data  # overwrite INSERT if COPY exists
+    try:
+        tables = _scan_into_spills(lines(), filename, spill_dir, batch_size)
+    finally:
+        text_stream.detach()
 
-    if not all_tables:
-        return [ParseResult(
+    if not tables:
+        return [empty_stream(ParseResult(
             filename=filename,
             encoding_detected=encoding,
             delimiter_detected=None,
@@ -209,12 +294,12 @@ def parse_sql(raw_data: bytes, filename: str = "unknown.sql") -> list[ParseResul
                 message="No INSERT or COPY statements found in SQL file",
                 severity="red",
             )],
-        )]
+        ))]
 
     results = []
-    for table_name, data in all_tables.items():
-        columns = data["columns"]
-        rows = data["rows"]
+    for table_name, spill in tables.items():
+        columns = spill.columns
+        rows = spill.head
 
         # Build ColumnInfo
         col_infos = []
@@ -230,28 +315,35 @@ def parse_sql(raw_data: bytes, filename: str = "unknown.sql") -> list[ParseResul
         domain = infer_domain(columns)
 
         # Detect date format from values
-        from parsers.csv_parser import detect_date_format
         date_values = []
-        for row in rows[:20]:
+        for row in rows[:SQL_HEAD_ROWS]:
             for v in row.values():
                 if v and re.search(r"\d{2,4}[/\-.]", v):
                     date_values.append(v)
         date_format = detect_date_format(date_values) if date_values else None
 
-        parse_result = ParseResult(
+        meta = ParseResult(
             filename=f"{filename}:{table_name}",
             encoding_detected=encoding,
             delimiter_detected=None,
             header_row=0,
-            row_count=len(rows),
+            row_count=spill.row_count,
             columns=col_infos,
-            rows=rows,
             date_format_detected=date_format,
             warnings=warnings.copy(),
             domain_hint=domain,
         )
-        results.append(parse_result)
+        results.append(read_spill(spill.path, meta))
 
-        logger.info(f"Parsed {filename}:{table_name}: {len(rows)} rows, {len(columns)} columns, domain={domain}")
+        logger.info(f"Parsed {filename}:{table_name}: {spill.row_count} rows, {len(columns)} columns, domain={domain}")
 
     return results
+
+
+def parse_sql(raw_data: bytes, filename: str = "unknown.sql") -> list[ParseResult]:
+    """
+    Parse a SQL dump file. Returns a list of ParseResult (one per table found).
+    Handles both INSERT INTO and COPY FROM stdin formats.
+    """
+    with tempfile.TemporaryDirectory(prefix="sql-parse-") as spill_dir:
+        return [stream.collect() for stream in stream_sql(raw_data, filename, spill_dir=spill_dir)]
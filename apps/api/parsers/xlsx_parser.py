@@ -7,12 +7,15 @@ Uses openpyxl for .xlsx (read-only streaming mode).
 Uses xlrd for .xls (legacy Excel).
 """
 
+import itertools
 import re
 import logging
-import io
-from typing import Optional
+from typing import Iterator, Optional
 
-from parsers.base_parser import ParseResult, ColumnInfo, FileWarning
+from parsers.base_parser import (
+    ROW_BATCH_SIZE, ColumnInfo, FileWarning, ParseResult, RowBatch, RowStream, Source,
+    as_binary, empty_stream, iter_batches,
+)
 
 logger = logging.getLogger("import.xlsx_parser")
 
@@ -55,60 +58,38 @@ def _infer_domain_from_headers(headers: list[str]) -> Optional[str]:
     return infer_domain(headers)
 
 
-def parse_xlsx(raw_data: bytes, filename: str = "unknown.xlsx") -> ParseResult:
+def _empty(filename: str, message: str) -> RowStream:
+    return empty_stream(ParseResult(
+        filename=filename, encoding_detected="utf-8", delimiter_detected=None,
+        header_row=0, row_count=0,
+        warnings=[FileWarning(field=None, message=message, severity="red")],
+    ))
+
+
+def _stream_sheet_rows(
+    rows: Iterator[list],
+    filename: str,
+    kind: str,
+    batch_size: int,
+    close=None,
+    detect_dates: bool = True,
+) -> RowStream:
     """
-    Parse an XLSX file from raw bytes.
-    Uses openpyxl in read-only mode for memory efficiency.
+    Shared XLSX/XLS tail: detect header, samples, dates and domain from a
+    prefix of ``rows`` and stream the remainder as row-dict batches.
+    ``close`` is called once the rows are exhausted (or never iterated past).
     """
     warnings: list[FileWarning] = []
+    prefix = list(itertools.islice(rows, MAX_HEADER_SCAN + MAX_SAMPLE_VALUES))
 
-    try:
-        from openpyxl import load_workbook
-    except ImportError:
-        return ParseResult(
-            filename=filename,
-            encoding_detected="utf-8",
-            delimiter_detected=None,
-            header_row=0,
-            row_count=0,
-            warnings=[FileWarning(field=None, message="openpyxl not installed", severity="red")],
-        )
-
-    try:
-        wb = load_workbook(io.BytesIO(raw_data), read_only=True, data_only=True)
-    except Exception as e:
-        return ParseResult(
-            filename=filename,
-            encoding_detected="utf-8",
-            delimiter_detected=None,
-            header_row=0,
-            row_count=0,
-            warnings=[FileWarning(field=None, message=f"Cannot open XLSX: {e}", severity="red")],
-        )
-
-    # Use the first sheet
-    ws = wb[wb.sheetnames[0]]
-
-    # Read all rows (streaming)
-    all_rows = []
-    for row in ws.iter_rows(values_only=True):
-        all_rows.append(list(row))
-        if len(all_rows) > 50000:
-            warnings.append(FileWarning(field=None, message="File exceeds 50,000 rows — truncated", severity="amber"))
-            break
-
-    wb.close()
-
-    if not all_rows:
-        return ParseResult(
-            filename=filename, encoding_detected="utf-8", delimiter_detected=None,
-            header_row=0, row_count=0,
-            warnings=[FileWarning(field=None, message="Spreadsheet is empty", severity="red")],
-        )
+    if not prefix:
+        if close:
+            close()
+        return _empty(filename, "Spreadsheet is empty")
 
     # Find header row (skip metadata rows — Sealogical pattern)
     header_idx = 0
-    for i, row in enumerate(all_rows[:MAX_HEADER_SCAN]):
+    for i, row in enumerate(prefix[:MAX_HEADER_SCAN]):
         if _is_header_row(row):
             header_idx = i
             break
@@ -121,12 +102,12 @@ def parse_xlsx(raw_data: bytes, filename: str = "unknown.xlsx") -> ParseResult:
             row=header_idx,
         ))
 
-    headers = [_cell_to_str(c) for c in all_rows[header_idx]]
+    headers = [_cell_to_str(c) for c in prefix[header_idx]]
     # Remove trailing empty headers
     while headers and not headers[-1]:
         headers.pop()
 
-    data_rows = all_rows[header_idx + 1:]
+    sample_rows = prefix[header_idx + 1:header_idx + 1 + MAX_SAMPLE_VALUES]
 
     # Build column info
     columns: list[ColumnInfo] = []
@@ -135,7 +116,7 @@ def parse_xlsx(raw_data: bytes, filename: str = "unknown.xlsx") -> ParseResult:
         if not header:
             continue
         samples = []
-        for row in data_rows[:MAX_SAMPLE_VALUES]:
+        for row in sample_rows:
             if col_idx < len(row) and row[col_idx] is not None:
                 val = _cell_to_str(row[col_idx])
                 if val:
@@ -146,7 +127,7 @@ def parse_xlsx(raw_data: bytes, filename: str = "unknown.xlsx") -> ParseResult:
         columns.append(ColumnInfo(source_name=header, sample_values=samples))
 
     # Detect date format
-    date_format = _detect_date_format_from_cells(all_date_values) if all_date_values else None
+    date_format = _detect_date_format_from_cells(all_date_values) if detect_dates and all_date_values else None
     if date_format == "ambiguous":
         warnings.append(FileWarning(
             field=None,
@@ -154,140 +135,118 @@ def parse_xlsx(raw_data: bytes, filename: str = "unknown.xlsx") -> ParseResult:
             severity="amber",
         ))
 
-    # Convert data rows to dicts
-    row_dicts = []
-    for row in data_rows:
-        if not any(_cell_to_str(c) for c in row):
-            continue
-        row_dict = {}
-        for col_idx, header in enumerate(headers):
-            if not header:
-                continue
-            value = _cell_to_str(row[col_idx]) if col_idx < len(row) else ""
-            row_dict[header] = value
-        row_dicts.append(row_dict)
-
     # Infer domain
     domain = _infer_domain_from_headers(headers)
 
-    logger.info(f"Parsed {filename}: XLSX, {len(row_dicts)} rows, {len(columns)} columns, domain={domain}")
-
-    return ParseResult(
+    meta = ParseResult(
         filename=filename,
         encoding_detected="utf-8",
         delimiter_detected=None,
         header_row=header_idx,
-        row_count=len(row_dicts),
+        row_count=0,
         columns=columns,
-        rows=row_dicts,
         date_format_detected=date_format,
         warnings=warnings,
         domain_hint=domain,
     )
 
-
-def parse_xls(raw_data: bytes, filename: str = "unknown.xls") -> ParseResult:
+    def to_dict(row: list) -> dict[str, str]:
+        row_dict = {}
+        for col_idx, header in enumerate(headers):
+            if not header:
+                continue
+            row_dict[header] = _cell_to_str(row[col_idx]) if col_idx < len(row) else ""
+        return row_dict
+
+    # Convert data rows to dicts, batch by batch
+    def batches() -> Iterator[RowBatch]:
+        count = 0
+        try:
+            data_rows = itertools.chain(prefix[header_idx + 1:], rows)
+            for batch in iter_batches(
+                (to_dict(row) for row in data_rows if any(_cell_to_str(c) for c in row)),
+                batch_size,
+            ):
+                count += len(batch)
+                yield batch
+        finally:
+            if close:
+                close()
+        logger.info(f"Parsed {filename}: {kind}, {count} rows, {len(columns)} columns, domain={domain}")
+
+    return RowStream(meta, batches())
+
+
+def stream_xlsx(source: Source, filename: str = "unknown.xlsx", batch_size: int = ROW_BATCH_SIZE) -> RowStream:
     """
-    Parse a legacy .xls file using xlrd.
+    Parse an XLSX file incrementally from raw bytes or a seekable binary file.
+    Uses openpyxl in read-only mode, so only the current row is in memory.
     """
-    warnings: list[FileWarning] = []
-
     try:
-        import xlrd
+        from openpyxl import load_workbook
     except ImportError:
-        return ParseResult(
-            filename=filename, encoding_detected="utf-8", delimiter_detected=None,
-            header_row=0, row_count=0,
-            warnings=[FileWarning(field=None, message="xlrd not installed", severity="red")],
-        )
+        return _empty(filename, "openpyxl not installed")
 
     try:
-        wb = xlrd.open_workbook(file_contents=raw_data)
+        wb = load_workbook(as_binary(source), read_only=True, data_only=True)
     except Exception as e:
-        return ParseResult(
-            filename=filename, encoding_detected="utf-8", delimiter_detected=None,
-            header_row=0, row_count=0,
-            warnings=[FileWarning(field=None, message=f"Cannot open XLS: {e}", severity="red")],
-        )
+        return _empty(filename, f"Cannot open XLSX: {e}")
 
-    sheet = wb.sheet_by_index(0)
-
-    # Read all rows
-    all_rows = []
-    for row_idx in range(min(sheet.nrows, 50001)):
-        row_values = []
-        for col_idx in range(sheet.ncols):
-            cell = sheet.cell(row_idx, col_idx)
-            if cell.ctype == xlrd.XL_CELL_DATE:
-                try:
-                    dt = xlrd.xldate_as_datetime(cell.value, wb.datemode)
-                    row_values.append(dt.strftime("%Y-%m-%d"))
-                except Exception:
-                    row_values.append(str(cell.value))
-            elif cell.ctype == xlrd.XL_CELL_NUMBER:
-                # Integer check
-                if cell.value == int(cell.value):
-                    row_values.append(str(int(cell.value)))
-                else:
-                    row_values.append(str(cell.value))
-            else:
-                row_values.append(str(cell.value).strip() if cell.value else "")
-        all_rows.append(row_values)
-
-    if not all_rows:
-        return ParseResult(
-            filename=filename, encoding_detected="utf-8", delimiter_detected=None,
-            header_row=0, row_count=0,
-            warnings=[FileWarning(field=None, message="Spreadsheet is empty", severity="red")],
-        )
-
-    # Find header row
-    header_idx = 0
-    for i, row in enumerate(all_rows[:MAX_HEADER_SCAN]):
-        if _is_header_row(row):
-            header_idx = i
-            break
+    # Use the first sheet
+    ws = wb[wb.sheetnames[0]]
+    rows = (list(row) for row in ws.iter_rows(values_only=True))
+    return _stream_sheet_rows(rows, filename, "XLSX", batch_size, close=wb.close)
 
-    if header_idx > 0:
-        warnings.append(FileWarning(
-            field=None, message=f"Skipped {header_idx} metadata row(s) before header",
-            severity="info", row=header_idx,
-        ))
 
-    headers = [str(c).strip() for c in all_rows[header_idx]]
-    while headers and not headers[-1]:
-        headers.pop()
+def parse_xlsx(raw_data: bytes, filename: str = "unknown.xlsx") -> ParseResult:
+    """
+    Parse an XLSX file from raw bytes.
+    Uses openpyxl in read-only mode for memory efficiency.
+    """
+    return stream_xlsx(raw_data, filename).collect()
 
-    data_rows = all_rows[header_idx + 1:]
 
-    columns = []
-    for col_idx, header in enumerate(headers):
-        if not header:
-            continue
-        samples = []
-        for row in data_rows[:MAX_SAMPLE_VALUES]:
-            if col_idx < len(row) and row[col_idx]:
-                samples.append(str(row[col_idx]).strip())
-        columns.append(ColumnInfo(source_name=header, sample_values=samples))
+def _xls_cell_to_str(xlrd, cell, datemode) -> str:
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate_as_datetime(cell.value, datemode).strftime("%Y-%m-%d")
+        except Exception:
+            return str(cell.value)
+    if cell.ctype == xlrd.XL_CELL_NUMBER:
+        # Integer check
+        if cell.value == int(cell.value):
+            return str(int(cell.value))
+        return str(cell.value)
+    return str(cell.value).strip() if cell.value else ""
 
-    row_dicts = []
-    for row in data_rows:
-        if not any(str(c).strip() for c in row):
-            continue
-        row_dict = {}
-        for col_idx, header in enumerate(headers):
-            if not header:
-                continue
-            value = str(row[col_idx]).strip() if col_idx < len(row) else ""
-            row_dict[header] = value
-        row_dicts.append(row_dict)
 
-    domain = _infer_domain_from_headers(headers)
+def stream_xls(source: Source, filename: str = "unknown.xls", batch_size: int = ROW_BATCH_SIZE) -> RowStream:
+    """
+    Parse a legacy .xls file using xlrd.
+    The BIFF format has to be loaded whole (and is capped at 65,536 rows),
+    but rows are still converted and yielded in batches.
+    """
+    try:
+        import xlrd
+    except ImportError:
+        return _empty(filename, "xlrd not installed")
 
-    logger.info(f"Parsed {filename}: XLS, {len(row_dicts)} rows, {len(columns)} columns, domain={domain}")
+    try:
+        fh = as_binary(source)
+        wb = xlrd.open_workbook(file_contents=fh.read())
+    except Exception as e:
+        return _empty(filename, f"Cannot open XLS: {e}")
 
-    return ParseResult(
-        filename=filename, encoding_detected="utf-8", delimiter_detected=None,
-        header_row=header_idx, row_count=len(row_dicts), columns=columns,
-        rows=row_dicts, date_format_detected=None, warnings=warnings, domain_hint=domain,
+    sheet = wb.sheet_by_index(0)
+    rows = (
+        [_xls_cell_to_str(xlrd, sheet.cell(row_idx, col_idx), wb.datemode) for col_idx in range(sheet.ncols)]
+        for row_idx in range(sheet.nrows)
     )
+    return _stream_sheet_rows(rows, filename, "XLS", batch_size, close=wb.release_resources, detect_dates=False)
+
+
+def parse_xls(raw_data: bytes, filename: str = "unknown.xls") -> ParseResult:
+    """
+    Parse a legacy .xls file using xlrd.
+    """
+    return stream_xls(raw_data, filename).collect()
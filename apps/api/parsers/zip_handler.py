@@ -14,16 +14,22 @@ Folder names in the ZIP are used as domain hints for documents.
 """
 
 import os
-import io
+import shutil
+import tempfile
 import zipfile
 import logging
 from pathlib import Path
 from typing import Optional
 
-from parsers.base_parser import ParseResult, FileWarning, DocumentInfo
+from parsers.base_parser import ROW_BATCH_SIZE, DocumentInfo, FileWarning, RowStream, Source, as_binary
 
 logger = logging.getLogger("import.zip_handler")
 
+MAX_ZIP_CONTENT_BYTES = 500 * 1024 * 1024
+
+# Workbooks above this are spooled to disk before openpyxl/xlrd open them
+WORKBOOK_SPOOL_BYTES = 16 * 1024 * 1024
+
 # File extension routing
 DATA_EXTENSIONS = {".csv", ".sql", ".xlsx", ".xls"}
 DOCUMENT_EXTENSIONS = {
@@ -90,47 +96,40 @@ def _infer_domain_from_path(filepath: str) -> Optional[str]:
     return None
 
 
-def extract_zip(raw_data: bytes, filename: str = "unknown.zip") -> dict:
+def open_zip(source: Source, filename: str = "unknown.zip") -> tuple[Optional[zipfile.ZipFile], list[FileWarning]]:
+    """Open a ZIP from raw bytes or a seekable file; (None, [red warning]) if unusable."""
+    try:
+        zf = zipfile.ZipFile(as_binary(source), "r")
+    except zipfile.BadZipFile:
+        return None, [FileWarning(field=None, message="Invalid ZIP file", severity="red")]
+
+    # Check for zip bomb (basic protection)
+    total_size = sum(info.file_size for info in zf.infolist() if not info.is_dir())
+    if total_size > MAX_ZIP_CONTENT_BYTES:
+        zf.close()
+        return None, [FileWarning(
+            field=None,
+            message=f"ZIP contents too large ({total_size / 1024 / 1024:.0f}MB). Maximum 500MB.",
+            severity="red",
+        )]
+    return zf, []
+
+
+def list_zip_members(zf: zipfile.ZipFile) -> dict:
     """
-    Extract a ZIP archive and classify its contents.
+    Classify ZIP members without reading them.
 
     Returns:
         {
-            "data_files": [(filename, extension, raw_bytes), ...],
-            "documents": [DocumentInfo, ...],
+            "data_files": [(basename, extension, ZipInfo), ...],
+            "documents": [DocumentInfo (data=None, archive_path set), ...],
             "unclassified": [DocumentInfo, ...],
-            "warnings": [FileWarning, ...],
         }
     """
-    warnings = []
     data_files = []
     documents = []
     unclassified = []
 
-    try:
-        zf = zipfile.ZipFile(io.BytesIO(raw_data), "r")
-    except zipfile.BadZipFile:
-        return {
-            "data_files": [],
-            "documents": [],
-            "unclassified": [],
-            "warnings": [FileWarning(field=None, message="Invalid ZIP file", severity="red")],
-        }
-
-    # Check for zip bomb (basic protection)
-    total_size = sum(info.file_size for info in zf.infolist() if not info.is_dir())
-    if total_size > 500 * 1024 * 1024:  # 500MB limit
-        return {
-            "data_files": [],
-            "documents": [],
-            "unclassified": [],
-            "warnings": [FileWarning(
-                field=None,
-                message=f"ZIP contents too large ({total_size / 1024 / 1024:.0f}MB). Maximum 500MB.",
-                severity="red",
-            )],
-        }
-
     for info in zf.infolist():
         # Skip directories and macOS resource forks
         if info.is_dir():
@@ -143,38 +142,107 @@ def extract_zip(raw_data: bytes, filename: str = "unknown.zip") -> dict:
         ext = os.path.splitext(info.filename)[1].lower()
         basename = os.path.basename(info.filename)
 
-        try:
-            file_data = zf.read(info.filename)
-        except Exception as e:
-            warnings.append(FileWarning(
-                field=None,
-                message=f"Cannot read {info.filename}: {e}",
-                severity="amber",
-            ))
-            continue
-
         if ext in DATA_EXTENSIONS:
-            data_files.append((basename, ext, file_data))
+            data_files.append((basename, ext, info))
 
         elif ext in DOCUMENT_EXTENSIONS:
-            domain = _infer_domain_from_path(info.filename)
             documents.append(DocumentInfo(
                 filename=basename,
-                size_bytes=len(file_data),
+                size_bytes=info.file_size,
                 content_type=DOCUMENT_EXTENSIONS[ext],
-                domain_hint=domain,
-                data=file_data,
+                domain_hint=_infer_domain_from_path(info.filename),
+                archive_path=info.filename,
             ))
 
         else:
             unclassified.append(DocumentInfo(
                 filename=basename,
-                size_bytes=len(file_data),
+                size_bytes=info.file_size,
                 content_type="application/octet-stream",
                 domain_hint=None,
-                data=file_data,
+                archive_path=info.filename,
             ))
 
+    return {"data_files": data_files, "documents": documents, "unclassified": unclassified}
+
+
+def stream_zip_member(
+    zf: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    basename: str,
+    ext: str,
+    spill_dir: Optional[str] = None,
+    batch_size: int = ROW_BATCH_SIZE,
+) -> list[RowStream]:
+    """
+    Stream one data file out of an open ZIP (one RowStream per file, or per
+    table for SQL). CSV/SQL decompress straight from the archive; workbooks
+    are copied to a spooled temp file first since openpyxl/xlrd need random
+    access. Consume the streams before closing ``zf``.
+    """
+    if ext == ".csv":
+        from parsers.csv_parser import stream_csv
+        return [stream_csv(zf.open(info), basename, batch_size)]
+
+    if ext == ".sql":
+        from parsers.sql_parser import stream_sql
+        with zf.open(info) as member:
+            return stream_sql(member, basename, spill_dir=spill_dir, batch_size=batch_size)
+
+    workbook = tempfile.SpooledTemporaryFile(max_size=WORKBOOK_SPOOL_BYTES)
+    with zf.open(info) as member:
+        shutil.copyfileobj(member, workbook, 1024 * 1024)
+    workbook.seek(0)
+    if ext == ".xlsx":
+        from parsers.xlsx_parser import stream_xlsx
+        return [stream_xlsx(workbook, basename, batch_size)]
+    from parsers.xlsx_parser import stream_xls
+    return [stream_xls(workbook, basename, batch_size)]
+
+
+def extract_zip(raw_data: bytes, filename: str = "unknown.zip") -> dict:
+    """
+    Extract a ZIP archive and classify its contents.
+
+    Returns:
+        {
+            "data_files": [(filename, extension, raw_bytes), ...],
+            "documents": [DocumentInfo, ...],
+            "unclassified": [DocumentInfo, ...],
+            "warnings": [FileWarning, ...],
+        }
+    """
+    zf, warnings = open_zip(raw_data, filename)
+    if zf is None:
+        return {"data_files": [], "documents": [], "unclassified": [], "warnings": warnings}
+
+    members = list_zip_members(zf)
+
+    def read(name: str) -> Optional[bytes]:
+        try:
+            return zf.read(name)
+        except Exception as e:
+            warnings.append(FileWarning(
+                field=None,
+                message=f"Cannot read {name}: {e}",
+                severity="amber",
+            ))
+            return None
+
+    data_files = []
+    for basename, ext, info in members["data_files"]:
+        file_data = read(info.filename)
+        if file_data is not None:
+            data_files.append((basename, ext, file_data))
+
+    documents = []
+    unclassified = []
+    for target, source in ((documents, members["documents"]), (unclassified, members["unclassified"])):
+        for doc in source:
+            doc.data = read(doc.archive_path)
+            if doc.data is not None:
+                target.append(doc)
+
     zf.close()
 
     logger.info(
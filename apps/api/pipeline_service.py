@@ -26,7 +26,7 @@ except ImportError:
 
 from fastapi import FastAPI, HTTPException, Request, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
 import asyncio
@@ -56,6 +56,7 @@ if str(_api_dir) not in sys.path:
 
 # Import auth middleware for JWT validation + tenant lookup
 from middleware.auth import get_authenticated_user, lookup_tenant_for_user
+from services.document_proxy import proxy_document
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -68,6 +69,28 @@ app = FastAPI(
     version="2026.02.20.001",
 )
 
+
+@app.on_event("startup")
+async def _start_tenant_invalidation_listener():
+    """Apply tenant cache invalidations (role changes) published over Redis to this worker."""
+    from middleware.auth import start_tenant_invalidation_listener
+    start_tenant_invalidation_listener()
+
+
+@app.on_event("shutdown")
+async def _close_async_http_clients():
+    """Release pooled async PostgREST, storage proxy and Graph connections and render workers on worker shutdown."""
+    from integrations.graph_client import close_graph_http_clients
+    from integrations.supabase import close_async_clients
+    from middleware.auth import stop_tenant_invalidation_listener
+    from services.document_proxy import close_http_clients
+    from services.render_pool import shutdown_render_pool
+    await stop_tenant_invalidation_listener()
+    await close_async_clients()
+    await close_http_clients()
+    await close_graph_http_clients()
+    shutdown_render_pool()
+
 # ============================================================================
 # CORS CONFIGURATION (Production-Grade)
 # ============================================================================
@@ -118,11 +141,16 @@ app.add_middleware(
         "X-Request-Id",
         "X-Yacht-Signature",
         "X-Import-Dev-Token",   # Import pipeline dev-mode auth bypass
+        "Upload-Offset",        # Resumable attachment upload sessions
     ],
     expose_headers=["X-Request-Id"],  # Allow client to read request ID
     max_age=3600,  # Cache preflight for 1 hour
 )
 
+# Reject oversized upload bodies before they are parsed/spooled
+from middleware.upload_limits import UploadSizeLimitMiddleware
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Middleware to add Vary: Origin for CDN cache correctness
 # IMPORTANT: Append to existing Vary header, don't overwrite
 @app.middleware("http")
@@ -1657,7 +1685,8 @@ async def stream_document(
     - Verifies document ownership
 
     Returns:
-    - File bytes with proper Content-Type
+    - File body streamed in bounded chunks with proper Content-Type
+    - 206 Partial Content for Range requests, 304 for matching If-None-Match
     - Content-Disposition header for inline viewing
     """
     user_id = auth['user_id']
@@ -1705,15 +1734,7 @@ async def stream_document(
 
     logger.info(f"[stream_document] Storage path: {storage_path[:50]}...")
 
-    # 3. Download from Supabase Storage
-    try:
-        file_bytes = supabase.storage.from_('documents').download(storage_path)
-        logger.info(f"[stream_document] Downloaded {len(file_bytes)} bytes")
-    except Exception as e:
-        logger.error(f"[stream_document] Storage download failed: {e}")
-        raise HTTPException(404, detail=f"File not found in storage")
-
-    # 4. Detect content type
+    # 3. Detect content type
     filename = doc.get('filename', 'document')
     content_type = doc.get('content_type')
 
@@ -1728,18 +1749,28 @@ async def stream_document(
         else:
             content_type = 'application/octet-stream'
 
-    # 5. Return file stream
-    logger.info(f"[stream_document] Streaming {filename} ({content_type})")
+    # 4. Proxy from Supabase Storage (Range/ETag aware, chunked, never buffered whole)
+    logger.info(f"[stream_document] Streaming {filename} ({content_type}) range={request.headers.get('range')}")
 
-    return Response(
-        content=file_bytes,
-        media_type=content_type,
-        headers={
-            "Content-Disposition": f'inline; filename="{filename}"',
-            "Cache-Control": "private, max-age=3600",
-            "X-Document-Id": document_id,
-        }
-    )
+    try:
+        return await proxy_document(
+            tenant_key_alias,
+            'documents',
+            storage_path,
+            request.headers,
+            content_type=content_type,
+            version=doc.get('updated_at') or doc.get('content_hash'),
+            response_headers={
+                "Content-Disposition": f'inline; filename="{filename}"',
+                "Cache-Control": "private, max-age=3600",
+                "X-Document-Id": document_id,
+            },
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[stream_document] Storage proxy failed: {e}")
+        raise HTTPException(404, detail=f"File not found in storage")
 
 
 # ============================================================================
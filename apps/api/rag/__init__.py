@@ -25,6 +25,7 @@ from .context_builder import (
     build_context,
     build_context_sync,
     generate_query_embedding,
+    generate_query_embedding_async,
     compute_query_hash,
     # Domain serializers
     serialize_hours_of_rest,
@@ -39,6 +40,8 @@ from .answer_generator import (
     RAGAnswer,
     generate_answer,
     generate_answer_sync,
+    stream_answer,
+    finalize_answer,
     generate_no_context_answer,
     generate_error_answer,
 )
@@ -60,11 +63,14 @@ __all__ = [
     'build_context',
     'build_context_sync',
     'generate_query_embedding',
+    'generate_query_embedding_async',
     'compute_query_hash',
     # Answer
     'RAGAnswer',
     'generate_answer',
     'generate_answer_sync',
+    'stream_answer',
+    'finalize_answer',
     'generate_no_context_answer',
     'generate_error_answer',
     # Verification
@@ -13,12 +13,12 @@ Key principles:
 
 import json
 import os
-from typing import Dict, List, Optional, Any, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 import openai
 
-from .context_builder import RAGContext, Citation
+from .context_builder import RAGContext, Citation, get_async_openai_client
 
 
 @dataclass
@@ -134,43 +134,16 @@ def compute_confidence(context: RAGContext, cited_indices: List[int]) -> float:
     return min(1.0, max(0.0, confidence))
 
 
-async def generate_answer(
+def finalize_answer(
     context: RAGContext,
-    model: str = "gpt-4o-mini",
-    temperature: float = 0.1,  # Low for determinism
-    max_tokens: int = 1000,
+    answer_text: str,
+    model: str,
+    tokens_used: int,
+    start_time: float,
 ) -> RAGAnswer:
-    """
-    Generate answer from context using GPT.
-
-    Uses low temperature for deterministic responses.
-    """
+    """Map the cited indices of a completed answer onto the context's citations."""
     import time
-    start_time = time.time()
-
-    api_key = os.environ.get('OPENAI_API_KEY')
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not set")
-
-    # Build prompts
-    system_prompt = build_system_prompt(context.role, context.lens)
-    user_prompt = build_user_prompt(context)
-
-    # Call GPT
-    response = openai.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        temperature=temperature,
-        max_tokens=max_tokens,
-    )
-
-    answer_text = response.choices[0].message.content
-    tokens_used = response.usage.total_tokens
 
-    # Extract citations used
     cited_indices = extract_cited_indices(answer_text)
 
     # Map cited indices to actual citations
@@ -202,6 +175,81 @@ async def generate_answer(
     )
 
 
+def _build_messages(context: RAGContext) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": build_system_prompt(context.role, context.lens)},
+        {"role": "user", "content": build_user_prompt(context)}
+    ]
+
+
+async def generate_answer(
+    context: RAGContext,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,  # Low for determinism
+    max_tokens: int = 1000,
+) -> RAGAnswer:
+    """
+    Generate answer from context using GPT.
+
+    Uses low temperature for deterministic responses.
+    """
+    import time
+    start_time = time.time()
+
+    # Call GPT (async client - does not block the event loop)
+    response = await get_async_openai_client().chat.completions.create(
+        model=model,
+        messages=_build_messages(context),
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+
+    answer_text = response.choices[0].message.content
+    tokens_used = response.usage.total_tokens
+
+    return finalize_answer(context, answer_text, model, tokens_used, start_time)
+
+
+async def stream_answer(
+    context: RAGContext,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    max_tokens: int = 1000,
+) -> AsyncIterator[Union[str, RAGAnswer]]:
+    """
+    Stream the answer as it is generated.
+
+    Yields text deltas as they arrive, then the completed RAGAnswer (with
+    citations and confidence) as the final item.
+    """
+    import time
+    start_time = time.time()
+
+    stream = await get_async_openai_client().chat.completions.create(
+        model=model,
+        messages=_build_messages(context),
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+
+    parts: List[str] = []
+    tokens_used = 0
+    async with stream:
+        async for chunk in stream:
+            if chunk.usage:
+                tokens_used = chunk.usage.total_tokens
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+    yield finalize_answer(context, ''.join(parts), model, tokens_used, start_time)
+
+
 def generate_answer_sync(
     context: RAGContext,
     model: str = "gpt-4o-mini",
@@ -218,15 +266,9 @@ def generate_answer_sync(
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set")
 
-    system_prompt = build_system_prompt(context.role, context.lens)
-    user_prompt = build_user_prompt(context)
-
     response = openai.chat.completions.create(
         model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
+        messages=_build_messages(context),
         temperature=temperature,
         max_tokens=max_tokens,
     )
@@ -234,31 +276,7 @@ def generate_answer_sync(
     answer_text = response.choices[0].message.content
     tokens_used = response.usage.total_tokens
 
-    cited_indices = extract_cited_indices(answer_text)
-
-    used_citations = []
-    used_doc_ids = []
-    for idx in sorted(cited_indices):
-        if 0 < idx <= len(context.chunks):
-            chunk = context.chunks[idx - 1]
-            used_citations.append(chunk.citation.to_dict())
-            if chunk.citation.doc_id not in used_doc_ids:
-                used_doc_ids.append(chunk.citation.doc_id)
-
-    confidence = compute_confidence(context, cited_indices)
-    latency_ms = int((time.time() - start_time) * 1000)
-
-    return RAGAnswer(
-        answer=answer_text,
-        citations=used_citations,
-        used_doc_ids=used_doc_ids,
-        confidence=confidence,
-        query=context.query,
-        query_hash=context.query_hash,
-        model=model,
-        tokens_used=tokens_used,
-        latency_ms=latency_ms,
-    )
+    return finalize_answer(context, answer_text, model, tokens_used, start_time)
 
 
 # =============================================================================
@@ -20,9 +20,12 @@ import json
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+import logging
 import openai
 import os
 
+logger = logging.getLogger(__name__)
+
 # Token estimation (rough: 4 chars ≈ 1 token for English)
 CHARS_PER_TOKEN = 4
 DEFAULT_TOKEN_BUDGET = 4000  # Max tokens for context
@@ -90,6 +93,34 @@ class RAGContext:
         return [chunk.citation.to_dict() for chunk in self.chunks]
 
 
+_async_openai_client: Optional[openai.AsyncOpenAI] = None
+
+
+def get_async_openai_client() -> openai.AsyncOpenAI:
+    """Get or create the shared async OpenAI client (keeps its connection pool)."""
+    global _async_openai_client
+    if _async_openai_client is None:
+        api_key = os.environ.get('OPENAI_API_KEY')
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not set")
+        _async_openai_client = openai.AsyncOpenAI(api_key=api_key)
+    return _async_openai_client
+
+
+async def generate_query_embedding_async(query: str) -> Optional[List[float]]:
+    """Generate embedding via OpenAI without blocking the event loop."""
+    try:
+        response = await get_async_openai_client().embeddings.create(
+            model="text-embedding-3-small",
+            input=query,
+            dimensions=1536
+        )
+        return response.data[0].embedding
+    except Exception as e:
+        logger.error(f"[RAG] Failed to generate embedding: {e}")
+        return None
+
+
 def generate_query_embedding(query: str) -> Optional[List[float]]:
     """Generate embedding via OpenAI GPT text-embedding-3-small."""
     try:
@@ -503,7 +534,7 @@ async def build_context(
     5. Budget to token cap
     """
     # Generate embedding
-    query_embedding = generate_query_embedding(query)
+    query_embedding = await generate_query_embedding_async(query)
     if not query_embedding:
         raise ValueError("Failed to generate query embedding")
 
@@ -10,6 +10,11 @@ Robust matching:
 - Token similarity: token-F1 and coverage
 - Embedding similarity (optional): cosine on sentence vs chunk
 
+Each chunk is preprocessed once per answer (normalized tokens, word bitmasks,
+date and number sets); ROUGE-L uses a bit-parallel LCS and is skipped when the
+token-overlap upper bound cannot reach the threshold, so verification is cheap
+enough to run on every answer.
+
 Confidence computation (Fix 8):
 - faithfulness = supported_sentences / factual_sentences
 - coverage = cited_chunks_used / topK
@@ -18,6 +23,7 @@ Confidence computation (Fix 8):
 """
 
 import re
+from bisect import bisect_left
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -178,9 +184,10 @@ def normalize_text(text: str) -> str:
 
 def compute_token_f1(text1: str, text2: str) -> float:
     """Compute token-level F1 score."""
-    tokens1 = tokenize(text1)
-    tokens2 = tokenize(text2)
+    return _token_f1(tokenize(text1), tokenize(text2))
+
 
+def _token_f1(tokens1: Set[str], tokens2: Set[str]) -> float:
     if not tokens1 or not tokens2:
         return 0.0
 
@@ -194,6 +201,39 @@ def compute_token_f1(text1: str, text2: str) -> float:
     return 2 * precision * recall / (precision + recall)
 
 
+def word_masks(words: List[str]) -> Dict[str, int]:
+    """Bitmask of the positions of each word (input to lcs_length)."""
+    masks: Dict[str, int] = {}
+    for i, word in enumerate(words):
+        masks[word] = masks.get(word, 0) | (1 << i)
+    return masks
+
+
+def lcs_length(masks: Dict[str, int], length: int, other: List[str]) -> int:
+    """
+    Length of the longest common subsequence, bit-parallel (Hyyrö).
+
+    ``masks``/``length`` describe one sequence (see word_masks); each word of
+    ``other`` costs a few big-int operations instead of a DP row.
+    """
+    full = (1 << length) - 1
+    v = full
+    for word in other:
+        u = v & masks.get(word, 0)
+        v = ((v + u) | (v - u)) & full
+    return length - v.bit_count()
+
+
+def _rouge_from_lcs(lcs: int, m: int, n: int) -> float:
+    precision = lcs / m if m else 0
+    recall = lcs / n if n else 0
+
+    if precision + recall == 0:
+        return 0.0
+
+    return 2 * precision * recall / (precision + recall)
+
+
 def compute_rouge_l(text1: str, text2: str) -> float:
     """Compute ROUGE-L (longest common subsequence) score."""
     words1 = text1.lower().split()
@@ -202,25 +242,51 @@ def compute_rouge_l(text1: str, text2: str) -> float:
     if not words1 or not words2:
         return 0.0
 
-    # LCS using dynamic programming
-    m, n = len(words1), len(words2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    lcs = lcs_length(word_masks(words2), len(words2), words1)
+    return _rouge_from_lcs(lcs, len(words1), len(words2))
 
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if words1[i-1] == words2[j-1]:
-                dp[i][j] = dp[i-1][j-1] + 1
-            else:
-                dp[i][j] = max(dp[i-1][j], dp[i][j-1])
 
-    lcs_length = dp[m][n]
-    precision = lcs_length / m if m else 0
-    recall = lcs_length / n if n else 0
+# =============================================================================
+# CHUNK PREPROCESSING
+# =============================================================================
 
-    if precision + recall == 0:
-        return 0.0
+@dataclass
+class PreparedChunk:
+    """Everything the verifier needs from a chunk, computed once per answer."""
+    tokens: Set[str]
+    words: List[str]
+    word_set: Set[str]
+    masks: Dict[str, int]
+    dates: Set[datetime]
+    numbers: List[float]  # sorted
+
+    @classmethod
+    def from_text(cls, text: str) -> 'PreparedChunk':
+        normalized = normalize_text(text)
+        words = normalized.split()
+        return cls(
+            tokens=tokenize(normalized),
+            words=words,
+            word_set=set(words),
+            masks=word_masks(words),
+            dates=set(extract_dates(text)),
+            numbers=sorted(set(extract_numbers(text))),
+        )
+
+    def has_number(self, num: float, tolerance: float = 0.01) -> bool:
+        """numbers_match against any chunk number, via bisect on the sorted list."""
+        lo = bisect_left(self.numbers, num * (1 - tolerance) - tolerance)
+        for candidate in self.numbers[lo:]:
+            if candidate > num / (1 - tolerance) + tolerance:
+                break
+            if numbers_match(num, candidate, tolerance):
+                return True
+        return False
 
-    return 2 * precision * recall / (precision + recall)
+
+def prepare_chunks(chunks: List[Any]) -> List[PreparedChunk]:
+    """Preprocess context chunks (ContextChunk) for verification."""
+    return [PreparedChunk.from_text(chunk.text) for chunk in chunks]
 
 
 # =============================================================================
@@ -314,6 +380,7 @@ def verify_sentence_against_chunks(
     cited_indices: List[int],
     token_threshold: float = 0.25,
     date_required: bool = True,
+    prepared: Optional[List[PreparedChunk]] = None,
 ) -> SentenceVerification:
     """
     Verify a single sentence against context chunks.
@@ -323,6 +390,9 @@ def verify_sentence_against_chunks(
     2. Number match: numbers in sentence appear in a chunk
     3. Token match: token F1 >= threshold
     4. Semantic match: embedding similarity >= 0.8 (if available)
+
+    ``prepared`` (from prepare_chunks) lets callers preprocess chunks once
+    for many sentences.
     """
     if not is_factual_sentence(sentence):
         return SentenceVerification(
@@ -338,6 +408,9 @@ def verify_sentence_against_chunks(
     sentence_normalized = normalize_text(sentence)
     sentence_dates = extract_dates(sentence)
     sentence_numbers = extract_numbers(sentence)
+    sentence_tokens = tokenize(sentence_normalized)
+    sentence_words = sentence_normalized.split()
+    sentence_word_set = set(sentence_words)
 
     supporting_chunks = []
     support_type = 'none'
@@ -348,35 +421,25 @@ def verify_sentence_against_chunks(
     if cited_indices:
         for idx in cited_indices:
             if 0 < idx <= len(chunks):
-                chunks_to_check.append((idx, chunks[idx - 1]))
+                chunks_to_check.append(idx)
     else:
         # Check all chunks if no citations
-        chunks_to_check = [(i + 1, chunk) for i, chunk in enumerate(chunks)]
+        chunks_to_check = list(range(1, len(chunks) + 1))
 
-    for idx, chunk in chunks_to_check:
-        chunk_text = chunk.text
-        chunk_normalized = normalize_text(chunk_text)
-        chunk_dates = extract_dates(chunk_text)
-        chunk_numbers = extract_numbers(chunk_text)
+    for idx in chunks_to_check:
+        chunk = prepared[idx - 1] if prepared is not None else PreparedChunk.from_text(chunks[idx - 1].text)
 
         # Check date match
-        if sentence_dates and chunk_dates:
+        if sentence_dates and chunk.dates:
             for sd in sentence_dates:
-                for cd in chunk_dates:
-                    if dates_match(sd, cd):
-                        supporting_chunks.append(idx)
-                        support_type = 'date'
-                        max_similarity = max(max_similarity, 0.9)
-                        break
+                if sd in chunk.dates:
+                    supporting_chunks.append(idx)
+                    support_type = 'date'
+                    max_similarity = max(max_similarity, 0.9)
 
         # Check number match
-        if sentence_numbers and chunk_numbers:
-            matched_numbers = 0
-            for sn in sentence_numbers:
-                for cn in chunk_numbers:
-                    if numbers_match(sn, cn):
-                        matched_numbers += 1
-                        break
+        if sentence_numbers and chunk.numbers:
+            matched_numbers = sum(1 for sn in sentence_numbers if chunk.has_number(sn))
             if matched_numbers > 0:
                 number_ratio = matched_numbers / len(sentence_numbers)
                 if number_ratio >= 0.5:
@@ -387,8 +450,21 @@ def verify_sentence_against_chunks(
                     max_similarity = max(max_similarity, 0.7 + 0.2 * number_ratio)
 
         # Check token similarity
-        token_f1 = compute_token_f1(sentence_normalized, chunk_normalized)
-        rouge_l = compute_rouge_l(sentence_normalized, chunk_normalized)
+        token_f1 = _token_f1(sentence_tokens, chunk.tokens)
+
+        m, n = len(sentence_words), len(chunk.words)
+        if not m or not n:
+            rouge_l = 0.0
+        else:
+            # LCS can't exceed the sentence words present in the chunk (and
+            # vice versa); skip it when even that bound misses the threshold
+            overlap = min(
+                sum(1 for w in sentence_words if w in chunk.word_set),
+                sum(1 for w in chunk.words if w in sentence_word_set),
+            )
+            if 0.6 * token_f1 + 0.4 * _rouge_from_lcs(overlap, m, n) < token_threshold - 1e-9:
+                continue
+            rouge_l = _rouge_from_lcs(lcs_length(chunk.masks, n, sentence_words), m, n)
 
         combined_token_score = 0.6 * token_f1 + 0.4 * rouge_l
 
@@ -453,6 +529,7 @@ def verify_answer(
     sentences = split_into_sentences(answer.answer)
     sentence_results = []
     all_cited_chunks = set()
+    prepared = prepare_chunks(context.chunks)
 
     for sentence in sentences:
         cited_indices = extract_citations_from_text(sentence)
@@ -462,6 +539,7 @@ def verify_answer(
             sentence=sentence,
             chunks=context.chunks,
             cited_indices=cited_indices,
+            prepared=prepared,
         )
         sentence_results.append(result)
 
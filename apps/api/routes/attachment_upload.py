@@ -10,17 +10,32 @@ owned by the Render backend. Vercel (frontend) only touches MASTER for auth.
 Flow:
   Browser → POST multipart to Render → Render uploads to TENANT storage
           → Render inserts pms_attachments row → 200 OK to browser
+
+The part is read in chunks to a temp file (lib/upload_stream.py), never into
+one bytes object. Clients on flaky links can use the resumable session
+endpoints instead: create a session, PATCH chunks at Upload-Offset, and
+resume from GET .../sessions/{id} after a drop.
 """
 
+import asyncio
 import logging
 import os
 import uuid
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Request, UploadFile, status
+from pydantic import BaseModel, Field
 from supabase import create_client
 
+from lib.upload_stream import (
+    UPLOAD_CHUNK_BYTES,
+    ResumableUploadStore,
+    SpooledUpload,
+    resolve_content_type,
+    spool_upload,
+    upload_spooled_to_storage,
+)
 from middleware.auth import get_authenticated_user
 from middleware.vessel_access import resolve_yacht_id
 from utils.filenames import sanitize_storage_filename
@@ -68,57 +83,59 @@ def _get_tenant_client(tenant_key_alias: str):
     return create_client(url, key)
 
 
-@router.post("/upload", include_in_schema=True)
-async def upload_entity_attachment(
-    file: UploadFile = File(..., description="File to attach (≤15 MB)"),
-    entity_type: str = Form(..., description='Parent entity type e.g. "warranty"'),
-    entity_id: str = Form(..., description="UUID of the parent entity"),
-    bucket: str = Form(..., description="Supabase storage bucket name"),
-    category: str = Form(..., description='File category e.g. "claim_document"'),
-    yacht_id_override: Optional[str] = Form(None, alias="yacht_id"),
-    auth: dict = Depends(get_authenticated_user),
-):
-    yacht_id = resolve_yacht_id(auth, yacht_id_override)
-    user_id = auth["user_id"]
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(..., description="Original filename")
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+    content_type: Optional[str] = Field(None, description="Declared MIME type")
+    entity_type: str = Field(..., description='Parent entity type e.g. "warranty"')
+    entity_id: str = Field(..., description="UUID of the parent entity")
+    bucket: str = Field(..., description="Supabase storage bucket name")
+    category: str = Field(..., description='File category e.g. "claim_document"')
+    yacht_id: Optional[str] = None
 
-    # ── MIME gate ──────────────────────────────────────────────────────────
-    content_type = (file.content_type or "application/octet-stream").lower()
+
+_session_store: Optional[ResumableUploadStore] = None
+
+
+def _get_session_store() -> ResumableUploadStore:
+    global _session_store
+    if _session_store is None:
+        _session_store = ResumableUploadStore()
+    return _session_store
+
+
+def _check_mime(content_type: str) -> None:
     if content_type not in ACCEPTED_MIME_TYPES:
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             detail=f"Unsupported file type: {content_type}",
         )
 
-    # ── Read + size gate ───────────────────────────────────────────────────
-    try:
-        file_content = await file.read()
-    except Exception as exc:
-        logger.error(f"[attachments/upload] Failed to read stream: {exc}")
-        raise HTTPException(status_code=400, detail="Failed to read uploaded file")
 
-    if not file_content:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty")
-    if len(file_content) > MAX_UPLOAD_BYTES:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File exceeds maximum size of {MAX_UPLOAD_BYTES // (1024*1024)} MB",
-        )
+async def _store_attachment(
+    auth: dict,
+    yacht_id: str,
+    spooled: SpooledUpload,
+    raw_name: str,
+    content_type: str,
+    entity_type: str,
+    entity_id: str,
+    bucket: str,
+    category: str,
+) -> dict:
+    """Upload a spooled file to storage and insert its pms_attachments row."""
+    user_id = auth["user_id"]
 
     # ── Build storage path ─────────────────────────────────────────────────
     attachment_id = str(uuid.uuid4())
-    raw_name = file.filename or "attachment"
-    filename = sanitize_storage_filename(raw_name)
+    filename = sanitize_storage_filename(raw_name or "attachment")
     storage_path = f"{entity_type}/{entity_id}/{attachment_id}/{filename}"
 
     supabase = _get_tenant_client(auth["tenant_key_alias"])
 
-    # ── Step 1: upload blob ─────────────────────────────────────────────────
+    # ── Step 1: upload blob (streamed from the temp file, retried) ─────────
     try:
-        supabase.storage.from_(bucket).upload(
-            path=storage_path,
-            file=file_content,
-            file_options={"content-type": content_type, "upsert": "false"},
-        )
+        await asyncio.to_thread(upload_spooled_to_storage, supabase, bucket, storage_path, spooled, content_type)
     except Exception as exc:
         logger.error(f"[attachments/upload] Storage upload failed: bucket={bucket} path={storage_path} err={exc}")
         raise HTTPException(status_code=500, detail="Failed to upload file to storage")
@@ -134,7 +151,7 @@ async def upload_entity_attachment(
         "storage_path": storage_path,
         "filename": filename,
         "mime_type": content_type,
-        "file_size": len(file_content),
+        "file_size": spooled.size,
         "category": category,
         "uploaded_by": user_id,
         "created_at": now,
@@ -163,7 +180,7 @@ async def upload_entity_attachment(
 
     logger.info(
         f"[attachments/upload] OK: id={attachment_id[:8]} entity={entity_type}/{entity_id[:8]} "
-        f"bucket={bucket} size={len(file_content)} yacht={yacht_id[:8]}"
+        f"bucket={bucket} size={spooled.size} sha256={spooled.sha256[:12]} yacht={yacht_id[:8]}"
     )
     return {
         "id": attachment_id,
@@ -171,7 +188,108 @@ async def upload_entity_attachment(
         "storage_path": storage_path,
         "storage_bucket": bucket,
         "mime_type": content_type,
-        "file_size": len(file_content),
+        "file_size": spooled.size,
         "entity_type": entity_type,
         "entity_id": entity_id,
     }
+
+
+@router.post("/upload", include_in_schema=True)
+async def upload_entity_attachment(
+    file: UploadFile = File(..., description="File to attach (≤15 MB)"),
+    entity_type: str = Form(..., description='Parent entity type e.g. "warranty"'),
+    entity_id: str = Form(..., description="UUID of the parent entity"),
+    bucket: str = Form(..., description="Supabase storage bucket name"),
+    category: str = Form(..., description='File category e.g. "claim_document"'),
+    yacht_id_override: Optional[str] = Form(None, alias="yacht_id"),
+    auth: dict = Depends(get_authenticated_user),
+):
+    yacht_id = resolve_yacht_id(auth, yacht_id_override)
+
+    # ── MIME gate ──────────────────────────────────────────────────────────
+    content_type = (file.content_type or "application/octet-stream").lower()
+    _check_mime(content_type)
+
+    # ── Chunked read + size gate (rejects at the first chunk past the cap) ─
+    spooled = await spool_upload(file, max_bytes=MAX_UPLOAD_BYTES)
+    try:
+        content_type = resolve_content_type(content_type, spooled.sniffed_type, ACCEPTED_MIME_TYPES)
+        return await _store_attachment(
+            auth, yacht_id, spooled, file.filename, content_type,
+            entity_type, entity_id, bucket, category,
+        )
+    finally:
+        spooled.cleanup()
+
+
+# ── Resumable uploads ──────────────────────────────────────────────────────
+# POST  /upload/sessions               → {upload_id, offset: 0}
+# PATCH /upload/sessions/{id}          Upload-Offset: <n>, raw body chunk
+#                                      → {offset} … final chunk → attachment
+# GET   /upload/sessions/{id}          → {offset} (resume point after a drop)
+
+
+@router.post("/upload/sessions", status_code=201)
+async def create_upload_session(
+    body: UploadSessionCreate,
+    auth: dict = Depends(get_authenticated_user),
+):
+    yacht_id = resolve_yacht_id(auth, body.yacht_id)
+    content_type = (body.content_type or "application/octet-stream").lower()
+    _check_mime(content_type)
+
+    session = _get_session_store().create(
+        owner=f"{auth['user_id']}:{yacht_id}",
+        size=body.size,
+        filename=body.filename,
+        content_type=content_type,
+        metadata={
+            "yacht_id": yacht_id,
+            "entity_type": body.entity_type,
+            "entity_id": body.entity_id,
+            "bucket": body.bucket,
+            "category": body.category,
+        },
+        max_bytes=MAX_UPLOAD_BYTES,
+    )
+    return {"upload_id": session.upload_id, "offset": 0, "size": session.size, "chunk_size": UPLOAD_CHUNK_BYTES}
+
+
+@router.get("/upload/sessions/{upload_id}")
+async def get_upload_session(
+    upload_id: str,
+    yacht_id: Optional[str] = Query(None),
+    auth: dict = Depends(get_authenticated_user),
+):
+    yacht_id = resolve_yacht_id(auth, yacht_id)
+    session = _get_session_store().get(upload_id, owner=f"{auth['user_id']}:{yacht_id}")
+    return {"upload_id": upload_id, "offset": session.offset, "size": session.size}
+
+
+@router.patch("/upload/sessions/{upload_id}")
+async def append_upload_session(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    yacht_id: Optional[str] = Query(None),
+    auth: dict = Depends(get_authenticated_user),
+):
+    yacht_id = resolve_yacht_id(auth, yacht_id)
+    store = _get_session_store()
+    session = store.get(upload_id, owner=f"{auth['user_id']}:{yacht_id}")
+    session = await store.append(session, upload_offset, request.stream())
+
+    if not session.complete:
+        return {"upload_id": upload_id, "offset": session.offset, "size": session.size, "complete": False}
+
+    spooled = await asyncio.to_thread(store.finish, session)
+    try:
+        meta = session.metadata
+        content_type = resolve_content_type(session.content_type, spooled.sniffed_type, ACCEPTED_MIME_TYPES)
+        attachment = await _store_attachment(
+            auth, meta["yacht_id"], spooled, session.filename, content_type,
+            meta["entity_type"], meta["entity_id"], meta["bucket"], meta["category"],
+        )
+    finally:
+        spooled.cleanup()
+    return {"upload_id": upload_id, "offset": session.offset, "size": session.size, "complete": True, **attachment}
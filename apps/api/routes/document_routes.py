@@ -22,11 +22,18 @@ import logging
 import time
 import os
 import uuid
-import io
+import asyncio
 import zipfile
 
 from middleware.auth import get_authenticated_user
 from middleware.vessel_access import resolve_yacht_id
+from lib.upload_stream import resolve_content_type, spool_upload, upload_spooled_to_storage
+from services.document_import import (
+    find_existing_blobs,
+    insert_doc_rows,
+    scan_zip_members,
+    upload_import_blobs,
+)
 from supabase import create_client
 from utils.filenames import sanitize_storage_filename
 from handlers.ledger_utils import build_ledger_event
@@ -643,30 +650,20 @@ async def upload_document(
         )
 
     # -----------------------------------------------------------------------
-    # Read file bytes and validate size
+    # Read file in chunks to a temp file and validate size as it arrives.
     # -----------------------------------------------------------------------
-    # UploadFile doesn't expose size until we read — read, then check.
-    # The 15 MB cap keeps memory pressure bounded per request.
-    try:
-        file_content = await file.read()
-    except Exception as e:
-        logger.error(f"[documents/upload] Failed to read upload stream: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to read uploaded file"
-        )
+    # spool_upload stops at the first chunk past the 15 MB cap and keeps
+    # memory at one chunk per request (UploadSizeLimitMiddleware has already
+    # refused bodies whose Content-Length is over the limit).
+    supabase = _get_tenant_client(auth['tenant_key_alias'])
 
-    size_bytes = len(file_content)
-    if size_bytes == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Uploaded file is empty"
-        )
-    if size_bytes > MAX_UPLOAD_BYTES:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File exceeds maximum size of {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
-        )
+    spooled = await spool_upload(file, max_bytes=MAX_UPLOAD_BYTES)
+    size_bytes = spooled.size
+    try:
+        content_type = resolve_content_type(content_type, spooled.sniffed_type, ACCEPTED_UPLOAD_MIME_TYPES)
+    except HTTPException:
+        spooled.cleanup()
+        raise
 
     # -----------------------------------------------------------------------
     # Build document identity + storage path
@@ -676,20 +673,13 @@ async def upload_document(
     filename = sanitize_storage_filename(raw_filename)
     storage_path = f"{yacht_id}/documents/{doc_id}/{filename}"
 
-    supabase = _get_tenant_client(auth['tenant_key_alias'])
-
     # -----------------------------------------------------------------------
     # Step 1 — upload the blob to Supabase Storage FIRST.
     # If this fails, no doc_metadata row is written (no ghost).
     # -----------------------------------------------------------------------
     try:
-        supabase.storage.from_(effective_bucket).upload(
-            path=storage_path,
-            file=file_content,
-            file_options={
-                'content-type': content_type,
-                'upsert': 'false',
-            },
+        await asyncio.to_thread(
+            upload_spooled_to_storage, supabase, effective_bucket, storage_path, spooled, content_type
         )
     except Exception as e:
         logger.error(
@@ -700,6 +690,8 @@ async def upload_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to upload file to storage"
         )
+    finally:
+        spooled.cleanup()
 
     # -----------------------------------------------------------------------
     # Step 2 — insert doc_metadata. The F2 trigger fires AFTER this INSERT
@@ -954,6 +946,11 @@ async def import_documents(
     Writes one doc_metadata row per file (stamped with a shared import_batch_id),
     uploads the blob to Supabase Storage, and lets the F2 trigger enqueue
     extraction. Emits ONE ledger_events + ONE pms_audit_log for the whole batch.
+
+    Members are streamed from the spooled upload, uploaded with bounded
+    concurrency and inserted as multi-row batches; files whose SHA-256 already
+    exists for this yacht are linked to the stored blob instead of re-uploaded
+    (see services/document_import.py).
     """
     yacht_id = resolve_yacht_id(auth, yacht_id)
     user_id = auth['user_id']
@@ -972,10 +969,15 @@ async def import_documents(
         )
 
     # -----------------------------------------------------------------------
-    # Read zip bytes + validate
+    # Open the spooled upload + validate. Starlette spools multipart bodies
+    # over 1 MB to a temp file; ZipFile reads members straight from it, so
+    # the archive is never materialised in memory.
     # -----------------------------------------------------------------------
+    upload_fh = zipfile_.file
     try:
-        zip_bytes = await zipfile_.read()
+        upload_fh.seek(0, os.SEEK_END)
+        zip_size = upload_fh.tell()
+        upload_fh.seek(0)
     except Exception as e:
         logger.error(f"[documents/import] Failed to read zip stream: {e}")
         raise HTTPException(
@@ -983,20 +985,20 @@ async def import_documents(
             detail="Failed to read uploaded zip"
         )
 
-    if not zip_bytes:
+    if not zip_size:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Uploaded zip is empty"
         )
 
-    if len(zip_bytes) > IMPORT_MAX_TOTAL_BYTES:
+    if zip_size > IMPORT_MAX_TOTAL_BYTES:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"Zip exceeds maximum size of {IMPORT_MAX_TOTAL_BYTES // (1024 * 1024)} MB"
         )
 
     try:
-        zf = zipfile.ZipFile(io.BytesIO(zip_bytes), 'r')
+        zf = zipfile.ZipFile(upload_fh, 'r')
     except zipfile.BadZipFile:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1038,98 +1040,75 @@ async def import_documents(
     batch_id = str(uuid.uuid4())
     uploaded_blobs: List[str] = []
     inserted_doc_ids: List[str] = []
-    failed: List[dict] = []
     imported_bytes = 0
+    deduplicated = 0
+
+    # Hash + size every entry (streamed, one chunk resident at a time)
+    accepted, failed = await asyncio.to_thread(
+        scan_zip_members, zf, members, yacht_id,
+        _guess_content_type, IMPORT_ACCEPTED_MIME_PREFIX, sanitize_storage_filename,
+    )
 
     # -----------------------------------------------------------------------
-    # Process each entry. On any exception we break out and run compensating
-    # delete of everything committed so far.
+    # Dedup → upload → multi-row insert. On any exception we break out and
+    # run compensating delete of everything committed so far.
     # -----------------------------------------------------------------------
     try:
-        for m in members:
-            original_path = m.filename
-            # Skip macOS resource forks and hidden files at the top level
-            base = os.path.basename(original_path)
-            if not base or base.startswith('.') or '__MACOSX' in original_path:
-                continue
-
-            try:
-                with zf.open(m) as fh:
-                    file_bytes = fh.read()
-            except Exception as e:
-                failed.append({
-                    "path": original_path,
-                    "error": f"read_failed: {e}",
-                })
-                continue
-
-            if len(file_bytes) == 0:
-                failed.append({"path": original_path, "error": "empty_file"})
-                continue
-
-            content_type = _guess_content_type(base)
-            if not content_type.startswith(IMPORT_ACCEPTED_MIME_PREFIX):
-                failed.append({"path": original_path, "error": f"unsupported_mime:{content_type}"})
-                continue
-
-            doc_id = str(uuid.uuid4())
-            safe_filename = sanitize_storage_filename(base)
-            storage_path = f"{yacht_id}/documents/{doc_id}/{safe_filename}"
-
-            # Upload blob
-            try:
-                supabase.storage.from_(DOCUMENTS_BUCKET).upload(
-                    path=storage_path,
-                    file=file_bytes,
-                    file_options={
-                        'content-type': content_type,
-                        'upsert': 'false',
-                    },
-                )
-            except Exception as e:
-                failed.append({"path": original_path, "error": f"storage_failed: {e}"})
+        existing = await asyncio.to_thread(
+            find_existing_blobs, supabase, yacht_id, [m.sha256 for m in accepted]
+        )
+        track_hashes = existing is not None
+        blob_for_hash = dict(existing or {})
+
+        # First member per unseen hash uploads; the rest link to its blob.
+        to_upload = []
+        for m in accepted:
+            if m.sha256 not in blob_for_hash:
+                blob_for_hash[m.sha256] = m.storage_path
+                to_upload.append(m)
+
+        uploaded, upload_failed = await upload_import_blobs(zf, supabase, DOCUMENTS_BUCKET, to_upload)
+        failed.extend(upload_failed)
+        uploaded_blobs.extend(m.storage_path for m in uploaded)
+        landed = {m.storage_path for m in uploaded} | set((existing or {}).values())
+
+        rows = []
+        for m in accepted:
+            blob_path = blob_for_hash[m.sha256]
+            if blob_path not in landed:
+                if m.storage_path != blob_path:
+                    failed.append({"path": m.original_path, "error": "storage_failed: duplicate of failed upload"})
                 continue
-            uploaded_blobs.append(storage_path)
+            if blob_path != m.storage_path:
+                deduplicated += 1
 
-            # Insert doc_metadata row. is_seed explicitly FALSE (column default
-            # is TRUE — would hide the row from v_documents_enriched).
+            # is_seed explicitly FALSE (column default is TRUE — would hide
+            # the row from v_documents_enriched).
             row = {
-                'id': doc_id,
+                'id': m.doc_id,
                 'yacht_id': yacht_id,
                 'source': 'bulk_import',
-                'filename': safe_filename,
-                'original_path': original_path,
-                'storage_path': storage_path,
+                'filename': m.filename,
+                'original_path': m.original_path,
+                'storage_path': blob_path,
                 'storage_bucket': DOCUMENTS_BUCKET,
-                'content_type': content_type,
-                'size_bytes': len(file_bytes),
+                'content_type': m.content_type,
+                'size_bytes': m.size,
                 'uploaded_by': user_id,
                 'import_batch_id': batch_id,
                 'is_seed': False,
             }
+            if track_hashes:
+                row['content_sha256'] = m.sha256
             if doc_type_default:
                 row['doc_type'] = doc_type_default
             if system_tag_default:
                 row['system_type'] = system_tag_default
+            rows.append(row)
+            imported_bytes += m.size
 
-            try:
-                ins = supabase.table('doc_metadata').insert(row).execute()
-                if not ins.data:
-                    raise ValueError("insert returned no data")
-                inserted_doc_ids.append(ins.data[0].get('id', doc_id))
-                imported_bytes += len(file_bytes)
-            except Exception as e:
-                failed.append({"path": original_path, "error": f"db_insert_failed: {e}"})
-                # The blob is orphaned — roll it back individually so the
-                # batch rollback doesn't have to retry it.
-                try:
-                    supabase.storage.from_(DOCUMENTS_BUCKET).remove([storage_path])
-                    uploaded_blobs.remove(storage_path)
-                except Exception as rollback_err:
-                    logger.error(
-                        f"[documents/import] per-file blob rollback failed: "
-                        f"path={storage_path} err={rollback_err}"
-                    )
+        if rows:
+            inserted_doc_ids = await asyncio.to_thread(insert_doc_rows, supabase, rows)
 
         # If NOTHING landed, treat the whole batch as a failure so the caller
         # sees a 4xx rather than a success with imported=0.
@@ -1138,7 +1117,8 @@ async def import_documents(
 
     except Exception as batch_err:
         # -------------------------------------------------------------------
-        # Compensating rollback: delete every blob and every doc_metadata row
+        # Compensating rollback: delete every blob this batch uploaded (linked
+        # blobs belong to earlier documents) and every doc_metadata row
         # stamped with this batch_id.
         # -------------------------------------------------------------------
         logger.error(
@@ -1161,6 +1141,8 @@ async def import_documents(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Bulk import failed: {batch_err}"
         )
+    finally:
+        zf.close()
 
     # -----------------------------------------------------------------------
     # ONE audit log + ONE ledger event for the whole batch
@@ -1180,6 +1162,7 @@ async def import_documents(
                 'imported': imported_count,
                 'failed_count': len(failed),
                 'total_bytes': imported_bytes,
+                'deduplicated': deduplicated,
                 'zip_filename': zip_basename,
                 'doc_type_default': doc_type_default,
                 'system_tag_default': system_tag_default,
@@ -1225,6 +1208,7 @@ async def import_documents(
     logger.info(
         f"[documents/import] OK: batch={batch_id[:8]} yacht={yacht_id[:8]} "
         f"imported={imported_count} failed={len(failed)} bytes={imported_bytes} "
+        f"deduplicated={deduplicated} "
         f"user={user_id[:8] if user_id else 'unknown'} role={user_role}"
     )
 
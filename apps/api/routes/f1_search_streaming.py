@@ -8,7 +8,8 @@ Emits results as they arrive - NEVER blocks on one shard before emitting others.
 Event sequence:
 1. diagnostics - Search started, search_id
 2. result_batch - Fused results (every ~100ms or on early win)
-3. finalized - Search complete, latency metrics
+3. result_update - Progressive mode only: re-rank/patch of the text batch
+4. finalized - Search complete, latency metrics
 
 Flow: JWT → UserContext → Extraction → Cortex → Signal Router → hyper_search_multi → SSE
 
@@ -30,7 +31,9 @@ import os
 import time
 import uuid
 from types import SimpleNamespace
-from typing import AsyncGenerator, Optional, Dict, Any, List
+from bisect import bisect_left
+from functools import lru_cache
+from typing import AsyncGenerator, Optional, Dict, Any, List, Tuple
 
 import asyncpg
 import hashlib
@@ -609,21 +612,130 @@ def reciprocal_rank_fusion(
 # Snippet Generation (Google/Spotlight-style highlighted previews)
 # ============================================================================
 
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == '_'
+
+
+class SnippetMatcher:
+    """
+    Query terms prepared once per query for snippet extraction.
+
+    Term occurrences are located once per text (str.find on the lowercased
+    text); the same offsets drive both window selection and highlighting,
+    so no regex runs per window or per term.
+    """
+
+    def __init__(self, query: str):
+        # Tokenize query into terms (simple word split, lowercase)
+        terms = dict.fromkeys(t.strip().lower() for t in query.split() if len(t.strip()) >= 2)
+        self.terms = sorted(terms, key=len, reverse=True)
+        self._fallback = (
+            re.compile('|'.join(re.escape(t) for t in self.terms), re.IGNORECASE)
+            if self.terms else None
+        )
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """(start, end, term index) of every term occurrence, by start then longest."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Case folding changed offsets (rare non-ASCII): regex on the original
+            index = {t: i for i, t in enumerate(self.terms)}
+            return [
+                (m.start(), m.end(), index[m.group().lower()])
+                for m in self._fallback.finditer(text)
+                if m.group().lower() in index
+            ]
+
+        found = []
+        find = lowered.find
+        for i, term in enumerate(self.terms):
+            size = len(term)
+            pos = find(term)
+            while pos != -1:
+                found.append((pos, -size, i))
+                pos = find(term, pos + 1)
+        found.sort()
+        return [(pos, pos - neg_size, i) for pos, neg_size, i in found]
+
+    def best_window(self, matches: List[Tuple[int, int, int]], text_length: int, window_size: int) -> int:
+        """
+        Start of the window holding the most distinct terms, tightest first.
+
+        Two-pointer sweep over the match list: score = distinct terms plus a
+        proximity bonus (window_size - span) / window_size when two or more
+        terms co-occur.
+        """
+        if not matches or text_length <= window_size:
+            return 0
+
+        counts = [0] * len(self.terms)
+        distinct = 0
+        best_score, best_span = -1.0, (0, 0)
+        left = 0
+        for _, end, term in matches:
+            if counts[term] == 0:
+                distinct += 1
+            counts[term] += 1
+            while end - matches[left][0] > window_size:
+                counts[matches[left][2]] -= 1
+                if counts[matches[left][2]] == 0:
+                    distinct -= 1
+                left += 1
+            span = end - matches[left][0]
+            score = distinct + ((window_size - span) / window_size if distinct >= 2 else 0)
+            if score > best_score:
+                best_score, best_span = score, (matches[left][0], end)
+
+        start, end = best_span
+        # A little leading context, without running past the end of the text
+        start = max(0, start - min(20, window_size - (end - start)))
+        return max(0, min(start, text_length - window_size))
+
+    @staticmethod
+    def highlight(text: str, matches: List[Tuple[int, int, int]], start: int, end: int) -> str:
+        """text[start:end] with whole-word term matches wrapped in **bold** markers."""
+        parts = []
+        pos = start
+        for m_start, m_end, _ in matches[bisect_left(matches, (start,)):]:
+            if m_start < pos:
+                continue
+            if m_end > end:
+                break
+            # Word boundary matching to avoid partial matches
+            if m_start > 0 and _is_word_char(text[m_start - 1]) == _is_word_char(text[m_start]):
+                continue
+            if m_end < len(text) and _is_word_char(text[m_end - 1]) == _is_word_char(text[m_end]):
+                continue
+            parts.append(text[pos:m_start])
+            parts.append(f"**{text[m_start:m_end]}**")
+            pos = m_end
+        parts.append(text[pos:end])
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=256)
+def get_snippet_matcher(query: str) -> SnippetMatcher:
+    """Prepared matcher for a query (shared by every result of a request)."""
+    return SnippetMatcher(query)
+
+
 def generate_snippet(
     search_text: Optional[str],
     query: str,
-    max_length: int = 150
+    max_length: int = 150,
+    matcher: Optional[SnippetMatcher] = None,
 ) -> Optional[str]:
     """
     Extract best matching segment from search_text with highlighted terms.
 
     Returns snippet with **bold** markers around query terms.
-    Uses sliding window to find segment where most terms co-occur.
+    Picks the window where most terms co-occur (see SnippetMatcher).
 
     Args:
         search_text: Raw searchable text from search_index
         query: Original user query
         max_length: Maximum snippet length (default 150 chars)
+        matcher: Prepared matcher for ``query`` (looked up if omitted)
 
     Returns:
         Highlighted snippet or None if no text available
@@ -631,60 +743,160 @@ def generate_snippet(
     if not search_text or not query:
         return None
 
-    # Tokenize query into terms (simple word split, lowercase)
-    query_terms = [t.strip().lower() for t in query.split() if len(t.strip()) >= 2]
-    if not query_terms:
+    matcher = matcher or get_snippet_matcher(query)
+    if not matcher.terms:
         return None
 
-    text_lower = search_text.lower()
-
-    # Find best window using sliding window approach
-    best_start = 0
-    best_score = -1
     window_size = max_length
-    step = 20  # Check every 20 chars for performance
+    matches = matcher.find(search_text)
+    start = matcher.best_window(matches, len(search_text), window_size)
+    end = min(len(search_text), start + window_size)
+    prefix = suffix = ''
 
-    for i in range(0, max(1, len(search_text) - window_size), step):
-        window = text_lower[i:i + window_size]
+    # Trim to word boundaries
+    if start > 0:
+        # Start mid-document: trim to first space and prepend ellipsis
+        first_space = search_text.find(' ', start, end) - start
+        if 0 <= first_space < 20:
+            start += first_space + 1
+            prefix = '...'
 
-        # Score: count of terms present
-        score = sum(1 for t in query_terms if t in window)
+    if end < len(search_text):
+        # End mid-document: trim to last space and append ellipsis
+        last_space = search_text.rfind(' ', start, end)
+        if last_space != -1 and len(prefix) + last_space - start > max_length - 20:
+            end = last_space
+            suffix = '...'
 
-        # Proximity bonus: if multiple terms, prefer them close together
-        if score >= 2:
-            positions = [window.find(t) for t in query_terms if t in window]
-            if len(positions) >= 2:
-                span = max(positions) - min(positions)
-                # Bonus for tight clustering (smaller span = higher bonus)
-                score += (window_size - span) / window_size
+    snippet = prefix + matcher.highlight(search_text, matches, start, end) + suffix
 
-        if score > best_score:
-            best_score = score
-            best_start = i
+    return snippet.strip() if snippet.strip() else None
 
-    # Extract window from original text (preserve case)
-    snippet = search_text[best_start:best_start + window_size]
 
-    # Trim to word boundaries
-    if best_start > 0:
-        # Start mid-document: trim to first space and prepend ellipsis
-        first_space = snippet.find(' ')
-        if first_space > 0 and first_space < 20:
-            snippet = '...' + snippet[first_space + 1:]
+# ============================================================================
+# Result Post-Processing (role gate + snippets)
+# ============================================================================
 
-    if best_start + window_size < len(search_text):
-        # End mid-document: trim to last space and append ellipsis
-        last_space = snippet.rfind(' ')
-        if last_space > max_length - 20:
-            snippet = snippet[:last_space] + '...'
+# HoR sign-offs contain personal compliance data. Non-HOD users
+# should only see their own records in search results.
+ROLE_GATED_TYPES = {'hours_of_rest_signoff'}
+HOD_ROLES = {'chief_engineer', 'eto', 'captain', 'manager', 'chief_officer', 'chief_steward', 'purser'}
+
+
+def apply_role_gate(items: List[Dict[str, Any]], ctx: UserContext) -> List[Dict[str, Any]]:
+    """Drop personnel-sensitive results the caller is not allowed to see."""
+    if not items or getattr(ctx, 'role', '') in HOD_ROLES:
+        return items
+    auth_user_id = getattr(ctx, 'user_id', '')
+    return [
+        item for item in items
+        if item.get('object_type') not in ROLE_GATED_TYPES
+        or (isinstance(item.get('payload'), dict) and item['payload'].get('user_id') == auth_user_id)
+    ]
 
-    # Highlight query terms with **bold** markers (case-insensitive, preserve case)
-    for term in sorted(query_terms, key=len, reverse=True):
-        # Word boundary matching to avoid partial matches
-        pattern = re.compile(rf'\b({re.escape(term)})\b', re.IGNORECASE)
-        snippet = pattern.sub(r'**\1**', snippet)
 
-    return snippet.strip() if snippet.strip() else None
+def attach_snippets(items: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    """Move search_text out of each item and into payload['snippet']."""
+    matcher = get_snippet_matcher(query) if query else None
+    for item in items:
+        search_text = item.pop('search_text', None)  # Remove from output, use for snippet
+        if search_text:
+            snippet = generate_snippet(search_text, query, max_length=150, matcher=matcher)
+            if snippet:
+                payload = item.get('payload') or {}
+                if isinstance(payload, dict):
+                    # Copy: payload dicts are shared with cached/fused results
+                    payload = dict(payload)
+                    payload['snippet'] = snippet
+                    item['payload'] = payload
+    return items
+
+
+def normalize_text_results(text_results: List[Any]) -> List[Dict[str, Any]]:
+    """Convert hyper_search rows into the standard fusion input format."""
+    processed = []
+    for r in text_results:
+        item = dict(r)
+        for key in ('payload', 'ranks', 'components'):
+            if key in item and isinstance(item[key], str):
+                item[key] = json.loads(item[key])
+        processed.append({
+            "object_type": item.get('object_type'),
+            "object_id": str(item.get('object_id')),
+            "payload": item.get('payload'),
+            "search_text": item.get('search_text'),  # From f1_search_cards v2
+            "fused_score": item.get('fused_score'),
+            "best_rewrite_idx": item.get('best_rewrite_idx'),
+            "ranks": item.get('ranks'),
+            "components": item.get('components'),
+        })
+    return processed
+
+
+def normalize_vector_results(vector_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert match_search_index rows into the standard fusion input format."""
+    return [
+        {
+            "object_type": r.get('object_type'),
+            "object_id": str(r.get('object_id')),
+            "payload": r.get('payload'),
+            "similarity": r.get('similarity'),
+            "search_text": r.get('search_text'),
+        }
+        for r in vector_results
+    ]
+
+
+# ============================================================================
+# Progressive Streaming (result_batch → result_update reconciliation)
+# ============================================================================
+
+def result_key(item: Dict[str, Any]) -> str:
+    """Stable client-side identity for a result: '<object_type>:<object_id>'."""
+    return f"{item.get('object_type')}:{item.get('object_id')}"
+
+
+def build_result_update(
+    previous: List[Dict[str, Any]],
+    current: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Describe how the client should reconcile `previous` into `current`.
+
+    The client keeps results keyed by result_key(). `order` is the full new
+    ordering; `added` carries full items the client has not seen yet;
+    `removed` lists keys to drop; `moved` lists {key, from, to} for items
+    whose position changed. Items already on screen are not re-sent unless
+    their payload changed (e.g. rerank_score arrived) — those go in `patched`.
+    """
+    prev_pos = {result_key(it): i for i, it in enumerate(previous)}
+    prev_by_key = {result_key(it): it for it in previous}
+    order: List[str] = []
+    added: List[Dict[str, Any]] = []
+    moved: List[Dict[str, Any]] = []
+    patched: List[Dict[str, Any]] = []
+
+    for i, item in enumerate(current):
+        key = result_key(item)
+        order.append(key)
+        if key not in prev_pos:
+            added.append(item)
+            continue
+        if prev_pos[key] != i:
+            moved.append({"key": key, "from": prev_pos[key], "to": i})
+        if item != prev_by_key[key]:
+            patched.append(item)
+
+    current_keys = set(order)
+    removed = [key for key in prev_pos if key not in current_keys]
+
+    return {
+        "order": order,
+        "added": added,
+        "removed": removed,
+        "moved": moved,
+        "patched": patched,
+    }
 
 
 # ============================================================================
@@ -751,6 +963,10 @@ async def call_match_search_index(
 async def f1_search_stream(
     request: Request,
     q: str = Query(..., min_length=1, description="Search query"),
+    progressive: bool = Query(
+        False,
+        description="Emit text hits as soon as the text leg returns, then result_update events",
+    ),
     auth: dict = Depends(get_authenticated_user),
 ):
     """
@@ -766,11 +982,22 @@ async def f1_search_stream(
     Events:
     - diagnostics: {"search_id": "...", "status": "started", "targets": [...]}
     - exact_match_win: {"object_id": "...", "object_type": "..."}
-    - result_batch: {"items": [...], "partial": true/false}
-    - finalized: {"search_id": "...", "latency_ms": N, "early_win": bool}
+    - result_batch: {"items": [...], "partial": true/false, "seq": N}
+    - result_update: {"seq": N, "stage": "fused"|"reranked", "final": bool,
+                      "order": [key], "added": [...], "removed": [key],
+                      "moved": [{key, from, to}], "patched": [...]}
+    - finalized: {"search_id": "...", "latency_ms": N, "early_win": bool, "last_seq": N}
+
+    Progressive mode (?progressive=true): the first result_batch (partial=true,
+    stage="text") carries text/trigram hits as soon as hyper_search returns.
+    Vector fusion and rerank then arrive as result_update events keyed by
+    "<object_type>:<object_id>"; apply them in seq order. The update with
+    final=true is the authoritative list. Cache hits and searches with no
+    text hits fall back to a single result_batch.
 
     Args:
         q: Search query (natural language)
+        progressive: Stream text hits first, reconcile later stages via result_update
         auth: JWT auth context (via dependency)
 
     Returns:
@@ -814,6 +1041,11 @@ async def f1_search_stream(
         reranked = False
         total_results = 0
         pending_tasks: List[asyncio.Task] = []
+        # Progressive streaming state: seq increments on every result event;
+        # emitted_items is the list the client currently holds.
+        seq = 0
+        emitted_items: Optional[List[Dict[str, Any]]] = None
+        first_result_ms: Optional[int] = None
 
         try:
             # Check for client disconnect
@@ -999,6 +1231,33 @@ async def f1_search_stream(
                         text_results = await run_text_search()
                         span.set_attribute("text_result_count", len(text_results))
 
+                    # Progressive mode: emit text hits now, before embeddings,
+                    # vector search and rerank. Later stages arrive as
+                    # result_update events the client reconciles by seq.
+                    if progressive and text_results:
+                        with tracer.start_as_current_span("progressive.emit_text_batch") as span:
+                            span.set_attribute("search_id", search_id)
+                            early_items = reciprocal_rank_fusion(
+                                normalize_text_results(text_results),
+                                [],
+                                rrf_k=60,
+                                page_limit=20,
+                            )
+                            early_items = attach_snippets(apply_role_gate(early_items, ctx), q)
+                            seq += 1
+                            span.set_attribute("item_count", len(early_items))
+                            span.set_attribute("seq", seq)
+                        emitted_items = early_items
+                        first_result_ms = int((time.time() - start) * 1000)
+                        yield sse_event("result_batch", {
+                            "search_id": search_id,
+                            "items": early_items,
+                            "partial": True,
+                            "count": len(early_items),
+                            "seq": seq,
+                            "stage": "text",
+                        })
+
                     # ============================================================
                     # LAW 23: L2 Deep Path - Escalate if text search has <3 hits
                     # ============================================================
@@ -1140,34 +1399,9 @@ async def f1_search_stream(
                         f"l2_escalation={l2_escalation_used}, embeddings={embeddings_generated}"
                     )
 
-                # Process text results into standard format
-                processed_text_results = []
-                for r in text_results:
-                    item = dict(r)
-                    for key in ('payload', 'ranks', 'components'):
-                        if key in item and isinstance(item[key], str):
-                            item[key] = json.loads(item[key])
-                    processed_text_results.append({
-                        "object_type": item.get('object_type'),
-                        "object_id": str(item.get('object_id')),
-                        "payload": item.get('payload'),
-                        "search_text": item.get('search_text'),  # From f1_search_cards v2
-                        "fused_score": item.get('fused_score'),
-                        "best_rewrite_idx": item.get('best_rewrite_idx'),
-                        "ranks": item.get('ranks'),
-                        "components": item.get('components'),
-                    })
-
-                # Process vector results into standard format
-                processed_vector_results = []
-                for r in vector_results:
-                    processed_vector_results.append({
-                        "object_type": r.get('object_type'),
-                        "object_id": str(r.get('object_id')),
-                        "payload": r.get('payload'),
-                        "similarity": r.get('similarity'),
-                        "search_text": r.get('search_text'),
-                    })
+                # Process text and vector results into standard format
+                processed_text_results = normalize_text_results(text_results)
+                processed_vector_results = normalize_vector_results(vector_results)
 
                 # Fuse text and vector results using RRF
                 with tracer.start_as_current_span("fusion.rrf") as span:
@@ -1231,8 +1465,25 @@ async def f1_search_stream(
             # ================================================================
             # Phase 4b: Optional re-ranking (feature-flagged, 80ms budget)
             # ================================================================
+            will_rerank = RERANKER_ENABLED and len(items) > 1 and not early_win
+
+            # Progressive mode: vector leg has landed. If a rerank is still to
+            # come, patch the client's list now rather than after the rerank.
+            if progressive and emitted_items is not None and will_rerank:
+                fused_items = attach_snippets(apply_role_gate([dict(it) for it in items], ctx), q)
+                seq += 1
+                yield sse_event("result_update", {
+                    "search_id": search_id,
+                    "seq": seq,
+                    "stage": "fused",
+                    "final": False,
+                    "count": len(fused_items),
+                    **build_result_update(emitted_items, fused_items),
+                })
+                emitted_items = fused_items
+
             reranked = False
-            if RERANKER_ENABLED and len(items) > 1 and not early_win:
+            if will_rerank:
                 with tracer.start_as_current_span("rerank.apply") as span:
                     span.set_attribute("search_id", search_id)
                     span.set_attribute("item_count", len(items))
@@ -1245,46 +1496,40 @@ async def f1_search_stream(
             # ================================================================
             # Phase 4c-pre: Role-gated post-filter for personnel-sensitive types
             # ================================================================
-            # HoR sign-offs contain personal compliance data. Non-HOD users
-            # should only see their own records in search results.
-            ROLE_GATED_TYPES = {'hours_of_rest_signoff'}
-            HOD_ROLES = {'chief_engineer', 'eto', 'captain', 'manager', 'chief_officer', 'chief_steward', 'purser'}
-            if items:
-                auth_role = ctx.role if hasattr(ctx, 'role') else ''
-                auth_user_id = ctx.user_id if hasattr(ctx, 'user_id') else ''
-                is_hod_plus = auth_role in HOD_ROLES
-                if not is_hod_plus:
-                    items = [
-                        item for item in items
-                        if item.get('object_type') not in ROLE_GATED_TYPES
-                        or (isinstance(item.get('payload'), dict) and item['payload'].get('user_id') == auth_user_id)
-                    ]
+            items = apply_role_gate(items, ctx)
 
             # ================================================================
             # Phase 4c: Generate snippets for each result
             # ================================================================
-            for item in items:
-                search_text = item.pop('search_text', None)  # Remove from output, use for snippet
-                if search_text:
-                    snippet = generate_snippet(search_text, q, max_length=150)
-                    if snippet:
-                        # Add snippet to payload
-                        payload = item.get('payload') or {}
-                        if isinstance(payload, dict):
-                            payload['snippet'] = snippet
-                            item['payload'] = payload
-
-            # Emit result batch
+            items = attach_snippets(items, q)
+
+            # Emit result batch (or, in progressive mode, the final update
+            # against what the client already holds)
             with tracer.start_as_current_span("fusion.emit_batch") as span:
                 span.set_attribute("search_id", search_id)
                 span.set_attribute("item_count", len(items))
                 span.set_attribute("early_win", early_win)
-                yield sse_event("result_batch", {
-                    "search_id": search_id,
-                    "items": items,
-                    "partial": False,
-                    "count": len(items),
-                })
+                seq += 1
+                span.set_attribute("seq", seq)
+                if progressive and emitted_items is not None:
+                    yield sse_event("result_update", {
+                        "search_id": search_id,
+                        "seq": seq,
+                        "stage": "reranked" if reranked else "fused",
+                        "final": True,
+                        "count": len(items),
+                        **build_result_update(emitted_items, items),
+                    })
+                else:
+                    if first_result_ms is None:
+                        first_result_ms = int((time.time() - start) * 1000)
+                    yield sse_event("result_batch", {
+                        "search_id": search_id,
+                        "items": items,
+                        "partial": False,
+                        "count": len(items),
+                        "seq": seq,
+                    })
 
             # ================================================================
             # Phase 5: Finalize
@@ -1312,6 +1557,9 @@ async def f1_search_stream(
             yield sse_event("finalized", {
                 "search_id": search_id,
                 "latency_ms": latency_ms,
+                "first_result_ms": first_result_ms,
+                "progressive": progressive,
+                "last_seq": seq,
                 "total_results": total_results,
                 "rewrites_count": len(rewrites),
                 "embeddings_count": embeddings_count,  # GOD MODE: semantic search enabled
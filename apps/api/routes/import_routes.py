@@ -15,21 +15,30 @@ Auth: JWT with scope="import" from registration portal, verified against MASTER
 Dev bypass: X-Import-Dev-Token header with yacht_id UUID (requires IMPORT_DEV_MODE=true).
 """
 
+import asyncio
+import io
+import itertools
 import os
 import json
 import logging
+import shutil
+import tempfile
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Iterator, Optional
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request, Header
 from fastapi.responses import JSONResponse
 
-from parsers.csv_parser import parse_csv
-from parsers.xlsx_parser import parse_xlsx, parse_xls
-from parsers.sql_parser import parse_sql
-from parsers.zip_handler import parse_zip
-from parsers.base_parser import ParseResult
+from parsers.csv_parser import stream_csv
+from parsers.xlsx_parser import stream_xlsx, stream_xls
+from parsers.sql_parser import stream_sql
+from parsers.zip_handler import list_zip_members, open_zip, stream_zip_member
+from parsers.base_parser import ParseResult, RowStream
+from parsers.row_spill import (
+    drop_session_spill, purge_expired_spills, read_spill, session_spill_dir,
+    spill_path, spill_stream, tee_to_spill,
+)
 from mappers.column_matcher import match_columns
 from services.import_service import dry_run_domain, commit_domain, rollback_domain
 
@@ -43,6 +52,16 @@ IMPORT_DEV_MODE = os.getenv("IMPORT_DEV_MODE", "false").lower() == "true"
 # Import token verification (separate from Supabase auth)
 IMPORT_JWT_SECRET = os.getenv("IMPORT_JWT_SECRET", "")
 
+# Document file extensions stored (not parsed) on direct upload
+DOC_CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".tiff": "image/tiff", ".tif": "image/tiff",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".doc": "application/msword",
+}
+
 # Supabase client — use the shared client from integrations/supabase.py
 def get_tenant_client():
     """Get the shared Supabase client for tenant DB (service role)."""
@@ -290,120 +309,81 @@ async def upload_files(
     # Data file extensions
     data_extensions = {".csv", ".sql", ".xlsx", ".xls"}
     # Document file extensions
-    doc_extensions = {".pdf", ".jpg", ".jpeg", ".png", ".tiff", ".tif", ".docx", ".doc"}
+    doc_extensions = set(DOC_CONTENT_TYPES)
+
+    # Parsed rows are spilled here once so dry-run and commit skip re-parsing
+    purge_expired_spills()
+    spill_dir = session_spill_dir(session_id)
 
     for upload_file in files:
-        raw_data = await upload_file.read()
         filename = upload_file.filename or "unknown"
         ext = os.path.splitext(filename)[1].lower()
+        local_path = await _spool_import_file(upload_file)
+        try:
+            size_bytes = os.path.getsize(local_path)
+
+            # Handle ZIP: extract and process contents
+            if ext == ".zip":
+                # Store the zip itself
+                zip_path = f"{yacht_id}/{session_id}/{filename}"
+                try:
+                    await asyncio.to_thread(_store_import_file, sb, zip_path, local_path, "application/zip")
+                    stored_paths.append(zip_path)
+                except Exception as e:
+                    logger.error(f"[Import] ZIP storage failed: {e}")
+
+                zip_files, zip_docs, zip_paths = await asyncio.to_thread(
+                    _process_zip, sb, local_path, filename, source, yacht_id, session_id, spill_dir,
+                )
+                parsed_files.extend(zip_files)
+                documents.extend(zip_docs)
+                stored_paths.extend(zip_paths)
+                continue  # Skip the per-file processing below
 
-        # Handle ZIP: extract and process contents
-        if ext == ".zip":
-            zip_result = parse_zip(raw_data, filename, source=source)
-            # Store the zip itself
-            zip_path = f"{yacht_id}/{session_id}/{filename}"
+            # Store in Supabase Storage
+            storage_path = f"{yacht_id}/{session_id}/{filename}"
             try:
-                sb.storage.from_("vessel-imports").upload(
-                    zip_path, raw_data,
-                    {"content-type": "application/zip", "upsert": "true"},
+                await asyncio.to_thread(
+                    _store_import_file, sb, storage_path, local_path,
+                    upload_file.content_type or "application/octet-stream",
                 )
-                stored_paths.append(zip_path)
+                stored_paths.append(storage_path)
+                logger.info(f"[Import] Stored {filename} ({size_bytes} bytes) at {storage_path}")
             except Exception as e:
-                logger.error(f"[Import] ZIP storage failed: {e}")
-
-            # Process extracted data files
-            for pr in zip_result["parse_results"]:
-                parsed_files.append(_parse_result_to_dict(pr, source=source))
-            # Process extracted documents
-            for doc in zip_result["documents"]:
-                doc_path = f"{yacht_id}/{session_id}/documents/{doc.filename}"
-                if doc.data:
-                    try:
-                        sb.storage.from_("vessel-imports").upload(
-                            doc_path, doc.data,
-                            {"content-type": doc.content_type, "upsert": "true"},
-                        )
-                        stored_paths.append(doc_path)
-                    except Exception as e:
-                        logger.warning(f"[Import] Doc storage failed for {doc.filename}: {e}")
+                logger.error(f"[Import] Storage failed for {filename}: {e}")
+                # Continue with other files — don't fail the whole upload
+                parsed_files.append({
+                    "filename": filename,
+                    "error": f"Storage failed: {str(e)}",
+                })
+                continue
+
+            # Route by file type
+            if ext in data_extensions:
+                # Parse data file once; rows are spilled for dry-run/commit
+                parsed_files.extend(await asyncio.to_thread(
+                    _detect_data_file, local_path, filename, ext, source, spill_dir,
+                ))
+            elif ext in doc_extensions:
+                # Document — store metadata, don't parse
                 documents.append({
-                    "filename": doc.filename,
-                    "size_bytes": doc.size_bytes,
-                    "type": doc.content_type,
-                    "domain_hint": doc.domain_hint,
-                    "storage_path": doc_path,
+                    "filename": filename,
+                    "size_bytes": size_bytes,
+                    "type": DOC_CONTENT_TYPES.get(ext, "application/octet-stream"),
+                    "domain_hint": _infer_doc_domain(filename),
+                    "storage_path": storage_path,
                 })
-            # Unclassified from ZIP
-            for uc in zip_result["unclassified"]:
+            else:
+                # Unknown file type — store but flag
                 documents.append({
-                    "filename": uc.filename,
-                    "size_bytes": uc.size_bytes,
+                    "filename": filename,
+                    "size_bytes": size_bytes,
                     "type": "unknown",
                     "domain_hint": None,
+                    "storage_path": storage_path,
                 })
-            continue  # Skip the per-file processing below
-
-        # Store in Supabase Storage
-        storage_path = f"{yacht_id}/{session_id}/{filename}"
-        try:
-            sb.storage.from_("vessel-imports").upload(
-                storage_path,
-                raw_data,
-                {"content-type": upload_file.content_type or "application/octet-stream", "upsert": "true"},
-            )
-            stored_paths.append(storage_path)
-            logger.info(f"[Import] Stored {filename} ({len(raw_data)} bytes) at {storage_path}")
-        except Exception as e:
-            logger.error(f"[Import] Storage failed for {filename}: {e}")
-            # Continue with other files — don't fail the whole upload
-            parsed_files.append({
-                "filename": filename,
-                "error": f"Storage failed: {str(e)}",
-            })
-            continue
-
-        # Route by file type
-        if ext in data_extensions:
-            # Parse data file
-            if ext == ".csv":
-                parse_result = parse_csv(raw_data, filename)
-                parsed_files.append(_parse_result_to_dict(parse_result, source=source))
-            elif ext == ".xlsx":
-                parse_result = parse_xlsx(raw_data, filename)
-                parsed_files.append(_parse_result_to_dict(parse_result, source=source))
-            elif ext == ".xls":
-                parse_result = parse_xls(raw_data, filename)
-                parsed_files.append(_parse_result_to_dict(parse_result, source=source))
-            elif ext == ".sql":
-                sql_results = parse_sql(raw_data, filename)
-                for sr in sql_results:
-                    parsed_files.append(_parse_result_to_dict(sr, source=source))
-        elif ext in doc_extensions:
-            # Document — store metadata, don't parse
-            content_type_map = {
-                ".pdf": "application/pdf",
-                ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-                ".png": "image/png",
-                ".tiff": "image/tiff", ".tif": "image/tiff",
-                ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                ".doc": "application/msword",
-            }
-            documents.append({
-                "filename": filename,
-                "size_bytes": len(raw_data),
-                "type": content_type_map.get(ext, "application/octet-stream"),
-                "domain_hint": _infer_doc_domain(filename),
-                "storage_path": storage_path,
-            })
-        else:
-            # Unknown file type — store but flag
-            documents.append({
-                "filename": filename,
-                "size_bytes": len(raw_data),
-                "type": "unknown",
-                "domain_hint": None,
-                "storage_path": storage_path,
-            })
+        finally:
+            os.remove(local_path)
 
     # 3. Build detection result
     detection_result = {
@@ -566,12 +546,12 @@ async def dry_run(
                 for col in file_info.get("columns", [])
             ]
 
-        # Re-parse the file to get row data (handles both direct CSV and ZIP)
+        # Stream the file's rows (session spill, or re-parse of direct file / ZIP)
         file_paths = sess.get("file_paths", [])
-        rows = _reparse_rows_for_domain(filename, file_paths, sb)
+        rows = _nonempty(_session_rows(session_id, filename, file_paths, sb))
 
         # Run dry-run
-        if rows:
+        if rows is not None:
             domain_result = dry_run_domain(
                 rows=rows,
                 column_map=file_mappings,
@@ -712,11 +692,11 @@ async def commit_import(
                 for col in file_info.get("columns", [])
             ]
 
-        # Re-parse file (handles both direct CSV and ZIP)
+        # Stream the file's rows (session spill, or re-parse of direct file / ZIP)
         file_paths = sess.get("file_paths", [])
-        rows = _reparse_rows_for_domain(filename, file_paths, sb)
+        rows = _nonempty(_session_rows(session_id, filename, file_paths, sb))
 
-        if rows:
+        if rows is not None:
             try:
                 count, _ = commit_domain(
                     rows=rows,
@@ -744,6 +724,7 @@ async def commit_import(
         "records_created": records_created,
         "completed_at": datetime.now(timezone.utc).isoformat(),
     }).eq("id", session_id).execute()
+    drop_session_spill(session_id)
 
     rollback_until = (datetime.now(timezone.utc) + timedelta(hours=48)).isoformat()
 
@@ -864,41 +845,177 @@ async def get_unresolved_refs(
 # HELPERS
 # =============================================================================
 
-def _reparse_rows_for_domain(filename: str, file_paths: list, sb) -> list[dict]:
+async def _spool_import_file(upload_file: UploadFile) -> str:
+    """Copy an upload to a named temp file so storage and the parsers both read from disk."""
+    fd, path = tempfile.mkstemp(prefix="import-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            await upload_file.seek(0)
+            await asyncio.to_thread(shutil.copyfileobj, upload_file.file, out, 1024 * 1024)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _store_import_file(sb, storage_path: str, local_path: str, content_type: str) -> None:
+    with open(local_path, "rb") as fh:
+        sb.storage.from_("vessel-imports").upload(
+            storage_path, fh,
+            {"content-type": content_type, "upsert": "true"},
+        )
+
+
+def _open_data_streams(fh, filename: str, ext: str, spill_dir: str) -> list[RowStream]:
+    if ext == ".csv":
+        return [stream_csv(fh, filename)]
+    if ext == ".xlsx":
+        return [stream_xlsx(fh, filename)]
+    if ext == ".xls":
+        return [stream_xls(fh, filename)]
+    if ext == ".sql":
+        return stream_sql(fh, filename, spill_dir=spill_dir)
+    return []
+
+
+def _spill_and_describe(streams: list[RowStream], spill_dir: str, source: str) -> list[dict]:
+    """Drain each stream into the session spill, then build its detection entry."""
+    described = []
+    for stream in streams:
+        spill_stream(stream, spill_path(spill_dir, stream.filename))
+        described.append(_parse_result_to_dict(stream.meta, source=source))
+    return described
+
+
+def _detect_data_file(local_path: str, filename: str, ext: str, source: str, spill_dir: str) -> list[dict]:
+    try:
+        with open(local_path, "rb") as fh:
+            return _spill_and_describe(_open_data_streams(fh, filename, ext, spill_dir), spill_dir, source)
+    except Exception as e:
+        logger.error(f"[Import] Parse failed for {filename}: {e}")
+        return [{"filename": filename, "error": f"Parse failed: {str(e)}"}]
+
+
+def _process_zip(
+    sb, local_path: str, filename: str, source: str, yacht_id: str, session_id: str, spill_dir: str,
+) -> tuple[list[dict], list[dict], list[str]]:
+    """
+    Parse data files and store documents from an uploaded ZIP, one member at
+    a time. Returns (parsed_files, documents, stored_paths).
+    """
+    parsed_files: list[dict] = []
+    documents: list[dict] = []
+    stored_paths: list[str] = []
+
+    with open(local_path, "rb") as fh:
+        zf, warnings = open_zip(fh, filename)
+        if zf is None:
+            logger.warning(f"[Import] {filename}: {warnings[0].message}")
+            return parsed_files, documents, stored_paths
+        with zf:
+            members = list_zip_members(zf)
+
+            # Process extracted data files
+            for basename, ext, info in members["data_files"]:
+                try:
+                    streams = stream_zip_member(zf, info, basename, ext, spill_dir=spill_dir)
+                    parsed_files.extend(_spill_and_describe(streams, spill_dir, source))
+                except Exception as e:
+                    logger.warning(f"[Import] Cannot parse {info.filename} in {filename}: {e}")
+
+            # Process extracted documents
+            for doc in members["documents"]:
+                doc_path = f"{yacht_id}/{session_id}/documents/{doc.filename}"
+                try:
+                    sb.storage.from_("vessel-imports").upload(
+                        doc_path, zf.read(doc.archive_path),
+                        {"content-type": doc.content_type, "upsert": "true"},
+                    )
+                    stored_paths.append(doc_path)
+                except Exception as e:
+                    logger.warning(f"[Import] Doc storage failed for {doc.filename}: {e}")
+                documents.append({
+                    "filename": doc.filename,
+                    "size_bytes": doc.size_bytes,
+                    "type": doc.content_type,
+                    "domain_hint": doc.domain_hint,
+                    "storage_path": doc_path,
+                })
+            # Unclassified from ZIP
+            for uc in members["unclassified"]:
+                documents.append({
+                    "filename": uc.filename,
+                    "size_bytes": uc.size_bytes,
+                    "type": "unknown",
+                    "domain_hint": None,
+                })
+
+    return parsed_files, documents, stored_paths
+
+
+def _nonempty(rows: Iterator[dict]) -> Optional[Iterator[dict]]:
+    """Return ``rows`` unchanged unless it is empty (then None)."""
+    first = next(rows, None)
+    if first is None:
+        return None
+    return itertools.chain([first], rows)
+
+
+def _session_rows(session_id: str, filename: str, file_paths: list, sb) -> Iterator[dict]:
     """
-    Re-parse rows for a given filename from stored files.
-    Handles both direct CSV paths and ZIP archives (where individual CSVs
-    are extracted in memory but only the ZIP is stored).
+    Stream rows for a given filename (``name.csv`` or ``dump.sql:table``).
+
+    Reads the spill written at upload time. If it is missing (spill expired
+    or another instance took the upload) the stored file is downloaded and
+    re-parsed — directly, or out of the stored ZIP — and spilled again so
+    the next phase reuses it.
     """
+    spill_dir = session_spill_dir(session_id)
+    target = spill_path(spill_dir, filename)
+    spilled = read_spill(target)
+    if spilled is not None:
+        yield from spilled.rows()
+        return
+
+    source_name = filename.split(":", 1)[0] if ".sql:" in filename else filename
+    source_ext = os.path.splitext(source_name)[1].lower()
+
+    def pick(streams: list[RowStream]) -> Iterator[dict]:
+        stream = next((st for st in streams if st.filename == filename), None)
+        if stream is None:
+            return
+        if stream.spill_path == target:
+            yield from stream.rows()
+            return
+        for batch in tee_to_spill(stream, target, filename):
+            yield from batch
+
     # First try: direct match in file_paths
-    matching_path = next((p for p in file_paths if filename in p), None)
+    matching_path = next((p for p in file_paths if p.endswith(f"/{source_name}")), None)
     if matching_path:
         try:
             file_data = sb.storage.from_("vessel-imports").download(matching_path)
-            ext = os.path.splitext(matching_path)[1].lower()
-            if ext == ".csv":
-                return parse_csv(file_data, filename).rows
-            elif ext == ".xlsx":
-                return parse_xlsx(file_data, filename).rows
-            elif ext == ".xls":
-                return parse_xls(file_data, filename).rows
+            yield from pick(_open_data_streams(io.BytesIO(file_data), source_name, source_ext, spill_dir))
+            return
         except Exception as e:
             logger.warning(f"[Import] Could not re-parse {filename} from {matching_path}: {e}")
 
-    # Second try: look for a ZIP in file_paths and extract the CSV from it
+    # Second try: look for a ZIP in file_paths and stream the file out of it
     zip_path = next((p for p in file_paths if p.endswith(".zip")), None)
     if zip_path:
         try:
             zip_data = sb.storage.from_("vessel-imports").download(zip_path)
-            zip_result = parse_zip(zip_data, os.path.basename(zip_path))
-            for pr in zip_result["parse_results"]:
-                if pr.filename == filename:
-                    return pr.rows
+            zf, _ = open_zip(zip_data, os.path.basename(zip_path))
+            if zf is not None:
+                with zf:
+                    for basename, ext, info in list_zip_members(zf)["data_files"]:
+                        if basename == source_name:
+                            yield from pick(stream_zip_member(zf, info, basename, ext, spill_dir=spill_dir))
+                            return
             logger.warning(f"[Import] File '{filename}' not found inside ZIP")
         except Exception as e:
             logger.warning(f"[Import] Could not extract {filename} from ZIP: {e}")
 
-    return []
 
 def _parse_result_to_dict(result: ParseResult, source: str = "generic") -> dict:
     """Convert ParseResult to JSON-serializable dict for detection_result.
@@ -7,18 +7,29 @@ Frontend (Vercel) calls these endpoints since it only has access to Master DB.
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from typing import Optional, List
-from datetime import datetime, date, timedelta
-from pathlib import Path
+from datetime import datetime, date
+import asyncio
 import logging
 import hashlib
-import hmac as _hmac
 import json
 import os
 from uuid import uuid4
 from pydantic import BaseModel
 
+from integrations.supabase import aexecute
+from lib.pagination import InvalidCursor, PageRequest, total_count_key
 from middleware.auth import get_authenticated_user
 from middleware.vessel_access import resolve_yacht_id
+from services.ledger_export import (
+    LEDGER_EXPORT_BUCKET,
+    SIGNED_URL_TTL_SECONDS,
+    LedgerExportSpec,
+    apply_export_filters,
+    get_export_job,
+    mask_export_id,
+    start_ledger_export,
+)
+from services.seal_queue import find_seal_job
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +46,8 @@ router = APIRouter(prefix="/v1/ledger", tags=["ledger"])
 async def get_ledger_events(
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="Opaque next_cursor from the previous page (keyset; overrides offset)"),
+    include_total: bool = Query(default=False, description="Include an estimated, cached total"),
     user_id: Optional[str] = Query(default=None, description="Filter by specific user_id (for 'Me' view)"),
     action: Optional[str] = Query(default=None, description="Filter by action: add_note, artefact_opened, etc."),
     date_from: Optional[str] = Query(default=None, description="Start date (YYYY-MM-DD)"),
@@ -47,15 +60,27 @@ async def get_ledger_events(
     Returns events in reverse chronological order.
     - If user_id is provided, filters to only that user's events (Me view)
     - If user_id is not provided, returns all yacht events (Department view)
+    - Pass the returned next_cursor back as ``cursor`` for constant-cost
+      deep pages; ``offset`` is kept for older clients.
     """
     try:
         tenant_alias = user_context.get("tenant_key_alias", "")
         yacht_id = resolve_yacht_id(user_context, yacht_id)
 
+        page = PageRequest.from_params({
+            "limit": limit,
+            "offset": offset,
+            "cursor": cursor,
+            "include_total": include_total,
+        }, default_order="created_at")
+        count_key = total_count_key("ledger_events", yacht_id, {
+            "user_id": user_id, "action": action, "date_from": date_from, "date_to": date_to,
+        })
+
         db_client = _get_tenant_client(tenant_alias)
 
         # Build query
-        query = db_client.table("ledger_events").select("*")
+        query = db_client.table("ledger_events").select("*", count=page.count_method(count_key))
 
         # Filter by yacht (RLS should handle this, but be explicit)
         query = query.eq("yacht_id", yacht_id)
@@ -74,21 +99,26 @@ async def get_ledger_events(
         if date_to:
             query = query.lte("created_at", f"{date_to}T23:59:59Z")
 
-        # Order and paginate (use created_at since that's the actual column)
-        query = query.order("created_at", desc=True)
-        query = query.range(offset, offset + limit - 1)
+        # Order by (created_at, id) and seek past the cursor (or offset)
+        query = page.apply(query)
 
         result = query.execute()
+        events = result.data or []
 
-        return {
+        response = {
             "success": True,
-            "events": result.data or [],
-            "count": len(result.data or []),
-            "offset": offset,
+            "events": events,
+            "count": len(events),
+            "offset": page.offset,
             "limit": limit,
-            "has_more": len(result.data or []) == limit
+            **page.meta(events),
         }
+        if include_total:
+            response["total"] = page.total(count_key, result, events)
+        return response
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -335,6 +365,7 @@ async def record_read_event(
 async def get_ledger_timeline(
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
     event_category: Optional[str] = None,
     yacht_id: Optional[str] = Query(default=None, description="Vessel scope (fleet users)"),
     user_context: dict = Depends(get_authenticated_user),
@@ -357,6 +388,14 @@ async def get_ledger_timeline(
     user_role    = user_context.get("role", "")
     department   = user_context.get("department", "")
 
+    try:
+        page = PageRequest.from_params(
+            {"limit": limit, "offset": offset, "cursor": cursor, "include_total": False},
+            default_order="created_at",
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     db_client = _get_tenant_client(tenant_alias)
 
     query = db_client.table("ledger_events") \
@@ -382,155 +421,13 @@ async def get_ledger_timeline(
     if event_category:
         query = query.eq("event_category", event_category)
 
-    result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
-    return {"success": True, "events": result.data, "total": len(result.data)}
+    result = page.apply(query).execute()
+    events = result.data or []
+    return {"success": True, "events": events, "total": len(events), **page.meta(events)}
 
 
 # ── Export helpers ─────────────────────────────────────────────────────────────
 
-# Fields stripped from embedded JSON before export.
-# Rationale for each:
-#   user_id, yacht_id, entity_id  — replaced by HMAC refs (actor_ref, vessel_ref, entity_ref)
-#   id                            — raw event UUID; no tenant/user info but zero reason to expose
-#   session_id                    — internal session correlation, not evidence-relevant
-#   day_anchor_id                 — internal chain anchor FK, not evidence-relevant
-#   related_event_ids             — internal cross-reference UUIDs; if populated would leak event IDs
-_STRIP_FIELDS = frozenset({
-    "user_id", "yacht_id", "entity_id",
-    "id", "session_id", "day_anchor_id", "related_event_ids",
-})
-
-
-def _mask_export_id(raw_id: str, secret: str) -> str:
-    """HMAC-SHA256 mask for external-facing export identifiers.
-
-    Unlike plain SHA-256, requires knowing EXPORT_HMAC_SECRET to reproduce.
-    An attacker who obtains raw UUIDs cannot verify they match refs in an
-    exported PDF without the server-side key.
-    """
-    return _hmac.new(
-        secret.encode("utf-8"),
-        str(raw_id).encode("utf-8"),
-        hashlib.sha256,
-    ).hexdigest()
-
-
-def _build_ledger_pdf(
-    events: list,
-    export_id: str,
-    vessel_name: str,
-    date_from: str,
-    date_to: str,
-    requester_name: str,
-    scope_label: str,
-    export_secret: str,
-) -> bytes:
-    """
-    Build a PDF with embedded ledger_events.json attachment (PyMuPDF stage).
-
-    IDs masked with HMAC-SHA256 before embedding:
-      user_id   → actor_ref   (replaces, stripped from output)
-      yacht_id  → vessel_ref  (replaces, stripped from output)
-      entity_id → entity_ref  (replaces, stripped from output)
-
-    Additionally stripped: id, session_id, day_anchor_id, related_event_ids
-    See _STRIP_FIELDS for documented rationale.
-
-    The cover page carries human-readable actor_name/email by design —
-    evidence without attribution is worthless. The export preview UI
-    must tell the operator this before they confirm.
-    """
-    import fitz  # PyMuPDF — imported here to keep workers from loading it
-
-    # ── Mask and strip ──
-    masked_events = []
-    for e in events:
-        masked = {k: v for k, v in e.items() if k not in _STRIP_FIELDS}
-        masked["actor_ref"]  = _mask_export_id(e.get("user_id",   ""), export_secret)
-        masked["vessel_ref"] = _mask_export_id(e.get("yacht_id",  ""), export_secret)
-        masked["entity_ref"] = _mask_export_id(e.get("entity_id", ""), export_secret)
-        masked["event_timestamp"] = masked.pop("created_at", None) or masked.get("event_timestamp")
-        masked_events.append(masked)
-
-    # Chronological order for JSON (verifier checks this)
-    masked_events.sort(key=lambda e: e.get("event_timestamp") or "")
-    json_bytes = json.dumps(masked_events, sort_keys=True, ensure_ascii=False, indent=2).encode("utf-8")
-
-    # ── Cover page ──
-    _FONT_DIR = Path(__file__).parent.parent / "evidence" / "fonts"
-    doc = fitz.open()
-    page = doc.new_page(width=595, height=842)
-
-    # Embed Inter — required for PDF/A-3 (Helvetica is never embedded)
-    page.insert_font(fontname="Inter",     fontfile=str(_FONT_DIR / "Inter-Regular.ttf"))
-    page.insert_font(fontname="InterBold", fontfile=str(_FONT_DIR / "Inter-Bold.ttf"))
-
-    page.draw_rect(fitz.Rect(0, 0, 595, 4), color=None, fill=(0.18, 0.73, 0.91))
-
-    y = 48
-    def line(text: str, size: int = 10, bold: bool = False, color=(0.13, 0.13, 0.13), indent: int = 48):
-        nonlocal y
-        page.insert_text(fitz.Point(indent, y), text,
-                         fontsize=size, color=color,
-                         fontname="InterBold" if bold else "Inter")
-        y += size * 1.55
-
-    line("Ledger Evidence Export", size=22, bold=True, color=(0.08, 0.08, 0.08))
-    line(vessel_name, size=14, color=(0.12, 0.72, 0.9))
-    y += 12
-
-    line("PERIOD", size=8, color=(0.55, 0.55, 0.55))
-    line(f"{date_from}  ·  {date_to}", size=11)
-    y += 6
-
-    line("REQUESTED BY", size=8, color=(0.55, 0.55, 0.55))
-    line(scope_label, size=11)
-    y += 6
-
-    line("EXPORT ID", size=8, color=(0.55, 0.55, 0.55))
-    line(export_id, size=9, color=(0.40, 0.40, 0.40))
-    y += 6
-
-    line("GENERATED", size=8, color=(0.55, 0.55, 0.55))
-    line(datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"), size=9, color=(0.40, 0.40, 0.40))
-    y += 16
-
-    line(f"Events: {len(masked_events)}", size=10)
-    y += 20
-
-    page.draw_line(fitz.Point(48, y), fitz.Point(547, y), color=(0.88, 0.88, 0.88), width=0.5)
-    y += 16
-
-    # Explicit disclosure — operator must see this before confirming export
-    line("DISCLOSURE", size=8, bold=True, color=(0.55, 0.55, 0.55))
-    y += 2
-    line("Actor names and email addresses appear in readable form in the embedded JSON", size=8, color=(0.55, 0.55, 0.55))
-    line("and on this cover. This is by design: evidence without attribution is not", size=8, color=(0.55, 0.55, 0.55))
-    line("evidence. Database identifiers (user_id, yacht_id, entity_id) are replaced", size=8, color=(0.55, 0.55, 0.55))
-    line("with HMAC-SHA256 refs and do not appear anywhere in this document.", size=8, color=(0.55, 0.55, 0.55))
-    y += 8
-
-    line("ID MASKING", size=8, bold=True, color=(0.55, 0.55, 0.55))
-    y += 2
-    line("actor_ref, vessel_ref, entity_ref are HMAC-SHA256(id, EXPORT_HMAC_SECRET).", size=8, color=(0.55, 0.55, 0.55))
-    line("Same actor = same actor_ref across all events. Cross-event correlation", size=8, color=(0.55, 0.55, 0.55))
-    line("is preserved. Verification: verify.celeste7.ai", size=8, color=(0.55, 0.55, 0.55))
-    y += 8
-
-    line("SIGNATURE STATUS", size=8, bold=True, color=(0.55, 0.55, 0.55))
-    y += 2
-    line("v0.1 staging: proof_hash chain only. PAdES-B-LT + RFC 3161 timestamp planned v1.0.", size=8, color=(0.55, 0.55, 0.55))
-    line("Public certificate: celeste7.ai/.well-known/verify.pem", size=8, color=(0.55, 0.55, 0.55))
-
-    # ── Embed JSON ──
-    doc.embfile_add("ledger_events.json", json_bytes, desc="CelesteOS Ledger Events")
-
-    pdf_bytes = doc.tobytes(garbage=4, deflate=True)
-    doc.close()
-
-    return pdf_bytes
-
-
 # ── Export schema ──────────────────────────────────────────────────────────────
 
 class LedgerExportRequest(BaseModel):
@@ -607,7 +504,7 @@ async def get_export_actors(
             uid = row.get("user_id", "")
             if uid not in seen:
                 seen[uid] = {
-                    "actor_ref":  _mask_export_id(uid, export_secret),
+                    "actor_ref":  mask_export_id(uid, export_secret),
                     "actor_name": row.get("actor_name") or row.get("user_role") or "Unknown",
                     "user_role":  row.get("user_role", ""),
                 }
@@ -620,13 +517,18 @@ async def get_export_actors(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/export")
+@router.post("/export", status_code=202)
 async def create_ledger_export(
     payload: LedgerExportRequest,
     user_context: dict = Depends(get_authenticated_user),
 ):
     """
-    Generate a ledger evidence PDF with embedded JSON.
+    Start a ledger evidence PDF export (PDF with embedded JSON).
+
+    The export runs as a background job (services/ledger_export.py): events
+    are keyset-paged, rendered in the render pool, optionally sealed and
+    streamed to storage. Poll GET /v1/ledger/export/{export_id} for progress
+    and the download URL.
 
     IDs masked: user_id→actor_ref, yacht_id→vessel_ref, entity_id→entity_ref
     Storage path: {hmac(yacht_id)[:16]}/{export_id}.pdf  (no raw UUID in path)
@@ -647,8 +549,8 @@ async def create_ledger_export(
 
         db_client = _get_tenant_client(tenant_alias)
 
-        vessel_row = db_client.table("yacht_registry").select("name") \
-            .eq("id", str(resolved_yid)).maybe_single().execute()
+        vessel_row = await aexecute(db_client.table("yacht_registry").select("name")
+                                    .eq("id", str(resolved_yid)).maybe_single())
         vessel_name = (vessel_row.data or {}).get("name", "Unknown Vessel") if vessel_row else "Unknown Vessel"
 
         requester_name = user_context.get("email") or user_context.get("name") or str(user_id)
@@ -662,155 +564,130 @@ async def create_ledger_export(
         else:
             scope_label = f"All crew · requested by {requester_name}"
 
-        # ── Fetch events ──
-        query = db_client.table("ledger_events").select("*") \
-            .eq("yacht_id", str(resolved_yid)) \
-            .gte("created_at", f"{payload.date_from}T00:00:00Z") \
-            .lte("created_at", f"{payload.date_to}T23:59:59Z")
-
-        if payload.scope == "me":
-            query = query.eq("user_id", payload.scope_user_id or str(user_id))
-        elif payload.scope == "department" and user_role not in ("captain",):
-            query = query.eq("department", user_context.get("department", ""))
-
-        events_result = query.order("created_at", desc=False).execute()
-        events = events_result.data or []
+        spec = LedgerExportSpec(
+            yacht_id=str(resolved_yid),
+            user_id=str(user_id),
+            user_role=user_role,
+            department=user_context.get("department", ""),
+            requester_name=requester_name,
+            scope=payload.scope,
+            scope_label=scope_label,
+            date_from=payload.date_from,
+            date_to=payload.date_to,
+            vessel_name=vessel_name,
+            export_secret=export_secret,
+            filter_user_id=(payload.scope_user_id or str(user_id)) if payload.scope == "me" else None,
+            filter_department=(
+                user_context.get("department", "")
+                if payload.scope == "department" and user_role not in ("captain",) else None
+            ),
+            scope_user_id=scope_user_id,
+        )
 
-        if not events:
+        # ── Cheap existence check so an empty scope still fails fast ──
+        probe = await aexecute(
+            apply_export_filters(db_client.table("ledger_events").select("id"), spec).limit(1)
+        )
+        if not probe.data:
             raise HTTPException(
                 status_code=404,
                 detail="No ledger events found for the requested scope and date range"
             )
 
-        # ── Generate PDF (+ optional v1.0 sealing) ──
         export_id = str(uuid4())
-        pdf_bytes = _build_ledger_pdf(
-            events=events,
-            export_id=export_id,
-            vessel_name=vessel_name,
-            date_from=payload.date_from,
-            date_to=payload.date_to,
-            requester_name=requester_name,
-            scope_label=scope_label,
-            export_secret=export_secret,
-        )
+        job = start_ledger_export(db_client, spec, export_id)
 
-        sealing_info = None
-        is_sealed = os.environ.get("LEDGER_EXPORT_SEAL", "false").lower() == "true"
-        if is_sealed:
-            try:
-                import asyncio
-                from functools import partial
-                from evidence.sealing import seal_export, SealingError
-                loop = asyncio.get_event_loop()
-                pdf_bytes, sealing_info = await loop.run_in_executor(
-                    None, partial(seal_export, pdf_bytes)
-                )
-                logger.info(
-                    f"[Ledger] Export {export_id} sealed — "
-                    f"sha256={sealing_info.pdf_sha256[:16]}… "
-                    f"tsa={sealing_info.tsa_authority}"
-                )
-            except Exception as seal_err:
-                # Raise — never return an unsealed document when sealing is expected.
-                # Caller must investigate; half-sealed state is unacceptable.
-                logger.error(f"[Ledger] Sealing failed for {export_id}: {seal_err}", exc_info=True)
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Sealing failed: {seal_err}. Export aborted — no document was stored."
-                )
-
-        # ── HMAC storage path — no raw UUID visible in any signed URL ──
-        vessel_folder = _mask_export_id(str(resolved_yid), export_secret)[:16]
-        storage_path  = f"{vessel_folder}/{export_id}.pdf"
-
-        # ── Upload ──
-        storage = db_client.storage.from_("ledger-exports")
-        storage.upload(
-            path=storage_path,
-            file=pdf_bytes,
-            file_options={"content-type": "application/pdf", "cache-control": "no-store"},
-        )
-
-        signed = storage.create_signed_url(storage_path, expires_in=3600)
-        download_url = signed.get("signedURL") or signed.get("signedUrl") or ""
-
-        # ── Record ──
-        insert_row = {
-            "id":                   export_id,
-            "yacht_id":             str(resolved_yid),
-            "requested_by_user_id": str(user_id),
-            "requested_by_role":    user_role or "member",
-            "requested_by_dept":    user_context.get("department", ""),
-            "requested_by_name":    requester_name,
-            "scope_user_id":        scope_user_id,
-            "scope_department":     user_context.get("department", "") if payload.scope == "department" else None,
-            "date_from":            payload.date_from,
-            "date_to":              payload.date_to,
-            "event_count":          len(events),
-            "storage_bucket":       "ledger-exports",
-            "storage_path":         storage_path,
-            "file_name":            f"celeste-evidence-{export_id[:8]}.pdf",
-            "file_size_bytes":      len(pdf_bytes),
-            "export_status":        "completed",
-            "generated_at":         datetime.utcnow().isoformat(),
+        return {
+            "success":    True,
+            "status_url": f"/v1/ledger/export/{export_id}",
+            **job.to_dict(),
         }
-        if sealing_info is not None:
-            insert_row["content_hash"]     = sealing_info.pdf_sha256
-            insert_row["tsa_authority"]    = sealing_info.tsa_authority
-            insert_row["cert_fingerprint"] = sealing_info.cert_fingerprint
-        db_client.table("ledger_exports").insert(insert_row).execute()
 
-        # ── Ledger event ── record the export action in the activity log
-        try:
-            db_client.table("ledger_events").insert({
-                "yacht_id":       str(resolved_yid),
-                "user_id":        str(user_id),
-                "event_type":     "mutation",
-                "entity_type":    "ledger_export",
-                "entity_id":      str(export_id),
-                "action":         "export_generated",
-                "change_summary": f"Evidence PDF exported — {len(events)} events ({payload.scope}), {'sealed' if is_sealed else 'unsigned'}",
-                "metadata":       {"event_count": len(events), "scope": payload.scope, "sealed": is_sealed},
-            }).execute()
-        except Exception as _ev_err:
-            logger.warning(f"[Ledger] Export ledger event insert failed: {_ev_err}")
-
-        # ── Notify ── fire-and-forget; never blocks the export response
-        try:
-            db_client.table("ledger_notifications").insert({
-                "yacht_id":           str(resolved_yid),
-                "user_id":            str(user_id),
-                "export_id":          export_id,
-                "notification_type":  "export_complete",
-                "event_count":        len(events),
-                "sealed":             is_sealed,
-                "download_url":       download_url,
-                "expires_at":         (datetime.utcnow() + timedelta(seconds=3600)).isoformat(),
-                "is_read":            False,
-            }).execute()
-        except Exception as _notif_err:
-            logger.warning(f"[Ledger] Notification insert failed: {_notif_err}")
-
-        logger.info(
-            f"[Ledger] Export {export_id} — {len(events)} events, "
-            f"{len(pdf_bytes):,} bytes, sealed={is_sealed}"
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[Ledger] export failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+
+@router.get("/export/{export_id}")
+async def get_ledger_export_status(
+    export_id: str,
+    yacht_id: Optional[str] = Query(default=None),
+    user_context: dict = Depends(get_authenticated_user),
+):
+    """
+    Progress of an export started by the caller.
+
+    status: queued | fetching | rendering | sealing | uploading | completed | failed
+    Completed exports carry download_url; exports finished on another worker
+    are found through their ledger_exports row (with a fresh signed URL), and
+    exports still waiting on the sealing worker through their seal job.
+    """
+    resolved_yid = str(resolve_yacht_id(user_context, yacht_id))
+    user_id      = str(user_context.get("user_id") or user_context.get("sub"))
+
+    job = get_export_job(export_id)
+    if job is not None:
+        if job.yacht_id != resolved_yid or job.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Export not found")
+        return {"success": job.status != "failed", **job.to_dict()}
+
+    try:
+        db_client = _get_tenant_client(user_context.get("tenant_key_alias", ""))
+        result = await aexecute(
+            db_client.table("ledger_exports")
+            .select("id, event_count, file_size_bytes, storage_bucket, storage_path, export_status, tsa_authority, cert_fingerprint")
+            .eq("id", export_id)
+            .eq("yacht_id", resolved_yid)
+            .eq("requested_by_user_id", user_id)
+            .limit(1)
         )
+        row = (result.data or [None])[0]
+        if not row:
+            return await _seal_job_status(db_client, export_id, resolved_yid, user_id)
 
+        storage = db_client.storage.from_(row.get("storage_bucket") or LEDGER_EXPORT_BUCKET)
+        signed = await asyncio.to_thread(storage.create_signed_url, row["storage_path"], SIGNED_URL_TTL_SECONDS)
         return {
             "success":          True,
             "export_id":        export_id,
-            "event_count":      len(events),
-            "file_size_bytes":  len(pdf_bytes),
-            "download_url":     download_url,
-            "storage_path":     storage_path,
-            "sealed":           is_sealed,
-            "tsa_authority":    sealing_info.tsa_authority if sealing_info else None,
-            "cert_fingerprint": sealing_info.cert_fingerprint if sealing_info else None,
+            "status":           row.get("export_status") or "completed",
+            "events_exported":  row.get("event_count"),
+            "error":            None,
+            "event_count":      row.get("event_count"),
+            "file_size_bytes":  row.get("file_size_bytes"),
+            "download_url":     signed.get("signedURL") or signed.get("signedUrl") or "",
+            "storage_path":     row["storage_path"],
+            "sealed":           bool(row.get("tsa_authority")),
+            "tsa_authority":    row.get("tsa_authority"),
+            "cert_fingerprint": row.get("cert_fingerprint"),
         }
-
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[Ledger] export failed: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+        logger.error(f"[Ledger] export status failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _seal_job_status(db_client, export_id: str, yacht_id: str, user_id: str) -> dict:
+    """Status of an export owned by another API worker that is still being sealed."""
+    seal_job = await find_seal_job(db_client, export_id, yacht_id)
+    if not seal_job or str(seal_job.get("requested_by")) != user_id:
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    if seal_job["status"] in ("pending", "sealing"):
+        status, error = "sealing", None
+    elif seal_job["status"] == "failed":
+        status, error = "failed", f"Sealing failed: {seal_job.get('error')}. Export aborted — no document was stored."
+    else:
+        # Sealed, but the export was never recorded (its API worker went away)
+        status, error = "failed", "Export interrupted before it was recorded. Please export again."
+    return {
+        "success":         status != "failed",
+        "export_id":       export_id,
+        "status":          status,
+        "events_exported": None,
+        "error":           error,
+        "seal_job_id":     seal_job["id"],
+    }
@@ -21,7 +21,7 @@ from middleware.auth import get_authenticated_user
 from middleware.vessel_access import resolve_yacht_id
 
 # Centralized Supabase client factory
-from integrations.supabase import get_tenant_client
+from integrations.supabase import get_async_tenant_client
 
 # Orchestration layer
 from orchestration import (
@@ -132,7 +132,7 @@ def get_orchestrator() -> SearchOrchestrator:
     return _orchestrator
 
 
-# NOTE: get_tenant_client is imported from integrations.supabase
+# NOTE: get_async_tenant_client is imported from integrations.supabase
 
 
 # =============================================================================
@@ -193,7 +193,7 @@ async def orchestrated_search(
 
         # Get tenant client and execute
         execute_start = time.time()
-        client = get_tenant_client(tenant_key_alias)
+        client = get_async_tenant_client(tenant_key_alias)
         executor = PlanExecutor(client, yacht_id)
         execution_result = await executor.execute(result.plan)
         execute_time = (time.time() - execute_start) * 1000
@@ -11,9 +11,10 @@ PDF structure:
   - Accepted line items table: # / Description / Part No. / Qty / Unit Price / Total
   - Denied items section (with denial reasons)
   - Totals (accepted items only)
-  - Footer: generated timestamp + system label
+  - Footer: generated timestamp + system label (every page)
 """
 
+import asyncio
 import logging
 import io
 from datetime import datetime, timezone
@@ -25,6 +26,8 @@ from db import get_supabase_client
 from routes.auth import get_authenticated_user
 from utils.yacht_resolver import resolve_yacht_id
 from handlers.purchase_order_handlers import fetch_po_for_pdf
+from services.pdf_render import PdfCanvas, page_chrome
+from services.render_pool import run_render
 
 logger = logging.getLogger(__name__)
 
@@ -75,13 +78,9 @@ def _fmt_date(iso: str) -> str:
 
 
 def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
+    """Lay out the purchase order PDF. Runs in the render pool (see services.pdf_render)."""
     import fitz  # PyMuPDF
 
-    from pathlib import Path
-    font_dir = Path(__file__).parent.parent / "assets" / "fonts"
-    inter_regular = str(font_dir / "Inter-Regular.ttf") if (font_dir / "Inter-Regular.ttf").exists() else None
-    inter_bold    = str(font_dir / "Inter-Bold.ttf")    if (font_dir / "Inter-Bold.ttf").exists()    else None
-
     currency = po.get("currency", "USD")
     po_number = po.get("po_number") or "PO"
     status = (po.get("status") or "draft").upper()
@@ -96,39 +95,33 @@ def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
     accepted = [i for i in items if (i.get("line_status") or "accepted") != "denied"]
     denied   = [i for i in items if (i.get("line_status") or "accepted") == "denied"]
 
-    doc = fitz.open()
-    page = doc.new_page(width=PAGE_W, height=PAGE_H)
-
-    if inter_regular:
-        page.insert_font(fontname="Inter",     fontfile=inter_regular)
-        page.insert_font(fontname="InterBold", fontfile=inter_bold)
-    font      = "InterBold" if inter_bold else "helv"
-    font_reg  = "Inter"     if inter_regular else "helv"
+    canvas = PdfCanvas(
+        PAGE_W, PAGE_H,
+        chrome=page_chrome(PAGE_W, PAGE_H, TEAL),
+        footer=f"Generated {_now_label()} · CelesteOS PMS · {po_number}",
+    )
+    canvas.new_page()
 
     def hrule(y_pos, lw=0.4, col=BORDER):
-        page.draw_line(fitz.Point(MARGIN, y_pos), fitz.Point(PAGE_W - MARGIN, y_pos), color=col, width=lw)
+        canvas.page.draw_line(fitz.Point(MARGIN, y_pos), fitz.Point(PAGE_W - MARGIN, y_pos), color=col, width=lw)
 
-    # ── Header bar ───────────────────────────────────────────────────────────
-    page.draw_rect(fitz.Rect(0, 0, PAGE_W, 5), color=None, fill=TEAL)
+    # ── Header (accent bar comes from the page chrome) ───────────────────────
     y = 28
-    page.insert_text(fitz.Point(MARGIN, y), "PURCHASE ORDER",
-                     fontsize=7, fontname=font, color=GREY)
-    page.insert_text(fitz.Point(MARGIN, y + 14), po_number,
-                     fontsize=18, fontname=font, color=DARK)
-    page.insert_text(fitz.Point(PAGE_W - MARGIN - 80, y + 14), status,
-                     fontsize=9, fontname=font,
-                     color=TEAL if status not in ("CANCELLED", "DRAFT") else GREY)
+    canvas.text(MARGIN, y, "PURCHASE ORDER", size=7, bold=True, color=GREY)
+    canvas.text(MARGIN, y + 14, po_number, size=18, bold=True, color=DARK)
+    canvas.text(PAGE_W - MARGIN - 80, y + 14, status, size=9, bold=True,
+                color=TEAL if status not in ("CANCELLED", "DRAFT") else GREY)
     y += 38
 
     # ── Vessel + supplier ────────────────────────────────────────────────────
     hrule(y)
     y += 10
     half = (PAGE_W - 2 * MARGIN) / 2
-    page.insert_text(fitz.Point(MARGIN, y), "VESSEL", fontsize=7, fontname=font, color=GREY)
-    page.insert_text(fitz.Point(MARGIN + half, y), "SUPPLIER", fontsize=7, fontname=font, color=GREY)
+    canvas.text(MARGIN, y, "VESSEL", size=7, bold=True, color=GREY)
+    canvas.text(MARGIN + half, y, "SUPPLIER", size=7, bold=True, color=GREY)
     y += 10
-    page.insert_text(fitz.Point(MARGIN, y), vessel_name[:36], fontsize=10, fontname=font, color=DARK)
-    page.insert_text(fitz.Point(MARGIN + half, y), supplier[:36], fontsize=10, fontname=font_reg, color=DARK)
+    canvas.text(MARGIN, y, vessel_name[:36], size=10, bold=True, color=DARK)
+    canvas.text(MARGIN + half, y, supplier[:36], size=10, color=DARK)
     y += 16
 
     # ── Meta row ────────────────────────────────────────────────────────────
@@ -142,31 +135,27 @@ def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
     col_w = (PAGE_W - 2 * MARGIN) / len(meta_cols)
     for i, (lbl, val) in enumerate(meta_cols):
         x = MARGIN + i * col_w
-        page.insert_text(fitz.Point(x, y), lbl, fontsize=7, fontname=font, color=GREY)
-        page.insert_text(fitz.Point(x, y + 10), val, fontsize=9, fontname=font_reg, color=DARK)
+        canvas.text(x, y, lbl, size=7, bold=True, color=GREY)
+        canvas.text(x, y + 10, val, size=9, color=DARK)
     y += 26
 
     # ── Tracking block (only if present) ─────────────────────────────────────
     if tracking_number or delivery_start:
         hrule(y, col=(0.85, 0.85, 0.85))
         y += 8
-        page.insert_text(fitz.Point(MARGIN, y), "TRACKING / DELIVERY",
-                         fontsize=7, fontname=font, color=TEAL)
+        canvas.text(MARGIN, y, "TRACKING / DELIVERY", size=7, bold=True, color=TEAL)
         y += 10
         if tracking_number:
-            page.insert_text(fitz.Point(MARGIN, y),
-                             f"Tracking: {tracking_number}" + (f"  via {carrier}" if carrier else ""),
-                             fontsize=9, fontname=font_reg, color=DARK)
+            canvas.text(MARGIN, y,
+                        f"Tracking: {tracking_number}" + (f"  via {carrier}" if carrier else ""),
+                        size=9, color=DARK)
             y += 12
         if delivery_start and delivery_end:
-            page.insert_text(fitz.Point(MARGIN, y),
-                             f"Expected delivery: {delivery_start} – {delivery_end}",
-                             fontsize=9, fontname=font_reg, color=DARK)
+            canvas.text(MARGIN, y, f"Expected delivery: {delivery_start} – {delivery_end}",
+                        size=9, color=DARK)
             y += 12
         elif delivery_start:
-            page.insert_text(fitz.Point(MARGIN, y),
-                             f"Expected from: {delivery_start}",
-                             fontsize=9, fontname=font_reg, color=DARK)
+            canvas.text(MARGIN, y, f"Expected from: {delivery_start}", size=9, color=DARK)
             y += 12
 
     # ── Line items table ──────────────────────────────────────────────────────
@@ -184,7 +173,7 @@ def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
     RIGHT  = PAGE_W - MARGIN
 
     def th(txt, x):
-        page.insert_text(fitz.Point(x, y), txt, fontsize=7, fontname=font, color=GREY)
+        canvas.text(x, y, txt, size=7, bold=True, color=GREY)
 
     th("#",          C_NUM)
     th("DESCRIPTION",C_DESC)
@@ -202,11 +191,7 @@ def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
     for idx, item in enumerate(accepted, start=1):
         if y > PAGE_H - 120:
             # New page
-            page = doc.new_page(width=PAGE_W, height=PAGE_H)
-            if inter_regular:
-                page.insert_font(fontname="Inter",     fontfile=inter_regular)
-                page.insert_font(fontname="InterBold", fontfile=inter_bold)
-            page.draw_rect(fitz.Rect(0, 0, PAGE_W, 5), color=None, fill=TEAL)
+            canvas.new_page()
             y = 22
             th("#",          C_NUM)
             th("DESCRIPTION",C_DESC)
@@ -215,12 +200,12 @@ def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
             th("UNIT PRICE", C_UP)
             th("TOTAL",      C_TOT)
             y += 4
-            page.draw_line(fitz.Point(MARGIN, y), fitz.Point(RIGHT, y), color=BORDER, width=0.4)
+            canvas.page.draw_line(fitz.Point(MARGIN, y), fitz.Point(RIGHT, y), color=BORDER, width=0.4)
             y += 8
 
         if idx % 2 == 0:
-            page.draw_rect(fitz.Rect(MARGIN - 2, y - ROW_H + 3, RIGHT + 2, y + 3),
-                           color=None, fill=(0.97, 0.97, 0.97))
+            canvas.page.draw_rect(fitz.Rect(MARGIN - 2, y - ROW_H + 3, RIGHT + 2, y + 3),
+                                  color=None, fill=(0.97, 0.97, 0.97))
 
         qty = item.get("quantity_ordered") or item.get("quantity") or 0
         up  = item.get("unit_price")
@@ -236,8 +221,7 @@ def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
         partno = (item.get("part_number") or "—")[:14]
 
         def td(txt, x, bold=False, col=None):
-            page.insert_text(fitz.Point(x, y), str(txt) if txt is not None else "—",
-                             fontsize=8, fontname=font if bold else font_reg, color=col or DARK)
+            canvas.text(x, y, str(txt) if txt is not None else "—", size=8, bold=bold, color=col or DARK)
 
         td(str(idx),              C_NUM,  bold=True)
         td(desc,                  C_DESC)
@@ -253,63 +237,39 @@ def _build_po_pdf(po: dict, items: list, vessel_name: str) -> bytes:
     y += 10
     denied_count = len(denied)
     if denied_count:
-        page.insert_text(fitz.Point(C_UP - 40, y),
-                         f"({denied_count} line(s) denied — excluded from total)",
-                         fontsize=7, fontname=font_reg, color=RED)
+        canvas.text(C_UP - 40, y, f"({denied_count} line(s) denied — excluded from total)",
+                    size=7, color=RED)
         y += 12
-    page.insert_text(fitz.Point(C_UP - 20, y), "ORDER TOTAL",
-                     fontsize=8, fontname=font, color=GREY)
-    page.insert_text(fitz.Point(C_TOT, y), _fmt_price(accepted_total, currency),
-                     fontsize=10, fontname=font, color=DARK)
+    canvas.text(C_UP - 20, y, "ORDER TOTAL", size=8, bold=True, color=GREY)
+    canvas.text(C_TOT, y, _fmt_price(accepted_total, currency), size=10, bold=True, color=DARK)
     y += 18
 
     # ── Denied items section ──────────────────────────────────────────────────
     if denied:
         if y > PAGE_H - 100:
-            page = doc.new_page(width=PAGE_W, height=PAGE_H)
-            if inter_regular:
-                page.insert_font(fontname="Inter",     fontfile=inter_regular)
-                page.insert_font(fontname="InterBold", fontfile=inter_bold)
-            page.draw_rect(fitz.Rect(0, 0, PAGE_W, 5), color=None, fill=TEAL)
+            canvas.new_page()
             y = 30
 
         hrule(y, lw=0.6, col=RED)
         y += 10
-        page.insert_text(fitz.Point(MARGIN, y), "DENIED LINE ITEMS — NOT ORDERED",
-                         fontsize=8, fontname=font, color=RED)
+        canvas.text(MARGIN, y, "DENIED LINE ITEMS — NOT ORDERED", size=8, bold=True, color=RED)
         y += 12
 
         for item in denied:
             if y > PAGE_H - 60:
-                page = doc.new_page(width=PAGE_W, height=PAGE_H)
-                if inter_regular:
-                    page.insert_font(fontname="Inter",     fontfile=inter_regular)
-                    page.insert_font(fontname="InterBold", fontfile=inter_bold)
-                page.draw_rect(fitz.Rect(0, 0, PAGE_W, 5), color=None, fill=TEAL)
+                canvas.new_page()
                 y = 30
 
             desc = (item.get("description") or item.get("name") or "")[:40]
             reason = (item.get("denial_reason") or "No reason given")[:60]
-            page.draw_rect(fitz.Rect(MARGIN - 2, y - 10, PAGE_W - MARGIN + 2, y + 14),
-                           color=None, fill=RED_BG)
-            page.insert_text(fitz.Point(MARGIN, y), desc,
-                             fontsize=9, fontname=font, color=RED)
-            page.insert_text(fitz.Point(MARGIN, y + 11), f"Reason: {reason}",
-                             fontsize=8, fontname=font_reg, color=MID)
+            canvas.page.draw_rect(fitz.Rect(MARGIN - 2, y - 10, PAGE_W - MARGIN + 2, y + 14),
+                                  color=None, fill=RED_BG)
+            canvas.text(MARGIN, y, desc, size=9, bold=True, color=RED)
+            canvas.text(MARGIN, y + 11, f"Reason: {reason}", size=8, color=MID)
             y += 26
 
-    # ── Footer ────────────────────────────────────────────────────────────────
-    footer_y = PAGE_H - 28
-    page.draw_line(fitz.Point(MARGIN, footer_y - 8),
-                   fitz.Point(PAGE_W - MARGIN, footer_y - 8), color=BORDER, width=0.4)
-    page.insert_text(fitz.Point(MARGIN, footer_y),
-                     f"Generated {_now_label()} · CelesteOS PMS · {po_number}",
-                     fontsize=7, fontname=font_reg, color=GREY)
-
-    buf = io.BytesIO()
-    doc.save(buf)
-    doc.close()
-    return buf.getvalue()
+    # Footer rule and label come from the page chrome
+    return canvas.to_bytes()
 
 
 @router.get("/{po_id}/pdf")
@@ -323,12 +283,12 @@ async def export_purchase_order_pdf(
         yacht_id = resolve_yacht_id(auth, yacht_id)
         supabase = get_supabase_client()
 
-        pdf_data = fetch_po_for_pdf(supabase, po_id, yacht_id)
+        pdf_data = await asyncio.to_thread(fetch_po_for_pdf, supabase, po_id, yacht_id)
         po = pdf_data["po"]
         items = pdf_data["items"]
         vessel_name = pdf_data["vessel_name"]
 
-        pdf_bytes = _build_po_pdf(po, items, vessel_name)
+        pdf_bytes = await run_render(_build_po_pdf, po, items, vessel_name)
         filename = f"{po.get('po_number', po_id)}.pdf"
 
         return StreamingResponse(
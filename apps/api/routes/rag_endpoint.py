@@ -3,9 +3,15 @@ RAG API Endpoint
 ================
 
 POST /api/rag/answer
+POST /api/rag/answer/stream  (SSE)
 
 Generates answers from retrieved context with citations.
 
+The pipeline is fully async: retrieval runs on the shared asyncpg read pool
+and embedding / completion calls use the async OpenAI client, so one slow
+question never blocks the worker. The streaming variant emits the citations
+as soon as context is built and then the answer token by token.
+
 Request:
 {
     "query": "What are the compliance requirements for hours of rest?",
@@ -30,6 +36,12 @@ Response:
     }
 }
 
+Stream events:
+    citations  {"query_hash", "citations", "cached"}   - once context is built
+    token      {"text"}                                - answer deltas
+    done       <Response above>                        - final payload
+    error      {"query_hash", "answer", ...}
+
 Security:
 - yacht_id resolved from JWT, never from payload
 - Role-based context filtering
@@ -37,43 +49,31 @@ Security:
 - Read-only (RAG never mutates)
 """
 
-import os
 import json
-import hashlib
 import logging
 import time
-import psycopg2
-import psycopg2.extras
-from typing import Optional
-from datetime import datetime
-from contextlib import contextmanager
+from collections import OrderedDict
+from typing import AsyncIterator, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from fastapi.responses import JSONResponse
+from starlette.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 # Auth dependency
 from middleware.auth import get_authenticated_user
 from middleware.vessel_access import resolve_yacht_id
 
-# Database connection
-READ_DSN = os.getenv("READ_DB_DSN") or os.getenv("DATABASE_URL")
-
-@contextmanager
-def get_db_connection():
-    """Get database connection for RAG queries."""
-    if not READ_DSN:
-        raise ValueError("READ_DB_DSN or DATABASE_URL not configured")
-    conn = psycopg2.connect(READ_DSN)
-    try:
-        yield conn
-    finally:
-        conn.close()
+# Shared read pool, Redis connection and SSE framing from the F1 search layer
+from routes.f1_search_streaming import get_db_pool, get_redis, sse_event
 
 # Import RAG modules (path set by pipeline_service.py)
 from rag import (
+    RAGAnswer,
+    RAGContext,
     build_context,
     generate_answer,
+    stream_answer,
     verify_answer,
     generate_no_context_answer,
     generate_error_answer,
@@ -127,9 +127,11 @@ class RAGResponse(BaseModel):
 # CACHING
 # =============================================================================
 
-# Simple in-memory cache (use Redis in production)
-_cache: dict = {}
+# Redis is the shared cache across workers; a small per-process LRU backs it
+# when Redis is not configured or unavailable.
 CACHE_TTL_SECONDS = 300  # 5 minutes
+LOCAL_CACHE_MAX_SIZE = 256
+_cache: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
 
 
 def get_cache_key(yacht_id: str, role: str, lens: str, query_hash: str, dataset_version: str = "v1") -> str:
@@ -137,27 +139,144 @@ def get_cache_key(yacht_id: str, role: str, lens: str, query_hash: str, dataset_
     return f"rag:{dataset_version}:{yacht_id}:{role}:{lens}:{query_hash}"
 
 
-def get_cached_response(cache_key: str) -> Optional[dict]:
-    """Get cached response if valid."""
-    if cache_key in _cache:
-        entry = _cache[cache_key]
-        if time.time() - entry['timestamp'] < CACHE_TTL_SECONDS:
-            return entry['response']
-        else:
-            del _cache[cache_key]
+async def get_cached_response(cache_key: str) -> Optional[dict]:
+    """Get cached response if valid (Redis first, then the local LRU)."""
+    redis_conn = await get_redis()
+    if redis_conn:
+        try:
+            cached = await redis_conn.get(cache_key)
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning(f"RAG cache get error: {e}")
+
+    entry = _cache.get(cache_key)
+    if entry:
+        timestamp, response = entry
+        if time.time() - timestamp < CACHE_TTL_SECONDS:
+            _cache.move_to_end(cache_key)
+            return response
+        del _cache[cache_key]
     return None
 
 
-def set_cached_response(cache_key: str, response: dict):
-    """Cache a response."""
-    _cache[cache_key] = {
-        'response': response,
-        'timestamp': time.time()
+async def set_cached_response(cache_key: str, response: dict):
+    """Cache a response (Redis with TTL, else the bounded local LRU)."""
+    redis_conn = await get_redis()
+    if redis_conn:
+        try:
+            await redis_conn.set(cache_key, json.dumps(response), ex=CACHE_TTL_SECONDS)
+            return
+        except Exception as e:
+            logger.warning(f"RAG cache set error: {e}")
+
+    _cache[cache_key] = (time.time(), response)
+    _cache.move_to_end(cache_key)
+    while len(_cache) > LOCAL_CACHE_MAX_SIZE:
+        _cache.popitem(last=False)
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def detect_mode(query: str) -> Tuple[Optional[str], float, str]:
+    """Detect domain for focused retrieval: (domain, domain_boost, mode)."""
+    domain_result = detect_domain_from_query(query)
+    domain = domain_result[0] if domain_result else None
+    domain_boost = domain_result[1] if domain_result else 0.0
+    return domain, domain_boost, ('focused' if domain else 'explore')
+
+
+async def retrieve_context(
+    request: RAGRequest,
+    yacht_id: str,
+    role: str,
+    domain: Optional[str],
+    domain_boost: float,
+    mode: str,
+) -> RAGContext:
+    """Build context on a pooled connection (released before generation)."""
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        return await build_context(
+            conn=conn,
+            yacht_id=yacht_id,
+            query=request.query,
+            role=role,
+            lens=request.lens,
+            domain=domain,
+            mode=mode,
+            domain_boost=domain_boost,
+            top_k=request.top_k,
+        )
+
+
+def build_response(
+    request: RAGRequest,
+    context: RAGContext,
+    answer: RAGAnswer,
+    domain: Optional[str],
+    mode: str,
+    start_time: float,
+) -> dict:
+    """Response payload for an answered query."""
+    response_data = {
+        'answer': answer.answer,
+        'citations': context.get_citations(),
+        'used_doc_ids': answer.used_doc_ids,
+        'confidence': answer.confidence,
     }
 
+    # Verify faithfulness on every answer (monitoring; hash only in logs)
+    verification = verify_answer(answer, context) if context.chunks else None
+    if verification:
+        logger.info(
+            f"RAG faithfulness: query_hash={context.query_hash} "
+            f"score={verification.faithfulness_score:.2f} "
+            f"supported={verification.supported_sentences}/{verification.factual_sentences}"
+        )
+
+    if request.debug:
+        response_data['signals'] = {
+            'context_tokens': context.total_tokens,
+            'chunks_used': len(context.chunks),
+            'latency_ms': int((time.time() - start_time) * 1000),
+            'model': answer.model,
+            'domain': domain,
+            'mode': mode,
+            'faithfulness_score': verification.faithfulness_score if verification else None,
+        }
+
+    return response_data
+
+
+def build_error_response(request: RAGRequest, query_hash: str, e: Exception) -> dict:
+    """Log a pipeline failure (hash only) and build the error payload."""
+    import traceback
+    error_msg = str(e)
+    error_tb = traceback.format_exc()
+    logger.error(f"RAG error: query_hash={query_hash} error={error_msg}")
+    logger.error(f"RAG traceback: {error_tb}")
+
+    error_answer = generate_error_answer(request.query, query_hash, error_msg)
+    response_content = {
+        'answer': error_answer.answer,
+        'citations': [],
+        'used_doc_ids': [],
+        'confidence': 0.0,
+    }
+
+    # Include error details for debugging
+    if request.debug:
+        response_content['debug_error'] = error_msg
+        response_content['debug_traceback'] = error_tb[:500]
+
+    return response_content
+
 
 # =============================================================================
-# ENDPOINT
+# ENDPOINTS
 # =============================================================================
 
 @router.post("/answer", response_model=RAGResponse)
@@ -186,64 +305,25 @@ async def rag_answer(
 
     # Check cache
     cache_key = get_cache_key(yacht_id, role, request.lens, query_hash)
-    cached = get_cached_response(cache_key)
+    cached = await get_cached_response(cache_key)
     if cached:
         logger.info(f"RAG cache hit: {query_hash}")
         return JSONResponse(content=cached)
 
-    # Detect domain for focused retrieval
-    domain_result = detect_domain_from_query(request.query)
-    domain = domain_result[0] if domain_result else None
-    domain_boost = domain_result[1] if domain_result else 0.0
-    mode = 'focused' if domain else 'explore'
+    domain, domain_boost, mode = detect_mode(request.query)
 
     try:
-        # Get database connection and build context
-        with get_db_connection() as conn:
-            from rag import build_context_sync, generate_answer_sync
-            context = build_context_sync(
-                conn=conn,
-                yacht_id=yacht_id,
-                query=request.query,
-                role=role,
-                lens=request.lens,
-                domain=domain,
-                mode=mode,
-                domain_boost=domain_boost,
-                top_k=request.top_k,
-            )
+        context = await retrieve_context(request, yacht_id, role, domain, domain_boost, mode)
 
-            if not context.chunks:
-                answer = generate_no_context_answer(request.query, query_hash)
-            else:
-                # Generate answer (sync version)
-                answer = generate_answer_sync(context)
-
-                # Verify faithfulness (optional, for monitoring)
-                if request.debug:
-                    verification = verify_answer(answer, context)
-
-        # Build response (after connection closed)
-        response_data = {
-            'answer': answer.answer,
-            'citations': [c.citation.to_dict() for c in context.chunks] if context.chunks else [],
-            'used_doc_ids': answer.used_doc_ids,
-            'confidence': answer.confidence,
-        }
+        if not context.chunks:
+            answer = generate_no_context_answer(request.query, query_hash)
+        else:
+            answer = await generate_answer(context)
 
-        if request.debug:
-            response_data['signals'] = {
-                'context_tokens': context.total_tokens,
-                'chunks_used': len(context.chunks),
-                'latency_ms': int((time.time() - start_time) * 1000),
-                'model': answer.model,
-                'domain': domain,
-                'mode': mode,
-                'faithfulness_score': verification.faithfulness_score if request.debug and context.chunks else None,
-            }
+        response_data = build_response(request, context, answer, domain, mode, start_time)
 
         # Cache response
-        set_cached_response(cache_key, response_data)
+        await set_cached_response(cache_key, response_data)
 
         # Log (hash only, no raw text)
         logger.info(f"RAG answer: query_hash={query_hash} chunks={len(context.chunks)} confidence={answer.confidence:.2f}")
@@ -251,32 +331,77 @@ async def rag_answer(
         return JSONResponse(content=response_data)
 
     except Exception as e:
-        import traceback
-        error_msg = str(e)
-        error_tb = traceback.format_exc()
-        logger.error(f"RAG error: query_hash={query_hash} error={error_msg}")
-        logger.error(f"RAG traceback: {error_tb}")
-
-        # Return error response with debug info in dev mode
-        error_answer = generate_error_answer(request.query, query_hash, error_msg)
-        response_content = {
-            'answer': error_answer.answer,
-            'citations': [],
-            'used_doc_ids': [],
-            'confidence': 0.0,
-        }
-
-        # Include error details for debugging
-        if request.debug:
-            response_content['debug_error'] = error_msg
-            response_content['debug_traceback'] = error_tb[:500]
-
         return JSONResponse(
             status_code=500,
-            content=response_content
+            content=build_error_response(request, query_hash, e)
         )
 
 
+@router.post("/answer/stream")
+async def rag_answer_stream(
+    request: RAGRequest,
+    req: Request,
+    auth: dict = Depends(get_authenticated_user),
+    yacht_id: Optional[str] = Query(None, description="Vessel scope (fleet users)"),
+):
+    """
+    Stream an answer over SSE: citations once context is built, then tokens.
+
+    Same security model and cache as POST /answer.
+    """
+    start_time = time.time()
+
+    yacht_id = resolve_yacht_id(auth, yacht_id)
+    role = auth.get('role', 'crew')
+    query_hash = compute_query_hash(request.query, yacht_id, role, request.lens)
+    cache_key = get_cache_key(yacht_id, role, request.lens, query_hash)
+
+    async def event_stream() -> AsyncIterator[str]:
+        cached = await get_cached_response(cache_key)
+        if cached:
+            logger.info(f"RAG cache hit: {query_hash}")
+            yield sse_event("citations", {"query_hash": query_hash, "citations": cached['citations'], "cached": True})
+            yield sse_event("token", {"text": cached['answer']})
+            yield sse_event("done", cached)
+            return
+
+        domain, domain_boost, mode = detect_mode(request.query)
+
+        try:
+            context = await retrieve_context(request, yacht_id, role, domain, domain_boost, mode)
+            yield sse_event("citations", {"query_hash": query_hash, "citations": context.get_citations(), "cached": False})
+
+            if not context.chunks:
+                answer = generate_no_context_answer(request.query, query_hash)
+                yield sse_event("token", {"text": answer.answer})
+            else:
+                answer = None
+                async for item in stream_answer(context):
+                    if isinstance(item, RAGAnswer):
+                        answer = item
+                    else:
+                        yield sse_event("token", {"text": item})
+
+            response_data = build_response(request, context, answer, domain, mode, start_time)
+            await set_cached_response(cache_key, response_data)
+
+            logger.info(f"RAG answer (stream): query_hash={query_hash} chunks={len(context.chunks)} confidence={answer.confidence:.2f}")
+            yield sse_event("done", response_data)
+
+        except Exception as e:
+            yield sse_event("error", {"query_hash": query_hash, **build_error_response(request, query_hash, e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        },
+    )
+
+
 # =============================================================================
 # HEALTH CHECK
 # =============================================================================
@@ -288,6 +413,7 @@ async def rag_health():
     return {
         "status": "ok",
         "cache_size": len(_cache),
+        "redis_configured": bool(os.environ.get('REDIS_URL')),
         "version": "2026-02-07-v2",
         "openai_key_set": bool(os.environ.get('OPENAI_API_KEY')),
         "read_dsn_set": bool(os.environ.get('READ_DB_DSN') or os.environ.get('DATABASE_URL')),
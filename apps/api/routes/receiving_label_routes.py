@@ -16,21 +16,22 @@ GET /v1/receiving/{receiving_id}/labels
     &item_ids=<uuid>,…  (optional — defaults to all accepted items)
     &user_id=<uuid>     (optional — needed to fire ledger event)
 """
+import asyncio
 import fitz
 import logging
-from pathlib import Path
 
 from fastapi import APIRouter, Query, HTTPException
 from fastapi.responses import Response
 
 from handlers.db_client import get_service_db
 from handlers.receiving_handlers import fetch_label_data, log_labels_generated
+from services.pdf_render import PdfCanvas
+from services.render_pool import run_render
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 MM_TO_PT = 2.8346
-_FONT_DIR = Path(__file__).parent.parent / "evidence" / "fonts"
 
 SIZE_MAP = {
     "A4":       (210, 297),
@@ -60,31 +61,38 @@ async def generate_labels(
     user_id: str    = Query(None),
 ):
     db = get_service_db(yacht_id)
-    data = fetch_label_data(db, yacht_id, receiving_id, item_ids)
+    data = await asyncio.to_thread(fetch_label_data, db, yacht_id, receiving_id, item_ids)
     if "error" in data:
         raise HTTPException(data["status_code"], data["error"])
     pw, ph = _resolve_dims(size, w, h)
     compact = size in ("label_62", "label_36")
-    doc = fitz.open()
-    for item in data["items"]:
-        pg = doc.new_page(width=pw, height=ph)
-        _load_fonts(pg)
-        _draw_label(pg, item, data["recv"], data["yacht_name"], compact, pw, ph)
-    pdf = doc.tobytes(garbage=4, deflate=True)
-    doc.close()
+    pdf = await run_render(render_labels_pdf, data["items"], data["recv"], data["yacht_name"], compact, pw, ph)
     if user_id:
-        log_labels_generated(db, yacht_id, user_id, receiving_id, len(data["items"]), size)
+        await asyncio.to_thread(
+            log_labels_generated, db, yacht_id, user_id, receiving_id, len(data["items"]), size,
+        )
     return Response(pdf, media_type="application/pdf",
                     headers={"Content-Disposition": f'attachment; filename="labels_{receiving_id[:8]}.pdf"'})
 
 
-def _load_fonts(page: fitz.Page) -> None:
-    page.insert_font(fontname="Inter",     fontfile=str(_FONT_DIR / "Inter-Regular.ttf"))
-    page.insert_font(fontname="InterBold", fontfile=str(_FONT_DIR / "Inter-Bold.ttf"))
+def render_labels_pdf(
+    items: list,
+    recv: dict,
+    yacht_name: str,
+    is_compact: bool,
+    w_pt: float,
+    h_pt: float,
+) -> bytes:
+    """Render every label into one document in a single pass (runs in the render pool)."""
+    canvas = PdfCanvas(w_pt, h_pt)
+    for item in items:
+        canvas.new_page()
+        _draw_label(canvas, item, recv, yacht_name, is_compact, w_pt, h_pt)
+    return canvas.to_bytes()
 
 
 def _draw_label(
-    page: fitz.Page,
+    canvas: PdfCanvas,
     item: dict,
     recv: dict,
     yacht_name: str,
@@ -102,27 +110,21 @@ def _draw_label(
     margin      = 8 * MM_TO_PT
 
     def txt(x, y, text, size=10, bold=False, color=(0.08, 0.08, 0.08)):
-        page.insert_text(
-            fitz.Point(x, y),
-            str(text),
-            fontsize=size,
-            fontname="InterBold" if bold else "Inter",
-            color=color,
-        )
+        canvas.text(x, y, text, size=size, bold=bold, color=color)
 
     if is_compact:
         y = margin + 10
         txt(margin, y, description[:30], size=8, bold=True)
         y += 12
         barcode_rect = fitz.Rect(margin, y, w_pt - margin, y + 9 * MM_TO_PT)
-        page.draw_rect(barcode_rect, color=(0.75, 0.75, 0.75), fill=(0.94, 0.94, 0.94))
+        canvas.page.draw_rect(barcode_rect, color=(0.75, 0.75, 0.75), fill=(0.94, 0.94, 0.94))
         txt(margin + 2, barcode_rect.y0 + 7, f"[{part_number}]", size=6, color=(0.4, 0.4, 0.4))
         y = barcode_rect.y1 + 4
         txt(margin, y, f"Qty: {qty}  |  {location}", size=7)
     else:
         y = margin + 16
         barcode_rect = fitz.Rect(margin, y, w_pt - margin, y + 18 * MM_TO_PT)
-        page.draw_rect(barcode_rect, color=(0.75, 0.75, 0.75), fill=(0.94, 0.94, 0.94))
+        canvas.page.draw_rect(barcode_rect, color=(0.75, 0.75, 0.75), fill=(0.94, 0.94, 0.94))
         txt(
             margin + 4,
             barcode_rect.y0 + 13 * MM_TO_PT,
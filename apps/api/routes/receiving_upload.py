@@ -8,6 +8,7 @@ from typing import Optional
 from fastapi import APIRouter, File, Form, UploadFile, Header, HTTPException, status
 import httpx
 
+from lib.upload_stream import spool_upload
 from middleware.auth import get_authenticated_user
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,9 @@ IMAGE_PROCESSOR_URL = os.getenv("IMAGE_PROCESSOR_URL", "https://image-processing
 # Timeout for proxy requests (seconds)
 PROXY_TIMEOUT = 30.0
 
+# Phone photos / scans; enforced while the part is read
+RECEIVING_MAX_UPLOAD_BYTES = int(os.getenv("RECEIVING_MAX_UPLOAD_BYTES", str(30 * 1024 * 1024)))
+
 
 @router.post("/{receiving_id}/upload")
 async def proxy_receiving_upload(
@@ -75,19 +79,14 @@ async def proxy_receiving_upload(
             detail="Invalid or expired JWT",
         )
 
-    # Read file content (we need to buffer it for httpx)
-    try:
-        file_content = await file.read()
-    except Exception as e:
-        logger.error(f"Failed to read uploaded file: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to read uploaded file",
-        )
+    # Spool the part to a temp file in chunks (size-capped as it arrives) so
+    # httpx streams the multipart body from disk instead of a bytes buffer.
+    spooled = await spool_upload(file, max_bytes=RECEIVING_MAX_UPLOAD_BYTES)
+    spooled_fh = spooled.open()
 
     # Prepare multipart form data for image-processing
     files = {
-        "file": (file.filename, file_content, file.content_type),
+        "file": (file.filename, spooled_fh, file.content_type),
     }
 
     form_data = {
@@ -151,7 +150,9 @@ async def proxy_receiving_upload(
             detail="Upload proxy error",
         )
     finally:
-        # Clean up file handle
+        # Clean up file handle + spooled copy
+        spooled_fh.close()
+        spooled.cleanup()
         await file.close()
 
 
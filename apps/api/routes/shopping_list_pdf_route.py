@@ -13,11 +13,10 @@ PDF structure:
   - Candidate parts flagged with ⚠
   - Subtotal + estimated total
   - HOD approval chain (if hod_approved or converted_to_po)
-  - Footer: generated timestamp + system label
+  - Footer: generated timestamp + system label (every page)
 """
 
 import logging
-from pathlib import Path
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException, Query
@@ -26,6 +25,8 @@ import io
 
 from integrations.supabase import get_supabase_client
 from handlers.shopping_list_handlers import ShoppingListV2Handlers
+from services.pdf_render import PdfCanvas, page_chrome
+from services.render_pool import run_render
 
 logger = logging.getLogger(__name__)
 
@@ -88,57 +89,31 @@ def _fmt_qty(val) -> str:
 
 
 def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
+    """Lay out the requisition PDF. Runs in the render pool (see services.pdf_render)."""
     import fitz  # PyMuPDF
 
-    _FONT_DIR = Path(__file__).parent.parent / "evidence" / "fonts"
-    inter_regular = str(_FONT_DIR / "Inter-Regular.ttf")
-    inter_bold    = str(_FONT_DIR / "Inter-Bold.ttf")
-
-    doc = fitz.open()
+    canvas = PdfCanvas(
+        PAGE_W, PAGE_H,
+        chrome=page_chrome(PAGE_W, PAGE_H, TEAL),
+        footer=f"Generated {_now_label()} · CelesteOS PMS · Requisition {sl.get('list_number', '')}",
+    )
 
     # -------------------------------------------------------------------------
     # PAGE 1 — Cover + items table
     # -------------------------------------------------------------------------
-    page = doc.new_page(width=PAGE_W, height=PAGE_H)
-    page.insert_font(fontname="Inter",     fontfile=inter_regular)
-    page.insert_font(fontname="InterBold", fontfile=inter_bold)
-
-    y = 0
-
-    # Header bar
-    page.draw_rect(fitz.Rect(0, 0, PAGE_W, 5), color=None, fill=TEAL)
+    canvas.new_page()
     y = 28
 
     def text(txt: str, size: int = 10, bold: bool = False,
-             color=DARK, x: int = MARGIN, wrap_w: int = None):
-        nonlocal y
-        fn = "InterBold" if bold else "Inter"
-        if wrap_w:
-            # Simple manual wrapping via fitz.TextWriter not needed — use insert_textbox
-            page.insert_textbox(
-                fitz.Rect(x, y, x + wrap_w, y + size * 4),
-                txt, fontsize=size, fontname=fn, color=color,
-                align=0
-            )
-            y += size * 1.55
-        else:
-            page.insert_text(fitz.Point(x, y), txt, fontsize=size,
-                             fontname=fn, color=color)
-            y += size * 1.55
-
-    def label_value(lbl: str, val: str, size: int = 9):
+             color=DARK, x: int = MARGIN):
         nonlocal y
-        page.insert_text(fitz.Point(MARGIN, y), lbl,
-                         fontsize=7, fontname="InterBold", color=GREY)
-        y += 9
-        page.insert_text(fitz.Point(MARGIN, y), val,
-                         fontsize=size, fontname="Inter", color=MID)
-        y += size * 1.5 + 4
+        canvas.text(x, y, txt, size=size, bold=bold, color=color)
+        y += size * 1.55
 
     def hrule(lw: float = 0.5, col=BORDER):
         nonlocal y
-        page.draw_line(fitz.Point(MARGIN, y), fitz.Point(PAGE_W - MARGIN, y),
-                       color=col, width=lw)
+        canvas.page.draw_line(fitz.Point(MARGIN, y), fitz.Point(PAGE_W - MARGIN, y),
+                              color=col, width=lw)
         y += 8
 
     # Title block
@@ -161,14 +136,14 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
     # Left column
     def meta_left(lbl, val, size=9):
         nonlocal y
-        page.insert_text(fitz.Point(left_x, y), lbl, fontsize=7, fontname="InterBold", color=GREY)
+        canvas.text(left_x, y, lbl, size=7, bold=True, color=GREY)
         y += 9
-        page.insert_text(fitz.Point(left_x, y), val or "—", fontsize=size, fontname="Inter", color=MID)
+        canvas.text(left_x, y, val or "—", size=size, color=MID)
         y += size * 1.5 + 3
 
     def meta_right(lbl, val, y_pos, size=9):
-        page.insert_text(fitz.Point(right_x, y_pos), lbl, fontsize=7, fontname="InterBold", color=GREY)
-        page.insert_text(fitz.Point(right_x, y_pos + 9), val or "—", fontsize=size, fontname="Inter", color=MID)
+        canvas.text(right_x, y_pos, lbl, size=7, bold=True, color=GREY)
+        canvas.text(right_x, y_pos + 9, val or "—", size=size, color=MID)
 
     meta_left("VESSEL", vessel_name)
     r1 = meta_y_start
@@ -186,12 +161,9 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
 
     if sl.get("notes"):
         y += 4
-        page.insert_text(fitz.Point(MARGIN, y), "NOTES", fontsize=7, fontname="InterBold", color=GREY)
+        canvas.text(MARGIN, y, "NOTES", size=7, bold=True, color=GREY)
         y += 9
-        page.insert_textbox(
-            fitz.Rect(MARGIN, y, PAGE_W - MARGIN, y + 30),
-            sl["notes"], fontsize=9, fontname="Inter", color=MID, align=0
-        )
+        canvas.textbox((MARGIN, y, PAGE_W - MARGIN, y + 30), sl["notes"], size=9, color=MID)
         y += 24
 
     y += 8
@@ -216,7 +188,7 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
     RIGHT_EDGE = PAGE_W - MARGIN
 
     def th(txt: str, x: int):
-        page.insert_text(fitz.Point(x, y), txt, fontsize=7, fontname="InterBold", color=GREY)
+        canvas.text(x, y, txt, size=7, bold=True, color=GREY)
 
     # Table header
     th("#",          COL_NUM)
@@ -236,16 +208,12 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
     ROW_H = 14
 
     def _new_page():
-        nonlocal page, y
-        page = doc.new_page(width=PAGE_W, height=PAGE_H)
-        page.insert_font(fontname="Inter",     fontfile=inter_regular)
-        page.insert_font(fontname="InterBold", fontfile=inter_bold)
-        page.draw_rect(fitz.Rect(0, 0, PAGE_W, 5), color=None, fill=TEAL)
+        nonlocal y
+        canvas.new_page()
         y = 28
         # Continuation header
-        page.insert_text(fitz.Point(MARGIN, y),
-                         f"Shopping List {sl.get('list_number', '')} — continued",
-                         fontsize=9, fontname="InterBold", color=GREY)
+        canvas.text(MARGIN, y, f"Shopping List {sl.get('list_number', '')} — continued",
+                    size=9, bold=True, color=GREY)
         y += 18
         # Re-draw column headers
         th("#",          COL_NUM)
@@ -258,7 +226,7 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
         th("STATUS",     COL_STA)
         th("NOTES",      COL_NOTES)
         y += 10
-        page.draw_line(fitz.Point(MARGIN, y), fitz.Point(RIGHT_EDGE, y), color=BORDER, width=0.5)
+        canvas.page.draw_line(fitz.Point(MARGIN, y), fitz.Point(RIGHT_EDGE, y), color=BORDER, width=0.5)
         y += 8
 
     for idx, item in enumerate(items, start=1):
@@ -282,8 +250,8 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
 
         # Alternate row background for readability
         if idx % 2 == 0:
-            page.draw_rect(fitz.Rect(MARGIN - 2, y - ROW_H + 3, RIGHT_EDGE + 2, y + 3),
-                           color=None, fill=(0.97, 0.97, 0.97))
+            canvas.page.draw_rect(fitz.Rect(MARGIN - 2, y - ROW_H + 3, RIGHT_EDGE + 2, y + 3),
+                                  color=None, fill=(0.97, 0.97, 0.97))
 
         part_name = item.get("part_name", "")
         if is_candidate:
@@ -293,10 +261,8 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
         status_str = ITEM_STATUS_LABELS.get(item.get("status", ""), item.get("status", ""))
 
         def td(txt: str, x: int, col=None, bold: bool = False):
-            page.insert_text(fitz.Point(x, y), str(txt) if txt is not None else "—",
-                             fontsize=8,
-                             fontname="InterBold" if bold else "Inter",
-                             color=col or DARK)
+            canvas.text(x, y, str(txt) if txt is not None else "—",
+                        size=8, bold=bold, color=col or DARK)
 
         td(str(idx),                    COL_NUM)
         # Part name — may be long, truncate
@@ -322,17 +288,15 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
     # -------------------------------------------------------------------------
     y += 4
     hrule()
-    page.insert_text(fitz.Point(COL_TOT - 60, y), "ESTIMATED TOTAL",
-                     fontsize=8, fontname="InterBold", color=GREY)
+    canvas.text(COL_TOT - 60, y, "ESTIMATED TOTAL", size=8, bold=True, color=GREY)
     total_str = _fmt_price(estimated_total, currency) if estimated_total else "—"
-    page.insert_text(fitz.Point(COL_TOT, y), total_str,
-                     fontsize=9, fontname="InterBold", color=DARK)
+    canvas.text(COL_TOT, y, total_str, size=9, bold=True, color=DARK)
     y += 14
 
     if has_candidate:
-        page.insert_text(fitz.Point(MARGIN, y),
-                         "⚠  Items marked with ⚠ are candidate parts not yet in the parts catalogue.",
-                         fontsize=7, fontname="Inter", color=(0.6, 0.4, 0.0))
+        canvas.text(MARGIN, y,
+                    "⚠  Items marked with ⚠ are candidate parts not yet in the parts catalogue.",
+                    size=7, color=(0.6, 0.4, 0.0))
         y += 12
 
     # -------------------------------------------------------------------------
@@ -342,37 +306,20 @@ def _build_shopping_list_pdf(sl: dict, items: list, vessel_name: str) -> bytes:
     if hod_status in ("hod_approved", "converted_to_po"):
         y += 8
         hrule(lw=0.5, col=TEAL)
-        page.insert_text(fitz.Point(MARGIN, y), "HOD APPROVAL",
-                         fontsize=8, fontname="InterBold", color=TEAL_LIGHT)
+        canvas.text(MARGIN, y, "HOD APPROVAL", size=8, bold=True, color=TEAL_LIGHT)
         y += 12
         approved_at = (sl.get("approved_at") or "")[:16] or "—"
-        page.insert_text(fitz.Point(MARGIN, y),
-                         f"Approved at: {approved_at} UTC",
-                         fontsize=9, fontname="Inter", color=MID)
+        canvas.text(MARGIN, y, f"Approved at: {approved_at} UTC", size=9, color=MID)
         y += 12
         if hod_status == "converted_to_po":
             converted_at = (sl.get("converted_at") or "")[:16] or "—"
             po_id = sl.get("converted_to_po_id", "")
-            page.insert_text(fitz.Point(MARGIN, y),
-                             f"Converted to PO: {po_id[:8]}…  at {converted_at} UTC",
-                             fontsize=9, fontname="Inter", color=MID)
+            canvas.text(MARGIN, y, f"Converted to PO: {po_id[:8]}…  at {converted_at} UTC",
+                        size=9, color=MID)
             y += 12
 
-    # -------------------------------------------------------------------------
-    # Footer
-    # -------------------------------------------------------------------------
-    footer_y = PAGE_H - 28
-    page.draw_line(fitz.Point(MARGIN, footer_y - 8),
-                   fitz.Point(PAGE_W - MARGIN, footer_y - 8),
-                   color=BORDER, width=0.4)
-    page.insert_text(fitz.Point(MARGIN, footer_y),
-                     f"Generated {_now_label()} · CelesteOS PMS · Requisition {sl.get('list_number', '')}",
-                     fontsize=7, fontname="Inter", color=GREY)
-
-    buf = io.BytesIO()
-    doc.save(buf)
-    doc.close()
-    return buf.getvalue()
+    # Header bar, footer rule and footer line come from the page chrome
+    return canvas.to_bytes()
 
 
 @router.get("")
@@ -421,7 +368,7 @@ async def export_shopping_list_pdf(
     vessel_name = pdf_data["vessel_name"]
 
     try:
-        pdf_bytes = _build_shopping_list_pdf(sl, items, vessel_name)
+        pdf_bytes = await run_render(_build_shopping_list_pdf, sl, items, vessel_name)
     except ImportError:
         raise HTTPException(status_code=500, detail="PyMuPDF not available on this worker")
     except Exception as exc:
@@ -28,7 +28,8 @@ from datetime import datetime, timedelta, timezone
 
 from middleware.auth import get_authenticated_user
 from middleware.vessel_access import validate_vessel_id_format
-from integrations.supabase import get_tenant_client
+from integrations.supabase import get_tenant_client, get_async_tenant_client
+from lib.fetch_plan import run_fetch_plan
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/vessel", tags=["vessel-surface"])
@@ -254,372 +255,379 @@ def _scope_query(query, yacht_ids: List[str]):
     return query.in_("yacht_id", yacht_ids)
 
 
-@router.get("/{vessel_id}/surface")
-async def get_vessel_surface(vessel_id: str, auth: dict = Depends(get_authenticated_user)):
-    """
-    Returns current-state summary for the Vessel Surface home screen.
-    6 sections, read-only, scoped to authenticated vessel.
-    When vessel_id='all', aggregates across all fleet vessels (overview mode).
-    """
-    _validate_vessel_access(auth, vessel_id)
-
-    tenant_key = auth["tenant_key_alias"]
-    yacht_ids = _resolve_yacht_ids(auth, vessel_id)
-    is_overview = vessel_id == "all"
-    supabase = get_tenant_client(tenant_key)
-
-    result = {"is_overview": is_overview}
-
-    # ── Work Orders: top 3 by urgency ────────────────────────────────────────
-    try:
-        wo_select = "id, title, wo_number, status, priority, assigned_to, equipment_id, due_date, created_at"
-        if is_overview:
-            wo_select = "yacht_id, " + wo_select
-        wo_q = supabase.table("pms_work_orders").select(wo_select)
-        wo_r = _scope_query(wo_q, yacht_ids).eq(
-            "is_seed", False
-        ).in_(
-            "status", ["planned", "in_progress"]
-        ).order("created_at", desc=True).limit(20).execute()
-
-        wo_items = wo_r.data or []
-
-        # Enrich with equipment names in batch
-        equip_ids = list({w.get("equipment_id") for w in wo_items if w.get("equipment_id")})
-        equip_names = {}
-        if equip_ids:
+# ── Surface sections (independent; run concurrently via lib.fetch_plan) ─────
+# Each returns its finished section payload. A section that raises or overruns
+# its budget degrades to the same empty default the old per-block try/except
+# produced, and is listed in the response's failed_sections.
+
+async def _surface_work_orders(db, yacht_ids: List[str], is_overview: bool):
+    """Work Orders: top 3 by urgency."""
+    wo_select = "id, title, wo_number, status, priority, assigned_to, equipment_id, due_date, created_at"
+    if is_overview:
+        wo_select = "yacht_id, " + wo_select
+    wo_q = db.table("pms_work_orders").select(wo_select)
+    wo_r = await _scope_query(wo_q, yacht_ids).eq(
+        "is_seed", False
+    ).in_(
+        "status", ["planned", "in_progress"]
+    ).order("created_at", desc=True).limit(20).execute()
+
+    wo_items = wo_r.data or []
+
+    # Enrich with equipment names in batch
+    equip_ids = list({w.get("equipment_id") for w in wo_items if w.get("equipment_id")})
+    equip_names = {}
+    if equip_ids:
+        try:
+            eq_r = await db.table("pms_equipment").select("id, name").in_("id", equip_ids).execute()
+            equip_names = {e["id"]: e.get("name", "") for e in (eq_r.data or [])}
+        except Exception:
+            pass
+
+    # Mark overdue
+    now = datetime.now(timezone.utc)
+    for w in wo_items:
+        due = w.get("due_date")
+        if due and w.get("status") not in ("overdue",):
             try:
-                eq_r = supabase.table("pms_equipment").select("id, name").in_("id", equip_ids).execute()
-                equip_names = {e["id"]: e.get("name", "") for e in (eq_r.data or [])}
+                due_dt = datetime.fromisoformat(due.replace("Z", "+00:00"))
+                if due_dt < now:
+                    w["status"] = "overdue"
             except Exception:
                 pass
 
-        # Mark overdue
-        now = datetime.now(timezone.utc)
-        for w in wo_items:
-            due = w.get("due_date")
-            if due and w.get("status") not in ("overdue",):
-                try:
-                    due_dt = datetime.fromisoformat(due.replace("Z", "+00:00"))
-                    if due_dt < now:
-                        w["status"] = "overdue"
-                except Exception:
-                    pass
-
-        wo_items.sort(key=_status_priority_key)
-        wo_top = wo_items[:3]
-
-        overdue_count = sum(1 for w in wo_items if (w.get("status") or "").lower() == "overdue")
-
-        result["work_orders"] = {
-            "open_count": len(wo_items),
-            "overdue_count": overdue_count,
-            "items": [
-                {
-                    "id": w.get("id"),
-                    **({"yacht_id": w.get("yacht_id")} if is_overview else {}),
-                    "ref": w.get("wo_number") or f"WO-{str(w.get('id', ''))[:6]}",
-                    "title": w.get("title", ""),
-                    "equipment_id": w.get("equipment_id"),
-                    "equipment_name": equip_names.get(w.get("equipment_id"), ""),
-                    "assigned_to": w.get("assigned_to", ""),
-                    "status": w.get("status", "open"),
-                    "priority": w.get("priority", "normal"),
-                    "age_days": (now - datetime.fromisoformat(
-                        (w.get("created_at") or now.isoformat()).replace("Z", "+00:00")
-                    )).days if w.get("created_at") else 0,
-                    "due_date": w.get("due_date"),
-                }
-                for w in wo_top
-            ],
-            "limit": 3,
-        }
-    except Exception as e:
-        logger.error(f"[VesselSurface] Work orders query failed: {e}")
-        result["work_orders"] = {"open_count": 0, "overdue_count": 0, "items": [], "limit": 3}
+    wo_items.sort(key=_status_priority_key)
+    wo_top = wo_items[:3]
 
-    # ── Faults: top 3 by severity ────────────────────────────────────────────
-    try:
-        f_select = "id, title, fault_code, status, severity, equipment_id, created_at"
-        if is_overview:
-            f_select = "yacht_id, " + f_select
-        f_q = supabase.table("pms_faults").select(f_select)
-        f_r = _scope_query(f_q, yacht_ids).eq(
-            "is_seed", False
-        ).in_(
-            "status", ["open", "critical", "monitoring", "in_progress", "investigating"]
-        ).order("created_at", desc=True).limit(20).execute()
-
-        fault_items = f_r.data or []
-        fault_items.sort(key=_status_priority_key)
-        fault_top = fault_items[:3]
-
-        critical_count = sum(1 for f in fault_items if (f.get("severity") or "").lower() == "critical")
-
-        # Resolve equipment names for faults (same pattern as work orders)
-        fault_equip_ids = list({f.get("equipment_id") for f in fault_top if f.get("equipment_id")})
-        fault_equip_names = {}
-        if fault_equip_ids:
-            try:
-                eq_r = supabase.table("pms_equipment").select("id, name").in_("id", fault_equip_ids).execute()
-                fault_equip_names = {e["id"]: e.get("name", "") for e in (eq_r.data or [])}
-            except Exception:
-                pass
+    overdue_count = sum(1 for w in wo_items if (w.get("status") or "").lower() == "overdue")
 
-        result["faults"] = {
-            "open_count": len(fault_items),
-            "critical_count": critical_count,
-            "items": [
-                {
-                    "id": f.get("id"),
-                    **({"yacht_id": f.get("yacht_id")} if is_overview else {}),
-                    "ref": f.get("fault_code") or "",
-                    "title": f.get("title", ""),
-                    "severity": f.get("severity", "normal"),
-                    "status": f.get("status", "open"),
-                    "assigned_to": f.get("assigned_to", ""),
-                    "equipment_id": f.get("equipment_id"),
-                    "equipment_name": fault_equip_names.get(f.get("equipment_id"), ""),
-                    "age_display": _age_display(f.get("created_at")),
-                }
-                for f in fault_top
-            ],
-        }
-    except Exception as e:
-        logger.error(f"[VesselSurface] Faults query failed: {e}")
-        result["faults"] = {"open_count": 0, "critical_count": 0, "items": []}
+    return {
+        "open_count": len(wo_items),
+        "overdue_count": overdue_count,
+        "items": [
+            {
+                "id": w.get("id"),
+                **({"yacht_id": w.get("yacht_id")} if is_overview else {}),
+                "ref": w.get("wo_number") or f"WO-{str(w.get('id', ''))[:6]}",
+                "title": w.get("title", ""),
+                "equipment_id": w.get("equipment_id"),
+                "equipment_name": equip_names.get(w.get("equipment_id"), ""),
+                "assigned_to": w.get("assigned_to", ""),
+                "status": w.get("status", "open"),
+                "priority": w.get("priority", "normal"),
+                "age_days": (now - datetime.fromisoformat(
+                    (w.get("created_at") or now.isoformat()).replace("Z", "+00:00")
+                )).days if w.get("created_at") else 0,
+                "due_date": w.get("due_date"),
+            }
+            for w in wo_top
+        ],
+        "limit": 3,
+    }
 
-    # ── Last Handover (prefer SIGNED, fallback to latest of any status) ─────
-    try:
-        # Try SIGNED first
-        ho_q = supabase.table("handover_drafts").select(
-            "id, title, state, generated_by_user_id, created_at"
-        )
-        ho_r = _scope_query(ho_q, yacht_ids).eq(
-            "state", "SIGNED"
-        ).order("created_at", desc=True).limit(1).execute()
 
-        ho_data = (ho_r.data or [None])[0]
+async def _surface_faults(db, yacht_ids: List[str], is_overview: bool):
+    """Faults: top 3 by severity."""
+    f_select = "id, title, fault_code, status, severity, equipment_id, created_at"
+    if is_overview:
+        f_select = "yacht_id, " + f_select
+    f_q = db.table("pms_faults").select(f_select)
+    f_r = await _scope_query(f_q, yacht_ids).eq(
+        "is_seed", False
+    ).in_(
+        "status", ["open", "critical", "monitoring", "in_progress", "investigating"]
+    ).order("created_at", desc=True).limit(20).execute()
+
+    fault_items = f_r.data or []
+    fault_items.sort(key=_status_priority_key)
+    fault_top = fault_items[:3]
+
+    critical_count = sum(1 for f in fault_items if (f.get("severity") or "").lower() == "critical")
+
+    # Resolve equipment names for faults (same pattern as work orders)
+    fault_equip_ids = list({f.get("equipment_id") for f in fault_top if f.get("equipment_id")})
+    fault_equip_names = {}
+    if fault_equip_ids:
+        try:
+            eq_r = await db.table("pms_equipment").select("id, name").in_("id", fault_equip_ids).execute()
+            fault_equip_names = {e["id"]: e.get("name", "") for e in (eq_r.data or [])}
+        except Exception:
+            pass
 
-        # Fallback: if no SIGNED, get most recent of any state
-        if not ho_data:
-            ho_q2 = supabase.table("handover_drafts").select(
-                "id, title, state, generated_by_user_id, created_at"
-            )
-            ho_r = _scope_query(ho_q2, yacht_ids).order(
-                "created_at", desc=True
-            ).limit(1).execute()
-            ho_data = (ho_r.data or [None])[0]
-        if ho_data:
-            # Resolve crew name from user ID
-            from_name = ""
-            user_id = ho_data.get("generated_by_user_id")
-            if user_id:
-                try:
-                    profile_r = supabase.table("auth_users_profiles").select(
-                        "name"
-                    ).eq("id", user_id).maybe_single().execute()
-                    if profile_r and profile_r.data:
-                        from_name = profile_r.data.get("name", "")
-                except Exception:
-                    pass
-
-            is_draft = (ho_data.get("state") or "").upper() != "SIGNED"
-            result["last_handover"] = {
-                "id": ho_data.get("id"),
-                "from_crew": from_name or "Unknown",
-                "to_crew": "",
-                "signed_at": ho_data.get("created_at"),
-                "status": ho_data.get("state", "draft"),
-                "is_draft": is_draft,
+    return {
+        "open_count": len(fault_items),
+        "critical_count": critical_count,
+        "items": [
+            {
+                "id": f.get("id"),
+                **({"yacht_id": f.get("yacht_id")} if is_overview else {}),
+                "ref": f.get("fault_code") or "",
+                "title": f.get("title", ""),
+                "severity": f.get("severity", "normal"),
+                "status": f.get("status", "open"),
+                "assigned_to": f.get("assigned_to", ""),
+                "equipment_id": f.get("equipment_id"),
+                "equipment_name": fault_equip_names.get(f.get("equipment_id"), ""),
+                "age_display": _age_display(f.get("created_at")),
             }
-        else:
-            result["last_handover"] = None
-    except Exception as e:
-        logger.error(f"[VesselSurface] Handover query failed: {e}")
-        result["last_handover"] = None
+            for f in fault_top
+        ],
+    }
 
-    # ── Parts Below Min Stock ────────────────────────────────────────────────
-    try:
-        # Supabase doesn't support "column < other_column" in PostgREST easily
-        # Fetch parts with low stock using a reasonable approach
-        p_select = "id, name, quantity_on_hand, minimum_quantity, location"
-        if is_overview:
-            p_select = "yacht_id, " + p_select
-        p_q = supabase.table("pms_parts").select(p_select)
-        p_r = _scope_query(p_q, yacht_ids).eq("is_seed", False).execute()
-
-        all_parts = p_r.data or []
-        below_min = [
-            p for p in all_parts
-            if p.get("minimum_quantity") is not None
-            and p.get("quantity_on_hand") is not None
-            and p["quantity_on_hand"] < p["minimum_quantity"]
-        ]
-
-        # Sort: zero stock first, then by ratio ascending
-        below_min.sort(key=lambda p: (
-            0 if p.get("quantity_on_hand", 0) == 0 else 1,
-            (p.get("quantity_on_hand", 0) / max(p.get("minimum_quantity", 1), 1)),
-        ))
-
-        result["parts_below_min"] = {
-            "count": len(below_min),
-            "items": [
-                {
-                    "id": p.get("id"),
-                    **({"yacht_id": p.get("yacht_id")} if is_overview else {}),
-                    "name": p.get("name", ""),
-                    "stock_level": p.get("quantity_on_hand", 0),
-                    "min_stock": p.get("minimum_quantity", 0),
-                    "location": p.get("location", ""),
-                }
-                for p in below_min[:5]
-            ],
-        }
-    except Exception as e:
-        logger.error(f"[VesselSurface] Parts below min query failed: {e}")
-        result["parts_below_min"] = {"count": 0, "items": []}
 
-    # ── Recent Activity (from ledger) ────────────────────────────────────────
-    try:
-        led_q = supabase.table("ledger_events").select(
-            "id, entity_type, entity_id, action, actor_name, created_at, change_summary, user_id"
-        )
-        led_r = _scope_query(led_q, yacht_ids).neq(
-            "event_category", "read"
-        ).order("created_at", desc=True).limit(15).execute()
+async def _surface_last_handover(db, yacht_ids: List[str], is_overview: bool):
+    """Last Handover (prefer SIGNED, fallback to latest of any status)."""
+    # Try SIGNED first
+    ho_q = db.table("handover_drafts").select(
+        "id, title, state, generated_by_user_id, created_at"
+    )
+    ho_r = await _scope_query(ho_q, yacht_ids).eq(
+        "state", "SIGNED"
+    ).order("created_at", desc=True).limit(1).execute()
 
-        raw_events = led_r.data or []
+    ho_data = (ho_r.data or [None])[0]
 
-        # Resolve actor names from user_id if actor_name is missing
-        user_ids = list({ev.get("user_id") for ev in raw_events if ev.get("user_id") and not ev.get("actor_name")})
-        user_names = {}
-        if user_ids:
+    # Fallback: if no SIGNED, get most recent of any state
+    if not ho_data:
+        ho_q2 = db.table("handover_drafts").select(
+            "id, title, state, generated_by_user_id, created_at"
+        )
+        ho_r = await _scope_query(ho_q2, yacht_ids).order(
+            "created_at", desc=True
+        ).limit(1).execute()
+        ho_data = (ho_r.data or [None])[0]
+    if ho_data:
+        # Resolve crew name from user ID
+        from_name = ""
+        user_id = ho_data.get("generated_by_user_id")
+        if user_id:
             try:
-                names_r = supabase.table("auth_users_profiles").select("id, name").in_("id", user_ids).execute()
-                user_names = {u["id"]: u.get("name", "") for u in (names_r.data or [])}
+                profile_r = await db.table("auth_users_profiles").select(
+                    "name"
+                ).eq("id", user_id).maybe_single().execute()
+                if profile_r and profile_r.data:
+                    from_name = profile_r.data.get("name", "")
             except Exception:
                 pass
 
-        # Deduplicate: group by entity + actor within 5 min, show latest only
-        seen = set()
-        activity_items = []
-        for ev in raw_events:
-            # Dedup key: entity_type + entity_id + action (within 5 min)
-            dedup_key = f"{ev.get('entity_type')}:{ev.get('entity_id')}:{ev.get('action')}"
-            if dedup_key in seen:
-                continue
-            seen.add(dedup_key)
-
-            # Resolve actor name
-            actor = ev.get("actor_name") or user_names.get(ev.get("user_id"), "") or "System"
-
-            # Humanise entity type (table name → domain key → display label)
-            domain_key = _humanise_entity_type(ev.get("entity_type", ""))
-            display_label = _entity_display_label(domain_key)
-
-            # Humanise action verb
-            action_verb = _humanise_action(ev.get("action", ""))
-
-            # Build entity ref: use short UUID prefix formatted as domain ref
-            entity_id_str = str(ev.get("entity_id", ""))
-            ref_prefix = {"work_order": "WO", "fault": "F", "equipment": "E", "part": "P",
-                          "certificate": "C", "document": "D", "receiving": "RCV"}.get(domain_key, "")
-            entity_ref = f"{ref_prefix}\u00b7{entity_id_str[:6]}" if ref_prefix else entity_id_str[:8]
-
-            activity_items.append({
-                "entity_type": domain_key,
-                "entity_type_label": display_label,
-                "entity_id": ev.get("entity_id", ""),
-                "entity_ref": entity_ref,
-                "action": action_verb,
-                "actor": actor,
-                "timestamp": ev.get("created_at"),
-                "summary": f"{actor} {action_verb}",
-                "time_display": _age_display(ev.get("created_at")),
-            })
+        is_draft = (ho_data.get("state") or "").upper() != "SIGNED"
+        return {
+            "id": ho_data.get("id"),
+            "from_crew": from_name or "Unknown",
+            "to_crew": "",
+            "signed_at": ho_data.get("created_at"),
+            "status": ho_data.get("state", "draft"),
+            "is_draft": is_draft,
+        }
+    else:
+        return None
+
+
+async def _surface_parts_below_min(db, yacht_ids: List[str], is_overview: bool):
+    """Parts Below Min Stock."""
+    # Supabase doesn't support "column < other_column" in PostgREST easily
+    # Fetch parts with low stock using a reasonable approach
+    p_select = "id, name, quantity_on_hand, minimum_quantity, location"
+    if is_overview:
+        p_select = "yacht_id, " + p_select
+    p_q = db.table("pms_parts").select(p_select)
+    p_r = await _scope_query(p_q, yacht_ids).eq("is_seed", False).execute()
+
+    all_parts = p_r.data or []
+    below_min = [
+        p for p in all_parts
+        if p.get("minimum_quantity") is not None
+        and p.get("quantity_on_hand") is not None
+        and p["quantity_on_hand"] < p["minimum_quantity"]
+    ]
+
+    # Sort: zero stock first, then by ratio ascending
+    below_min.sort(key=lambda p: (
+        0 if p.get("quantity_on_hand", 0) == 0 else 1,
+        (p.get("quantity_on_hand", 0) / max(p.get("minimum_quantity", 1), 1)),
+    ))
 
-            if len(activity_items) >= 5:
-                break
+    return {
+        "count": len(below_min),
+        "items": [
+            {
+                "id": p.get("id"),
+                **({"yacht_id": p.get("yacht_id")} if is_overview else {}),
+                "name": p.get("name", ""),
+                "stock_level": p.get("quantity_on_hand", 0),
+                "min_stock": p.get("minimum_quantity", 0),
+                "location": p.get("location", ""),
+            }
+            for p in below_min[:5]
+        ],
+    }
 
-        result["recent_activity"] = activity_items
-    except Exception as e:
-        logger.error(f"[VesselSurface] Recent activity query failed: {e}")
-        result["recent_activity"] = []
-
-    # ── Certificates Expiring (already-expired + within 90 days) ─────────────
-    #
-    # Fixes 4 bugs in the original widget query:
-    #   1. Used `pms_vessel_certificates` → crew certs invisible. Now uses
-    #      v_certificates_enriched which UNIONs vessel + crew.
-    #   2. Backend emitted `certificate_name` but frontend reads `c.name` from
-    #      SurfaceCertItem. Widget showed empty names. Fixed: emit both, with
-    #      `name` formatted for display (person — cert_type for crew).
-    #   3. `.gte(expiry_date, today)` filtered out already-expired certs —
-    #      the most operationally urgent ones. Removed that filter.
-    #   4. Expired certs excluded via the gte filter AND only valid statuses
-    #      considered. Now: status IN ('valid','expired') only (terminal states
-    #      superseded/revoked/suspended excluded).
-    #
-    # Window: 90 days (industry standard for planning) instead of 45.
-    try:
-        cutoff = (datetime.now(timezone.utc) + timedelta(days=90)).strftime("%Y-%m-%d")
-
-        cert_select = "id, certificate_name, certificate_type, expiry_date, status, domain, person_name"
-        if is_overview:
-            cert_select = "yacht_id, " + cert_select
-        cert_q = supabase.table("v_certificates_enriched").select(cert_select)
-        cert_r = _scope_query(cert_q, yacht_ids).lte(
-            "expiry_date", cutoff
-        ).in_(
-            "status", ["valid", "expired"]
-        ).order("expiry_date").limit(50).execute()
-
-        cert_items = cert_r.data or []
-
-        def _cert_display_name(c: dict) -> str:
-            """Build a name the frontend can render — crew certs embed the person."""
-            if c.get("domain") == "crew":
-                person = c.get("person_name") or ""
-                cert_type = c.get("certificate_type") or "Certificate"
-                return f"{person} — {cert_type}".strip(" —") if person else cert_type
-            return c.get("certificate_name") or c.get("certificate_type") or "Certificate"
-
-        def _days_remaining(expiry):
-            if not expiry:
-                return None
-            try:
-                return (
-                    datetime.strptime(expiry, "%Y-%m-%d")
-                    - datetime.now(timezone.utc).replace(
-                        hour=0, minute=0, second=0, microsecond=0, tzinfo=None
-                    )
-                ).days
-            except Exception:
-                return None
-
-        result["certificates_expiring"] = {
-            "count": len(cert_items),
-            "items": [
-                {
-                    "id": c.get("id"),
-                    **({"yacht_id": c.get("yacht_id")} if is_overview else {}),
-                    # `name` matches the SurfaceCertItem contract on the frontend
-                    "name": _cert_display_name(c),
-                    "certificate_name": c.get("certificate_name", ""),
-                    "certificate_type": c.get("certificate_type", ""),
-                    "domain": c.get("domain", "vessel"),
-                    "expiry_date": c.get("expiry_date"),
-                    "days_remaining": _days_remaining(c.get("expiry_date")),
-                    "status": c.get("status", "valid"),
-                }
-                for c in cert_items
-            ],
-        }
-    except Exception as e:
-        logger.error(f"[VesselSurface] Certificates query failed: {e}")
-        result["certificates_expiring"] = {"count": 0, "items": []}
+
+async def _surface_recent_activity(db, yacht_ids: List[str], is_overview: bool):
+    """Recent Activity (from ledger)."""
+    led_q = db.table("ledger_events").select(
+        "id, entity_type, entity_id, action, actor_name, created_at, change_summary, user_id"
+    )
+    led_r = await _scope_query(led_q, yacht_ids).neq(
+        "event_category", "read"
+    ).order("created_at", desc=True).limit(15).execute()
+
+    raw_events = led_r.data or []
+
+    # Resolve actor names from user_id if actor_name is missing
+    user_ids = list({ev.get("user_id") for ev in raw_events if ev.get("user_id") and not ev.get("actor_name")})
+    user_names = {}
+    if user_ids:
+        try:
+            names_r = await db.table("auth_users_profiles").select("id, name").in_("id", user_ids).execute()
+            user_names = {u["id"]: u.get("name", "") for u in (names_r.data or [])}
+        except Exception:
+            pass
+
+    # Deduplicate: group by entity + actor within 5 min, show latest only
+    seen = set()
+    activity_items = []
+    for ev in raw_events:
+        # Dedup key: entity_type + entity_id + action (within 5 min)
+        dedup_key = f"{ev.get('entity_type')}:{ev.get('entity_id')}:{ev.get('action')}"
+        if dedup_key in seen:
+            continue
+        seen.add(dedup_key)
+
+        # Resolve actor name
+        actor = ev.get("actor_name") or user_names.get(ev.get("user_id"), "") or "System"
+
+        # Humanise entity type (table name → domain key → display label)
+        domain_key = _humanise_entity_type(ev.get("entity_type", ""))
+        display_label = _entity_display_label(domain_key)
+
+        # Humanise action verb
+        action_verb = _humanise_action(ev.get("action", ""))
+
+        # Build entity ref: use short UUID prefix formatted as domain ref
+        entity_id_str = str(ev.get("entity_id", ""))
+        ref_prefix = {"work_order": "WO", "fault": "F", "equipment": "E", "part": "P",
+                      "certificate": "C", "document": "D", "receiving": "RCV"}.get(domain_key, "")
+        entity_ref = f"{ref_prefix}\u00b7{entity_id_str[:6]}" if ref_prefix else entity_id_str[:8]
+
+        activity_items.append({
+            "entity_type": domain_key,
+            "entity_type_label": display_label,
+            "entity_id": ev.get("entity_id", ""),
+            "entity_ref": entity_ref,
+            "action": action_verb,
+            "actor": actor,
+            "timestamp": ev.get("created_at"),
+            "summary": f"{actor} {action_verb}",
+            "time_display": _age_display(ev.get("created_at")),
+        })
+
+        if len(activity_items) >= 5:
+            break
+
+    return activity_items
+
+
+# Fixes 4 bugs in the original widget query:
+#   1. Used `pms_vessel_certificates` → crew certs invisible. Now uses
+#      v_certificates_enriched which UNIONs vessel + crew.
+#   2. Backend emitted `certificate_name` but frontend reads `c.name` from
+#      SurfaceCertItem. Widget showed empty names. Fixed: emit both, with
+#      `name` formatted for display (person — cert_type for crew).
+#   3. `.gte(expiry_date, today)` filtered out already-expired certs —
+#      the most operationally urgent ones. Removed that filter.
+#   4. Expired certs excluded via the gte filter AND only valid statuses
+#      considered. Now: status IN ('valid','expired') only (terminal states
+#      superseded/revoked/suspended excluded).
+#
+# Window: 90 days (industry standard for planning) instead of 45.
+async def _surface_certificates_expiring(db, yacht_ids: List[str], is_overview: bool):
+    """Certificates Expiring (already-expired + within 90 days)."""
+    cutoff = (datetime.now(timezone.utc) + timedelta(days=90)).strftime("%Y-%m-%d")
+
+    cert_select = "id, certificate_name, certificate_type, expiry_date, status, domain, person_name"
+    if is_overview:
+        cert_select = "yacht_id, " + cert_select
+    cert_q = db.table("v_certificates_enriched").select(cert_select)
+    cert_r = await _scope_query(cert_q, yacht_ids).lte(
+        "expiry_date", cutoff
+    ).in_(
+        "status", ["valid", "expired"]
+    ).order("expiry_date").limit(50).execute()
+
+    cert_items = cert_r.data or []
+
+    def _cert_display_name(c: dict) -> str:
+        """Build a name the frontend can render — crew certs embed the person."""
+        if c.get("domain") == "crew":
+            person = c.get("person_name") or ""
+            cert_type = c.get("certificate_type") or "Certificate"
+            return f"{person} — {cert_type}".strip(" —") if person else cert_type
+        return c.get("certificate_name") or c.get("certificate_type") or "Certificate"
+
+    def _days_remaining(expiry):
+        if not expiry:
+            return None
+        try:
+            return (
+                datetime.strptime(expiry, "%Y-%m-%d")
+                - datetime.now(timezone.utc).replace(
+                    hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+                )
+            ).days
+        except Exception:
+            return None
+
+    return {
+        "count": len(cert_items),
+        "items": [
+            {
+                "id": c.get("id"),
+                **({"yacht_id": c.get("yacht_id")} if is_overview else {}),
+                # `name` matches the SurfaceCertItem contract on the frontend
+                "name": _cert_display_name(c),
+                "certificate_name": c.get("certificate_name", ""),
+                "certificate_type": c.get("certificate_type", ""),
+                "domain": c.get("domain", "vessel"),
+                "expiry_date": c.get("expiry_date"),
+                "days_remaining": _days_remaining(c.get("expiry_date")),
+                "status": c.get("status", "valid"),
+            }
+            for c in cert_items
+        ],
+    }
+
+
+@router.get("/{vessel_id}/surface")
+async def get_vessel_surface(vessel_id: str, auth: dict = Depends(get_authenticated_user)):
+    """
+    Returns current-state summary for the Vessel Surface home screen.
+    6 sections, read-only, scoped to authenticated vessel.
+    When vessel_id='all', aggregates across all fleet vessels (overview mode).
+    Sections are fetched concurrently; page latency is the slowest section.
+    """
+    _validate_vessel_access(auth, vessel_id)
+
+    tenant_key = auth["tenant_key_alias"]
+    yacht_ids = _resolve_yacht_ids(auth, vessel_id)
+    is_overview = vessel_id == "all"
+    db = get_async_tenant_client(tenant_key)
+
+    sections, meta = await run_fetch_plan(
+        {
+            "work_orders": (lambda: _surface_work_orders(db, yacht_ids, is_overview), {"open_count": 0, "overdue_count": 0, "items": [], "limit": 3}),
+            "faults": (lambda: _surface_faults(db, yacht_ids, is_overview), {"open_count": 0, "critical_count": 0, "items": []}),
+            "last_handover": (lambda: _surface_last_handover(db, yacht_ids, is_overview), None),
+            "parts_below_min": (lambda: _surface_parts_below_min(db, yacht_ids, is_overview), {"count": 0, "items": []}),
+            "recent_activity": (lambda: _surface_recent_activity(db, yacht_ids, is_overview), []),
+            "certificates_expiring": (lambda: _surface_certificates_expiring(db, yacht_ids, is_overview), {"count": 0, "items": []}),
+        },
+        log_prefix="[VesselSurface]",
+    )
+
+    result = {"is_overview": is_overview, **sections}
+    result["partial"] = meta.partial
+    result["failed_sections"] = meta.failed
 
     # ── Domain counts for sidebar badges ─────────────────────────────────────
     try:
@@ -886,28 +894,28 @@ async def get_domain_records(
         # UUIDs must not reach the frontend). Single round-trip per resolver.
         if domain == "work_orders" and records:
             # Lazy import so reloads/tests don't pay the hit when domain != work_orders
-            from lib.user_resolver import resolve_users, resolve_equipment_batch
+            from lib.dataloader import RequestLoader
 
-            eq_ids = list({r.get("equipment_id") for r in records if r.get("equipment_id")})
-            user_ids = list({r.get("assigned_to") for r in records if r.get("assigned_to")})
+            loader = RequestLoader(supabase, yacht_id)
+            eq_ids = [r.get("equipment_id") for r in records]
+            user_ids = [r.get("assigned_to") for r in records]
+            loader.prime_users(user_ids)
 
             eq_name_map: Dict[str, str] = {}
             eq_code_map: Dict[str, str] = {}
-            if eq_ids:
-                try:
-                    for eq in resolve_equipment_batch(supabase, yacht_id, eq_ids):
-                        if eq.get("id"):
-                            eq_name_map[eq["id"]] = eq.get("name") or ""
-                            eq_code_map[eq["id"]] = eq.get("code") or ""
-                except Exception as e:
-                    logger.warning(f"[DomainRecords] work_orders equipment resolve failed: {e}")
+            try:
+                for eq in loader.equipment(eq_ids):
+                    if eq.get("id"):
+                        eq_name_map[eq["id"]] = eq.get("name") or ""
+                        eq_code_map[eq["id"]] = eq.get("code") or ""
+            except Exception as e:
+                logger.warning(f"[DomainRecords] work_orders equipment resolve failed: {e}")
 
             user_map: Dict[str, Dict[str, Optional[str]]] = {}
-            if user_ids:
-                try:
-                    user_map = resolve_users(supabase, yacht_id, user_ids)
-                except Exception as e:
-                    logger.warning(f"[DomainRecords] work_orders user resolve failed: {e}")
+            try:
+                user_map = loader.users()
+            except Exception as e:
+                logger.warning(f"[DomainRecords] work_orders user resolve failed: {e}")
 
             for raw, fmt in zip(records, formatted):
                 eid = raw.get("equipment_id")
@@ -3,14 +3,44 @@ Email Watcher - Candidate Finder
 
 Finds PMS objects that might match an email thread based on extracted tokens.
 Phase 7e-g: Work Orders, Equipment/Parts, Vendors
+
+Each token type is resolved with one query matching all of its values
+(an OR of ilike patterns) rather than one query per value, results are
+deduped by object id, and independent lookups run concurrently off the
+event loop.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional
+import asyncio
 import logging
 
+from integrations.supabase import aexecute
+
 logger = logging.getLogger(__name__)
 
 
+def _ilike_any(column: str, values: Iterable[str]) -> str:
+    """PostgREST or-filter matching ``column`` ILIKE %value% for any value."""
+    patterns = []
+    for value in values:
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+        patterns.append(f'{column}.ilike."%{escaped}%"')
+    return ','.join(patterns)
+
+
+def _first_match(text: Optional[str], values: Iterable[str]) -> Optional[str]:
+    """First token value contained in ``text`` (case-insensitive)."""
+    haystack = (text or '').lower()
+    for value in values:
+        if value.lower() in haystack:
+            return value
+    return None
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(v for v in values if v))
+
+
 class CandidateFinder:
     """
     Find candidate PMS objects matching email tokens.
@@ -46,30 +76,19 @@ class CandidateFinder:
         Returns:
             List of candidate objects with scores
         """
-        candidates = []
-
         # Get ID tokens
         ids = tokens.get('ids', {})
         parts = tokens.get('parts', {})
         vendor = tokens.get('vendor', {})
 
-        # Phase 7e: Work Order candidates
-        wo_candidates = await self.find_work_order_candidates(yacht_id, ids, vendor)
-        candidates.extend(wo_candidates)
-
-        # Phase 7f: Equipment candidates
-        eq_candidates = await self.find_equipment_candidates(yacht_id, parts)
-        candidates.extend(eq_candidates)
-
-        # Phase 7f: Part candidates
-        part_candidates = await self.find_part_candidates(yacht_id, parts)
-        candidates.extend(part_candidates)
-
-        # Phase 7g: Vendor candidates
-        vendor_candidates = await self.find_vendor_candidates(yacht_id, vendor)
-        candidates.extend(vendor_candidates)
-
-        return candidates
+        # Phase 7e-g lookups are independent — run them concurrently
+        groups = await asyncio.gather(
+            self.find_work_order_candidates(yacht_id, ids, vendor),
+            self.find_equipment_candidates(yacht_id, parts),
+            self.find_part_candidates(yacht_id, parts),
+            self.find_vendor_candidates(yacht_id, vendor),
+        )
+        return [candidate for group in groups for candidate in group]
 
     # ==========================================================================
     # Phase 7e: Work Order Candidates
@@ -96,66 +115,67 @@ class CandidateFinder:
         Returns:
             List of candidates
         """
-        candidates = []
+        candidates: Dict[str, Dict[str, Any]] = {}
 
         # 1. Exact WO number match (highest priority)
         # Check both wo_id (numeric) and wo_number (full alphanumeric like WO-TEST-68DB4A)
-        wo_values = set()
-        if 'wo_id' in ids:
-            wo_values.update(ids['wo_id'])
-        if 'wo_number' in ids:
-            wo_values.update(ids['wo_number'])
+        wo_values = _unique([*ids.get('wo_id', []), *ids.get('wo_number', [])])
+
+        # 2. Vendor hash match on active work orders (planned or in_progress)
+        sender_hash = vendor.get('sender_hash')
 
-        for wo_num in wo_values:
+        async def by_number():
+            if not wo_values:
+                return []
             try:
-                result = self.supabase.table('pms_work_orders').select(
+                result = await aexecute(self.supabase.table('pms_work_orders').select(
                     'id, wo_number, title, status, updated_at'
-                ).eq('yacht_id', yacht_id).ilike(
-                    'wo_number', f'%{wo_num}%'
-                ).execute()
-
-                for row in result.data or []:
-                    # Avoid duplicates
-                    if not any(c['object_id'] == row['id'] for c in candidates):
-                        candidates.append({
-                            'object_type': 'work_order',
-                            'object_id': row['id'],
-                            'label': f"{row['wo_number']}: {row['title']}",
-                            'match_reason': 'wo_id_match',
-                            'score': 135,  # Hard match - highest score for L1
-                            'status': row.get('status'),
-                            'updated_at': row.get('updated_at'),
-                        })
-
+                ).eq('yacht_id', yacht_id).or_(_ilike_any('wo_number', wo_values)))
+                return result.data or []
             except Exception as e:
                 logger.error(f"[CandidateFinder] WO number search error: {e}")
+                return []
 
-        # 2. Vendor hash match on active work orders (planned or in_progress)
-        sender_hash = vendor.get('sender_hash')
-        if sender_hash:
+        async def by_vendor():
+            if not sender_hash:
+                return []
             try:
-                result = self.supabase.table('pms_work_orders').select(
+                result = await aexecute(self.supabase.table('pms_work_orders').select(
                     'id, wo_number, title, status'
                 ).eq('yacht_id', yacht_id).eq(
                     'vendor_contact_hash', sender_hash
-                ).in_('status', ['planned', 'in_progress']).execute()
-
-                for row in result.data or []:
-                    # Don't duplicate if already matched by WO number
-                    if not any(c['object_id'] == row['id'] for c in candidates):
-                        candidates.append({
-                            'object_type': 'work_order',
-                            'object_id': row['id'],
-                            'label': f"WO-{row['wo_number']}: {row['title']}",
-                            'match_reason': 'vendor_hash_match',
-                            'score': 45,
-                            'status': row.get('status'),
-                        })
-
+                ).in_('status', ['planned', 'in_progress']))
+                return result.data or []
             except Exception as e:
                 logger.error(f"[CandidateFinder] Vendor hash WO search error: {e}")
+                return []
 
-        return candidates
+        number_rows, vendor_rows = await asyncio.gather(by_number(), by_vendor())
+
+        for row in number_rows:
+            candidates.setdefault(row['id'], {
+                'object_type': 'work_order',
+                'object_id': row['id'],
+                'label': f"{row['wo_number']}: {row['title']}",
+                'match_reason': 'wo_id_match',
+                'match_value': _first_match(row.get('wo_number'), wo_values),
+                'score': 135,  # Hard match - highest score for L1
+                'status': row.get('status'),
+                'updated_at': row.get('updated_at'),
+            })
+
+        for row in vendor_rows:
+            # Don't duplicate if already matched by WO number
+            candidates.setdefault(row['id'], {
+                'object_type': 'work_order',
+                'object_id': row['id'],
+                'label': f"WO-{row['wo_number']}: {row['title']}",
+                'match_reason': 'vendor_hash_match',
+                'score': 45,
+                'status': row.get('status'),
+            })
+
+        return list(candidates.values())
 
     # ==========================================================================
     # Phase 7f: Equipment Candidates
@@ -176,33 +196,33 @@ class CandidateFinder:
         Returns:
             List of candidates
         """
-        candidates = []
-
         # Serial number match
-        serial_numbers = parts.get('serial_number', [])
-        for serial in serial_numbers:
-            try:
-                result = self.supabase.table('equipment').select(
-                    'id, name, serial_number, model, manufacturer'
-                ).eq('yacht_id', yacht_id).ilike(
-                    'serial_number', f'%{serial}%'
-                ).execute()
+        serial_numbers = _unique(parts.get('serial_number', []))
+        if not serial_numbers:
+            return []
 
-                for row in result.data or []:
-                    candidates.append({
-                        'object_type': 'equipment',
-                        'object_id': row['id'],
-                        'label': f"{row['name']} (S/N: {row['serial_number']})",
-                        'match_reason': 'serial_match',
-                        'score': 70,
-                        'model': row.get('model'),
-                        'manufacturer': row.get('manufacturer'),
-                    })
+        try:
+            result = await aexecute(self.supabase.table('equipment').select(
+                'id, name, serial_number, model, manufacturer'
+            ).eq('yacht_id', yacht_id).or_(_ilike_any('serial_number', serial_numbers)))
+        except Exception as e:
+            logger.error(f"[CandidateFinder] Serial number search error: {e}")
+            return []
 
-            except Exception as e:
-                logger.error(f"[CandidateFinder] Serial number search error: {e}")
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for row in result.data or []:
+            candidates.setdefault(row['id'], {
+                'object_type': 'equipment',
+                'object_id': row['id'],
+                'label': f"{row['name']} (S/N: {row['serial_number']})",
+                'match_reason': 'serial_match',
+                'match_value': _first_match(row.get('serial_number'), serial_numbers),
+                'score': 70,
+                'model': row.get('model'),
+                'manufacturer': row.get('manufacturer'),
+            })
 
-        return candidates
+        return list(candidates.values())
 
     # ==========================================================================
     # Phase 7f: Part Candidates
@@ -223,58 +243,50 @@ class CandidateFinder:
         Returns:
             List of candidates
         """
-        candidates = []
-
-        # Part number match
-        part_numbers = parts.get('part_number', [])
-        for pn in part_numbers:
-            try:
-                result = self.supabase.table('pms_parts').select(
-                    'id, name, part_number, manufacturer, quantity_on_hand'
-                ).eq('yacht_id', yacht_id).ilike(
-                    'part_number', f'%{pn}%'
-                ).execute()
-
-                for row in result.data or []:
-                    candidates.append({
-                        'object_type': 'part',
-                        'object_id': row['id'],
-                        'label': f"{row['name']} (P/N: {row['part_number']})",
-                        'match_reason': 'part_number_match',
-                        'score': 70,
-                        'manufacturer': row.get('manufacturer'),
-                        'quantity': row.get('quantity_on_hand'),
-                    })
-
-            except Exception as e:
-                logger.error(f"[CandidateFinder] Part number search error: {e}")
-
-        # OEM number match
-        oem_numbers = parts.get('oem_number', [])
-        for oem in oem_numbers:
-            try:
-                # Search in metadata or alternate part numbers if available
-                result = self.supabase.table('pms_parts').select(
-                    'id, name, part_number, manufacturer'
-                ).eq('yacht_id', yacht_id).ilike(
-                    'part_number', f'%{oem}%'
-                ).execute()
+        part_numbers = _unique(parts.get('part_number', []))
+        # OEM numbers are searched in the same column; one query covers both
+        oem_numbers = [v for v in _unique(parts.get('oem_number', [])) if v not in part_numbers]
+        if not part_numbers and not oem_numbers:
+            return []
 
-                for row in result.data or []:
-                    # Don't duplicate
-                    if not any(c['object_id'] == row['id'] for c in candidates):
-                        candidates.append({
-                            'object_type': 'part',
-                            'object_id': row['id'],
-                            'label': f"{row['name']} (OEM: {oem})",
-                            'match_reason': 'oem_number_match',
-                            'score': 60,
-                        })
+        try:
+            result = await aexecute(self.supabase.table('pms_parts').select(
+                'id, name, part_number, manufacturer, quantity_on_hand'
+            ).eq('yacht_id', yacht_id).or_(_ilike_any('part_number', part_numbers + oem_numbers)))
+        except Exception as e:
+            logger.error(f"[CandidateFinder] Part number search error: {e}")
+            return []
 
-            except Exception as e:
-                logger.error(f"[CandidateFinder] OEM number search error: {e}")
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for row in result.data or []:
+            pn = _first_match(row.get('part_number'), part_numbers)
+            if pn:
+                # Part number match
+                candidates[row['id']] = {
+                    'object_type': 'part',
+                    'object_id': row['id'],
+                    'label': f"{row['name']} (P/N: {row['part_number']})",
+                    'match_reason': 'part_number_match',
+                    'match_value': pn,
+                    'score': 70,
+                    'manufacturer': row.get('manufacturer'),
+                    'quantity': row.get('quantity_on_hand'),
+                }
+                continue
+
+            # OEM number match
+            oem = _first_match(row.get('part_number'), oem_numbers)
+            if oem:
+                candidates.setdefault(row['id'], {
+                    'object_type': 'part',
+                    'object_id': row['id'],
+                    'label': f"{row['name']} (OEM: {oem})",
+                    'match_reason': 'oem_number_match',
+                    'match_value': oem,
+                    'score': 60,
+                })
 
-        return candidates
+        return list(candidates.values())
 
     # ==========================================================================
     # Phase 7g: Vendor Candidates
@@ -305,11 +317,11 @@ class CandidateFinder:
         sender_hash = vendor.get('sender_hash')
         if sender_hash:
             try:
-                result = self.supabase.table('vendors').select(
+                result = await aexecute(self.supabase.table('vendors').select(
                     'id, name, category, email'
                 ).eq('yacht_id', yacht_id).eq(
                     'email_hash', sender_hash
-                ).execute()
+                ))
 
                 for row in result.data or []:
                     candidates.append({
@@ -330,11 +342,11 @@ class CandidateFinder:
 
         if sender_domain and not candidates and not is_personal:
             try:
-                result = self.supabase.table('vendors').select(
+                result = await aexecute(self.supabase.table('vendors').select(
                     'id, name, category, domain'
                 ).eq('yacht_id', yacht_id).eq(
                     'domain', sender_domain
-                ).execute()
+                ))
 
                 for row in result.data or []:
                     candidates.append({
@@ -367,11 +379,11 @@ class CandidateFinder:
             List of related work orders
         """
         try:
-            result = self.supabase.table('pms_work_orders').select(
+            result = await aexecute(self.supabase.table('pms_work_orders').select(
                 'id, wo_number, title, status, updated_at'
             ).eq('yacht_id', yacht_id).eq(
                 'equipment_id', equipment_id
-            ).in_('status', ['planned', 'in_progress']).execute()
+            ).in_('status', ['planned', 'in_progress']))
 
             return [{
                 'object_type': 'work_order',
@@ -425,7 +437,7 @@ class CandidateFinder:
 
         try:
             # Call match_link_targets_v2 RPC (uses embedding_1536 and websearch_to_tsquery)
-            result = self.supabase.rpc('match_link_targets_v2', {
+            result = await aexecute(self.supabase.rpc('match_link_targets_v2', {
                 'p_yacht_id': yacht_id,
                 'p_query': query_text,
                 'p_query_embedding': query_embedding,
@@ -435,7 +447,7 @@ class CandidateFinder:
                 'p_text_k': limit * 2,  # Fetch more candidates for fusion
                 'p_vector_k': limit * 2,
                 'p_min_vector': 0.50,  # Minimum vector similarity threshold
-            }).execute()
+            }))
 
             # Map RPC results to candidate format
             for row in result.data or []:
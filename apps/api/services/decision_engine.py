@@ -10,18 +10,28 @@ Policy Sources:
 - E019_STATE_GUARDS.yaml (mutual exclusion / state machine)
 
 Output: ActionDecision[] for each action in the 30 action registry.
+
+Policies are compiled once at load into an evaluation plan (per-action
+guard/forbidden closures, pre-lowered intent and entity sets, HOD flag) and
+recompiled when the policy files change on disk.
 """
 
+import os
+import time
 import yaml
 import logging
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, FrozenSet, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# How often evaluate() checks the policy files for changes (seconds)
+POLICY_RELOAD_INTERVAL = float(os.getenv("DECISION_POLICY_RELOAD_INTERVAL", "5"))
+
 
 class ActionTier(str, Enum):
     PRIMARY = "primary"
@@ -117,11 +127,145 @@ class DecisionContext:
         return None
 
 
+# =============================================================================
+# COMPILED POLICY
+# =============================================================================
+
+class _EvalView:
+    """Per-call view of a DecisionContext: entity lookups and role check done once."""
+
+    __slots__ = ("entities", "typed", "entity_types", "work_order", "fault", "equipment",
+                 "intents", "detected_intents", "is_hod", "environment")
+
+    def __init__(self, context: DecisionContext, hod_roles: FrozenSet[str]):
+        self.entities = context.entities
+        by_type: Dict[Any, Dict] = {}
+        for e in context.entities:
+            by_type.setdefault(e.get("type"), e)
+        self.work_order = by_type.get("work_order")
+        self.fault = by_type.get("fault")
+        self.equipment = by_type.get("equipment")
+        self.typed = [(e.get("type", "").lower(), e) for e in context.entities]
+        self.entity_types = {t for t, _ in self.typed}
+        self.detected_intents = context.detected_intents
+        self.intents = [(d, d.lower()) for d in context.detected_intents]
+        self.is_hod = context.user_role.lower() in hod_roles
+        self.environment = context.environment
+
+
+def _wo_status_is(status: str, reason: str) -> Callable[[_EvalView], Optional[str]]:
+    return lambda v: reason if v.work_order and v.work_order.get("status") == status else None
+
+
+def _fault_has_active_work_order(v: _EvalView) -> Optional[str]:
+    if v.fault and v.fault.get("has_work_order"):
+        if v.work_order and v.work_order.get("status") not in ("closed", "completed", "cancelled"):
+            return "Fault has active work order"
+    return None
+
+
+# Forbidden context -> check returning the block reason. Contexts not listed
+# here (e.g. duplicate_wo_for_fault) are not enforced.
+_FORBIDDEN_CHECKS: Dict[str, Callable[[_EvalView], Optional[str]]] = {
+    "work_order_closed": _wo_status_is("closed", "Work order is closed"),
+    "work_order_cancelled": _wo_status_is("cancelled", "Work order was cancelled"),
+    "work_order_open": _wo_status_is("open", "Work order must be started first"),
+    "fault_closed": lambda v: "Fault is already resolved" if v.fault and v.fault.get("status") == "closed" else None,
+    "fault_has_work_order": lambda v: (
+        "A work order already exists for this fault" if v.fault and v.fault.get("has_work_order") else None
+    ),
+    "fault_has_active_work_order": _fault_has_active_work_order,
+    "no_work_order": lambda v: None if v.work_order else "No work order selected",
+    "no_equipment": lambda v: None if v.equipment else "No equipment selected",
+    "no_fault": lambda v: None if v.fault else "No fault selected",
+    "no_entity_context": lambda v: None if v.entities else "No entity context",
+    "user_not_hod": lambda v: None if v.is_hod else "Requires supervisor permissions",
+    "not_in_shipyard": lambda v: None if v.environment == "shipyard" else "Only available in shipyard mode",
+}
+
+# Situation (lowercase) -> predicate. Unknown situations never match.
+_SITUATION_CHECKS: Dict[str, Callable[[_EvalView], Any]] = {
+    "work_order_active": lambda v: v.work_order and v.work_order.get("status") in ("open", "in_progress"),
+    "work_order_open": lambda v: v.work_order and v.work_order.get("status") == "open",
+    "work_order_in_progress": lambda v: v.work_order and v.work_order.get("status") == "in_progress",
+    "work_order_has_checklist": lambda v: v.work_order and v.work_order.get("has_checklist"),
+    "fault_open": lambda v: v.fault and v.fault.get("status") != "closed",
+    "fault_closed": lambda v: v.fault and v.fault.get("status") == "closed",
+    "fault_has_no_work_order": lambda v: v.fault and not v.fault.get("has_work_order"),
+    "fault_not_acknowledged": lambda v: v.fault and not v.fault.get("acknowledged"),
+    "fault_exists": lambda v: v.fault is not None,
+    "fault_identified": lambda v: v.fault is not None,
+    "equipment_identified": lambda v: v.equipment is not None,
+    "equipment_has_manual": lambda v: v.equipment and v.equipment.get("has_manual"),
+    "user_is_hod": lambda v: v.is_hod,
+    "environment_shipyard": lambda v: v.environment == "shipyard",
+    "active_work_context": lambda v: bool(v.entities),
+    "in_shipyard_or_has_worklist": lambda v: v.environment == "shipyard" or v.work_order is not None,
+}
+
+
+# Placeholders _build_explanation knows how to fill
+_EXPLANATION_FIELDS = ("{work_order.title}", "{fault.title}", "{equipment.name}", "{entity.summary}")
+
+
+def _never(v: _EvalView) -> bool:
+    return False
+
+
+def _compile_state_guard(
+    label: str,
+    entity_of: Callable[[_EvalView], Optional[Dict]],
+    required_state: Any,
+) -> Callable[[_EvalView], Optional[str]]:
+    """Compile an E019 requires_state (a state or list of states) into a check."""
+    if isinstance(required_state, list):
+        allowed = frozenset(required_state)
+        expected = " or ".join(required_state)
+    else:
+        allowed = frozenset([required_state])
+        expected = required_state
+
+    def check(v: _EvalView) -> Optional[str]:
+        entity = entity_of(v)
+        if entity:
+            current_status = entity.get("status", "").lower()
+            if current_status not in allowed:
+                return f"{label} status must be {expected}, currently {current_status}"
+        return None
+
+    return check
+
+
+@dataclass(frozen=True)
+class _CompiledAction:
+    """One trigger contract, pre-resolved for evaluation."""
+    name: str
+    tier: ActionTier
+    threshold: float
+    blocked_explanation: str
+    explanation_template: str
+    explanation_fields: FrozenSet[str]
+    forbidden: Tuple[Callable[[_EvalView], Optional[str]], ...]
+    guards: Tuple[Callable[[_EvalView], Optional[str]], ...]
+    requires_hod: bool
+    intents: Tuple[Tuple[str, str], ...]
+    intent_set: FrozenSet[str]
+    intent_mismatch: str
+    entities_min: Tuple[str, ...]
+    entities_min_set: FrozenSet[str]
+    entities_min_with_ids: str
+    entities_min_without_ids: str
+    entities_one_of: Tuple[str, ...]
+    entities_one_of_missing: str
+    situations: Tuple[Tuple[Callable[[_EvalView], Any], str, str], ...]
+
+
 class DecisionEngine:
     """
     Core Decision Engine.
 
-    Loads policy files (E017, E019) and evaluates decisions for all 30 actions.
+    Loads policy files (E017, E019), compiles them into an evaluation plan and
+    evaluates decisions for all 30 actions.
     """
 
     # Tier thresholds per E018
@@ -134,13 +278,14 @@ class DecisionEngine:
     # HOD roles per E017/E019
     HOD_ROLES = frozenset(["chief_engineer", "eto", "captain", "manager", "hod"])
 
-    def __init__(self, policy_dir: Optional[Path] = None):
+    def __init__(self, policy_dir: Optional[Path] = None, reload_interval: float = POLICY_RELOAD_INTERVAL):
         """
         Initialize Decision Engine with policy files.
 
         Args:
             policy_dir: Directory containing E017/E019 YAML files.
                        Defaults to apps/api/config/
+            reload_interval: Seconds between checks for changed policy files.
         """
         if policy_dir is None:
             # Default: config/ directory relative to apps/api/
@@ -148,37 +293,149 @@ class DecisionEngine:
             policy_dir = Path(__file__).parent.parent / "config"
 
         self.policy_dir = policy_dir
+        self.reload_interval = reload_interval
         self.trigger_contracts: Dict[str, Dict] = {}
         self.state_guards: Dict[str, Dict] = {}
+        self._plan: Tuple[_CompiledAction, ...] = ()
+        self._policy_stamp = self._read_policy_stamp()
+        self._next_reload_check = time.monotonic() + reload_interval
         self._load_policies()
 
+    @property
+    def _policy_paths(self) -> Tuple[Path, Path]:
+        return (
+            self.policy_dir / "E017_TRIGGER_CONTRACTS.yaml",
+            self.policy_dir / "E019_STATE_GUARDS.yaml",
+        )
+
+    def _read_policy_stamp(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        stamp = []
+        for path in self._policy_paths:
+            try:
+                st = path.stat()
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
     def _load_policies(self):
-        """Load E017 and E019 YAML files."""
-        e017_path = self.policy_dir / "E017_TRIGGER_CONTRACTS.yaml"
-        e019_path = self.policy_dir / "E019_STATE_GUARDS.yaml"
+        """Load E017 and E019 YAML files and compile the evaluation plan."""
+        e017_path, e019_path = self._policy_paths
 
         # Load E017 Trigger Contracts
         if e017_path.exists():
             with open(e017_path, 'r') as f:
                 raw = yaml.safe_load(f)
                 # Filter out meta keys (start with _)
-                self.trigger_contracts = {
+                trigger_contracts = {
                     k: v for k, v in raw.items()
                     if not k.startswith('_') and isinstance(v, dict)
                 }
-            logger.info(f"Loaded {len(self.trigger_contracts)} trigger contracts from E017")
+            logger.info(f"Loaded {len(trigger_contracts)} trigger contracts from E017")
         else:
             logger.error(f"E017 not found at {e017_path}")
-            self.trigger_contracts = {}
+            trigger_contracts = {}
 
         # Load E019 State Guards
         if e019_path.exists():
             with open(e019_path, 'r') as f:
-                self.state_guards = yaml.safe_load(f) or {}
+                state_guards = yaml.safe_load(f) or {}
             logger.info(f"Loaded state guards from E019")
         else:
             logger.error(f"E019 not found at {e019_path}")
-            self.state_guards = {}
+            state_guards = {}
+
+        plan = self._compile(trigger_contracts, state_guards)
+
+        # Swap in one go so a concurrent evaluate() sees old or new, never a mix
+        self.trigger_contracts, self.state_guards, self._plan = trigger_contracts, state_guards, plan
+
+    def maybe_reload(self) -> bool:
+        """
+        Recompile if a policy file changed on disk. Returns True if reloaded.
+
+        Checks at most once per reload_interval. A policy that fails to parse
+        or compile is logged and the previous plan stays in service.
+        """
+        now = time.monotonic()
+        if now < self._next_reload_check:
+            return False
+        self._next_reload_check = now + self.reload_interval
+
+        stamp = self._read_policy_stamp()
+        if stamp == self._policy_stamp:
+            return False
+        self._policy_stamp = stamp
+
+        try:
+            self._load_policies()
+        except Exception as e:
+            logger.error(f"Policy reload failed, keeping previous policies: {e}")
+            return False
+        logger.info(f"Reloaded decision policies from {self.policy_dir}")
+        return True
+
+    def _compile(self, trigger_contracts: Dict[str, Dict], state_guards: Dict) -> Tuple[_CompiledAction, ...]:
+        """Compile trigger contracts + state guards into the evaluation plan."""
+        guard_sources = (
+            ("Work order", attrgetter("work_order"), state_guards.get("work_order", {}).get("state_guards", {})),
+            ("Fault", attrgetter("fault"), state_guards.get("fault", {}).get("state_guards", {})),
+        )
+
+        plan = []
+        for action_name, contract in trigger_contracts.items():
+            tier = ActionTier(contract.get("tier", "conditional"))
+            requires = contract.get("requires") or {}
+            forbidden_list = [f for f in contract.get("forbidden") or [] if isinstance(f, str)]
+            situation_required = requires.get("situation") or []
+            required_intents = requires.get("intent") or []
+            entity_req = requires.get("entities") or {}
+            min_required = entity_req.get("min") or []
+            min_one_of = entity_req.get("min_one_of") or []
+            template = contract.get("explanation_template", "")
+
+            forbidden = []
+            for name in forbidden_list:
+                check = _FORBIDDEN_CHECKS.get(name)
+                if check is None:
+                    logger.debug(f"{action_name}: forbidden context '{name}' is not enforced")
+                elif check not in forbidden:
+                    forbidden.append(check)
+
+            guards = []
+            for label, entity_of, guards_by_action in guard_sources:
+                required_state = (guards_by_action.get(action_name) or {}).get("requires_state")
+                if required_state:
+                    guards.append(_compile_state_guard(label, entity_of, required_state))
+
+            situations = tuple(
+                (_SITUATION_CHECKS.get(sit.lower(), _never), f"Situation met: {sit}", f"Situation not met: {sit}")
+                for sit in situation_required
+            )
+
+            plan.append(_CompiledAction(
+                name=action_name,
+                tier=tier,
+                threshold=self.TIER_THRESHOLDS[tier],
+                blocked_explanation=contract.get("explanation_template", action_name),
+                explanation_template=template,
+                explanation_fields=frozenset(f for f in _EXPLANATION_FIELDS if f in template),
+                forbidden=tuple(forbidden),
+                guards=tuple(guards),
+                requires_hod="user_not_hod" in forbidden_list or "user_is_hod" in situation_required,
+                intents=tuple((r, r.lower()) for r in required_intents),
+                intent_set=frozenset(r.lower() for r in required_intents),
+                intent_mismatch=f" not in {required_intents}",
+                entities_min=tuple(r.lower() for r in min_required),
+                entities_min_set=frozenset(r.lower() for r in min_required),
+                entities_min_with_ids=f"All required entities with IDs: {min_required}",
+                entities_min_without_ids=f"Required entities present (no IDs): {min_required}",
+                entities_one_of=tuple(r.lower() for r in min_one_of),
+                entities_one_of_missing=f"None of required entities present: {min_one_of}",
+                situations=situations,
+            ))
+
+        return tuple(plan)
 
     def evaluate(self, context: DecisionContext) -> List[ActionDecision]:
         """
@@ -190,89 +447,39 @@ class DecisionEngine:
         Returns:
             List of ActionDecision for all 30 actions
         """
-        decisions = []
-
-        for action_name, contract in self.trigger_contracts.items():
-            decision = self._evaluate_action(action_name, contract, context)
-            decisions.append(decision)
+        self.maybe_reload()
+        view = _EvalView(context, self.HOD_ROLES)
+        return [self._evaluate_action(action, view) for action in self._plan]
 
-        return decisions
+    def _evaluate_action(self, action: _CompiledAction, view: _EvalView) -> ActionDecision:
+        """Evaluate a single compiled action."""
 
-    def _evaluate_action(
-        self,
-        action_name: str,
-        contract: Dict,
-        context: DecisionContext
-    ) -> ActionDecision:
-        """Evaluate a single action against its contract."""
+        # 1. Forbidden contexts (hard block), 2. state guards (mutual exclusion),
+        # 3. permission (role-based) — all short-circuit before scoring
+        for check in action.forbidden:
+            reason = check(view)
+            if reason:
+                return self._blocked(action, BlockedByType.FORBIDDEN, reason)
 
-        # Get tier
-        tier_str = contract.get("tier", "conditional")
-        tier = ActionTier(tier_str)
-
-        # Get threshold for this tier
-        threshold = self.TIER_THRESHOLDS[tier]
-
-        # Build reasons list
-        reasons: List[str] = []
-
-        # 1. Check forbidden contexts first (hard block)
-        forbidden_check = self._check_forbidden(action_name, contract, context)
-        if forbidden_check:
-            return ActionDecision(
-                action=action_name,
-                allowed=False,
-                tier=tier,
-                confidence=0.0,
-                reasons=[forbidden_check],
-                breakdown=ConfidenceBreakdown(),
-                blocked_by=BlockedBy(BlockedByType.FORBIDDEN, forbidden_check),
-                explanation=contract.get("explanation_template", action_name),
-            )
-
-        # 2. Check state guards (mutual exclusion)
-        guard_check = self._check_state_guards(action_name, context)
-        if guard_check:
-            return ActionDecision(
-                action=action_name,
-                allowed=False,
-                tier=tier,
-                confidence=0.0,
-                reasons=[guard_check],
-                breakdown=ConfidenceBreakdown(),
-                blocked_by=BlockedBy(BlockedByType.STATE_GUARD, guard_check),
-                explanation=contract.get("explanation_template", action_name),
-            )
+        for check in action.guards:
+            reason = check(view)
+            if reason:
+                return self._blocked(action, BlockedByType.STATE_GUARD, reason)
 
-        # 3. Check permission (role-based)
-        permission_check = self._check_permission(action_name, contract, context)
-        if permission_check:
-            return ActionDecision(
-                action=action_name,
-                allowed=False,
-                tier=tier,
-                confidence=0.0,
-                reasons=[permission_check],
-                breakdown=ConfidenceBreakdown(),
-                blocked_by=BlockedBy(BlockedByType.PERMISSION, permission_check),
-                explanation=contract.get("explanation_template", action_name),
-            )
+        if action.requires_hod and not view.is_hod:
+            return self._blocked(action, BlockedByType.PERMISSION, "This action requires supervisor permissions")
 
         # 4. Calculate confidence scores per E018
-        intent_score = self._score_intent(contract, context, reasons)
-        entity_score = self._score_entity(contract, context, reasons)
-        situation_score = self._score_situation(contract, context, reasons)
+        reasons: List[str] = []
+        intent_score = self._score_intent(action, view, reasons)
+        entity_score = self._score_entity(action, view, reasons)
+        situation_score = self._score_situation(action, view, reasons)
 
         # Weighted sum: intent 0.4 + entity 0.4 + situation 0.2
         total_confidence = (intent_score * 0.4) + (entity_score * 0.4) + (situation_score * 0.2)
 
-        breakdown = ConfidenceBreakdown(
-            intent=intent_score,
-            entity=entity_score,
-            situation=situation_score,
-        )
-
         # 5. Check threshold
+        threshold = action.threshold
         allowed = total_confidence >= threshold
         if not allowed:
             reasons.append(f"Confidence {total_confidence:.2f} below threshold {threshold}")
@@ -280,362 +487,135 @@ class DecisionEngine:
         else:
             blocked_by = None
 
-        # 6. Build explanation
-        explanation = self._build_explanation(contract, context)
-
         return ActionDecision(
-            action=action_name,
+            action=action.name,
             allowed=allowed,
-            tier=tier,
+            tier=action.tier,
             confidence=total_confidence,
             reasons=reasons,
-            breakdown=breakdown,
+            breakdown=ConfidenceBreakdown(
+                intent=intent_score,
+                entity=entity_score,
+                situation=situation_score,
+            ),
             blocked_by=blocked_by,
-            explanation=explanation,
+            explanation=self._build_explanation(action, view),
         )
 
-    def _check_forbidden(
-        self,
-        action_name: str,
-        contract: Dict,
-        context: DecisionContext
-    ) -> Optional[str]:
-        """Check forbidden contexts. Returns reason string if blocked."""
-        forbidden_list = contract.get("forbidden", [])
-
-        for forbidden in forbidden_list:
-            # Map forbidden context to check
-            if forbidden == "work_order_closed":
-                wo = context.work_order
-                if wo and wo.get("status") == "closed":
-                    return "Work order is closed"
-
-            elif forbidden == "work_order_cancelled":
-                wo = context.work_order
-                if wo and wo.get("status") == "cancelled":
-                    return "Work order was cancelled"
-
-            elif forbidden == "fault_closed":
-                fault = context.fault
-                if fault and fault.get("status") == "closed":
-                    return "Fault is already resolved"
-
-            elif forbidden == "fault_has_work_order":
-                fault = context.fault
-                if fault and fault.get("has_work_order"):
-                    return "A work order already exists for this fault"
-
-            elif forbidden == "no_work_order":
-                if not context.work_order:
-                    return "No work order selected"
-
-            elif forbidden == "no_equipment":
-                if not context.equipment:
-                    return "No equipment selected"
-
-            elif forbidden == "no_fault":
-                if not context.fault:
-                    return "No fault selected"
-
-            elif forbidden == "no_entity_context":
-                if not context.entities:
-                    return "No entity context"
-
-            elif forbidden == "user_not_hod":
-                if context.user_role.lower() not in self.HOD_ROLES:
-                    return "Requires supervisor permissions"
-
-            elif forbidden == "not_in_shipyard":
-                if context.environment != "shipyard":
-                    return "Only available in shipyard mode"
-
-            elif forbidden == "work_order_open":
-                wo = context.work_order
-                if wo and wo.get("status") == "open":
-                    return "Work order must be started first"
-
-            elif forbidden == "fault_has_active_work_order":
-                fault = context.fault
-                if fault and fault.get("has_work_order"):
-                    wo = context.work_order
-                    if wo and wo.get("status") not in ("closed", "completed", "cancelled"):
-                        return "Fault has active work order"
-
-        return None
-
-    def _check_state_guards(
-        self,
-        action_name: str,
-        context: DecisionContext
-    ) -> Optional[str]:
-        """Check state guards from E019. Returns reason string if blocked."""
-        # Check work order state machine
-        wo_guards = self.state_guards.get("work_order", {}).get("state_guards", {})
-        if action_name in wo_guards:
-            guard = wo_guards[action_name]
-            required_state = guard.get("requires_state")
-            wo = context.work_order
-
-            if required_state and wo:
-                current_status = wo.get("status", "").lower()
-                if isinstance(required_state, list):
-                    if current_status not in required_state:
-                        return f"Work order status must be {' or '.join(required_state)}, currently {current_status}"
-                elif current_status != required_state:
-                    return f"Work order status must be {required_state}, currently {current_status}"
-
-        # Check fault state machine
-        fault_guards = self.state_guards.get("fault", {}).get("state_guards", {})
-        if action_name in fault_guards:
-            guard = fault_guards[action_name]
-            required_state = guard.get("requires_state")
-            fault = context.fault
-
-            if required_state and fault:
-                current_status = fault.get("status", "").lower()
-                if isinstance(required_state, list):
-                    if current_status not in required_state:
-                        return f"Fault status must be {' or '.join(required_state)}, currently {current_status}"
-                elif current_status != required_state:
-                    return f"Fault status must be {required_state}, currently {current_status}"
-
-        return None
-
-    def _check_permission(
-        self,
-        action_name: str,
-        contract: Dict,
-        context: DecisionContext
-    ) -> Optional[str]:
-        """Check role-based permissions. Returns reason string if blocked."""
-        forbidden_list = contract.get("forbidden", [])
-
-        # Check if action requires HOD and user is not HOD
-        if "user_not_hod" in forbidden_list:
-            if context.user_role.lower() not in self.HOD_ROLES:
-                return "This action requires supervisor permissions"
-
-        # Check requires section for explicit role requirements
-        requires = contract.get("requires", {})
-        situation_required = requires.get("situation", [])
-
-        if "user_is_hod" in situation_required:
-            if context.user_role.lower() not in self.HOD_ROLES:
-                return "This action requires supervisor permissions"
-
-        return None
+    @staticmethod
+    def _blocked(action: _CompiledAction, blocked_type: BlockedByType, reason: str) -> ActionDecision:
+        return ActionDecision(
+            action=action.name,
+            allowed=False,
+            tier=action.tier,
+            confidence=0.0,
+            reasons=[reason],
+            breakdown=ConfidenceBreakdown(),
+            blocked_by=BlockedBy(blocked_type, reason),
+            explanation=action.blocked_explanation,
+        )
 
-    def _score_intent(
-        self,
-        contract: Dict,
-        context: DecisionContext,
-        reasons: List[str]
-    ) -> float:
+    def _score_intent(self, action: _CompiledAction, view: _EvalView, reasons: List[str]) -> float:
         """Score intent match per E018."""
-        required_intents = contract.get("requires", {}).get("intent", [])
-
-        if not required_intents:
+        if not action.intents:
             reasons.append("No intent requirement (1.0)")
             return 1.0
 
-        if not context.detected_intents:
+        if not view.intents:
             reasons.append("No intent detected (0.0)")
             return 0.0
 
         # Check for exact match
-        for detected in context.detected_intents:
-            detected_lower = detected.lower()
-            for required in required_intents:
-                if detected_lower == required.lower():
-                    reasons.append(f"Intent match: {detected}")
-                    return 1.0
-
-        # Check for partial/semantic match
-        for detected in context.detected_intents:
-            detected_lower = detected.lower()
-            for required in required_intents:
-                # Substring match
-                if required.lower() in detected_lower or detected_lower in required.lower():
+        for detected, detected_lower in view.intents:
+            if detected_lower in action.intent_set:
+                reasons.append(f"Intent match: {detected}")
+                return 1.0
+
+        # Check for partial/semantic match (substring either way)
+        for detected, detected_lower in view.intents:
+            for required, required_lower in action.intents:
+                if required_lower in detected_lower or detected_lower in required_lower:
                     reasons.append(f"Partial intent match: {detected} ~ {required}")
                     return 0.7
 
         # No match
-        reasons.append(f"Intent mismatch: {context.detected_intents} not in {required_intents}")
+        reasons.append(f"Intent mismatch: {view.detected_intents}{action.intent_mismatch}")
         return 0.0
 
-    def _score_entity(
-        self,
-        contract: Dict,
-        context: DecisionContext,
-        reasons: List[str]
-    ) -> float:
+    def _score_entity(self, action: _CompiledAction, view: _EvalView, reasons: List[str]) -> float:
         """Score entity match per E018."""
-        requires = contract.get("requires", {})
-        entity_req = requires.get("entities", {})
-
-        min_required = entity_req.get("min", [])
-        min_one_of = entity_req.get("min_one_of", [])
-
-        # No entity requirement
-        if not min_required and not min_one_of:
-            reasons.append("No entity requirement (1.0)")
-            return 1.0
-
-        entity_types = {e.get("type", "").lower() for e in context.entities}
-
         # Check min (all required)
-        if min_required:
-            min_required_lower = [r.lower() for r in min_required]
-            missing = [r for r in min_required_lower if r not in entity_types]
+        if action.entities_min:
+            missing = [r for r in action.entities_min if r not in view.entity_types]
             if missing:
                 reasons.append(f"Missing required entities: {missing}")
                 return 0.0
-            else:
-                # Check if entities have IDs (higher quality)
-                has_ids = all(
-                    e.get("id") for e in context.entities
-                    if e.get("type", "").lower() in min_required_lower
-                )
-                if has_ids:
-                    reasons.append(f"All required entities with IDs: {min_required}")
-                    return 1.0
-                else:
-                    reasons.append(f"Required entities present (no IDs): {min_required}")
-                    return 0.7
+            # Entities with IDs are higher quality
+            if all(e.get("id") for t, e in view.typed if t in action.entities_min_set):
+                reasons.append(action.entities_min_with_ids)
+                return 1.0
+            reasons.append(action.entities_min_without_ids)
+            return 0.7
 
         # Check min_one_of (at least one)
-        if min_one_of:
-            min_one_lower = [r.lower() for r in min_one_of]
-            found = [r for r in min_one_lower if r in entity_types]
+        if action.entities_one_of:
+            found = [r for r in action.entities_one_of if r in view.entity_types]
             if found:
                 reasons.append(f"Found one of required entities: {found}")
                 return 1.0
-            else:
-                reasons.append(f"None of required entities present: {min_one_of}")
-                return 0.0
+            reasons.append(action.entities_one_of_missing)
+            return 0.0
 
+        reasons.append("No entity requirement (1.0)")
         return 1.0
 
-    def _score_situation(
-        self,
-        contract: Dict,
-        context: DecisionContext,
-        reasons: List[str]
-    ) -> float:
+    def _score_situation(self, action: _CompiledAction, view: _EvalView, reasons: List[str]) -> float:
         """Score situation match per E018."""
-        requires = contract.get("requires", {})
-        situation_required = requires.get("situation", [])
-
-        if not situation_required:
+        if not action.situations:
             reasons.append("No situation requirement (1.0)")
             return 1.0
 
         matched = 0
-        total = len(situation_required)
-
-        for sit in situation_required:
-            if self._check_situation(sit, context):
+        for check, met, not_met in action.situations:
+            if check(view):
                 matched += 1
-                reasons.append(f"Situation met: {sit}")
+                reasons.append(met)
             else:
-                reasons.append(f"Situation not met: {sit}")
-
-        score = matched / total if total > 0 else 1.0
-        return score
-
-    def _check_situation(self, situation: str, context: DecisionContext) -> bool:
-        """Check a single situation condition."""
-        sit_lower = situation.lower()
-
-        if sit_lower == "work_order_active":
-            wo = context.work_order
-            return wo and wo.get("status") in ("open", "in_progress")
-
-        elif sit_lower == "work_order_open":
-            wo = context.work_order
-            return wo and wo.get("status") == "open"
-
-        elif sit_lower == "work_order_in_progress":
-            wo = context.work_order
-            return wo and wo.get("status") == "in_progress"
-
-        elif sit_lower == "fault_open":
-            fault = context.fault
-            return fault and fault.get("status") != "closed"
-
-        elif sit_lower == "fault_closed":
-            fault = context.fault
-            return fault and fault.get("status") == "closed"
-
-        elif sit_lower == "fault_has_no_work_order":
-            fault = context.fault
-            return fault and not fault.get("has_work_order")
+                reasons.append(not_met)
 
-        elif sit_lower == "fault_not_acknowledged":
-            fault = context.fault
-            return fault and not fault.get("acknowledged")
+        return matched / len(action.situations)
 
-        elif sit_lower == "equipment_identified":
-            return context.equipment is not None
-
-        elif sit_lower == "equipment_has_manual":
-            eq = context.equipment
-            return eq and eq.get("has_manual")
-
-        elif sit_lower == "user_is_hod":
-            return context.user_role.lower() in self.HOD_ROLES
-
-        elif sit_lower == "environment_shipyard":
-            return context.environment == "shipyard"
-
-        elif sit_lower == "active_work_context":
-            return bool(context.entities)
-
-        elif sit_lower == "work_order_has_checklist":
-            wo = context.work_order
-            return wo and wo.get("has_checklist")
-
-        elif sit_lower in ("fault_exists", "fault_identified"):
-            return context.fault is not None
-
-        elif sit_lower == "in_shipyard_or_has_worklist":
-            return context.environment == "shipyard" or context.work_order is not None
-
-        # Default: not matched
-        return False
-
-    def _build_explanation(self, contract: Dict, context: DecisionContext) -> str:
+    def _build_explanation(self, action: _CompiledAction, view: _EvalView) -> str:
         """Build human-readable explanation from template."""
-        template = contract.get("explanation_template", "")
-
-        if not template:
-            return ""
+        fields = action.explanation_fields
+        if not fields:
+            return action.explanation_template
 
         # Simple variable substitution
-        explanation = template
+        explanation = action.explanation_template
 
         # Replace entity references
-        if context.work_order:
+        if view.work_order and "{work_order.title}" in fields:
             explanation = explanation.replace(
                 "{work_order.title}",
-                context.work_order.get("title", context.work_order.get("name", "Work Order"))
+                view.work_order.get("title", view.work_order.get("name", "Work Order"))
             )
 
-        if context.fault:
+        if view.fault and "{fault.title}" in fields:
             explanation = explanation.replace(
                 "{fault.title}",
-                context.fault.get("title", context.fault.get("name", "Fault"))
+                view.fault.get("title", view.fault.get("name", "Fault"))
             )
 
-        if context.equipment:
+        if view.equipment and "{equipment.name}" in fields:
             explanation = explanation.replace(
                 "{equipment.name}",
-                context.equipment.get("name", "Equipment")
+                view.equipment.get("name", "Equipment")
             )
 
         # Generic entity reference
-        if context.entities:
-            primary = context.entities[0]
+        if view.entities and "{entity.summary}" in fields:
+            primary = view.entities[0]
             explanation = explanation.replace(
                 "{entity.summary}",
                 primary.get("name", primary.get("title", "Item"))
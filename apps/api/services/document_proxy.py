@@ -0,0 +1,475 @@
+"""
+Streaming document proxy for Supabase Storage.
+
+``/v1/documents/{id}/stream`` used to ``download()`` the whole object into
+memory and return it as one ``Response``. A viewer jumping to page 300 of a
+200 MB manual therefore pulled and buffered 200 MB per request, and a few
+concurrent viewers were enough to exhaust a 512 MB instance.
+
+This module proxies the object instead:
+
+    * **Byte ranges forwarded.** ``Range`` / ``If-Range`` go upstream as-is;
+      ``206 Partial Content``, ``Content-Range``, ``Accept-Ranges`` and
+      ``416`` come back unchanged, so pdf.js fetches only the pages it draws.
+
+    * **Conditional requests.** ``If-None-Match`` / ``If-Modified-Since``
+      are forwarded (or answered from the local ETag) and a match is a bodyless
+      ``304``.
+
+    * **Bounded buffers.** The body is relayed in ``STREAM_CHUNK_BYTES``
+      chunks from a pooled ``httpx.AsyncClient``; peak memory per download is
+      a chunk or two regardless of file size.
+
+    * **Optional on-disk LRU.** With ``DOCUMENT_CACHE_DIR`` set, full-object
+      responses are teed to disk and ranged misses trigger a one-off background
+      fill; repeat reads (ranged or not) are then served locally. Entries are
+      keyed by tenant + path + document version and evicted least-recently-used
+      once ``DOCUMENT_CACHE_MAX_BYTES`` is exceeded.
+
+Usage::
+
+    return await proxy_document(
+        tenant_key_alias, "documents", storage_path, request.headers,
+        version=doc.get("updated_at"),
+        response_headers={"Content-Disposition": 'inline; filename="x.pdf"'},
+        content_type="application/pdf",
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from integrations.supabase import get_tenant_credentials
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_BYTES = int(os.getenv("DOCUMENT_STREAM_CHUNK_BYTES", str(64 * 1024)))
+DOCUMENT_PROXY_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0)
+
+DOCUMENT_CACHE_DIR = os.getenv("DOCUMENT_CACHE_DIR", "")
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+DOCUMENT_CACHE_MAX_OBJECT_BYTES = int(os.getenv("DOCUMENT_CACHE_MAX_OBJECT_BYTES", str(250 * 1024 * 1024)))
+
+# Upstream headers relayed to the client verbatim.
+_PASSTHROUGH_HEADERS = ("content-length", "content-range", "etag", "last-modified", "accept-ranges")
+# Client headers forwarded upstream.
+_FORWARD_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# ── HTTP client ──────────────────────────────────────────────────────────────
+
+# One pool per event loop — httpx connections are loop-bound (see
+# integrations.supabase._async_tenant_clients for the same reasoning).
+_http_clients: Dict[Optional[int], httpx.AsyncClient] = {}
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    try:
+        loop_id = id(asyncio.get_running_loop())
+    except RuntimeError:
+        loop_id = None
+    client = _http_clients.get(loop_id)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=DOCUMENT_PROXY_TIMEOUT,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+        _http_clients[loop_id] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close pooled proxy connections (call on app shutdown)."""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"[DocumentProxy] Close failed: {e}")
+
+
+def _object_url(base_url: str, bucket: str, path: str) -> str:
+    return f"{base_url.rstrip('/')}/storage/v1/object/authenticated/{bucket}/{quote(path)}"
+
+
+# ── Range helpers ────────────────────────────────────────────────────────────
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range against ``size``.
+
+    Returns ``(start, end)`` inclusive, or None when the header is absent,
+    malformed or multi-range (RFC 9110 lets us answer those with a 200).
+    Raises ``ValueError`` for a syntactically valid but unsatisfiable range.
+    """
+    if not header:
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None
+    first, last = m.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("unsatisfiable range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+def _etag_matches(header: Optional[str], etag: Optional[str]) -> bool:
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+# ── On-disk LRU ──────────────────────────────────────────────────────────────
+
+
+class BlobCache:
+    """
+    Size-bounded LRU of whole document blobs on local disk.
+
+    ``<key>.blob`` holds the bytes and ``<key>.json`` the response metadata
+    (size, ETag, Last-Modified, Content-Type). Writes land in a temp file and
+    are renamed into place, so readers never see a partial blob.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_object_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._filling: set = set()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(tenant: str, bucket: str, path: str, version: Any = None) -> str:
+        raw = f"{tenant}\x00{bucket}\x00{path}\x00{version or ''}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _blob(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.blob")
+
+    def _meta(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self) -> None:
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".blob"):
+                continue
+            key = name[:-5]
+            try:
+                st = os.stat(self._blob(key))
+            except OSError:
+                continue
+            if not os.path.exists(self._meta(key)):
+                continue
+            found.append((st.st_mtime, key, st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total += size
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        if key not in self._entries:
+            return None
+        try:
+            with open(self._meta(key)) as f:
+                meta = json.load(f)
+            os.utime(self._blob(key))
+        except (OSError, ValueError):
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return self._blob(key), meta
+
+    def new_temp_path(self, key: str) -> str:
+        return os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+
+    def commit(self, key: str, temp_path: str, meta: Dict[str, Any]) -> None:
+        size = os.path.getsize(temp_path)
+        with open(self._meta(key), "w") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self._blob(key))
+        if key in self._entries:
+            self._total -= self._entries.pop(key)
+        self._entries[key] = size
+        self._total += size
+        self._evict()
+
+    def _drop(self, key: str) -> None:
+        size = self._entries.pop(key, 0)
+        self._total -= size
+        for path in (self._blob(key), self._meta(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+
+_blob_cache: Optional[BlobCache] = None
+
+
+def get_blob_cache() -> Optional[BlobCache]:
+    """Process-wide blob cache, or None when ``DOCUMENT_CACHE_DIR`` is unset."""
+    global _blob_cache
+    if _blob_cache is None and DOCUMENT_CACHE_DIR:
+        try:
+            _blob_cache = BlobCache(DOCUMENT_CACHE_DIR, DOCUMENT_CACHE_MAX_BYTES, DOCUMENT_CACHE_MAX_OBJECT_BYTES)
+        except OSError as e:
+            logger.warning(f"[DocumentProxy] Cache disabled, cannot use {DOCUMENT_CACHE_DIR}: {e}")
+    return _blob_cache
+
+
+# ── Streaming bodies ─────────────────────────────────────────────────────────
+
+
+async def _iter_file(path: str, start: int, length: int) -> AsyncIterator[bytes]:
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        await asyncio.to_thread(f.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+async def _relay(upstream: httpx.Response, tee: Optional[Tuple[BlobCache, str, Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """Yield the upstream body chunk by chunk, optionally teeing it to the cache."""
+    sink = None
+    temp_path = None
+    written = 0
+    try:
+        if tee:
+            cache, key, _ = tee
+            temp_path = cache.new_temp_path(key)
+            sink = open(temp_path, "wb")
+        async for chunk in upstream.aiter_bytes(STREAM_CHUNK_BYTES):
+            if sink:
+                sink.write(chunk)
+                written += len(chunk)
+            yield chunk
+        if sink:
+            sink.close()
+            sink = None
+            cache, key, meta = tee
+            if written == meta["size"]:
+                cache.commit(key, temp_path, meta)
+                temp_path = None
+    finally:
+        await upstream.aclose()
+        if sink:
+            sink.close()
+        if temp_path:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+
+
+async def _fill_cache(cache: BlobCache, key: str, url: str, headers: Dict[str, str], content_type: str) -> None:
+    """Background full-object fetch after a ranged miss."""
+    if key in cache._filling:
+        return
+    cache._filling.add(key)
+    try:
+        client = _get_http_client()
+        upstream = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+        if upstream.status_code != 200:
+            await upstream.aclose()
+            return
+        meta = _cache_meta(upstream, content_type)
+        if meta["size"] is None or meta["size"] > cache.max_object_bytes:
+            await upstream.aclose()
+            return
+        async for _ in _relay(upstream, (cache, key, meta)):
+            pass
+    except Exception as e:
+        logger.debug(f"[DocumentProxy] Background cache fill failed: {e}")
+    finally:
+        cache._filling.discard(key)
+
+
+def _cache_meta(upstream: httpx.Response, content_type: str) -> Dict[str, Any]:
+    length = upstream.headers.get("content-length")
+    return {
+        "size": int(length) if length and length.isdigit() else None,
+        "etag": upstream.headers.get("etag"),
+        "last_modified": upstream.headers.get("last-modified"),
+        "content_type": content_type,
+        "cached_at": time.time(),
+    }
+
+
+def _serve_cached(
+    blob_path: str,
+    meta: Dict[str, Any],
+    request_headers: Mapping[str, str],
+    response_headers: Dict[str, str],
+    content_type: str,
+) -> Response:
+    size = meta["size"]
+    etag = meta.get("etag") or f'"{os.path.basename(blob_path)[:32]}"'
+    headers = {**response_headers, "ETag": etag, "Accept-Ranges": "bytes", "X-Document-Cache": "hit"}
+    if meta.get("last_modified"):
+        headers["Last-Modified"] = meta["last_modified"]
+
+    if _etag_matches(request_headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request_headers.get("range")
+    if_range = request_headers.get("if-range")
+    if if_range and if_range != etag and if_range != meta.get("last_modified"):
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_iter_file(blob_path, 0, size), media_type=content_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_file(blob_path, start, end - start + 1),
+        status_code=206,
+        media_type=content_type,
+        headers=headers,
+    )
+
+
+# ── Public entry point ───────────────────────────────────────────────────────
+
+
+async def proxy_document(
+    tenant_key_alias: str,
+    bucket: str,
+    storage_path: str,
+    request_headers: Mapping[str, str],
+    *,
+    content_type: str,
+    response_headers: Optional[Dict[str, str]] = None,
+    version: Any = None,
+) -> Response:
+    """
+    Stream ``bucket/storage_path`` to the client honouring Range and
+    conditional headers.
+
+    Raises:
+        HTTPException(404): object missing in storage
+        HTTPException(502): storage unreachable or returned an error
+        ValueError: tenant credentials missing (from get_tenant_credentials)
+    """
+    response_headers = dict(response_headers or {})
+    base_url, service_key = get_tenant_credentials(tenant_key_alias)
+    url = _object_url(base_url, bucket, storage_path)
+    # identity: Content-Length must describe the bytes we relay
+    auth_headers = {
+        "apikey": service_key,
+        "Authorization": f"Bearer {service_key}",
+        "Accept-Encoding": "identity",
+    }
+
+    cache = get_blob_cache()
+    cache_key = BlobCache.make_key(tenant_key_alias, bucket, storage_path, version) if cache else None
+
+    if cache:
+        hit = cache.get(cache_key)
+        if hit:
+            blob_path, meta = hit
+            return _serve_cached(blob_path, meta, request_headers, response_headers, content_type)
+
+    upstream_headers = dict(auth_headers)
+    for name in _FORWARD_HEADERS:
+        value = request_headers.get(name)
+        if value:
+            upstream_headers[name] = value
+
+    client = _get_http_client()
+    try:
+        upstream = await client.send(client.build_request("GET", url, headers=upstream_headers), stream=True)
+    except httpx.HTTPError as e:
+        logger.error(f"[DocumentProxy] Storage request failed: {e}")
+        raise HTTPException(502, detail="Storage unavailable")
+
+    passthrough = {
+        name.title(): upstream.headers[name]
+        for name in _PASSTHROUGH_HEADERS
+        if name in upstream.headers
+    }
+    passthrough.setdefault("Accept-Ranges", "bytes")
+
+    status = upstream.status_code
+    if status in (304, 416):
+        await upstream.aclose()
+        return Response(status_code=status, headers={**response_headers, **passthrough})
+    if status in (400, 404):
+        # Storage API reports a missing object as 400 {"statusCode": "404"}.
+        await upstream.aclose()
+        raise HTTPException(404, detail="File not found in storage")
+    if status not in (200, 206):
+        await upstream.aclose()
+        logger.error(f"[DocumentProxy] Storage returned HTTP {status} for {storage_path[:50]}")
+        raise HTTPException(502, detail="Storage error")
+
+    tee = None
+    if cache:
+        if status == 200:
+            meta = _cache_meta(upstream, content_type)
+            if meta["size"] is not None and meta["size"] <= cache.max_object_bytes:
+                tee = (cache, cache_key, meta)
+        else:
+            total = upstream.headers.get("content-range", "").rpartition("/")[2]
+            if total.isdigit() and int(total) <= cache.max_object_bytes:
+                asyncio.create_task(_fill_cache(cache, cache_key, url, auth_headers, content_type))
+
+    return StreamingResponse(
+        _relay(upstream, tee),
+        status_code=status,
+        media_type=content_type,
+        headers={**response_headers, **passthrough, "X-Document-Cache": "miss"},
+    )
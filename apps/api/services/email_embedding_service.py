@@ -13,6 +13,20 @@ Signals embedded:
 Model: text-embedding-3-small (same as query time for consistency)
 Vector dimension: 1536
 
+Pipeline:
+    Sync never calls OpenAI. New messages go onto the in-process
+    EmailEmbeddingQueue; the email watcher worker drains it in batches:
+
+        queued messages → distinct signal texts (content-hash dedupe,
+        plus a small LRU of recent vectors — senders and "Re:" subjects
+        repeat across a mailbox) → multi-input embedding requests packed
+        by estimated tokens → one bulk write per yacht
+        (update_email_embeddings_bulk RPC, per-row fallback)
+
+    The queue is bounded and not durable; anything dropped or lost on
+    restart still has meta_embedding NULL and is picked up by
+    backfill_embeddings, which uses the same batched path.
+
 Usage:
     service = EmailEmbeddingService()
 
@@ -31,9 +45,14 @@ Usage:
 """
 
 import os
+import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +64,68 @@ except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("OpenAI not available - embeddings will be disabled")
 
+# OpenAI accepts up to 2048 inputs and 300k tokens per embeddings request;
+# stay well inside the token cap since the estimate below is approximate.
+EMAIL_EMBED_MAX_INPUTS = int(os.getenv('EMAIL_EMBED_MAX_INPUTS', '2048'))
+EMAIL_EMBED_MAX_TOKENS = int(os.getenv('EMAIL_EMBED_MAX_TOKENS', '200000'))
+EMAIL_EMBED_MAX_CHARS = 8000  # per input — truncate to model limit
+
+# Recently embedded texts kept as float32 arrays (~6 KB each)
+EMAIL_EMBED_CACHE_SIZE = int(os.getenv('EMAIL_EMBED_CACHE_SIZE', '2000'))
+
+# Queue: messages per flush, how long to wait for a batch to fill, capacity
+EMAIL_EMBED_BATCH_SIZE = int(os.getenv('EMAIL_EMBED_BATCH_SIZE', '500'))
+EMAIL_EMBED_LINGER_SECONDS = float(os.getenv('EMAIL_EMBED_LINGER_SECONDS', '2'))
+EMAIL_EMBED_QUEUE_MAX = int(os.getenv('EMAIL_EMBED_QUEUE_MAX', '50000'))
+
+_EMBEDDING_COLUMNS = ('subject_embedding', 'sender_embedding', 'meta_embedding')
+
+
+def _estimate_tokens(text: str) -> int:
+    """Conservative token estimate (~3 chars/token) without a tokenizer."""
+    return len(text) // 3 + 1
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _signal_texts(
+    subject: str,
+    sender_name: str,
+    attachment_names: List[str],
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """The (subject, sender, meta) texts embedded for one email."""
+    subject_text = subject.strip() if subject and subject.strip() else None
+    sender_text = sender_name.strip() if sender_name and sender_name.strip() else None
+
+    # Build meta text (combined signal)
+    meta_parts = []
+    if subject:
+        meta_parts.append(f"Subject: {subject}")
+    if sender_name:
+        meta_parts.append(f"From: {sender_name}")
+    if attachment_names:
+        meta_parts.append(f"Attachments: {', '.join(attachment_names)}")
+    meta_text = " | ".join(meta_parts) or None
+
+    return subject_text, sender_text, meta_text
+
+
+def _attachment_names(attachments: Any) -> List[str]:
+    """Attachment filenames from stored metadata (list or JSON string)."""
+    if isinstance(attachments, str):
+        try:
+            attachments = json.loads(attachments)
+        except ValueError:
+            attachments = []
+    names = []
+    for att in attachments or []:
+        name = att.get('name') or att.get('filename')
+        if name:
+            names.append(name)
+    return names
+
 
 @dataclass
 class EmailEmbeddings:
@@ -86,6 +167,7 @@ class EmailEmbeddingService:
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         self._client = None
+        self._cache: "OrderedDict[str, array]" = OrderedDict()
 
     @property
     def client(self):
@@ -118,36 +200,13 @@ class EmailEmbeddingService:
         if not self.is_available():
             return EmailEmbeddings(error="Embedding service not available")
 
-        attachment_names = attachment_names or []
-
         try:
-            # Embed subject
-            subject_emb = None
-            if subject and subject.strip():
-                subject_emb = await self._embed_text(subject.strip())
-
-            # Embed sender
-            sender_emb = None
-            if sender_name and sender_name.strip():
-                sender_emb = await self._embed_text(sender_name.strip())
-
-            # Build meta text (combined signal)
-            meta_parts = []
-            if subject:
-                meta_parts.append(f"Subject: {subject}")
-            if sender_name:
-                meta_parts.append(f"From: {sender_name}")
-            if attachment_names:
-                meta_parts.append(f"Attachments: {', '.join(attachment_names)}")
-
-            meta_text = " | ".join(meta_parts) if meta_parts else ""
-            meta_emb = await self._embed_text(meta_text) if meta_text else None
-
-            return EmailEmbeddings(
-                subject_embedding=subject_emb,
-                sender_embedding=sender_emb,
-                meta_embedding=meta_emb,
-            )
+            results = await self.embed_batch([{
+                'subject': subject,
+                'sender_name': sender_name,
+                'attachment_names': attachment_names or [],
+            }])
+            return results[0]
 
         except Exception as e:
             logger.error(f"Email embedding failed: {e}")
@@ -167,16 +226,86 @@ class EmailEmbeddingService:
             return None
 
         try:
-            response = self.client.embeddings.create(
-                model=self.MODEL,
-                input=text[:8000],  # Truncate to model limit
-            )
-            return response.data[0].embedding
+            return (await self.embed_texts([text]))[0]
 
         except Exception as e:
             logger.error(f"Text embedding failed: {e}")
             return None
 
+    async def embed_texts(self, texts: List[Optional[str]]) -> List[Optional[List[float]]]:
+        """
+        Embed many texts with as few API requests as possible.
+
+        Identical texts are embedded once (and served from the recent-vector
+        cache when seen before); the rest go out in multi-input requests
+        packed up to EMAIL_EMBED_MAX_INPUTS / EMAIL_EMBED_MAX_TOKENS.
+        Empty texts map to None. Raises on API failure.
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        todo: Dict[str, Tuple[str, List[int]]] = {}
+
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            text = text[:EMAIL_EMBED_MAX_CHARS]
+            key = _content_hash(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                results[i] = cached.tolist()
+            elif key in todo:
+                todo[key][1].append(i)
+            else:
+                todo[key] = (text, [i])
+
+        if not todo or not self.client:
+            return results
+
+        keys = list(todo)
+        for batch in self._plan_requests([todo[k][0] for k in keys]):
+            vectors = await asyncio.to_thread(
+                self._create_embeddings, [todo[keys[j]][0] for j in batch]
+            )
+            for j, vector in zip(batch, vectors):
+                key = keys[j]
+                for i in todo[key][1]:
+                    results[i] = vector
+                self._remember(key, vector)
+
+        logger.debug(
+            f"Embedded {len(todo)} distinct texts for {len(texts)} inputs"
+        )
+        return results
+
+    @staticmethod
+    def _plan_requests(texts: List[str]) -> List[List[int]]:
+        """Split text indexes into requests by input count and token estimate."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        tokens = 0
+        for i, text in enumerate(texts):
+            cost = _estimate_tokens(text)
+            if current and (len(current) >= EMAIL_EMBED_MAX_INPUTS or tokens + cost > EMAIL_EMBED_MAX_TOKENS):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(i)
+            tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _create_embeddings(self, inputs: List[str]) -> List[List[float]]:
+        response = self.client.embeddings.create(model=self.MODEL, input=inputs)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if EMAIL_EMBED_CACHE_SIZE <= 0:
+            return
+        self._cache[key] = array('f', vector)
+        self._cache.move_to_end(key)
+        while len(self._cache) > EMAIL_EMBED_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
     def embed_email_sync(
         self,
         subject: str = "",
@@ -210,36 +339,58 @@ class EmailEmbeddingService:
         Returns:
             List of EmailEmbeddings
         """
-        results = []
+        if not self.is_available():
+            return [EmailEmbeddings(error="Embedding service not available") for _ in emails]
+
+        texts: List[Optional[str]] = []
         for email in emails:
-            emb = await self.embed_email(
-                subject=email.get('subject', ''),
-                sender_name=email.get('sender_name', ''),
-                attachment_names=email.get('attachment_names', []),
+            texts.extend(_signal_texts(
+                email.get('subject') or '',
+                email.get('sender_name') or '',
+                email.get('attachment_names') or [],
+            ))
+
+        try:
+            vectors = await self.embed_texts(texts)
+        except Exception as e:
+            logger.error(f"Email batch embedding failed: {e}")
+            return [EmailEmbeddings(error=str(e)) for _ in emails]
+
+        return [
+            EmailEmbeddings(
+                subject_embedding=vectors[3 * i],
+                sender_embedding=vectors[3 * i + 1],
+                meta_embedding=vectors[3 * i + 2],
             )
-            results.append(emb)
-        return results
+            for i in range(len(emails))
+        ]
 
 
 class EmailEmbeddingUpdater:
     """
     Updates email embeddings in the database.
 
-    Used by the email sync worker to populate embeddings
+    Used by the embedding queue and backfill to populate embeddings
     for newly synced emails.
     """
 
-    def __init__(self, supabase_client, yacht_id: str):
+    # Set once the bulk RPC is found missing, so later batches skip straight
+    # to per-row updates instead of failing the RPC every time.
+    _bulk_rpc_missing = False
+
+    def __init__(self, supabase_client, yacht_id: str, embedding_service: "EmailEmbeddingService" = None):
         """
         Initialize updater.
 
         Args:
             supabase_client: Supabase client for the tenant
             yacht_id: Yacht ID for isolation
+            embedding_service: Shared service (defaults to the singleton,
+                               so its recent-vector cache is reused)
         """
         self.client = supabase_client
         self.yacht_id = yacht_id
-        self.embedding_service = EmailEmbeddingService()
+        self.embedding_service = embedding_service or get_embedding_service()
 
     async def update_email_embeddings(
         self,
@@ -260,66 +411,95 @@ class EmailEmbeddingUpdater:
         Returns:
             True if successful
         """
-        if not self.embedding_service.is_available():
-            logger.warning("Embedding service not available - skipping")
-            return False
-
-        # Extract attachment names
-        attachment_names = []
-        if attachments:
-            for att in attachments:
-                name = att.get('name') or att.get('filename')
-                if name:
-                    attachment_names.append(name)
-
-        # Generate embeddings
-        embeddings = await self.embedding_service.embed_email(
-            subject=subject,
-            sender_name=sender_name,
-            attachment_names=attachment_names,
-        )
-
-        if not embeddings.has_embeddings():
-            logger.warning(f"No embeddings generated for email {email_id}: {embeddings.error}")
-            return False
+        stats = await self.update_embeddings_batch([{
+            'id': email_id,
+            'subject': subject,
+            'sender_name': sender_name,
+            'attachment_names': _attachment_names(attachments),
+        }])
+        return stats['success'] == 1
+
+    async def update_embeddings_batch(self, emails: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Embed and store many emails: batched API requests, one bulk write.
 
-        # Update database
-        try:
-            update_data = {}
+        Args:
+            emails: Dicts with 'id', 'subject', 'sender_name', 'attachment_names'
 
-            if embeddings.subject_embedding:
-                update_data['subject_embedding'] = embeddings.subject_embedding
+        Returns:
+            Stats dict with counts
+        """
+        stats = {'processed': len(emails), 'success': 0, 'failed': 0}
+        if not emails:
+            return stats
 
-            if embeddings.sender_embedding:
-                update_data['sender_embedding'] = embeddings.sender_embedding
+        if not self.embedding_service.is_available():
+            logger.warning("Embedding service not available - skipping")
+            stats['failed'] = len(emails)
+            return stats
+
+        embeddings = await self.embedding_service.embed_batch(emails)
+
+        rows = []
+        for email, emb in zip(emails, embeddings):
+            if not emb.has_embeddings():
+                logger.warning(f"No embeddings generated for email {email['id']}: {emb.error}")
+                continue
+            row = {'id': email['id']}
+            for column in _EMBEDDING_COLUMNS:
+                value = getattr(emb, column)
+                if value:
+                    row[column] = value
+            rows.append(row)
+
+        stats['success'] = self._write_embeddings(rows)
+        stats['failed'] = len(emails) - stats['success']
+        return stats
 
-            if embeddings.meta_embedding:
-                update_data['meta_embedding'] = embeddings.meta_embedding
+    def _write_embeddings(self, rows: List[Dict[str, Any]]) -> int:
+        """Store embedding rows; returns how many were written."""
+        if not rows:
+            return 0
+
+        if not EmailEmbeddingUpdater._bulk_rpc_missing:
+            try:
+                result = self.client.rpc('update_email_embeddings_bulk', {
+                    'p_yacht_id': self.yacht_id,
+                    'p_rows': rows,
+                }).execute()
+                return result.data if isinstance(result.data, int) else len(rows)
+            except Exception as e:
+                if 'update_email_embeddings_bulk' in str(e) and (
+                    'PGRST202' in str(e) or 'does not exist' in str(e) or 'Could not find' in str(e)
+                ):
+                    EmailEmbeddingUpdater._bulk_rpc_missing = True
+                    logger.warning("update_email_embeddings_bulk RPC missing - falling back to per-row updates")
+                else:
+                    logger.error(f"Bulk embedding write failed, retrying per row: {e}")
 
-            if update_data:
+        written = 0
+        for row in rows:
+            update_data = {k: v for k, v in row.items() if k != 'id'}
+            try:
                 self.client.table('email_messages').update(
                     update_data
-                ).eq('id', email_id).eq('yacht_id', self.yacht_id).execute()
-
-                logger.debug(f"Updated embeddings for email {email_id}")
-                return True
-
-        except Exception as e:
-            logger.error(f"Failed to update embeddings for email {email_id}: {e}")
-
-        return False
+                ).eq('id', row['id']).eq('yacht_id', self.yacht_id).execute()
+                written += 1
+            except Exception as e:
+                logger.error(f"Failed to update embeddings for email {row['id']}: {e}")
+        return written
 
     async def backfill_embeddings(
         self,
         limit: int = 100,
-        batch_size: int = 10,
+        batch_size: int = EMAIL_EMBED_BATCH_SIZE,
     ) -> Dict[str, int]:
         """
         Backfill embeddings for emails missing them.
 
         Args:
             limit: Max emails to process
-            batch_size: Emails per batch
+            batch_size: Emails per embed-and-write batch
 
         Returns:
             Stats dict with counts
@@ -337,29 +517,19 @@ class EmailEmbeddingUpdater:
             emails = result.data or []
             logger.info(f"Found {len(emails)} emails needing embeddings")
 
-            for email in emails:
-                stats['processed'] += 1
-
-                # Parse attachments
-                attachments = email.get('attachments') or []
-                if isinstance(attachments, str):
-                    import json
-                    try:
-                        attachments = json.loads(attachments)
-                    except:
-                        attachments = []
-
-                success = await self.update_email_embeddings(
-                    email_id=email['id'],
-                    subject=email.get('subject', ''),
-                    sender_name=email.get('from_display_name', ''),
-                    attachments=attachments,
-                )
-
-                if success:
-                    stats['success'] += 1
-                else:
-                    stats['failed'] += 1
+            for start in range(0, len(emails), max(1, batch_size)):
+                batch = [
+                    {
+                        'id': email['id'],
+                        'subject': email.get('subject') or '',
+                        'sender_name': email.get('from_display_name') or '',
+                        'attachment_names': _attachment_names(email.get('attachments')),
+                    }
+                    for email in emails[start:start + batch_size]
+                ]
+                batch_stats = await self.update_embeddings_batch(batch)
+                for key in stats:
+                    stats[key] += batch_stats[key]
 
         except Exception as e:
             logger.error(f"Backfill failed: {e}")
@@ -367,6 +537,106 @@ class EmailEmbeddingUpdater:
         return stats
 
 
+# =============================================================================
+# Embedding queue
+# =============================================================================
+
+@dataclass
+class EmailEmbeddingJob:
+    """One synced message awaiting embeddings."""
+    supabase: Any
+    yacht_id: str
+    email_id: str
+    subject: str = ""
+    sender_name: str = ""
+    attachment_names: List[str] = field(default_factory=list)
+
+
+class EmailEmbeddingQueue:
+    """
+    Bounded in-process queue of messages awaiting embeddings.
+
+    Sync calls enqueue() and moves on; run() drains the queue in batches of
+    up to EMAIL_EMBED_BATCH_SIZE, waiting up to EMAIL_EMBED_LINGER_SECONDS
+    for a batch to fill. A full queue drops the job — the row keeps
+    meta_embedding NULL and backfill_embeddings picks it up later.
+    """
+
+    def __init__(self, maxsize: int = EMAIL_EMBED_QUEUE_MAX):
+        self._queue: "asyncio.Queue[EmailEmbeddingJob]" = asyncio.Queue(maxsize=maxsize)
+        self.stats = {'queued': 0, 'dropped': 0, 'embedded': 0, 'failed': 0}
+
+    def enqueue(self, job: EmailEmbeddingJob) -> bool:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats['dropped'] += 1
+            logger.debug(f"Embedding queue full - email {job.email_id} left for backfill")
+            return False
+        self.stats['queued'] += 1
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def next_batch(
+        self,
+        max_items: int = EMAIL_EMBED_BATCH_SIZE,
+        linger: float = EMAIL_EMBED_LINGER_SECONDS,
+    ) -> List[EmailEmbeddingJob]:
+        """Wait for one job, then collect more until full or linger elapses."""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + linger
+        while len(batch) < max_items:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def flush(self, jobs: List[EmailEmbeddingJob]) -> None:
+        """Embed and write one batch, one bulk write per (tenant, yacht)."""
+        groups: Dict[Tuple[int, str], List[EmailEmbeddingJob]] = {}
+        for job in jobs:
+            groups.setdefault((id(job.supabase), job.yacht_id), []).append(job)
+
+        for group in groups.values():
+            updater = EmailEmbeddingUpdater(group[0].supabase, group[0].yacht_id)
+            try:
+                stats = await updater.update_embeddings_batch([
+                    {
+                        'id': job.email_id,
+                        'subject': job.subject,
+                        'sender_name': job.sender_name,
+                        'attachment_names': job.attachment_names,
+                    }
+                    for job in group
+                ])
+            except Exception as e:
+                logger.error(f"Embedding batch failed for yacht {group[0].yacht_id}: {e}")
+                stats = {'success': 0, 'failed': len(group)}
+            self.stats['embedded'] += stats['success']
+            self.stats['failed'] += stats['failed']
+
+    async def run(self) -> None:
+        """Drain forever (until cancelled)."""
+        while True:
+            batch = await self.next_batch()
+            await self.flush(batch)
+            logger.info(
+                f"Embedded batch of {len(batch)} email(s); "
+                f"{self.qsize()} queued, {self.stats['dropped']} dropped so far"
+            )
+
+
 # =============================================================================
 # Factory function
 # =============================================================================
@@ -380,3 +650,14 @@ def get_embedding_service() -> EmailEmbeddingService:
     if _embedding_service is None:
         _embedding_service = EmailEmbeddingService()
     return _embedding_service
+
+
+_embedding_queue = None
+
+
+def get_embedding_queue() -> EmailEmbeddingQueue:
+    """Get singleton embedding queue."""
+    global _embedding_queue
+    if _embedding_queue is None:
+        _embedding_queue = EmailEmbeddingQueue()
+    return _embedding_queue
@@ -3,17 +3,24 @@ Email Watcher - Email Sync Service
 
 Phase 6: Delta Sync Pipeline for Inbox + Sent folders.
 Uses Microsoft Graph API delta queries for incremental sync.
+
+Graph traffic per page: one delta request, plus one JSON $batch call per
+20 messages with attachments for their attachment metadata (delta queries
+do not support $expand, so it cannot ride along with the message list).
+All requests share one pooled keep-alive client.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import asyncio
 import hashlib
 import logging
 import httpx
 
+from integrations.graph_client import batch_attachment_metadata, get_graph_http_client
 from .ms_graph_rate_limiter import MicrosoftRateLimiter
 from .linking_ladder import LinkingLadder
-from .email_embedding_service import EmailEmbeddingUpdater
+from .email_embedding_service import EmailEmbeddingJob, get_embedding_queue
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +49,9 @@ class EmailSyncService:
     # Attachment fields
     ATTACHMENT_SELECT = "id,name,contentType,size"
 
+    # Graph allows 4 concurrent requests per mailbox; keep one spare
+    FOLDER_CONCURRENCY = 3
+
     # Folders to skip during mailbox-level sync (not relevant for PMS)
     SKIP_FOLDERS = {'drafts', 'junkemail', 'deleteditems', 'outbox'}
 
@@ -112,44 +122,34 @@ class EmailSyncService:
         # Get watcher_id for per-user thread isolation
         watcher_id = watcher.get('id')
 
-        # Sync Inbox
-        try:
-            inbox_result = await self.sync_folder(
+        # Inbox and Sent have independent delta links — sync them concurrently
+        inbox_result, sent_result = await asyncio.gather(
+            self.sync_folder(
                 user_id=user_id,
                 yacht_id=yacht_id,
                 watcher_id=watcher_id,
                 folder='inbox',
                 delta_link=watcher.get('delta_link_inbox'),
                 max_messages=max_messages
-            )
-            result['inbox'] = inbox_result
-            result['api_calls'] += inbox_result.get('api_calls', 0)
-
-        except Exception as e:
-            logger.error(f"[EmailSync] Inbox sync error: {e}")
-            result['errors'].append(f"inbox: {str(e)}")
-
-        # Check rate limit again before sent
-        if not await self.rate_limiter.can_make_call(user_id, yacht_id):
-            result['sent_skipped'] = True
-            return result
-
-        # Sync Sent
-        try:
-            sent_result = await self.sync_folder(
+            ),
+            self.sync_folder(
                 user_id=user_id,
                 yacht_id=yacht_id,
                 watcher_id=watcher_id,
                 folder='sentItems',
                 delta_link=watcher.get('delta_link_sent'),
                 max_messages=max_messages
-            )
-            result['sent'] = sent_result
-            result['api_calls'] += sent_result.get('api_calls', 0)
+            ),
+            return_exceptions=True,
+        )
 
-        except Exception as e:
-            logger.error(f"[EmailSync] Sent sync error: {e}")
-            result['errors'].append(f"sent: {str(e)}")
+        for key, folder_result in (('inbox', inbox_result), ('sent', sent_result)):
+            if isinstance(folder_result, BaseException):
+                logger.error(f"[EmailSync] {key.capitalize()} sync error: {folder_result}")
+                result['errors'].append(f"{key}: {str(folder_result)}")
+                continue
+            result[key] = folder_result
+            result['api_calls'] += folder_result.get('api_calls', 0)
 
         # Update watcher last_sync_at
         await self._update_watcher_sync_status(watcher['id'], result)
@@ -206,6 +206,7 @@ class EmailSyncService:
             return result
 
         result['api_calls'] += 1
+        await self.rate_limiter.record_call(user_id, yacht_id)
 
         # Load per-folder delta links from JSON blob
         raw_delta = watcher.get('delta_link') or '{}'
@@ -222,26 +223,27 @@ class EmailSyncService:
 
         logger.info(f"[EmailSync] Mailbox sync: {len(sync_folders)} folders to sync")
 
-        # Iterate each folder
-        for folder_id, well_known in sync_folders.items():
-            if not await self.rate_limiter.can_make_call(user_id, yacht_id):
-                logger.warning(f"[EmailSync] Rate limited mid-sync, stopping")
-                break
+        semaphore = asyncio.Semaphore(self.FOLDER_CONCURRENCY)
 
-            folder_name = self.FOLDER_NAME_MAP.get(well_known.lower(), well_known or 'other')
-            folder_delta = delta_links.get(folder_id)
+        async def sync_one_folder(client: httpx.AsyncClient, folder_id: str, well_known: str) -> None:
+            async with semaphore:
+                if not await self.rate_limiter.can_make_call(user_id, yacht_id):
+                    logger.warning(f"[EmailSync] Rate limited mid-sync, skipping folder")
+                    return
 
-            # Build URL
-            if folder_delta:
-                url = folder_delta
-            else:
-                url = f"{self.GRAPH_BASE_URL}/me/mailFolders/{folder_id}/messages/delta"
-                url += f"?$select={self.MESSAGE_SELECT}&$top=50"
+                folder_name = self.FOLDER_NAME_MAP.get(well_known.lower(), well_known or 'other')
+                folder_delta = delta_links.get(folder_id)
+
+                # Build URL
+                if folder_delta:
+                    url = folder_delta
+                else:
+                    url = f"{self.GRAPH_BASE_URL}/me/mailFolders/{folder_id}/messages/delta"
+                    url += f"?$select={self.MESSAGE_SELECT}&$top=50"
 
-            folder_processed = 0
+                folder_processed = 0
 
-            try:
-                async with httpx.AsyncClient() as client:
+                try:
                     while url and folder_processed < max_messages:
                         response = await client.get(
                             url,
@@ -252,6 +254,7 @@ class EmailSyncService:
                         await self.rate_limiter.record_call(user_id, yacht_id)
 
                         if response.status_code != 200:
+                            self._note_throttling(user_id, yacht_id, response)
                             logger.error(
                                 f"[EmailSync] Graph API error on folder {folder_name}: "
                                 f"{response.status_code} {response.text[:200]}"
@@ -260,12 +263,13 @@ class EmailSyncService:
                             break
 
                         data = response.json()
-                        messages = data.get('value', [])
+                        messages = data.get('value', [])[:max_messages - folder_processed]
+                        calls, prefetched = await self._prefetch_attachment_metadata(
+                            client, user_id, yacht_id, watcher_id, messages
+                        )
+                        result['api_calls'] += calls
 
                         for msg in messages:
-                            if folder_processed >= max_messages:
-                                break
-
                             # Handle @removed
                             if '@removed' in msg:
                                 await self._mark_message_deleted(yacht_id, msg)
@@ -285,6 +289,7 @@ class EmailSyncService:
                                 folder=folder_name,
                                 direction=direction,
                                 parent_folder_id=folder_id,
+                                prefetched=prefetched,
                             )
                             if thread_id:
                                 result['synced'] += 1
@@ -299,9 +304,17 @@ class EmailSyncService:
                         else:
                             url = None
 
-            except Exception as e:
-                logger.error(f"[EmailSync] Error syncing folder {folder_name}: {e}")
-                result['errors'].append(f"{folder_name}: {str(e)}")
+                except Exception as e:
+                    logger.error(f"[EmailSync] Error syncing folder {folder_name}: {e}")
+                    result['errors'].append(f"{folder_name}: {str(e)}")
+
+        # Folders have independent delta links — sync them concurrently,
+        # within Graph's per-mailbox concurrent request limit
+        client = get_graph_http_client()
+        await asyncio.gather(*(
+            sync_one_folder(client, folder_id, well_known)
+            for folder_id, well_known in sync_folders.items()
+        ))
 
         # Persist all delta links as JSON
         self.supabase.table('email_watchers').update({
@@ -328,26 +341,25 @@ class EmailSyncService:
         """
         url = f"{self.GRAPH_BASE_URL}/me/mailFolders?$top=100"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers={'Authorization': f'Bearer {self.access_token}'},
-                timeout=15.0
-            )
+        response = await get_graph_http_client().get(
+            url,
+            headers={'Authorization': f'Bearer {self.access_token}'},
+            timeout=15.0
+        )
 
-            if response.status_code != 200:
-                raise Exception(f"Failed to fetch mail folders: {response.status_code} {response.text[:300]}")
+        if response.status_code != 200:
+            raise Exception(f"Failed to fetch mail folders: {response.status_code} {response.text[:300]}")
 
-            data = response.json()
-            folder_map = {}
-            for folder in data.get('value', []):
-                folder_id = folder.get('id')
-                # Prefer wellKnownName, fall back to displayName
-                # Normalize: "Deleted Items" → "deleteditems" to match SKIP_FOLDERS
-                name = folder.get('wellKnownName') or folder.get('displayName', '')
-                folder_map[folder_id] = name.lower().replace(' ', '')
+        data = response.json()
+        folder_map = {}
+        for folder in data.get('value', []):
+            folder_id = folder.get('id')
+            # Prefer wellKnownName, fall back to displayName
+            # Normalize: "Deleted Items" → "deleteditems" to match SKIP_FOLDERS
+            name = folder.get('wellKnownName') or folder.get('displayName', '')
+            folder_map[folder_id] = name.lower().replace(' ', '')
 
-            return folder_map
+        return folder_map
 
     async def sync_folder(
         self,
@@ -389,50 +401,55 @@ class EmailSyncService:
         messages_processed = 0
         thread_ids = set()
 
-        async with httpx.AsyncClient() as client:
-            while url and messages_processed < max_messages:
-                # Make API call
-                response = await client.get(
-                    url,
-                    headers={'Authorization': f'Bearer {self.access_token}'},
-                    timeout=30.0
-                )
-                result['api_calls'] += 1
+        client = get_graph_http_client()
+        while url and messages_processed < max_messages:
+            # Make API call
+            response = await client.get(
+                url,
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                timeout=30.0
+            )
+            result['api_calls'] += 1
+
+            # Record API call
+            await self.rate_limiter.record_call(user_id, yacht_id)
+
+            if response.status_code != 200:
+                self._note_throttling(user_id, yacht_id, response)
+                logger.error(f"[EmailSync] Graph API error: {response.status_code} {response.text[:200]}")
+                break
 
-                # Record API call
-                await self.rate_limiter.record_call(user_id, yacht_id)
+            data = response.json()
+            messages = data.get('value', [])
+            calls, prefetched = await self._prefetch_attachment_metadata(
+                client, user_id, yacht_id, watcher_id, messages[:max_messages - messages_processed]
+            )
+            result['api_calls'] += calls
 
-                if response.status_code != 200:
-                    logger.error(f"[EmailSync] Graph API error: {response.status_code} {response.text[:200]}")
+            # Process messages
+            for msg in messages:
+                if messages_processed >= max_messages:
                     break
 
-                data = response.json()
-                messages = data.get('value', [])
-
-                # Process messages
-                for msg in messages:
-                    if messages_processed >= max_messages:
-                        break
-
-                    # Handle deleted messages (Microsoft Graph delta sync)
-                    if '@removed' in msg:
-                        await self._mark_message_deleted(yacht_id, msg)
-                        messages_processed += 1
-                        continue
-
-                    thread_id = await self._process_message(yacht_id, watcher_id, msg, folder)
-                    if thread_id:
-                        thread_ids.add(thread_id)
-                        messages_processed += 1
-
-                # Get next page or delta link
-                if '@odata.nextLink' in data:
-                    url = data['@odata.nextLink']
-                elif '@odata.deltaLink' in data:
-                    result['delta_link'] = data['@odata.deltaLink']
-                    url = None
-                else:
-                    url = None
+                # Handle deleted messages (Microsoft Graph delta sync)
+                if '@removed' in msg:
+                    await self._mark_message_deleted(yacht_id, msg)
+                    messages_processed += 1
+                    continue
+
+                thread_id = await self._process_message(yacht_id, watcher_id, msg, folder, prefetched)
+                if thread_id:
+                    thread_ids.add(thread_id)
+                    messages_processed += 1
+
+            # Get next page or delta link
+            if '@odata.nextLink' in data:
+                url = data['@odata.nextLink']
+            elif '@odata.deltaLink' in data:
+                result['delta_link'] = data['@odata.deltaLink']
+                url = None
+            else:
+                url = None
 
         result['synced'] = messages_processed
         result['threads'] = len(thread_ids)
@@ -451,7 +468,8 @@ class EmailSyncService:
         yacht_id: str,
         watcher_id: str,
         msg: Dict[str, Any],
-        folder: str
+        folder: str,
+        prefetched: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> Optional[str]:
         """
         Process a single message from Graph API.
@@ -508,6 +526,7 @@ class EmailSyncService:
                 from_hash=from_hash,
                 to_hashes=to_hashes,
                 cc_hashes=cc_hashes,
+                prefetched=prefetched,
             )
 
             return thread_id
@@ -524,6 +543,7 @@ class EmailSyncService:
         folder: str,
         direction: str,
         parent_folder_id: str,
+        prefetched: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> Optional[str]:
         """
         Process a message for mailbox-level sync (v2).
@@ -610,6 +630,7 @@ class EmailSyncService:
                 to_hashes=to_hashes,
                 cc_hashes=cc_hashes,
                 parent_folder_id=parent_folder_id,
+                prefetched=prefetched,
             )
 
             return thread_id
@@ -630,6 +651,7 @@ class EmailSyncService:
         to_hashes: List[str],
         cc_hashes: List[str],
         parent_folder_id: str,
+        prefetched: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> Optional[str]:
         """
         Insert email message for mailbox-level sync (v2).
@@ -642,7 +664,7 @@ class EmailSyncService:
         # Get attachment metadata (not content)
         attachments = []
         if msg.get('hasAttachments'):
-            attachments = await self._fetch_attachment_metadata(provider_message_id)
+            attachments = await self._fetch_attachment_metadata(provider_message_id, prefetched)
 
         subject = msg.get('subject', '')
         from_display_name = msg.get('from', {}).get('emailAddress', {}).get('name', '')
@@ -770,6 +792,7 @@ class EmailSyncService:
         from_hash: str,
         to_hashes: List[str],
         cc_hashes: List[str],
+        prefetched: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> Optional[str]:
         """Insert email message record (metadata only)."""
 
@@ -786,7 +809,7 @@ class EmailSyncService:
         # Get attachment metadata (not content)
         attachments = []
         if msg.get('hasAttachments'):
-            attachments = await self._fetch_attachment_metadata(provider_message_id)
+            attachments = await self._fetch_attachment_metadata(provider_message_id, prefetched)
 
         subject = msg.get('subject', '')
         from_display_name = msg.get('from', {}).get('emailAddress', {}).get('name', '')
@@ -881,52 +904,124 @@ class EmailSyncService:
         from_display_name: str,
         attachments: List[Dict[str, Any]],
     ) -> None:
-        """Generate and store embeddings for an email message."""
-        try:
-            updater = EmailEmbeddingUpdater(self.supabase, yacht_id)
-            await updater.update_email_embeddings(
-                email_id=message_id,
-                subject=subject,
-                sender_name=from_display_name,
-                attachments=attachments,
+        """
+        Queue the message for batched embedding.
+
+        Embeddings are generated off the sync path by the embedding queue
+        the watcher worker drains; a full queue leaves the row for backfill.
+        """
+        get_embedding_queue().enqueue(EmailEmbeddingJob(
+            supabase=self.supabase,
+            yacht_id=yacht_id,
+            email_id=message_id,
+            subject=subject or '',
+            sender_name=from_display_name or '',
+            attachment_names=[att['name'] for att in attachments if att.get('name')],
+        ))
+
+    async def _prefetch_attachment_metadata(
+        self,
+        client: httpx.AsyncClient,
+        user_id: str,
+        yacht_id: str,
+        watcher_id: str,
+        messages: List[Dict[str, Any]],
+    ) -> Tuple[int, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetch attachment metadata for a delta page in $batch calls of 20.
+
+        Only messages not yet stored for the watcher are fetched, since only
+        inserts read the metadata. Returns (Graph calls made, provider id →
+        attachment metadata) for the page; the caller hands the map to
+        message processing, so folders synced concurrently never share it.
+        Messages missing from it (failed sub-requests) fall back to a single
+        request in _fetch_attachment_metadata.
+        """
+        prefetched: Dict[str, List[Dict[str, Any]]] = {}
+        message_ids = [
+            msg['id'] for msg in messages
+            if msg.get('hasAttachments') and '@removed' not in msg and msg.get('id')
+        ]
+        if message_ids:
+            stored = self._stored_message_ids(watcher_id, message_ids)
+            message_ids = [message_id for message_id in message_ids if message_id not in stored]
+        if not message_ids:
+            return 0, prefetched
+
+        calls = 0
+
+        async def post(payload: Dict[str, Any]) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            await self.rate_limiter.record_call(user_id, yacht_id)
+            response = await client.post(
+                f"{self.GRAPH_BASE_URL}/$batch",
+                json=payload,
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                timeout=30.0
             )
+            self._note_throttling(user_id, yacht_id, response)
+            return response
+
+        try:
+            fetched = await batch_attachment_metadata(post, message_ids, self.ATTACHMENT_SELECT)
+            for message_id, attachments in fetched.items():
+                prefetched[message_id] = self._summarize_attachments(attachments)
         except Exception as e:
-            # Log but don't fail the sync if embedding fails
-            logger.warning(f"[EmailSync] Embedding failed for message {message_id}: {e}")
+            logger.warning(f"[EmailSync] Attachment $batch failed, falling back per message: {e}")
+
+        return calls, prefetched
+
+    def _stored_message_ids(self, watcher_id: str, message_ids: List[str]) -> set:
+        """Provider ids among message_ids already stored for the watcher."""
+        try:
+            existing = self.supabase.table('email_messages').select('provider_message_id').eq(
+                'watcher_id', watcher_id
+            ).in_('provider_message_id', message_ids).execute()
+            return {row['provider_message_id'] for row in existing.data or []}
+        except Exception as e:
+            logger.warning(f"[EmailSync] Could not check stored messages before prefetch: {e}")
+            return set()
 
     async def _fetch_attachment_metadata(
         self,
-        message_id: str
+        message_id: str,
+        prefetched: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> List[Dict[str, Any]]:
-        """Fetch attachment metadata (not content)."""
+        """Fetch attachment metadata (not content), using the page's $batch results when present."""
+        if prefetched and message_id in prefetched:
+            return prefetched[message_id]
+
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{self.GRAPH_BASE_URL}/me/messages/{message_id}/attachments"
-                url += f"?$select={self.ATTACHMENT_SELECT}"
-
-                response = await client.get(
-                    url,
-                    headers={'Authorization': f'Bearer {self.access_token}'},
-                    timeout=15.0
-                )
+            url = f"{self.GRAPH_BASE_URL}/me/messages/{message_id}/attachments"
+            url += f"?$select={self.ATTACHMENT_SELECT}"
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return [
-                        {
-                            'id': att.get('id'),
-                            'name': att.get('name'),
-                            'contentType': att.get('contentType'),
-                            'size': att.get('size'),
-                        }
-                        for att in data.get('value', [])
-                    ]
+            response = await get_graph_http_client().get(
+                url,
+                headers={'Authorization': f'Bearer {self.access_token}'},
+                timeout=15.0
+            )
+
+            if response.status_code == 200:
+                return self._summarize_attachments(response.json().get('value', []))
 
         except Exception as e:
             logger.error(f"[EmailSync] Error fetching attachments: {e}")
 
         return []
 
+    @staticmethod
+    def _summarize_attachments(attachments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'id': att.get('id'),
+                'name': att.get('name'),
+                'contentType': att.get('contentType'),
+                'size': att.get('size'),
+            }
+            for att in attachments
+        ]
+
     async def _trigger_linking(
         self,
         yacht_id: str,
@@ -975,6 +1070,11 @@ class EmailSyncService:
             'updated_at': datetime.utcnow().isoformat(),
         }).eq('id', watcher_id).execute()
 
+    def _note_throttling(self, user_id: str, yacht_id: str, response: httpx.Response) -> None:
+        """Back the mailbox off for Retry-After on 429/503 responses."""
+        if response.status_code in (429, 503):
+            self.rate_limiter.note_retry_after(user_id, yacht_id, response.headers.get('Retry-After'))
+
     def _hash_email(self, email: str) -> str:
         """Hash email address for privacy."""
         if not email:
@@ -10,13 +10,22 @@ Three-tier search strategy:
 3. Fuzzy filename match (pg_trgm similarity > 0.3)
 
 Used during the import pipeline's resolve stage, between transform and dry-run.
+
+The document list is indexed once per resolver (_DocIndex) so each reference
+is a lookup rather than a scan: reversed-path bisection for suffix matches,
+a filename dict, and a single rapidfuzz pass per reference for the fuzzy
+tier. Results are memoised per normalised reference,
+since exports repeat the same drawing/manual across many rows.
 """
 
 import os
 import logging
+from bisect import bisect_left
 from dataclasses import dataclass, asdict
 from typing import Optional
 
+from rapidfuzz import fuzz, process
+
 logger = logging.getLogger("import.file_resolver")
 
 # Minimum similarity score for fuzzy matches to be considered
@@ -40,6 +49,124 @@ class FileResolutionResult:
         return asdict(self)
 
 
+def _bigrams(s: str) -> set[str]:
+    return set(s[i:i+2] for i in range(len(s) - 1))
+
+
+class _DocIndex:
+    """Lookup structures over the cached document list (cache order is kept
+    as the tie-breaker so results match a linear scan).
+
+    Fuzzy scoring encodes each stem's bigram set as a sorted string with one
+    code point per distinct bigram. For sorted sequences of unique symbols the
+    LCS is exactly the set intersection, so rapidfuzz's Indel ratio
+    (2·LCS / (|A|+|B|)) equals the bigram Dice coefficient, so
+    ``process.extractOne`` scores candidates in C++.
+
+    Candidates are blocked with a bigram inverted index: only documents that
+    share one of the reference's rarer bigrams are scored first, and the full
+    library is only scanned when the best blocked score cannot be proven
+    unbeatable by documents outside the block.
+    """
+
+    def __init__(self, docs: list[dict]):
+        # Tier 1: storage_path suffixes become prefixes of the reversed path
+        reversed_paths = []
+        for idx, doc in enumerate(docs):
+            path = doc.get("storage_path", "") or ""
+            if path:
+                reversed_paths.append((path.lower().strip()[::-1], idx))
+        reversed_paths.sort()
+        self._rev_keys = [key for key, _ in reversed_paths]
+        self._rev_idx = [idx for _, idx in reversed_paths]
+
+        # Tier 2: normalised filename → doc indices
+        self.by_filename: dict[str, list[int]] = {}
+        # Tier 3: bigram-set strings, overall and per document_type
+        self._gram_codes: dict[str, str] = {}
+        self.by_stem: dict[str, list[int]] = {}
+        self._choices: dict[Optional[str], tuple[list[str], list[int]]] = {None: ([], [])}
+        self._encoded: dict[int, str] = {}
+        self._postings: dict[str, list[int]] = {}
+        for idx, doc in enumerate(docs):
+            filename = doc.get("filename", "") or ""
+            if not filename:
+                continue
+            self.by_filename.setdefault(filename.lower().strip(), []).append(idx)
+            stem = os.path.splitext(filename)[0].lower()
+            self.by_stem.setdefault(stem, []).append(idx)
+            encoded = self._encode(stem)
+            self._encoded[idx] = encoded
+            for gram in _bigrams(stem):
+                self._postings.setdefault(gram, []).append(idx)
+            doc_type = (doc.get("document_type", "") or "").lower()
+            for key in (None, doc_type):
+                choices, indices = self._choices.setdefault(key, ([], []))
+                choices.append(encoded)
+                indices.append(idx)
+
+    def _encode(self, stem: str) -> str:
+        codes = self._gram_codes
+        for gram in _bigrams(stem):
+            if gram not in codes:
+                n = len(codes) + 0x100
+                codes[gram] = chr(n if n < 0xD800 else n + 0x800)  # skip surrogates
+        return "".join(sorted(codes[g] for g in _bigrams(stem)))
+
+    def first_path_ending_with(self, suffix: str) -> Optional[int]:
+        key = suffix[::-1]
+        lo = bisect_left(self._rev_keys, key)
+        hi = bisect_left(self._rev_keys, key + "\U0010ffff", lo)
+        if lo == hi:
+            return None
+        return min(self._rev_idx[lo:hi])
+
+    def best_stem(
+        self,
+        stem: str,
+        threshold: float,
+        document_type: Optional[str] = None,
+    ) -> Optional[tuple[float, int]]:
+        """Best (Dice similarity, doc index) ≥ threshold, optionally within one document_type."""
+        stem = stem.lower()
+        type_key = document_type.lower() if document_type else None
+        choices, indices = self._choices.get(type_key, ([], []))
+        if not stem or not choices:
+            return None
+        if len(stem) < 2:
+            # No bigrams: only an identical stem scores (1.0)
+            allowed = set(indices)
+            same = [i for i in self.by_stem.get(stem, []) if i in allowed]
+            return (1.0, same[0]) if same else None
+        query = self._encode(stem)
+        cutoff = threshold * 100 - 1e-6
+
+        # Block on the rarest two thirds of the bigrams. A document sharing
+        # none of them overlaps in at most n - p bigrams, so its Dice score is
+        # at most 2(n-p) / (2n-p); a blocked best above that bound is final.
+        grams = sorted(_bigrams(stem), key=lambda g: len(self._postings.get(g, ())))
+        n = len(grams)
+        p = n - n // 3
+        block = set()
+        for gram in grams[:p]:
+            block.update(self._postings.get(gram, ()))
+        if type_key is not None:
+            block.intersection_update(indices)
+        if block and len(block) < len(indices):
+            blocked = sorted(block)
+            match = process.extractOne(
+                query, [self._encoded[i] for i in blocked], scorer=fuzz.ratio, score_cutoff=cutoff,
+            )
+            if match is not None and match[1] / 100.0 > 2 * (n - p) / (2 * n - p):
+                return round(match[1] / 100.0, 6), blocked[match[2]]
+
+        match = process.extractOne(query, choices, scorer=fuzz.ratio, score_cutoff=cutoff)
+        if match is None:
+            return None
+        _, score, pos = match
+        return round(score / 100.0, 6), indices[pos]
+
+
 class FileReferenceResolver:
     """
     Resolves file references from PMS exports against a yacht's document library.
@@ -53,6 +180,8 @@ class FileReferenceResolver:
         self._supabase = supabase_client
         self._yacht_id = yacht_id
         self._doc_cache = None  # lazy-loaded for batch operations
+        self._index: Optional[_DocIndex] = None
+        self._memo: dict[tuple[str, Optional[str]], tuple[Optional[dict], str, float]] = {}
 
     def _load_doc_cache(self):
         """Pre-fetch all documents for the yacht into memory for batch matching."""
@@ -75,6 +204,8 @@ class FileReferenceResolver:
         except Exception as e:
             logger.error("Failed to load document cache: %s", e)
             self._doc_cache = []
+        self._index = _DocIndex(self._doc_cache)
+        self._memo = {}
 
     @staticmethod
     def _extract_filename(reference: str) -> str:
@@ -101,11 +232,8 @@ class FileReferenceResolver:
         if a == b:
             return 1.0
 
-        def bigrams(s):
-            return set(s[i:i+2] for i in range(len(s) - 1))
-
-        a_bigrams = bigrams(a)
-        b_bigrams = bigrams(b)
+        a_bigrams = _bigrams(a)
+        b_bigrams = _bigrams(b)
         if not a_bigrams or not b_bigrams:
             return 0.0
 
@@ -141,69 +269,78 @@ class FileReferenceResolver:
         raw_reference = raw_reference.strip()
         self._load_doc_cache()
 
+        key = (raw_reference.lower(), (document_type_hint or "").lower() or None)
+        cached = self._memo.get(key)
+        if cached is None:
+            cached = self._lookup(raw_reference, document_type_hint)
+            self._memo[key] = cached
+        doc, match_type, confidence = cached
+
+        if doc is None:
+            logger.debug("No match for reference '%s' in yacht %s", raw_reference, self._yacht_id)
+            return FileResolutionResult(
+                raw_reference=raw_reference,
+                resolved=False,
+                document_id=None,
+                filename=None,
+                storage_path=None,
+                match_type="unresolved",
+                confidence=0.0,
+            )
+        logger.debug("%s match: '%s' → doc %s (confidence=%.2f)", match_type, raw_reference, doc["id"], confidence)
+        return FileResolutionResult(
+            raw_reference=raw_reference,
+            resolved=True,
+            document_id=doc["id"],
+            filename=doc.get("filename"),
+            storage_path=doc.get("storage_path"),
+            match_type=match_type,
+            confidence=confidence,
+        )
+
+    def _lookup(
+        self,
+        raw_reference: str,
+        document_type_hint: Optional[str],
+    ) -> tuple[Optional[dict], str, float]:
+        """Run the three tiers; returns (doc, match_type, confidence)."""
         # Tier 1: Exact path match
-        result = self._match_exact_path(raw_reference)
-        if result:
-            return result
+        doc = self._match_exact_path(raw_reference)
+        if doc:
+            return doc, "exact_path", 1.0
 
         # Tier 2: Exact filename match
         extracted_filename = self._extract_filename(raw_reference)
-        result = self._match_exact_filename(raw_reference, extracted_filename, document_type_hint)
-        if result:
-            return result
+        doc = self._match_exact_filename(extracted_filename, document_type_hint)
+        if doc:
+            return doc, "exact_filename", 0.9
 
         # Tier 3: Fuzzy filename match
-        result = self._match_fuzzy(raw_reference, extracted_filename, document_type_hint)
-        if result:
-            return result
+        match = self._match_fuzzy(extracted_filename, document_type_hint)
+        if match:
+            sim, doc = match
+            return doc, "fuzzy", round(sim, 3)
 
-        # No match found
-        logger.debug("No match for reference '%s' in yacht %s", raw_reference, self._yacht_id)
-        return FileResolutionResult(
-            raw_reference=raw_reference,
-            resolved=False,
-            document_id=None,
-            filename=None,
-            storage_path=None,
-            match_type="unresolved",
-            confidence=0.0,
-        )
+        return None, "unresolved", 0.0
 
-    def _match_exact_path(self, raw_reference: str) -> Optional[FileResolutionResult]:
-        """Tier 1: Check if any document's storage_path ends with the reference."""
-        normalized_ref = self._normalize_for_comparison(raw_reference)
-        for doc in self._doc_cache:
-            storage_path = doc.get("storage_path", "") or ""
-            if storage_path and self._normalize_for_comparison(storage_path).endswith(normalized_ref):
-                logger.info("Exact path match: '%s' → doc %s", raw_reference, doc["id"])
-                return FileResolutionResult(
-                    raw_reference=raw_reference,
-                    resolved=True,
-                    document_id=doc["id"],
-                    filename=doc.get("filename"),
-                    storage_path=storage_path,
-                    match_type="exact_path",
-                    confidence=1.0,
-                )
-        return None
+    def _match_exact_path(self, raw_reference: str) -> Optional[dict]:
+        """Tier 1: First document whose storage_path ends with the reference."""
+        idx = self._index.first_path_ending_with(self._normalize_for_comparison(raw_reference))
+        if idx is None:
+            return None
+        return self._doc_cache[idx]
 
     def _match_exact_filename(
         self,
-        raw_reference: str,
         extracted_filename: str,
         document_type_hint: Optional[str],
-    ) -> Optional[FileResolutionResult]:
+    ) -> Optional[dict]:
         """Tier 2: Match by filename (case-insensitive). Prefer matching document_type."""
         normalized = self._normalize_for_comparison(extracted_filename)
         if not normalized:
             return None
 
-        matches = []
-        for doc in self._doc_cache:
-            doc_filename = doc.get("filename", "") or ""
-            if self._normalize_for_comparison(doc_filename) == normalized:
-                matches.append(doc)
-
+        matches = [self._doc_cache[i] for i in self._index.by_filename.get(normalized, [])]
         if not matches:
             return None
 
@@ -217,73 +354,33 @@ class FileReferenceResolver:
                 matches = typed_matches
 
         # Pick the first (or only) match
-        doc = matches[0]
-        logger.info("Exact filename match: '%s' → doc %s", raw_reference, doc["id"])
-        return FileResolutionResult(
-            raw_reference=raw_reference,
-            resolved=True,
-            document_id=doc["id"],
-            filename=doc.get("filename"),
-            storage_path=doc.get("storage_path"),
-            match_type="exact_filename",
-            confidence=0.9,
-        )
+        return matches[0]
 
     def _match_fuzzy(
         self,
-        raw_reference: str,
         extracted_filename: str,
         document_type_hint: Optional[str],
-    ) -> Optional[FileResolutionResult]:
+    ) -> Optional[tuple[float, dict]]:
         """Tier 3: Fuzzy match using bigram similarity (Dice coefficient)."""
         if not extracted_filename:
             return None
 
         # Strip extension for comparison — "DWG-001.pdf" should match "dwg_001.pdf"
         ref_stem = os.path.splitext(extracted_filename)[0]
-
-        candidates = []
-        for doc in self._doc_cache:
-            doc_filename = doc.get("filename", "") or ""
-            if not doc_filename:
-                continue
-
-            doc_stem = os.path.splitext(doc_filename)[0]
-
-            # Compare stems (without extension)
-            sim = self._simple_similarity(ref_stem, doc_stem)
-            if sim >= FUZZY_THRESHOLD:
-                candidates.append((sim, doc))
-
-        if not candidates:
+        best = self._index.best_stem(ref_stem, FUZZY_THRESHOLD)
+        if best is None:
             return None
 
-        # Sort by similarity descending
-        candidates.sort(key=lambda x: x[0], reverse=True)
+        # If we have a type hint, prefer the best candidate of that type
+        # when it scores within 90% of the overall best
+        best_type = (self._doc_cache[best[1]].get("document_type", "") or "").lower()
+        if document_type_hint and best_type != document_type_hint.lower():
+            typed = self._index.best_stem(ref_stem, FUZZY_THRESHOLD, document_type_hint)
+            if typed and typed[0] >= best[0] * 0.9:
+                best = typed
 
-        # If we have a type hint, boost candidates that match
-        if document_type_hint and len(candidates) > 1:
-            typed = [
-                (sim, doc) for sim, doc in candidates
-                if (doc.get("document_type", "") or "").lower() == document_type_hint.lower()
-            ]
-            if typed and typed[0][0] >= candidates[0][0] * 0.9:
-                candidates = typed
-
-        best_sim, best_doc = candidates[0]
-        logger.info(
-            "Fuzzy match: '%s' → doc %s (similarity=%.2f)",
-            raw_reference, best_doc["id"], best_sim
-        )
-        return FileResolutionResult(
-            raw_reference=raw_reference,
-            resolved=True,
-            document_id=best_doc["id"],
-            filename=best_doc.get("filename"),
-            storage_path=best_doc.get("storage_path"),
-            match_type="fuzzy",
-            confidence=round(best_sim, 3),
-        )
+        sim, idx = best
+        return sim, self._doc_cache[idx]
 
     def resolve_batch(
         self,
@@ -0,0 +1,293 @@
+"""
+Import Bulk Writer
+==================
+Direct-Postgres commit and rollback for the PMS import pipeline.
+
+The PostgREST path in import_service inserts 100 rows per HTTP request and
+then upserts search_index in a second round of requests, so a 50k-row export
+costs ~1000 round trips over the vessel link. When IMPORT_DB_DSN is set the
+service uses this module instead:
+
+    commit:   COPY rows into a temp staging table (streamed, one pass)
+              → resolve equipment_ref → equipment_id with one UPDATE … FROM
+              → INSERT … SELECT into the entity table
+              → INSERT … SELECT into search_index (ON CONFLICT upsert)
+    rollback: one soft-delete UPDATE, then set-based link / search_index
+              cleanup scoped to the rows it just deleted
+
+Everything for one domain runs in a single transaction, so a failed commit
+leaves nothing behind. Rollback stays a soft delete (deleted_at) — production
+has a prevent_hard_delete() trigger on entity tables.
+
+Use the session-mode pooler (port 5432) or a direct connection for
+IMPORT_DB_DSN: COPY and temp tables do not survive Supavisor transaction
+mode (port 6543).
+"""
+
+import io
+import logging
+import os
+from contextlib import closing
+from typing import Callable, Iterable, Iterator, Optional
+
+import psycopg2
+from psycopg2 import sql
+
+logger = logging.getLogger("import.bulk")
+
+IMPORT_DB_DSN = os.getenv("IMPORT_DB_DSN")
+IMPORT_STATEMENT_TIMEOUT_MS = int(os.getenv("IMPORT_STATEMENT_TIMEOUT_MS", "300000"))
+
+# Virtual column on the faults domain: the equipment name/code/source id the
+# export used, resolved to the equipment_id FK inside the transaction.
+EQUIPMENT_REF = "equipment_ref"
+SEARCH_TEXT_MAX = 12000
+
+_STAGE = sql.Identifier("_import_stage")
+_STAGE_REF = "_equipment_ref"
+_STAGE_SEARCH = "_search_text"
+
+
+# =============================================================================
+# COPY text encoding
+# =============================================================================
+
+_COPY_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\x00": None,  # Postgres text cannot hold NUL
+})
+
+
+def copy_field(value) -> str:
+    """Encode one value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class CopyStream(io.RawIOBase):
+    """Lazy file-like over encoded COPY lines, so rows are never all in memory."""
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = iter(lines)
+        self._buf = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buf) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buf += line.encode("utf-8")
+        if size < 0:
+            out, self._buf = self._buf, b""
+        else:
+            out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
+def _copy_lines(first: dict, rows: Iterator[dict], columns: list[str],
+                search_text_fn: Callable[[dict], str]) -> Iterator[str]:
+    for row in _chain_one(first, rows):
+        fields = [copy_field(row.get(col)) for col in columns]
+        fields.append(copy_field(row.get(EQUIPMENT_REF)))
+        fields.append(copy_field(search_text_fn(row)[:SEARCH_TEXT_MAX]))
+        yield "\t".join(fields) + "\n"
+
+
+def _chain_one(first: dict, rest: Iterator[dict]) -> Iterator[dict]:
+    yield first
+    yield from rest
+
+
+# =============================================================================
+# Commit
+# =============================================================================
+
+def _connect(dsn: str):
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = False
+    return conn
+
+
+def bulk_commit(
+    dsn: str,
+    table_name: str,
+    object_type: Optional[str],
+    rows: Iterable[dict],
+    yacht_id: str,
+    session_id: str,
+    search_text_fn: Callable[[dict], str],
+) -> set[str]:
+    """
+    COPY transformed rows into ``table_name`` and index them in search_index.
+
+    Rows must share transform_row's shape; the column list is taken from the
+    first row (plus source_id, which transform_row only sets when present).
+    Rows whose equipment_ref does not resolve are skipped.
+
+    Returns the set of inserted ids.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return set()
+
+    columns = [c for c in first if c != EQUIPMENT_REF]
+    if "source_id" not in columns:
+        columns.append("source_id")
+    has_ref = EQUIPMENT_REF in first
+    insert_columns = columns + (["equipment_id"] if has_ref and "equipment_id" not in columns else [])
+
+    table = sql.Identifier(table_name)
+    col_list = sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+    insert_list = sql.SQL(", ").join(sql.Identifier(c) for c in insert_columns)
+
+    with closing(_connect(dsn)) as conn:
+        with conn, conn.cursor() as cur:
+            cur.execute("SET LOCAL statement_timeout = %s", (IMPORT_STATEMENT_TIMEOUT_MS,))
+            cur.execute(sql.SQL(
+                "CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+                "SELECT * FROM {table} WITH NO DATA"
+            ).format(stage=_STAGE, table=table))
+            cur.execute(sql.SQL(
+                "ALTER TABLE {stage} ADD COLUMN {ref} text, ADD COLUMN {search} text"
+            ).format(stage=_STAGE, ref=sql.Identifier(_STAGE_REF), search=sql.Identifier(_STAGE_SEARCH)))
+
+            copy = sql.SQL("COPY {stage} ({cols}, {ref}, {search}) FROM STDIN").format(
+                stage=_STAGE, cols=col_list,
+                ref=sql.Identifier(_STAGE_REF), search=sql.Identifier(_STAGE_SEARCH),
+            )
+            cur.copy_expert(copy.as_string(conn), CopyStream(_copy_lines(first, rows, columns, search_text_fn)))
+            staged = cur.rowcount
+
+            where = sql.SQL("")
+            if has_ref:
+                cur.execute(sql.SQL("""
+                    UPDATE {stage} s SET equipment_id = r.id
+                    FROM (
+                        SELECT DISTINCT ON (ref) ref, id FROM (
+                            SELECT lower(code) AS ref, id, 1 AS prio FROM pms_equipment
+                             WHERE yacht_id = %(yacht_id)s AND deleted_at IS NULL AND code IS NOT NULL
+                            UNION ALL
+                            SELECT lower(source_id), id, 2 FROM pms_equipment
+                             WHERE yacht_id = %(yacht_id)s AND deleted_at IS NULL AND source_id IS NOT NULL
+                            UNION ALL
+                            SELECT lower(name), id, 3 FROM pms_equipment
+                             WHERE yacht_id = %(yacht_id)s AND deleted_at IS NULL AND name IS NOT NULL
+                        ) candidates
+                        ORDER BY ref, prio
+                    ) r
+                    WHERE r.ref = lower(trim(s.{ref}))
+                """).format(stage=_STAGE, ref=sql.Identifier(_STAGE_REF)), {"yacht_id": yacht_id})
+                where = sql.SQL(" WHERE equipment_id IS NOT NULL")
+
+            cur.execute(sql.SQL(
+                "INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage}{where} RETURNING id"
+            ).format(table=table, cols=insert_list, stage=_STAGE, where=where))
+            inserted = {str(r[0]) for r in cur.fetchall()}
+            if has_ref and len(inserted) < staged:
+                logger.warning(
+                    "[ImportBulk] %d %s rows skipped: equipment_ref did not resolve",
+                    staged - len(inserted), table_name,
+                )
+
+            if inserted and object_type:
+                # Non-fatal — projection worker will catch up
+                cur.execute("SAVEPOINT search_index")
+                try:
+                    cur.execute(sql.SQL("""
+                        INSERT INTO search_index
+                            (object_type, object_id, yacht_id, org_id, search_text, embedding_status)
+                        SELECT %(object_type)s, t.id, t.yacht_id, t.yacht_id, s.{search}, 'pending'
+                        FROM {stage} s JOIN {table} t ON t.id = s.id
+                        WHERE t.import_session_id = %(session_id)s AND t.yacht_id = %(yacht_id)s
+                        ON CONFLICT (object_type, object_id) DO UPDATE
+                        SET search_text = EXCLUDED.search_text,
+                            yacht_id = EXCLUDED.yacht_id,
+                            org_id = EXCLUDED.org_id,
+                            embedding_status = 'pending'
+                    """).format(stage=_STAGE, table=table, search=sql.Identifier(_STAGE_SEARCH)),
+                        {"object_type": object_type, "session_id": session_id, "yacht_id": yacht_id})
+                    cur.execute("RELEASE SAVEPOINT search_index")
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT search_index")
+                    logger.warning(f"[ImportBulk] search_index insert warning for {table_name}: {e}")
+
+    logger.info(f"[ImportBulk] Committed {len(inserted)} rows into {table_name} via COPY")
+    return inserted
+
+
+# =============================================================================
+# Rollback
+# =============================================================================
+
+def set_rollback(
+    dsn: str,
+    table_name: str,
+    object_type: Optional[str],
+    yacht_id: str,
+    session_id: str,
+) -> int:
+    """Soft-delete a session's rows and clean up their links/index set-wise."""
+    table = sql.Identifier(table_name)
+    params = {"session_id": session_id, "yacht_id": yacht_id, "object_type": object_type}
+    # now() is fixed for the transaction, so this selects exactly the rows
+    # soft-deleted by the UPDATE below.
+    rolled_back = sql.SQL(
+        "SELECT id FROM {table} WHERE import_session_id = %(session_id)s "
+        "AND yacht_id = %(yacht_id)s AND deleted_at = now()"
+    ).format(table=table)
+
+    cleanup = [
+        # pms_equipment_documents has NO deleted_at — hard delete is allowed
+        ("equipment_documents", sql.SQL(
+            "DELETE FROM pms_equipment_documents WHERE yacht_id = %(yacht_id)s AND equipment_id IN ({ids})"
+        ).format(ids=rolled_back), None),
+        ("attachments", sql.SQL(
+            "UPDATE pms_attachments SET deleted_at = now() WHERE yacht_id = %(yacht_id)s "
+            "AND deleted_at IS NULL AND entity_id IN ({ids})"
+        ).format(ids=rolled_back), None),
+    ]
+    if object_type:
+        cleanup.append(("search_index", sql.SQL(
+            "DELETE FROM search_index WHERE object_type = %(object_type)s AND object_id IN ({ids})"
+        ).format(ids=rolled_back), sql.SQL(
+            # If hard delete is blocked on search_index too, mark as failed
+            "UPDATE search_index SET embedding_status = 'failed' "
+            "WHERE object_type = %(object_type)s AND object_id IN ({ids})"
+        ).format(ids=rolled_back)))
+
+    with closing(_connect(dsn)) as conn:
+        with conn, conn.cursor() as cur:
+            cur.execute("SET LOCAL statement_timeout = %s", (IMPORT_STATEMENT_TIMEOUT_MS,))
+            cur.execute(sql.SQL(
+                "UPDATE {table} SET deleted_at = now() WHERE import_session_id = %(session_id)s "
+                "AND yacht_id = %(yacht_id)s AND deleted_at IS NULL"
+            ).format(table=table), params)
+            count = cur.rowcount
+            if count:
+                for name, statement, fallback in cleanup:
+                    for stmt in (statement, fallback):
+                        if stmt is None:
+                            break
+                        cur.execute("SAVEPOINT cleanup")
+                        try:
+                            cur.execute(stmt, params)
+                            cur.execute("RELEASE SAVEPOINT cleanup")
+                            break
+                        except psycopg2.Error as e:
+                            cur.execute("ROLLBACK TO SAVEPOINT cleanup")
+                            logger.warning(f"[ImportBulk] Rollback cleanup of {name} failed: {e}")
+
+    logger.info(f"[ImportBulk] Rolled back (soft-deleted) {count} records from {table_name}")
+    return count
@@ -9,7 +9,7 @@ search_index population, and rollback.
 import uuid
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional
 
 from mappers.date_normalizer import normalize_date
 from mappers.status_mapper import map_status, CANONICAL_STATUSES
@@ -18,6 +18,7 @@ from handlers.schema_mapping import get_table
 from services.file_reference_resolver import (
     FileReferenceResolver, FileResolutionResult, summarize_resolutions,
 )
+from services.import_bulk import EQUIPMENT_REF, IMPORT_DB_DSN, bulk_commit, set_rollback
 
 logger = logging.getLogger("import.service")
 
@@ -287,7 +288,7 @@ def resolve_file_references(
 
 
 def dry_run_domain(
-    rows: list[dict],
+    rows: Iterable[dict],
     column_map: list[dict],
     domain: str,
     source: str,
@@ -298,7 +299,8 @@ def dry_run_domain(
 ) -> dict:
     """
     Dry-run a domain: transform all rows, validate, count results.
-    Does NOT write to database.
+    Does NOT write to database. ``rows`` may be a one-shot iterator; only
+    the first 10 transformed rows are kept.
 
     Returns:
         {
@@ -314,11 +316,14 @@ def dry_run_domain(
         }
     """
     all_warnings = []
-    transformed = []
+    first_10 = []
+    transformed_count = 0
+    total = 0
     all_file_refs = []
     errors = 0
 
     for row_idx, row in enumerate(rows):
+        total += 1
         try:
             result, row_warnings, file_refs = transform_row(
                 row, column_map, domain, source, yacht_id, session_id, date_format
@@ -328,7 +333,9 @@ def dry_run_domain(
                 w["row"] = row_idx
                 w["domain"] = domain
             all_warnings.extend(row_warnings)
-            transformed.append(result)
+            transformed_count += 1
+            if len(first_10) < 10:
+                first_10.append(result)
 
             # Collect file references with row index
             for ref in file_refs:
@@ -354,20 +361,162 @@ def dry_run_domain(
         resolution_summary = summarize_resolutions(file_resolutions)
 
     return {
-        "total": len(rows),
-        "new": len(transformed),
+        "total": total,
+        "new": transformed_count,
         "duplicates": 0,  # TODO: check against existing data
         "errors": errors,
         "warnings_count": len(all_warnings),
         "warnings": all_warnings,
-        "first_10": transformed[:10],
+        "first_10": first_10,
         "file_resolutions": [r.to_dict() for r in file_resolutions],
         "resolution_summary": resolution_summary,
     }
 
 
+SEARCH_TEXT_FIELDS = (
+    "name", "title", "description", "manufacturer", "model",
+    "serial_number", "part_number", "fault_code", "certificate_name",
+    "certificate_number", "person_name", "wo_number", "code",
+)
+REST_BATCH_SIZE = 100
+LINK_BATCH_SIZE = 500
+
+
+def _search_text(entity_row: dict, object_type: Optional[str]) -> str:
+    """Basic search_text from entity fields; the projection worker enriches it later."""
+    parts = [str(entity_row[f]) for f in SEARCH_TEXT_FIELDS if entity_row.get(f)]
+    return " ".join(parts) or f"Imported {object_type}"
+
+
+def _equipment_ref_index(supabase_client, yacht_id: str) -> dict[str, str]:
+    """lower(code | source_id | name) → equipment id, code taking precedence."""
+    index: dict[str, tuple[int, str]] = {}
+    page = 1000
+    start = 0
+    while True:
+        result = supabase_client.table("pms_equipment").select(
+            "id, code, source_id, name"
+        ).eq("yacht_id", yacht_id).is_("deleted_at", "null").range(
+            start, start + page - 1
+        ).execute()
+        data = result.data or []
+        for row in data:
+            for prio, field in enumerate(("code", "source_id", "name")):
+                value = row.get(field)
+                if value:
+                    key = str(value).strip().lower()
+                    if key not in index or prio < index[key][0]:
+                        index[key] = (prio, row["id"])
+        if len(data) < page:
+            break
+        start += page
+    return {key: eid for key, (_, eid) in index.items()}
+
+
+def _rest_commit(
+    supabase_client,
+    table_name: str,
+    object_type: Optional[str],
+    domain: str,
+    rows: Iterable[dict],
+    yacht_id: str,
+) -> set[str]:
+    """PostgREST fallback: insert + search_index upsert one batch at a time."""
+    inserted: set[str] = set()
+    ref_index: Optional[dict[str, str]] = None
+    skipped = 0
+    batch: list[dict] = []
+
+    def flush(batch: list[dict]) -> None:
+        try:
+            result = supabase_client.table(table_name).insert(batch).execute()
+        except Exception as e:
+            logger.error(f"[Import] Insert failed for {table_name} batch of {len(batch)}: {e}")
+            raise
+        if not result.data:
+            return
+        created = {r["id"] for r in result.data}
+        inserted.update(created)
+        logger.info(f"[Import] Inserted {len(result.data)} rows into {table_name}")
+
+        # Insert search_index rows for projection worker
+        # Real DB requires search_text (NOT NULL) — build from entity fields
+        if object_type:
+            search_rows = [{
+                "object_type": object_type,
+                "object_id": row["id"],
+                "yacht_id": yacht_id,
+                "org_id": yacht_id,
+                "search_text": _search_text(row, object_type)[:12000],  # max search_text length
+                "embedding_status": "pending",
+            } for row in batch if row["id"] in created]
+            try:
+                supabase_client.table("search_index").upsert(
+                    search_rows,
+                    on_conflict="object_type,object_id",
+                ).execute()
+            except Exception as e:
+                logger.warning(f"[Import] search_index upsert warning for {domain}: {e}")
+                # Non-fatal — projection worker will catch up
+
+    for row in rows:
+        if EQUIPMENT_REF in row:
+            if ref_index is None:
+                ref_index = _equipment_ref_index(supabase_client, yacht_id)
+            ref = row.pop(EQUIPMENT_REF)
+            equipment_id = ref_index.get(str(ref).strip().lower()) if ref else None
+            if not equipment_id:
+                skipped += 1
+                continue
+            row["equipment_id"] = equipment_id
+        batch.append(row)
+        if len(batch) >= REST_BATCH_SIZE:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    if skipped:
+        logger.warning(f"[Import] {skipped} {table_name} rows skipped: equipment_ref did not resolve")
+    return inserted
+
+
+def _insert_links(
+    supabase_client,
+    link_table: str,
+    pending: list[tuple[dict, FileResolutionResult]],
+) -> list[dict]:
+    """Insert document links in chunks; a failed chunk is retried row by row
+    so each bad ref is reported. Returns the refs that could not be linked."""
+    failed = []
+    for i in range(0, len(pending), LINK_BATCH_SIZE):
+        chunk = pending[i:i + LINK_BATCH_SIZE]
+        try:
+            supabase_client.table(link_table).insert([row for row, _ in chunk]).execute()
+            logger.info(f"[Import] Linked {len(chunk)} docs via {link_table}")
+            continue
+        except Exception as e:
+            logger.warning(f"[Import] Batch link into {link_table} failed, retrying per row: {e}")
+        for row, resolution in chunk:
+            entity_id = row.get("equipment_id") or row.get("entity_id")
+            try:
+                supabase_client.table(link_table).insert(row).execute()
+            except Exception as e:
+                logger.warning(
+                    "[Import] Failed to link doc %s → entity %s: %s",
+                    resolution.document_id, entity_id, e,
+                )
+                failed.append({
+                    "row": resolution.csv_row,
+                    "column": resolution.column,
+                    "value": resolution.raw_reference,
+                    "error": str(e),
+                })
+    return failed
+
+
 def commit_domain(
-    rows: list[dict],
+    rows: Iterable[dict],
     column_map: list[dict],
     domain: str,
     source: str,
@@ -376,13 +525,20 @@ def commit_domain(
     supabase_client,
     date_format: Optional[str] = None,
     user_id: Optional[str] = None,
+    db_dsn: Optional[str] = IMPORT_DB_DSN,
 ) -> tuple[int, list[str]]:
     """
     Commit a domain: transform rows and INSERT into entity table + search_index.
     Also resolves file references and creates document links.
 
+    With ``db_dsn`` set, rows are streamed through COPY in one transaction
+    (services.import_bulk); otherwise they go through PostgREST in batches.
+    Faults' virtual equipment_ref column is resolved to equipment_id either
+    way; rows whose reference does not match any equipment are skipped.
+
     Args:
         user_id: UUID of the authenticated user (for uploaded_by on attachment tables).
+        db_dsn: Direct Postgres DSN for the bulk path (defaults to IMPORT_DB_DSN).
 
     Returns:
         (records_created, entity_ids)
@@ -394,78 +550,44 @@ def commit_domain(
         logger.error(f"[Import] Unknown domain: {domain}")
         return 0, []
 
-    transformed = []
+    row_ids: list[str] = []
     all_file_refs = []
-    for row_idx, row in enumerate(rows):
-        result, _, file_refs = transform_row(
-            row, column_map, domain, source, yacht_id, session_id, date_format
-        )
-        transformed.append(result)
-        for ref in file_refs:
-            ref["csv_row"] = row_idx
-        all_file_refs.extend(file_refs)
-
-    if not transformed:
-        return 0, []
 
-    # Batch insert into entity table
-    entity_ids = []
-    batch_size = 100
-    for i in range(0, len(transformed), batch_size):
-        batch = transformed[i:i + batch_size]
-        try:
-            result = supabase_client.table(table_name).insert(batch).execute()
-            if result.data:
-                entity_ids.extend([r["id"] for r in result.data])
-                logger.info(f"[Import] Inserted {len(result.data)} rows into {table_name}")
-        except Exception as e:
-            logger.error(f"[Import] Insert failed for {table_name} batch {i}: {e}")
-            raise
+    def transformed_rows():
+        for row_idx, row in enumerate(rows):
+            result, _, file_refs = transform_row(
+                row, column_map, domain, source, yacht_id, session_id, date_format
+            )
+            row_ids.append(result["id"])
+            for ref in file_refs:
+                ref["csv_row"] = row_idx
+            all_file_refs.extend(file_refs)
+            yield result
 
-    # Insert search_index rows for projection worker
-    # Real DB requires search_text (NOT NULL) — build from entity fields
-    # Projection worker will later enrich with full text + embedding
-    if entity_ids and object_type:
-        search_rows = []
-        for idx, eid in enumerate(entity_ids):
-            # Build basic search_text from the transformed row
-            entity_row = transformed[idx] if idx < len(transformed) else {}
-            search_parts = []
-            for field in ("name", "title", "description", "manufacturer", "model",
-                          "serial_number", "part_number", "fault_code", "certificate_name",
-                          "certificate_number", "person_name", "wo_number", "code"):
-                val = entity_row.get(field)
-                if val:
-                    search_parts.append(str(val))
-            search_text = " ".join(search_parts) or f"Imported {object_type}"
-
-            search_rows.append({
-                "object_type": object_type,
-                "object_id": eid,
-                "yacht_id": yacht_id,
-                "org_id": yacht_id,
-                "search_text": search_text[:12000],  # max search_text length
-                "embedding_status": "pending",
-            })
+    if db_dsn:
+        inserted = bulk_commit(
+            db_dsn, table_name, object_type, transformed_rows(),
+            yacht_id, session_id, lambda r: _search_text(r, object_type),
+        )
+    else:
+        inserted = _rest_commit(
+            supabase_client, table_name, object_type, domain,
+            transformed_rows(), yacht_id,
+        )
 
-        for i in range(0, len(search_rows), batch_size):
-            batch = search_rows[i:i + batch_size]
-            try:
-                supabase_client.table("search_index").upsert(
-                    batch,
-                    on_conflict="object_type,object_id",
-                ).execute()
-            except Exception as e:
-                logger.warning(f"[Import] search_index upsert warning for {domain}: {e}")
-                # Non-fatal — projection worker will catch up
+    # Keep source-row order so file refs (by csv_row) map to their entity
+    entity_ids = [eid for eid in row_ids if eid in inserted]
+    if not entity_ids:
+        return 0, []
 
     # Resolve file references and create document links
     unresolved_refs = []
-    if all_file_refs and entity_ids:
+    if all_file_refs:
         file_resolutions = resolve_file_references(
             all_file_refs, source, domain, supabase_client, yacht_id
         )
         file_ref_columns = get_file_reference_columns(source, domain)
+        links: dict[str, list[tuple[dict, FileResolutionResult]]] = {}
 
         for resolution in file_resolutions:
             if not resolution.resolved:
@@ -478,62 +600,45 @@ def commit_domain(
 
             # Determine which entity this file ref belongs to
             row_idx = resolution.csv_row
-            if row_idx is None or row_idx >= len(entity_ids):
+            if row_idx is None or row_idx >= len(row_ids) or row_ids[row_idx] not in inserted:
                 continue
-            entity_id = entity_ids[row_idx]
+            entity_id = row_ids[row_idx]
 
             col_meta = file_ref_columns.get(resolution.column, {})
             link_table = col_meta.get("link_table", "pms_attachments")
 
-            try:
-                if link_table == "pms_equipment_documents":
-                    equip_doc_row = {
-                        "id": str(uuid.uuid4()),
-                        "yacht_id": yacht_id,
-                        "equipment_id": entity_id,
-                        "document_id": resolution.document_id,
-                        "storage_path": resolution.storage_path,
-                        "filename": resolution.filename,
-                        "document_type": col_meta.get("document_type_hint", "general"),
-                    }
-                    if user_id:
-                        equip_doc_row["uploaded_by"] = user_id
-                    supabase_client.table("pms_equipment_documents").insert(equip_doc_row).execute()
-                else:
-                    # Polymorphic attachment
-                    # mime_type, file_size, uploaded_by are NOT NULL on pms_attachments
-                    attach_row = {
-                        "id": str(uuid.uuid4()),
-                        "yacht_id": yacht_id,
-                        "entity_type": col_meta.get("entity_type", domain),
-                        "entity_id": entity_id,
-                        "filename": resolution.filename or resolution.raw_reference,
-                        "original_filename": resolution.raw_reference,
-                        "mime_type": "application/octet-stream",
-                        "file_size": 0,
-                        "storage_path": resolution.storage_path,
-                        "description": f"Linked during import (match: {resolution.match_type}, confidence: {resolution.confidence})",
-                    }
-                    if user_id:
-                        attach_row["uploaded_by"] = user_id
-                    supabase_client.table("pms_attachments").insert(attach_row).execute()
-
-                logger.info(
-                    "[Import] Linked doc %s → entity %s via %s (match=%s, conf=%.2f)",
-                    resolution.document_id, entity_id, link_table,
-                    resolution.match_type, resolution.confidence,
-                )
-            except Exception as e:
-                logger.warning(
-                    "[Import] Failed to link doc %s → entity %s: %s",
-                    resolution.document_id, entity_id, e,
-                )
-                unresolved_refs.append({
-                    "row": row_idx,
-                    "column": resolution.column,
-                    "value": resolution.raw_reference,
-                    "error": str(e),
-                })
+            if link_table == "pms_equipment_documents":
+                link_row = {
+                    "id": str(uuid.uuid4()),
+                    "yacht_id": yacht_id,
+                    "equipment_id": entity_id,
+                    "document_id": resolution.document_id,
+                    "storage_path": resolution.storage_path,
+                    "filename": resolution.filename,
+                    "document_type": col_meta.get("document_type_hint", "general"),
+                }
+            else:
+                # Polymorphic attachment
+                # mime_type, file_size, uploaded_by are NOT NULL on pms_attachments
+                link_table = "pms_attachments"
+                link_row = {
+                    "id": str(uuid.uuid4()),
+                    "yacht_id": yacht_id,
+                    "entity_type": col_meta.get("entity_type", domain),
+                    "entity_id": entity_id,
+                    "filename": resolution.filename or resolution.raw_reference,
+                    "original_filename": resolution.raw_reference,
+                    "mime_type": "application/octet-stream",
+                    "file_size": 0,
+                    "storage_path": resolution.storage_path,
+                    "description": f"Linked during import (match: {resolution.match_type}, confidence: {resolution.confidence})",
+                }
+            if user_id:
+                link_row["uploaded_by"] = user_id
+            links.setdefault(link_table, []).append((link_row, resolution))
+
+        for link_table, pending in links.items():
+            unresolved_refs.extend(_insert_links(supabase_client, link_table, pending))
 
         # Store unresolved refs in import session metadata
         if unresolved_refs:
@@ -556,16 +661,21 @@ def rollback_domain(
     session_id: str,
     yacht_id: str,
     supabase_client,
+    db_dsn: Optional[str] = IMPORT_DB_DSN,
 ) -> int:
     """
     Soft-delete all records for a domain created by this import session.
     Uses deleted_at (NOT hard DELETE) — production DB has prevent_hard_delete() trigger.
+    With ``db_dsn`` set this is one set-based transaction (services.import_bulk).
     Returns count of rolled-back records.
     """
     table_name = DOMAIN_TO_TABLE.get(domain)
     if not table_name:
         return 0
 
+    if db_dsn:
+        return set_rollback(db_dsn, table_name, DOMAIN_TO_OBJECT_TYPE.get(domain), yacht_id, session_id)
+
     try:
         # Get IDs for search_index cleanup
         ids_result = supabase_client.table(table_name).select("id").eq(
@@ -0,0 +1,488 @@
+"""
+Ledger Export — evidence PDF export jobs.
+
+An export used to load every matching ledger_events row, build the PDF in
+the request handler and only then seal and upload; a vessel-wide, year-long
+export held tens of thousands of events in memory and froze the event loop
+for seconds. An export is now a background job:
+
+    1. fetching   keyset pages over (created_at, id); each page is masked and
+                  appended to a spooled JSON file, so only one page is held
+                  in the API worker at a time
+    2. rendering  PyMuPDF runs in the render process pool and writes the PDF
+                  to disk (services/render_pool.py)
+    3. sealing    optional v1.0 PAdES + RFC 3161 (LEDGER_EXPORT_SEAL=true):
+                  the PDF is staged in a private path and sealed into place
+                  by workers/sealing_worker.py (services/seal_queue.py)
+    4. uploading  unsealed exports are streamed to the ledger-exports bucket
+    5. completed  ledger_exports row, ledger event and notification recorded
+
+Job progress is held per API worker and read through
+GET /v1/ledger/export/{export_id}; a finished export is also found through
+its ledger_exports row.
+
+IDs masked with HMAC-SHA256 before embedding:
+  user_id   → actor_ref   (replaces, stripped from output)
+  yacht_id  → vessel_ref  (replaces, stripped from output)
+  entity_id → entity_ref  (replaces, stripped from output)
+"""
+
+import asyncio
+import hashlib
+import hmac as _hmac
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from integrations.supabase import aexecute
+from lib.pagination import PageRequest
+from services.pdf_render import PdfCanvas, page_chrome
+from services.render_pool import run_render
+from services.seal_queue import enqueue_seal_job, staging_path, wait_for_seal_job
+
+logger = logging.getLogger(__name__)
+
+LEDGER_EXPORT_PAGE_SIZE = int(os.getenv("LEDGER_EXPORT_PAGE_SIZE", "1000"))
+LEDGER_EXPORT_JOB_TTL_SECONDS = 3600
+LEDGER_EXPORT_BUCKET = "ledger-exports"
+SIGNED_URL_TTL_SECONDS = 3600
+
+# Fields stripped from embedded JSON before export.
+# Rationale for each:
+#   user_id, yacht_id, entity_id  — replaced by HMAC refs (actor_ref, vessel_ref, entity_ref)
+#   id                            — raw event UUID; no tenant/user info but zero reason to expose
+#   session_id                    — internal session correlation, not evidence-relevant
+#   day_anchor_id                 — internal chain anchor FK, not evidence-relevant
+#   related_event_ids             — internal cross-reference UUIDs; if populated would leak event IDs
+STRIP_FIELDS = frozenset({
+    "user_id", "yacht_id", "entity_id",
+    "id", "session_id", "day_anchor_id", "related_event_ids",
+})
+
+
+def mask_export_id(raw_id: str, secret: str) -> str:
+    """HMAC-SHA256 mask for external-facing export identifiers.
+
+    Unlike plain SHA-256, requires knowing EXPORT_HMAC_SECRET to reproduce.
+    An attacker who obtains raw UUIDs cannot verify they match refs in an
+    exported PDF without the server-side key.
+    """
+    return _hmac.new(
+        secret.encode("utf-8"),
+        str(raw_id).encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def mask_event(event: Dict[str, Any], secret: str) -> Dict[str, Any]:
+    """Strip internal IDs from a ledger event and add the HMAC refs."""
+    masked = {k: v for k, v in event.items() if k not in STRIP_FIELDS}
+    masked["actor_ref"]  = mask_export_id(event.get("user_id",   ""), secret)
+    masked["vessel_ref"] = mask_export_id(event.get("yacht_id",  ""), secret)
+    masked["entity_ref"] = mask_export_id(event.get("entity_id", ""), secret)
+    masked["event_timestamp"] = masked.pop("created_at", None) or masked.get("event_timestamp")
+    return masked
+
+
+# =============================================================================
+# JOB STATE
+# =============================================================================
+
+@dataclass
+class LedgerExportSpec:
+    """What to export and for whom (resolved from the request and JWT)."""
+    yacht_id: str
+    user_id: str
+    user_role: str
+    department: str
+    requester_name: str
+    scope: str
+    scope_label: str
+    date_from: str
+    date_to: str
+    vessel_name: str
+    export_secret: str
+    filter_user_id: Optional[str] = None
+    filter_department: Optional[str] = None
+    scope_user_id: Optional[str] = None
+
+
+@dataclass
+class LedgerExportJob:
+    """Progress of one export (status: queued → fetching → rendering → sealing → uploading → completed | failed)."""
+    export_id: str
+    yacht_id: str
+    user_id: str
+    status: str = "queued"
+    events_exported: int = 0
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    seal_job_id: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def update(self, status: str, **changes: Any) -> None:
+        self.status = status
+        for key, value in changes.items():
+            setattr(self, key, value)
+        self.updated_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "export_id": self.export_id,
+            "status": self.status,
+            "events_exported": self.events_exported,
+            "error": self.error,
+            "seal_job_id": self.seal_job_id,
+            **(self.result or {}),
+        }
+
+
+_jobs: Dict[str, LedgerExportJob] = {}
+_tasks: set = set()
+
+
+def get_export_job(export_id: str) -> Optional[LedgerExportJob]:
+    return _jobs.get(export_id)
+
+
+def _prune_jobs() -> None:
+    cutoff = time.time() - LEDGER_EXPORT_JOB_TTL_SECONDS
+    for export_id in [k for k, job in _jobs.items() if job.finished and job.updated_at < cutoff]:
+        del _jobs[export_id]
+
+
+def start_ledger_export(db_client, spec: LedgerExportSpec, export_id: str) -> LedgerExportJob:
+    """Register an export job and run it in the background."""
+    _prune_jobs()
+    job = LedgerExportJob(export_id=export_id, yacht_id=spec.yacht_id, user_id=spec.user_id)
+    _jobs[export_id] = job
+    task = asyncio.create_task(run_ledger_export(job, db_client, spec))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+# =============================================================================
+# FETCH
+# =============================================================================
+
+def apply_export_filters(query, spec: LedgerExportSpec):
+    """Scope a ledger_events query to the export's vessel, period and scope."""
+    query = query.eq("yacht_id", spec.yacht_id) \
+        .gte("created_at", f"{spec.date_from}T00:00:00Z") \
+        .lte("created_at", f"{spec.date_to}T23:59:59Z")
+    if spec.filter_user_id:
+        query = query.eq("user_id", spec.filter_user_id)
+    elif spec.filter_department is not None:
+        query = query.eq("department", spec.filter_department)
+    return query
+
+
+async def iter_event_pages(
+    db_client,
+    spec: LedgerExportSpec,
+    page_size: Optional[int] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield matching events oldest-first, one keyset page at a time."""
+    cursor = None
+    while True:
+        page = PageRequest.from_params(
+            {"limit": page_size or LEDGER_EXPORT_PAGE_SIZE, "cursor": cursor, "include_total": False},
+            default_order="created_at",
+            default_dir="asc",
+        )
+        query = apply_export_filters(db_client.table("ledger_events").select("*"), spec)
+        rows = (await aexecute(page.apply(query))).data or []
+        if rows:
+            yield rows
+        cursor = page.next_cursor(rows)
+        if not cursor:
+            return
+
+
+class JsonArrayWriter:
+    """
+    Append objects to a JSON array file, one at a time.
+
+    Output is byte-identical to ``json.dumps(items, sort_keys=True,
+    ensure_ascii=False, indent=2)`` without holding ``items`` in memory.
+    """
+
+    def __init__(self, fh):
+        self._fh = fh
+        self.count = 0
+
+    def write(self, item: Dict[str, Any]) -> None:
+        body = json.dumps(item, sort_keys=True, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self._fh.write(("[\n  " if self.count == 0 else ",\n  ") + body)
+        self.count += 1
+
+    def close(self) -> None:
+        self._fh.write("\n]" if self.count else "[]")
+
+
+# =============================================================================
+# RENDER (runs in the render pool)
+# =============================================================================
+
+def render_ledger_pdf(json_path: str, pdf_path: str, cover: Dict[str, Any]) -> int:
+    """
+    Build the evidence PDF with embedded ledger_events.json (PyMuPDF stage).
+
+    Runs in a render worker process: reads the spooled JSON, writes the PDF
+    to ``pdf_path`` and returns its size in bytes.
+
+    The cover page carries human-readable actor_name/email by design —
+    evidence without attribution is worthless. The export preview UI
+    must tell the operator this before they confirm.
+    """
+    import fitz  # PyMuPDF — imported here to keep the API process from loading it
+
+    # ── Cover page ──
+    # Inter is embedded (and subset) by PdfCanvas — required for PDF/A-3,
+    # Helvetica is never embedded
+    canvas = PdfCanvas(595, 842, chrome=page_chrome(595, 842, (0.18, 0.73, 0.91), bar_height=4, footer_rule=False))
+    canvas.new_page()
+
+    y = 48
+    def line(text: str, size: int = 10, bold: bool = False, color=(0.13, 0.13, 0.13), indent: int = 48):
+        nonlocal y
+        canvas.text(indent, y, text, size=size, bold=bold, color=color)
+        y += size * 1.55
+
+    line("Ledger Evidence Export", size=22, bold=True, color=(0.08, 0.08, 0.08))
+    line(cover["vessel_name"], size=14, color=(0.12, 0.72, 0.9))
+    y += 12
+
+    line("PERIOD", size=8, color=(0.55, 0.55, 0.55))
+    line(f"{cover['date_from']}  ·  {cover['date_to']}", size=11)
+    y += 6
+
+    line("REQUESTED BY", size=8, color=(0.55, 0.55, 0.55))
+    line(cover["scope_label"], size=11)
+    y += 6
+
+    line("EXPORT ID", size=8, color=(0.55, 0.55, 0.55))
+    line(cover["export_id"], size=9, color=(0.40, 0.40, 0.40))
+    y += 6
+
+    line("GENERATED", size=8, color=(0.55, 0.55, 0.55))
+    line(datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"), size=9, color=(0.40, 0.40, 0.40))
+    y += 16
+
+    line(f"Events: {cover['event_count']}", size=10)
+    y += 20
+
+    canvas.page.draw_line(fitz.Point(48, y), fitz.Point(547, y), color=(0.88, 0.88, 0.88), width=0.5)
+    y += 16
+
+    # Explicit disclosure — operator must see this before confirming export
+    line("DISCLOSURE", size=8, bold=True, color=(0.55, 0.55, 0.55))
+    y += 2
+    line("Actor names and email addresses appear in readable form in the embedded JSON", size=8, color=(0.55, 0.55, 0.55))
+    line("and on this cover. This is by design: evidence without attribution is not", size=8, color=(0.55, 0.55, 0.55))
+    line("evidence. Database identifiers (user_id, yacht_id, entity_id) are replaced", size=8, color=(0.55, 0.55, 0.55))
+    line("with HMAC-SHA256 refs and do not appear anywhere in this document.", size=8, color=(0.55, 0.55, 0.55))
+    y += 8
+
+    line("ID MASKING", size=8, bold=True, color=(0.55, 0.55, 0.55))
+    y += 2
+    line("actor_ref, vessel_ref, entity_ref are HMAC-SHA256(id, EXPORT_HMAC_SECRET).", size=8, color=(0.55, 0.55, 0.55))
+    line("Same actor = same actor_ref across all events. Cross-event correlation", size=8, color=(0.55, 0.55, 0.55))
+    line("is preserved. Verification: verify.celeste7.ai", size=8, color=(0.55, 0.55, 0.55))
+    y += 8
+
+    line("SIGNATURE STATUS", size=8, bold=True, color=(0.55, 0.55, 0.55))
+    y += 2
+    line("v0.1 staging: proof_hash chain only. PAdES-B-LT + RFC 3161 timestamp planned v1.0.", size=8, color=(0.55, 0.55, 0.55))
+    line("Public certificate: celeste7.ai/.well-known/verify.pem", size=8, color=(0.55, 0.55, 0.55))
+
+    # ── Embed JSON ──
+    canvas.doc.embfile_add("ledger_events.json", Path(json_path).read_bytes(), desc="CelesteOS Ledger Events")
+    canvas.save(pdf_path)
+
+    return os.path.getsize(pdf_path)
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def _upload_file(storage, storage_path: str, pdf_path: str) -> None:
+    with open(pdf_path, "rb") as fh:
+        storage.upload(
+            path=storage_path,
+            file=fh,
+            file_options={"content-type": "application/pdf", "cache-control": "no-store"},
+        )
+
+
+async def run_ledger_export(job: LedgerExportJob, db_client, spec: LedgerExportSpec) -> None:
+    """Run one export job end to end, recording progress on ``job``."""
+    export_id = job.export_id
+    workdir = tempfile.mkdtemp(prefix=f"ledger-export-{export_id[:8]}-")
+    try:
+        # ── Fetch + mask, spooled to disk page by page ──
+        job.update("fetching")
+        json_path = os.path.join(workdir, "ledger_events.json")
+        with open(json_path, "w", encoding="utf-8") as fh:
+            writer = JsonArrayWriter(fh)
+            async for rows in iter_event_pages(db_client, spec):
+                for event in rows:
+                    writer.write(mask_event(event, spec.export_secret))
+                job.update("fetching", events_exported=writer.count)
+            writer.close()
+        event_count = writer.count
+
+        if not event_count:
+            job.update("failed", error="No ledger events found for the requested scope and date range")
+            return
+
+        # ── Render (render pool) ──
+        job.update("rendering")
+        pdf_path = os.path.join(workdir, "export.pdf")
+        file_size = await run_render(render_ledger_pdf, json_path, pdf_path, {
+            "export_id": export_id,
+            "vessel_name": spec.vessel_name,
+            "date_from": spec.date_from,
+            "date_to": spec.date_to,
+            "scope_label": spec.scope_label,
+            "event_count": event_count,
+        })
+
+        # ── HMAC storage path — no raw UUID visible in any signed URL ──
+        vessel_folder = mask_export_id(spec.yacht_id, spec.export_secret)[:16]
+        storage_path  = f"{vessel_folder}/{export_id}.pdf"
+        storage = db_client.storage.from_(LEDGER_EXPORT_BUCKET)
+
+        sealing_info = None
+        is_sealed = os.environ.get("LEDGER_EXPORT_SEAL", "false").lower() == "true"
+        if is_sealed:
+            # ── v1.0 sealing (sealing worker) ── the unsealed PDF is staged
+            # outside storage_path; only the worker writes the sealed file there.
+            job.update("sealing")
+            source_path = staging_path(storage_path)
+            await asyncio.to_thread(_upload_file, storage, source_path, pdf_path)
+            seal_job = await enqueue_seal_job(
+                db_client,
+                yacht_id=spec.yacht_id,
+                bucket=LEDGER_EXPORT_BUCKET,
+                source_path=source_path,
+                dest_path=storage_path,
+                subject_id=export_id,
+                requested_by=spec.user_id,
+            )
+            job.update("sealing", seal_job_id=seal_job["id"])
+            try:
+                sealing_info = await wait_for_seal_job(db_client, seal_job["id"])
+            except TimeoutError as seal_err:
+                sealing_info = {"status": "failed", "error": str(seal_err)}
+            if sealing_info["status"] != "completed":
+                # Fail — never store an unsealed document when sealing is expected.
+                # Caller must investigate; half-sealed state is unacceptable.
+                logger.error(f"[Ledger] Sealing failed for {export_id}: {sealing_info['error']}")
+                job.update("failed", error=f"Sealing failed: {sealing_info['error']}. Export aborted — no document was stored.")
+                return
+            file_size = sealing_info["file_size_bytes"]
+            logger.info(
+                f"[Ledger] Export {export_id} sealed — "
+                f"sha256={sealing_info['pdf_sha256'][:16]}… "
+                f"tsa={sealing_info['tsa_authority']}"
+            )
+        else:
+            # ── Upload (streamed from disk) ──
+            job.update("uploading")
+            await asyncio.to_thread(_upload_file, storage, storage_path, pdf_path)
+
+        signed = await asyncio.to_thread(storage.create_signed_url, storage_path, SIGNED_URL_TTL_SECONDS)
+        download_url = signed.get("signedURL") or signed.get("signedUrl") or ""
+
+        # ── Record ──
+        insert_row = {
+            "id":                   export_id,
+            "yacht_id":             spec.yacht_id,
+            "requested_by_user_id": spec.user_id,
+            "requested_by_role":    spec.user_role or "member",
+            "requested_by_dept":    spec.department,
+            "requested_by_name":    spec.requester_name,
+            "scope_user_id":        spec.scope_user_id,
+            "scope_department":     spec.department if spec.scope == "department" else None,
+            "date_from":            spec.date_from,
+            "date_to":              spec.date_to,
+            "event_count":          event_count,
+            "storage_bucket":       LEDGER_EXPORT_BUCKET,
+            "storage_path":         storage_path,
+            "file_name":            f"celeste-evidence-{export_id[:8]}.pdf",
+            "file_size_bytes":      file_size,
+            "export_status":        "completed",
+            "generated_at":         datetime.utcnow().isoformat(),
+        }
+        if sealing_info is not None:
+            insert_row["content_hash"]     = sealing_info["pdf_sha256"]
+            insert_row["tsa_authority"]    = sealing_info["tsa_authority"]
+            insert_row["cert_fingerprint"] = sealing_info["cert_fingerprint"]
+        await aexecute(db_client.table("ledger_exports").insert(insert_row))
+
+        # ── Ledger event ── record the export action in the activity log
+        try:
+            await aexecute(db_client.table("ledger_events").insert({
+                "yacht_id":       spec.yacht_id,
+                "user_id":        spec.user_id,
+                "event_type":     "mutation",
+                "entity_type":    "ledger_export",
+                "entity_id":      export_id,
+                "action":         "export_generated",
+                "change_summary": f"Evidence PDF exported — {event_count} events ({spec.scope}), {'sealed' if is_sealed else 'unsigned'}",
+                "metadata":       {"event_count": event_count, "scope": spec.scope, "sealed": is_sealed},
+            }))
+        except Exception as _ev_err:
+            logger.warning(f"[Ledger] Export ledger event insert failed: {_ev_err}")
+
+        # ── Notify ── best effort; never fails the export
+        try:
+            await aexecute(db_client.table("ledger_notifications").insert({
+                "yacht_id":           spec.yacht_id,
+                "user_id":            spec.user_id,
+                "export_id":          export_id,
+                "notification_type":  "export_complete",
+                "event_count":        event_count,
+                "sealed":             is_sealed,
+                "download_url":       download_url,
+                "expires_at":         (datetime.utcnow() + timedelta(seconds=SIGNED_URL_TTL_SECONDS)).isoformat(),
+                "is_read":            False,
+            }))
+        except Exception as _notif_err:
+            logger.warning(f"[Ledger] Notification insert failed: {_notif_err}")
+
+        logger.info(
+            f"[Ledger] Export {export_id} — {event_count} events, "
+            f"{file_size:,} bytes, sealed={is_sealed}"
+        )
+
+        job.update("completed", events_exported=event_count, result={
+            "event_count":      event_count,
+            "file_size_bytes":  file_size,
+            "download_url":     download_url,
+            "storage_path":     storage_path,
+            "sealed":           is_sealed,
+            "tsa_authority":    sealing_info["tsa_authority"] if sealing_info else None,
+            "cert_fingerprint": sealing_info["cert_fingerprint"] if sealing_info else None,
+        })
+
+    except Exception as e:
+        logger.error(f"[Ledger] export {export_id} failed: {e}", exc_info=True)
+        job.update("failed", error=f"Export failed: {e}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
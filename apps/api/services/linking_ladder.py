@@ -2,11 +2,18 @@
 Email Watcher - Linking Ladder
 
 Phase 8: Deterministic linking ladder (L1-L5) for primary object selection.
+
+The rungs' lookups are independent, so L1, L2, L2.5 and L3 start together
+and the ladder still decides in rung order: a confident L1 (then L2) match
+returns immediately and cancels the rest; otherwise L2.5 and L3 compete on
+score, then L4 / L5 as before.
 """
 
 from typing import Dict, List, Any, Optional
+import asyncio
 import logging
 
+from integrations.supabase import aexecute
 from .token_extractor import TokenExtractor
 from .candidate_finder import CandidateFinder
 from .scoring_engine import ScoringEngine
@@ -51,8 +58,10 @@ class LinkingLadder:
         """
         Run linking ladder to determine primary object.
 
-        Strategy: L1 first (deterministic), then parallel L2.5+L3, choose best by score.
-        This avoids "first-wins" masking better downstream candidates.
+        Strategy: L1 first (deterministic), then L2, then L2.5+L3 choosing the
+        best by score. This avoids "first-wins" masking better downstream
+        candidates. The rungs run concurrently; the order only decides which
+        result wins.
 
         Args:
             yacht_id: Yacht ID for isolation
@@ -76,29 +85,39 @@ class LinkingLadder:
 
         logger.debug(f"[LinkingLadder] Thread {thread_id}: Extracted tokens: {tokens}")
 
-        # Store extracted tokens on thread
-        await self._save_extracted_tokens(thread_id, tokens)
+        # Store extracted tokens on thread (concurrently with the rungs)
+        save_tokens = asyncio.create_task(self._save_extracted_tokens(thread_id, tokens))
 
-        # =======================================================================
-        # PHASE 1: L1 Deterministic (check first, auto-confirm if found)
-        # =======================================================================
-        l1_result = await self._check_l1_explicit_ids(yacht_id, tokens)
-        if l1_result:
-            logger.info(f"[LinkingLadder] Thread {thread_id}: L1 match - {l1_result['candidate']['label']}")
-            return {'level': 'L1', 'confidence': 'deterministic', **l1_result}
+        # Start every independent rung now; decide in ladder order below
+        l1_task = asyncio.create_task(self._check_l1_explicit_ids(yacht_id, tokens))
+        l2_task = asyncio.create_task(self._check_l2_procurement(yacht_id, tokens))
+        l25_task = asyncio.create_task(self._check_l25_hybrid(yacht_id, thread_id, subject, tokens, context))
+        l3_task = asyncio.create_task(self._check_l3_parts_equipment(yacht_id, tokens))
+        rungs = [l1_task, l2_task, l25_task, l3_task]
 
-        # L2: Strong procurement signals (check before parallel phase)
-        l2_result = await self._check_l2_procurement(yacht_id, tokens)
-        if l2_result:
-            logger.info(f"[LinkingLadder] Thread {thread_id}: L2 match - {l2_result['candidate']['label']}")
-            return {'level': 'L2', 'confidence': 'suggested', **l2_result}
-
-        # =======================================================================
-        # PHASE 2: Parallel L2.5 + L3 (score-and-choose best)
-        # =======================================================================
-        # Run L2.5 (semantic) and L3 (heuristic) together, pick highest score
-        l25_result = await self._check_l25_hybrid(yacht_id, thread_id, subject, tokens, context)
-        l3_result = await self._check_l3_parts_equipment(yacht_id, tokens)
+        try:
+            # =======================================================================
+            # PHASE 1: L1 Deterministic (auto-confirm if found)
+            # =======================================================================
+            l1_result = await l1_task
+            if l1_result:
+                logger.info(f"[LinkingLadder] Thread {thread_id}: L1 match - {l1_result['candidate']['label']}")
+                return {'level': 'L1', 'confidence': 'deterministic', **l1_result}
+
+            # L2: Strong procurement signals
+            l2_result = await l2_task
+            if l2_result:
+                logger.info(f"[LinkingLadder] Thread {thread_id}: L2 match - {l2_result['candidate']['label']}")
+                return {'level': 'L2', 'confidence': 'suggested', **l2_result}
+
+            # =======================================================================
+            # PHASE 2: L2.5 + L3 (score-and-choose best)
+            # =======================================================================
+            l25_result, l3_result = await asyncio.gather(l25_task, l3_task)
+        finally:
+            for task in rungs:
+                task.cancel()
+            await asyncio.gather(save_tokens, *rungs, return_exceptions=True)
 
         # Collect all candidates with their levels
         candidates_with_levels = []
@@ -170,24 +189,24 @@ class LinkingLadder:
 
         # Priority order for L1 - includes both numeric wo_id and full wo_number patterns
         l1_ids = ['wo_id', 'wo_number', 'po_id', 'fault_id', 'eq_id']
+        present = {id_type: ids[id_type] for id_type in l1_ids if ids.get(id_type)}
+        if not present:
+            return None
 
-        for id_type in l1_ids:
-            if id_type in ids and ids[id_type]:
-                # Find matching object
-                candidates = await self.candidate_finder.find_all_candidates(
-                    yacht_id,
-                    {'ids': {id_type: ids[id_type]}}
-                )
-
-                if candidates:
-                    # Score and select
-                    scored = self.scoring_engine.score_candidates(candidates)
-                    if scored and self.scoring_engine.should_auto_confirm(scored[0].get('score', 0)):
-                        return {
-                            'candidate': scored[0],
-                            'all_candidates': scored[:3],
-                            'action': 'auto_link'
-                        }
+        # One lookup for every L1 ID, then decide per ID type in priority order
+        candidates = await self.candidate_finder.find_all_candidates(yacht_id, {'ids': present})
+
+        for id_type, values in present.items():
+            matched = [c for c in candidates if c.get('match_value') in values]
+            if matched:
+                # Score and select
+                scored = self.scoring_engine.score_candidates(matched)
+                if scored and self.scoring_engine.should_auto_confirm(scored[0].get('score', 0)):
+                    return {
+                        'candidate': scored[0],
+                        'all_candidates': scored[:3],
+                        'action': 'auto_link'
+                    }
 
         return None
 
@@ -209,21 +228,21 @@ class LinkingLadder:
         vendor = tokens.get('vendor', {})
 
         # Find candidates for quote/invoice IDs
-        candidates = []
+        lookups = []
 
         if 'quote_id' in ids or 'invoice_id' in ids:
             # These might link to POs or open WOs
-            wo_candidates = await self.candidate_finder.find_work_order_candidates(
+            lookups.append(self.candidate_finder.find_work_order_candidates(
                 yacht_id, ids, vendor
-            )
-            candidates.extend(wo_candidates)
+            ))
 
         # Also check vendor match for procurement context
         if vendor.get('sender_hash'):
-            vendor_candidates = await self.candidate_finder.find_vendor_candidates(
+            lookups.append(self.candidate_finder.find_vendor_candidates(
                 yacht_id, vendor
-            )
-            candidates.extend(vendor_candidates)
+            ))
+
+        candidates = [c for group in await asyncio.gather(*lookups) for c in group]
 
         if candidates:
             scored = self.scoring_engine.score_candidates(candidates)
@@ -343,19 +362,12 @@ class LinkingLadder:
         if not parts:
             return None
 
-        candidates = []
-
-        # Equipment by serial
-        eq_candidates = await self.candidate_finder.find_equipment_candidates(
-            yacht_id, parts
-        )
-        candidates.extend(eq_candidates)
-
-        # Parts by part number
-        part_candidates = await self.candidate_finder.find_part_candidates(
-            yacht_id, parts
+        # Equipment by serial, parts by part number
+        eq_candidates, part_candidates = await asyncio.gather(
+            self.candidate_finder.find_equipment_candidates(yacht_id, parts),
+            self.candidate_finder.find_part_candidates(yacht_id, parts),
         )
-        candidates.extend(part_candidates)
+        candidates = eq_candidates + part_candidates
 
         if candidates:
             scored = self.scoring_engine.score_candidates(candidates)
@@ -449,10 +461,10 @@ class LinkingLadder:
     ) -> None:
         """Save extracted tokens to thread record."""
         try:
-            self.supabase.rpc('mark_thread_suggestions_generated', {
+            await aexecute(self.supabase.rpc('mark_thread_suggestions_generated', {
                 'p_thread_id': thread_id,
                 'p_extracted_tokens': tokens
-            }).execute()
+            }))
         except Exception as e:
             logger.error(f"[LinkingLadder] Error saving tokens: {e}")
 
@@ -468,11 +480,11 @@ class LinkingLadder:
         """
         try:
             # Get latest message in thread with embedding
-            result = self.supabase.table('email_messages').select(
+            result = await aexecute(self.supabase.table('email_messages').select(
                 'embedding, meta_embedding'
             ).eq('thread_id', thread_id).order(
                 'sent_at', desc=True
-            ).limit(1).maybe_single().execute()
+            ).limit(1).maybe_single())
 
             if result.data:
                 # Prefer meta_embedding (summary of thread) over individual message embedding
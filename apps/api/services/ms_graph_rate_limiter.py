@@ -4,14 +4,154 @@ Email Watcher - Microsoft Graph API Rate Limiter
 Respects Microsoft's 10,000 calls/hour limit.
 Tracks calls per user/yacht in email_watchers table.
 Auto-pauses sync when approaching limit.
+
+Budgets are kept in memory (GraphCallBudget, one per process): a token
+bucket per mailbox whose burst plus an hour of refill equals the hourly
+limit, plus one for the Graph app as a whole. Checks and records are pure
+in-memory operations; the DB counter is read once to seed a mailbox's
+bucket and is otherwise only updated by the worker's periodic checkpoints,
+so a Graph call no longer costs several Supabase round-trips. A 429/503
+Retry-After blocks the mailbox (or the whole app) until it has elapsed.
 """
 
-from typing import Optional
+import asyncio
+import os
+import time
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from services.rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
+# App-wide Graph budget across all mailboxes (per process)
+GRAPH_APP_BURST = int(os.getenv('GRAPH_APP_BURST', '2000'))
+GRAPH_APP_RATE = float(os.getenv('GRAPH_APP_RATE_PER_SECOND', '1000'))
+# Share of a mailbox's hourly limit it may spend in a burst; the rest refills
+# evenly over the hour, so no rolling hour exceeds the limit
+GRAPH_MAILBOX_BURST_FRACTION = float(os.getenv('GRAPH_MAILBOX_BURST_FRACTION', '0.1'))
+# How often in-memory call counts are written back to email_watchers
+GRAPH_RATE_CHECKPOINT_SECONDS = float(os.getenv('GRAPH_RATE_CHECKPOINT_SECONDS', '60'))
+# Retry-After fallback when Graph throttles without the header
+GRAPH_DEFAULT_RETRY_AFTER = float(os.getenv('GRAPH_DEFAULT_RETRY_AFTER_SECONDS', '30'))
+
+MailboxKey = Tuple[str, str]  # (user_id, yacht_id)
+
+
+def parse_retry_after(value: Optional[str], default: float = GRAPH_DEFAULT_RETRY_AFTER) -> float:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(when.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+class _MailboxBudget:
+    __slots__ = ('bucket', 'blocked_until', 'pending', 'seeded')
+
+    def __init__(self, capacity: int, refill_rate: float):
+        self.bucket = TokenBucket.create(capacity, refill_rate)
+        self.blocked_until = 0.0
+        self.pending = 0  # calls recorded since the last checkpoint
+        self.seeded = False
+
+
+class GraphCallBudget:
+    """
+    In-process Graph call budget shared by every MicrosoftRateLimiter.
+
+    Not thread-safe; used from the worker's event loop only.
+    """
+
+    def __init__(self, mailbox_limit: int, app_burst: int = GRAPH_APP_BURST, app_rate: float = GRAPH_APP_RATE):
+        self.mailbox_limit = mailbox_limit
+        self._mailboxes: Dict[MailboxKey, _MailboxBudget] = {}
+        self._app = TokenBucket.create(app_burst, app_rate)
+        self._app_blocked_until = 0.0
+        self._last_checkpoint = time.monotonic()
+        self._checkpoint_lock = asyncio.Lock()
+
+    def mailbox(self, key: MailboxKey) -> _MailboxBudget:
+        budget = self._mailboxes.get(key)
+        if budget is None:
+            burst = max(1, int(self.mailbox_limit * GRAPH_MAILBOX_BURST_FRACTION))
+            refill = max(0, self.mailbox_limit - burst) / 3600.0
+            budget = _MailboxBudget(burst, refill)
+            self._mailboxes[key] = budget
+        return budget
+
+    def seed(self, key: MailboxKey, calls_this_hour: int) -> None:
+        """Start a mailbox's bucket from the persisted hourly counter."""
+        budget = self.mailbox(key)
+        remaining = max(0, self.mailbox_limit - calls_this_hour)
+        budget.bucket.tokens = float(min(budget.bucket.capacity, remaining))
+        budget.bucket.last = time.monotonic()
+        budget.seeded = True
+
+    def wait_seconds(self, key: MailboxKey) -> float:
+        """0 if a call can be made now, else roughly how long until one can."""
+        now = time.monotonic()
+        budget = self.mailbox(key)
+        blocked = max(budget.blocked_until, self._app_blocked_until) - now
+        if blocked > 0:
+            return blocked
+        waits = []
+        for bucket in (budget.bucket, self._app):
+            missing = 1.0 - bucket.tokens_available()
+            if missing > 0:
+                waits.append(missing / bucket.refill_rate if bucket.refill_rate > 0 else 3600.0)
+        return max(waits, default=0.0)
+
+    def record(self, key: MailboxKey, count: int = 1) -> None:
+        budget = self.mailbox(key)
+        budget.bucket.consume(count)
+        budget.pending += count
+        self._app.consume(count)
+
+    def retry_after(self, key: Optional[MailboxKey], seconds: float) -> None:
+        """Block a mailbox (or the whole app when key is None) for ``seconds``."""
+        until = time.monotonic() + seconds
+        if key is None:
+            self._app_blocked_until = max(self._app_blocked_until, until)
+        else:
+            budget = self.mailbox(key)
+            budget.blocked_until = max(budget.blocked_until, until)
+
+    def checkpoint_due(self) -> bool:
+        return time.monotonic() - self._last_checkpoint >= GRAPH_RATE_CHECKPOINT_SECONDS
+
+    def drain_pending(self) -> Dict[MailboxKey, int]:
+        self._last_checkpoint = time.monotonic()
+        pending = {}
+        for key, budget in self._mailboxes.items():
+            if budget.pending:
+                pending[key] = budget.pending
+                budget.pending = 0
+        return pending
+
+    def restore_pending(self, key: MailboxKey, count: int) -> None:
+        self.mailbox(key).pending += count
+
+
+_budget: Optional[GraphCallBudget] = None
+
+
+def get_graph_budget() -> GraphCallBudget:
+    """Process-wide Graph call budget."""
+    global _budget
+    if _budget is None:
+        _budget = GraphCallBudget(MicrosoftRateLimiter.EFFECTIVE_LIMIT)
+    return _budget
+
 
 class MicrosoftRateLimiter:
     """
@@ -25,14 +165,16 @@ class MicrosoftRateLimiter:
     SAFETY_MARGIN = 500  # Stop at 9,500 to be safe
     EFFECTIVE_LIMIT = HOURLY_LIMIT - SAFETY_MARGIN
 
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, budget: Optional[GraphCallBudget] = None):
         """
         Initialize rate limiter with Supabase client.
 
         Args:
             supabase_client: Supabase client instance
+            budget: In-memory budget (defaults to the process-wide one)
         """
         self.supabase = supabase_client
+        self.budget = budget or get_graph_budget()
 
     async def can_make_call(self, user_id: str, yacht_id: str) -> bool:
         """
@@ -45,11 +187,27 @@ class MicrosoftRateLimiter:
         Returns:
             True if call is allowed, False if rate limited
         """
+        key = (user_id, yacht_id)
+        if not self.budget.mailbox(key).seeded and not await self._seed(user_id, yacht_id):
+            # Fail closed - don't make call if we can't verify
+            return False
+
+        wait = self.budget.wait_seconds(key)
+        if wait > 0:
+            logger.warning(f"[RateLimiter] Rate limited for user={user_id} (retry in {wait:.0f}s)")
+            return False
+        return True
+
+    def seconds_until_allowed(self, user_id: str, yacht_id: str) -> float:
+        """In-memory estimate of when the next call is allowed (0 = now)."""
+        return self.budget.wait_seconds((user_id, yacht_id))
+
+    async def _seed(self, user_id: str, yacht_id: str) -> bool:
+        """Load the persisted hourly counter once per mailbox per process."""
         try:
             # First, reset counter if hour has elapsed
             await self.reset_if_new_hour(user_id, yacht_id)
 
-            # Get current count
             result = self.supabase.table('email_watchers').select(
                 'api_calls_this_hour, hour_window_start'
             ).eq('user_id', user_id).eq('yacht_id', yacht_id).single().execute()
@@ -58,25 +216,17 @@ class MicrosoftRateLimiter:
                 logger.warning(f"[RateLimiter] No watcher found for user={user_id}, yacht={yacht_id}")
                 return False
 
-            calls_this_hour = result.data.get('api_calls_this_hour', 0) or 0
-
-            if calls_this_hour >= self.EFFECTIVE_LIMIT:
-                logger.warning(
-                    f"[RateLimiter] Rate limit reached: {calls_this_hour}/{self.EFFECTIVE_LIMIT} "
-                    f"for user={user_id}"
-                )
-                return False
-
+            self.budget.seed((user_id, yacht_id), result.data.get('api_calls_this_hour', 0) or 0)
             return True
 
         except Exception as e:
             logger.error(f"[RateLimiter] Error checking rate limit: {e}")
-            # Fail closed - don't make call if we can't verify
             return False
 
     async def record_call(self, user_id: str, yacht_id: str, count: int = 1) -> int:
         """
-        Record API call(s) made.
+        Record API call(s) made. In-memory only; the worker's poll loop
+        persists the counts with checkpoint().
 
         Args:
             user_id: User ID of the mailbox owner
@@ -84,29 +234,56 @@ class MicrosoftRateLimiter:
             count: Number of calls made (default 1)
 
         Returns:
-            New total call count for this hour
+            Remaining in-memory budget for this mailbox
         """
-        try:
-            # Use RPC function for atomic update
-            result = self.supabase.rpc('record_email_api_calls', {
-                'p_user_id': user_id,
-                'p_yacht_id': yacht_id,
-                'p_call_count': count
-            }).execute()
-
-            new_count = result.data if result.data else 0
-
-            logger.debug(
-                f"[RateLimiter] Recorded {count} call(s), total: {new_count} "
-                f"for user={user_id}"
-            )
+        key = (user_id, yacht_id)
+        self.budget.record(key, count)
+        return int(self.budget.mailbox(key).bucket.tokens_available())
 
-            return new_count
+    def note_retry_after(
+        self,
+        user_id: Optional[str],
+        yacht_id: Optional[str],
+        retry_after: Optional[str],
+    ) -> float:
+        """
+        Honour a throttling response's Retry-After header.
 
-        except Exception as e:
-            logger.error(f"[RateLimiter] Error recording call: {e}")
-            # Still return 0 but log the error
-            return 0
+        Pass user_id=None to block every mailbox (app-level throttling).
+        Returns the number of seconds blocked.
+        """
+        seconds = parse_retry_after(retry_after)
+        key = (user_id, yacht_id) if user_id else None
+        self.budget.retry_after(key, seconds)
+        logger.warning(
+            f"[RateLimiter] Graph throttled {'user=' + user_id if user_id else 'app'}; "
+            f"backing off {seconds:.0f}s"
+        )
+        return seconds
+
+    async def checkpoint(self) -> int:
+        """
+        Persist call counts recorded since the last checkpoint
+        (one RPC per active mailbox). Returns the number of mailboxes flushed.
+        """
+        async with self.budget._checkpoint_lock:
+            pending = self.budget.drain_pending()
+            for (user_id, yacht_id), count in pending.items():
+                try:
+                    await self.reset_if_new_hour(user_id, yacht_id)
+                    # Use RPC function for atomic update
+                    self.supabase.rpc('record_email_api_calls', {
+                        'p_user_id': user_id,
+                        'p_yacht_id': yacht_id,
+                        'p_call_count': count
+                    }).execute()
+                except Exception as e:
+                    logger.error(f"[RateLimiter] Error recording calls: {e}")
+                    # Keep them for the next checkpoint
+                    self.budget.restore_pending((user_id, yacht_id), count)
+            if pending:
+                logger.debug(f"[RateLimiter] Checkpointed {len(pending)} mailbox counter(s)")
+            return len(pending)
 
     async def get_remaining_calls(self, user_id: str, yacht_id: str) -> int:
         """
@@ -242,4 +419,4 @@ class MicrosoftRateLimiter:
 
 
 # Export
-__all__ = ['MicrosoftRateLimiter']
+__all__ = ['MicrosoftRateLimiter', 'GraphCallBudget', 'get_graph_budget', 'parse_retry_after']
@@ -0,0 +1,161 @@
+"""
+PDF Render — shared PyMuPDF drawing surface for generated documents.
+
+Shopping lists, purchase orders, receiving labels and ledger exports all
+lay out pages in Inter with the same accent bar / footer chrome. Drawing
+each document from scratch meant parsing and embedding both TTF files on
+every page (``page.insert_font`` from a path), which dominated render time
+for anything longer than a page. This module keeps those pieces warm for
+the life of a render worker:
+
+  * Inter Regular/Bold are loaded once per process into ``fitz.Font``
+    objects and written through TextWriter, so a document embeds each font
+    once and ships only the glyphs it uses (subset on save)
+  * Page chrome (accent bar, footer rule) is drawn once per size/colour
+    into a template page and stamped onto every page as a shared XObject
+
+Document builders take plain data and return bytes; call them through
+``services.render_pool.run_render`` so layout and compression never run on
+the API event loop.
+
+Usage:
+    canvas = PdfCanvas(595, 842, chrome=page_chrome(595, 842, TEAL), footer="Generated …")
+    canvas.new_page()
+    canvas.text(40, 28, "PURCHASE ORDER", size=7, bold=True, color=GREY)
+    pdf_bytes = canvas.to_bytes()
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+FONT_DIR = Path(__file__).parent.parent / "evidence" / "fonts"
+
+Color = Tuple[float, float, float]
+
+DARK: Color = (0.08, 0.08, 0.08)
+GREY: Color = (0.55, 0.55, 0.55)
+BORDER: Color = (0.88, 0.88, 0.88)
+
+MARGIN = 40
+FOOTER_OFFSET = 28
+
+
+@lru_cache(maxsize=1)
+def get_fonts() -> Dict[str, Any]:
+    """Inter Regular/Bold as memory-resident fitz.Font objects (once per process)."""
+    import fitz  # PyMuPDF — imported here to keep the API process from loading it
+
+    return {
+        "Inter": fitz.Font(fontbuffer=(FONT_DIR / "Inter-Regular.ttf").read_bytes()),
+        "InterBold": fitz.Font(fontbuffer=(FONT_DIR / "Inter-Bold.ttf").read_bytes()),
+    }
+
+
+@lru_cache(maxsize=32)
+def page_chrome(
+    width: float,
+    height: float,
+    accent: Color,
+    bar_height: float = 5,
+    footer_rule: bool = True,
+) -> bytes:
+    """
+    One-page template holding the static chrome for a page size and accent.
+
+    Returned as PDF bytes so the cache holds no live document; PdfCanvas
+    opens it once per document and every page shows it as the same XObject.
+    """
+    import fitz
+
+    doc = fitz.open()
+    page = doc.new_page(width=width, height=height)
+    page.draw_rect(fitz.Rect(0, 0, width, bar_height), color=None, fill=accent)
+    if footer_rule:
+        rule_y = height - FOOTER_OFFSET - 8
+        page.draw_line(fitz.Point(MARGIN, rule_y), fitz.Point(width - MARGIN, rule_y), color=BORDER, width=0.4)
+    data = doc.tobytes(garbage=4, deflate=True)
+    doc.close()
+    return data
+
+
+class PdfCanvas:
+    """
+    Page-by-page drawing surface over one PyMuPDF document.
+
+    Text goes through per-colour TextWriters and is flushed when the page is
+    finished, so it always sits above shapes drawn on the same page (row
+    shading, label boxes). Shapes are drawn directly on ``canvas.page``.
+    """
+
+    def __init__(
+        self,
+        width: float,
+        height: float,
+        chrome: Optional[bytes] = None,
+        footer: Optional[str] = None,
+    ):
+        import fitz
+
+        self._fitz = fitz
+        self.width = width
+        self.height = height
+        self.footer = footer
+        self.fonts = get_fonts()
+        self.doc = fitz.open()
+        self.page = None
+        self._chrome = fitz.open("pdf", chrome) if chrome else None
+        self._writers: Dict[Color, Any] = {}
+
+    def new_page(self, width: Optional[float] = None, height: Optional[float] = None):
+        """Finish the current page and start a new one with the chrome applied."""
+        self._flush()
+        self.page = self.doc.new_page(width=width or self.width, height=height or self.height)
+        if self._chrome is not None:
+            self.page.show_pdf_page(self.page.rect, self._chrome, 0)
+        if self.footer:
+            self.text(MARGIN, self.page.rect.height - FOOTER_OFFSET, self.footer, size=7, color=GREY)
+        return self.page
+
+    def _writer(self, color: Color):
+        writer = self._writers.get(color)
+        if writer is None:
+            writer = self._writers[color] = self._fitz.TextWriter(self.page.rect)
+        return writer
+
+    def text(self, x: float, y: float, txt: Any, size: float = 10, bold: bool = False, color: Color = DARK) -> None:
+        """Write one line of text with its baseline at (x, y)."""
+        font = self.fonts["InterBold" if bold else "Inter"]
+        self._writer(tuple(color)).append((x, y), str(txt), font=font, fontsize=size)
+
+    def textbox(self, rect, txt: str, size: float = 10, bold: bool = False, color: Color = DARK) -> None:
+        """Wrap text into ``rect``; lines that do not fit are dropped."""
+        font = self.fonts["InterBold" if bold else "Inter"]
+        self._writer(tuple(color)).fill_textbox(
+            self._fitz.Rect(rect), txt, font=font, fontsize=size, warn=None,
+        )
+
+    def _flush(self) -> None:
+        for color, writer in self._writers.items():
+            writer.write_text(self.page, color=color)
+        self._writers = {}
+
+    def _finish(self) -> None:
+        self._flush()
+        if self._chrome is not None:
+            self._chrome.close()
+            self._chrome = None
+        self.doc.subset_fonts()
+
+    def to_bytes(self) -> bytes:
+        """Finish the document and return the PDF (fonts subset, deflated)."""
+        self._finish()
+        data = self.doc.tobytes(garbage=4, deflate=True)
+        self.doc.close()
+        return data
+
+    def save(self, path: str) -> None:
+        """Finish the document and write it to ``path``."""
+        self._finish()
+        self.doc.save(path, garbage=4, deflate=True)
+        self.doc.close()
@@ -114,6 +114,15 @@ class TokenBucket:
             return True
         return False
 
+    def consume(self, amount: float) -> None:
+        """
+        Consume tokens for work already done, going into debt if needed
+        (the bucket then refills from below zero before allowing again).
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_rate) - amount
+        self.last = now
+
     def tokens_available(self) -> float:
         """Get current available tokens (for monitoring)."""
         now = time.monotonic()
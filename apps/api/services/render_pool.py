@@ -0,0 +1,76 @@
+"""
+Render Pool — bounded process pool for CPU-heavy document rendering.
+
+PyMuPDF holds the GIL while it lays out and compresses a document, so a
+render in the request handler (or even in a thread) stalls every other
+request on the worker. Renders submitted here run in separate processes;
+a per-event-loop semaphore caps how many are in flight from one API worker
+so a burst of exports queues instead of oversubscribing the CPU.
+
+Render functions must be module-level (picklable) and take/return plain
+data — file paths for large artefacts (ledger exports) so they never cross
+the process boundary as bytes; page-sized documents (purchase orders,
+shopping lists, label batches) return their PDF bytes directly. Workers are
+long-lived, so the fonts and page chrome cached by services.pdf_render are
+loaded once per worker rather than once per document.
+
+Usage:
+    from services.render_pool import run_render
+    size = await run_render(render_ledger_pdf, json_path, pdf_path, cover)
+    pdf_bytes = await run_render(render_labels_pdf, items, recv, yacht_name, compact, w, h)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", "2"))
+RENDER_MAX_CONCURRENCY = int(os.getenv("RENDER_MAX_CONCURRENCY", str(RENDER_POOL_WORKERS * 2)))
+# Recycle workers periodically so a very large render can't pin its peak RSS
+RENDER_MAX_TASKS_PER_CHILD = int(os.getenv("RENDER_MAX_TASKS_PER_CHILD", "50"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+
+def get_render_executor() -> ProcessPoolExecutor:
+    """Get or create the shared render process pool (spawned, not forked)."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=RENDER_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=RENDER_MAX_TASKS_PER_CHILD,
+        )
+        logger.info(f"[RenderPool] Started {RENDER_POOL_WORKERS} render workers")
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(RENDER_MAX_CONCURRENCY)
+    return semaphore
+
+
+async def run_render(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run ``fn(*args, **kwargs)`` in the render pool without blocking the loop."""
+    async with _get_semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_render_executor(), partial(fn, *args, **kwargs))
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render workers (call on app shutdown)."""
+    global _executor
+    executor, _executor = _executor, None
+    _semaphores.clear()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
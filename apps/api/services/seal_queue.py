@@ -0,0 +1,121 @@
+"""
+Seal Queue — API side of the durable evidence sealing queue.
+
+Sealing an export (PDF/A-3 upgrade, PAdES signature, RFC 3161 timestamp)
+takes seconds and depends on a third-party TSA, so it does not run in the
+API worker. A seal request is a row in evidence_seal_jobs; the unsealed PDF
+is staged in a private storage path and workers/sealing_worker.py — which
+keeps a warm signing context — seals it into ``dest_path``.
+
+    pending → sealing → completed
+                      ↘ pending (TSA failure, retried with backoff)
+                      ↘ failed
+
+Callers either poll get_seal_job() (status endpoints) or await
+wait_for_seal_job() from a background job.
+
+Usage:
+    job = await enqueue_seal_job(db, yacht_id=..., bucket=..., source_path=..., dest_path=...)
+    row = await wait_for_seal_job(db, job["id"])
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, Optional
+
+from integrations.supabase import aexecute
+
+logger = logging.getLogger(__name__)
+
+SEAL_JOB_TABLE = "evidence_seal_jobs"
+SEAL_JOB_TIMEOUT_SECONDS = int(os.getenv("SEAL_JOB_TIMEOUT_SECONDS", "900"))
+SEAL_JOB_POLL_INTERVAL = 1.0
+SEAL_JOB_MAX_POLL_INTERVAL = 5.0
+
+SEAL_JOB_FIELDS = (
+    "id, status, attempts, error, dest_path, requested_by, pdf_sha256, "
+    "file_size_bytes, tsa_authority, cert_fingerprint, key_version, signed_at"
+)
+
+
+def staging_path(dest_path: str) -> str:
+    """Private path for the unsealed PDF next to its sealed destination."""
+    folder, _, name = dest_path.rpartition("/")
+    return f"{folder}/_sealing/{name}" if folder else f"_sealing/{name}"
+
+
+async def enqueue_seal_job(
+    db_client,
+    *,
+    yacht_id: str,
+    bucket: str,
+    source_path: str,
+    dest_path: str,
+    subject_id: Optional[str] = None,
+    requested_by: Optional[str] = None,
+    kind: str = "ledger_export",
+) -> Dict[str, Any]:
+    """Insert a pending seal job and return its row."""
+    result = await aexecute(db_client.table(SEAL_JOB_TABLE).insert({
+        "yacht_id":       yacht_id,
+        "kind":           kind,
+        "subject_id":     subject_id,
+        "storage_bucket": bucket,
+        "source_path":    source_path,
+        "dest_path":      dest_path,
+        "requested_by":   requested_by,
+        "status":         "pending",
+    }))
+    row = (result.data or [None])[0]
+    if not row:
+        raise RuntimeError("Seal job insert returned no row")
+    logger.info(f"[SealQueue] Enqueued seal job {row['id']} for {kind} {subject_id}")
+    return row
+
+
+async def get_seal_job(db_client, job_id: str) -> Optional[Dict[str, Any]]:
+    result = await aexecute(
+        db_client.table(SEAL_JOB_TABLE).select(SEAL_JOB_FIELDS).eq("id", job_id).limit(1)
+    )
+    return (result.data or [None])[0]
+
+
+async def find_seal_job(db_client, subject_id: str, yacht_id: str) -> Optional[Dict[str, Any]]:
+    """Latest seal job for an export (status fallback across API workers)."""
+    result = await aexecute(
+        db_client.table(SEAL_JOB_TABLE).select(SEAL_JOB_FIELDS)
+        .eq("subject_id", subject_id).eq("yacht_id", yacht_id)
+        .order("created_at", desc=True).limit(1)
+    )
+    return (result.data or [None])[0]
+
+
+async def wait_for_seal_job(
+    db_client,
+    job_id: str,
+    timeout: Optional[float] = None,
+    on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Poll a seal job until it is completed or failed.
+
+    Returns the final row; raises TimeoutError if the job is still queued or
+    running after ``timeout`` seconds (the job itself stays in the queue).
+    """
+    loop = asyncio.get_running_loop()
+    limit = SEAL_JOB_TIMEOUT_SECONDS if timeout is None else timeout
+    deadline = loop.time() + limit
+    interval = SEAL_JOB_POLL_INTERVAL
+    while True:
+        row = await get_seal_job(db_client, job_id)
+        if row is None:
+            raise LookupError(f"Seal job {job_id} not found")
+        if on_update is not None:
+            on_update(row)
+        if row["status"] in ("completed", "failed"):
+            return row
+        if loop.time() >= deadline:
+            raise TimeoutError(f"Seal job {job_id} still {row['status']} after {limit}s")
+        await asyncio.sleep(interval)
+        interval = min(interval * 1.5, SEAL_JOB_MAX_POLL_INTERVAL)
@@ -321,3 +321,19 @@ class TestColumnMatcher:
         name_mapping = next(m for m in mappings if m.source_name == "equipment_name")
         assert name_mapping.suggested_target is not None
         assert name_mapping.confidence > 0.5
+
+    def test_fuzzy_pass_keeps_column_order_and_first_best(self, monkeypatch):
+        import mappers.column_matcher as cm
+        from rapidfuzz import fuzz, process
+        columns = ["equipment_name", "DRAWING_REF", "serial_num", "zzzz", "mfg"]
+        vocab = ["name", "serial_number", "manufacturer", "model", "location"]
+        monkeypatch.setattr(cm, "CDIST_AVAILABLE", False)
+        mappings = cm.match_columns(columns, "equipment", "generic", vocabulary=vocab)
+
+        assert [m.source_name for m in mappings] == columns
+        assert mappings[1].action == "link_as_document"
+        choices = [cm.normalize_column_name(v) for v in vocab]
+        for m in (mappings[0], mappings[2], mappings[4]):
+            expected = process.extractOne(cm.normalize_column_name(m.source_name), choices,
+                                          scorer=fuzz.WRatio, score_cutoff=50)
+            assert m.suggested_target == (vocab[expected[2]] if expected else None)
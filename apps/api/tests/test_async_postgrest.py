@@ -0,0 +1,88 @@
+"""
+Unit tests for the async PostgREST layer in apps/api/integrations/supabase.py
+
+  * get_async_tenant_client() uses the same env-var credentials as
+    get_tenant_client() and caches one client per tenant per event loop
+  * aexecute() awaits async builders and offloads sync builders to a thread,
+    so a slow sync .execute() does not block other coroutines
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from integrations import supabase as sb  # noqa: E402
+
+
+TENANT = "yASYNC_TEST"
+
+
+@pytest.fixture
+def tenant_env(monkeypatch):
+    monkeypatch.setenv(f"{TENANT}_SUPABASE_URL", "https://tenant.example.supabase.co/")
+    monkeypatch.setenv(f"{TENANT}_SUPABASE_SERVICE_KEY", "service-key")
+    yield
+    sb._async_tenant_clients.clear()
+
+
+async def test_async_client_exposes_builder_api(tenant_env):
+    client = sb.get_async_tenant_client(TENANT)
+    query = client.table("pms_work_orders").select("id").eq("yacht_id", "y1")
+    assert inspect.iscoroutinefunction(query.execute)
+    assert str(client.session.base_url).startswith("https://tenant.example.supabase.co/rest/v1")
+    assert client.session.headers["apikey"] == "service-key"
+
+
+async def test_async_client_cached_per_loop(tenant_env):
+    assert sb.get_async_tenant_client(TENANT) is sb.get_async_tenant_client(TENANT)
+
+
+def test_async_client_missing_credentials_raises():
+    with pytest.raises(ValueError):
+        sb.get_async_tenant_client("yNO_SUCH_TENANT")
+
+
+async def test_aexecute_awaits_async_builder():
+    query = MagicMock()
+    query.execute = AsyncMock(return_value="rows")
+    assert await sb.aexecute(query) == "rows"
+    query.execute.assert_awaited_once()
+
+
+async def test_aexecute_offloads_sync_builder():
+    loop_thread = threading.get_ident()
+    seen = {}
+
+    def slow_execute():
+        seen["thread"] = threading.get_ident()
+        time.sleep(0.05)
+        return "rows"
+
+    query = MagicMock()
+    query.execute = slow_execute
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while "thread" not in seen or ticks < 3:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    result, _ = await asyncio.gather(sb.aexecute(query), ticker())
+    assert result == "rows"
+    assert seen["thread"] != loop_thread
+    assert ticks >= 3
@@ -0,0 +1,190 @@
+"""
+Unit tests for apps/api/lib/dataloader.py
+
+Contracts exercised:
+
+  * Ids primed from several call sites resolve in ONE resolver call
+  * Ids already resolved on a loader are never queried again
+  * Resolved users are served cross-request from the TTL cache
+  * Misses / transient failures are not cached cross-request
+  * invalidate_user_cache() forces a fresh look-up
+  * equipment() preserves caller order and drops unknown ids
+  * Entity lens handlers resolve every user in the view in one call
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lib import dataloader  # noqa: E402
+from lib.dataloader import RequestLoader, invalidate_user_cache  # noqa: E402
+from handlers.entity_lens_handlers import EntityLensHandlers  # noqa: E402
+
+
+YACHT = "yacht-uuid-test"
+
+PROFILES = {
+    "u1": {"name": "Alice", "role": "captain"},
+    "u2": {"name": "Bob", "role": "chief_engineer"},
+    "u3": {"name": "Cara", "role": "crew"},
+}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Patch the underlying resolvers and record each call's ids."""
+    log = {"users": [], "equipment": [], "yacht": 0}
+
+    def fake_resolve_users(_supabase, yacht_id, user_ids):
+        log["users"].append(sorted(user_ids))
+        return {uid: PROFILES[uid] for uid in user_ids if uid in PROFILES}
+
+    def fake_resolve_equipment(_supabase, yacht_id, equipment_ids):
+        log["equipment"].append(sorted(equipment_ids))
+        return [{"id": eid, "name": f"Eq {eid}"} for eid in equipment_ids if eid != "gone"]
+
+    def fake_resolve_yacht_name(_supabase, yacht_id):
+        log["yacht"] += 1
+        return "M/Y Test"
+
+    monkeypatch.setattr(dataloader, "resolve_users", fake_resolve_users)
+    monkeypatch.setattr(dataloader, "resolve_equipment_batch", fake_resolve_equipment)
+    monkeypatch.setattr(dataloader, "resolve_yacht_name", fake_resolve_yacht_name)
+    invalidate_user_cache()
+    yield log
+    invalidate_user_cache()
+
+
+def test_primed_ids_resolve_in_one_batch(calls):
+    loader = RequestLoader(None, YACHT)
+    loader.prime_users(["u1", None, "u2"])
+    loader.prime_users(["u2", ""])
+    users = loader.users(["u3"])
+
+    assert calls["users"] == [["u1", "u2", "u3"]]
+    assert users == {"u3": PROFILES["u3"]}
+    assert loader.users() == PROFILES
+
+
+def test_loader_memoizes_hits_and_misses(calls):
+    loader = RequestLoader(None, YACHT)
+    loader.users(["u1", "ghost"])
+    loader.users(["u1", "ghost"])
+    assert loader.user("u1") == PROFILES["u1"]
+    assert loader.user("ghost") is None
+    assert calls["users"] == [["ghost", "u1"]]
+
+
+def test_cross_request_cache_serves_hits_only(calls):
+    RequestLoader(None, YACHT).users(["u1", "ghost"])
+    out = RequestLoader(None, YACHT).users(["u1", "ghost"])
+
+    assert out == {"u1": PROFILES["u1"]}
+    # Second request only re-asks for the miss
+    assert calls["users"] == [["ghost", "u1"], ["ghost"]]
+
+
+def test_cache_is_yacht_scoped(calls):
+    RequestLoader(None, YACHT).users(["u1"])
+    RequestLoader(None, "other-yacht").users(["u1"])
+    assert calls["users"] == [["u1"], ["u1"]]
+
+
+def test_invalidate_user_cache_forces_refresh(calls):
+    RequestLoader(None, YACHT).users(["u1", "u2"])
+    invalidate_user_cache(user_id="u1")
+    RequestLoader(None, YACHT).users(["u1", "u2"])
+    assert calls["users"] == [["u1", "u2"], ["u1"]]
+
+
+def test_equipment_preserves_order_and_batches(calls):
+    loader = RequestLoader(None, YACHT)
+    loader.prime_equipment(["e2"])
+    rows = loader.equipment(["e3", "gone", "e1", "e2"])
+
+    assert [r["id"] for r in rows] == ["e3", "e1", "e2"]
+    assert calls["equipment"] == [["e1", "e2", "e3", "gone"]]
+    loader.equipment(["e1"])
+    assert len(calls["equipment"]) == 1
+
+
+def test_yacht_name_memoized(calls):
+    loader = RequestLoader(None, YACHT)
+    assert loader.yacht_name() == "M/Y Test"
+    assert loader.yacht_name() == "M/Y Test"
+    assert calls["yacht"] == 1
+
+
+# ── Entity lens handlers ────────────────────────────────────────────────────
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows, self.single = rows, False
+
+    def __getattr__(self, name):  # select / eq / is_ / in_ / order / limit / filter
+        return lambda *args, **kwargs: self
+
+    def maybe_single(self):
+        self.single = True
+        return self
+
+    def execute(self):
+        if self.single:
+            return SimpleNamespace(data=self.rows[0]) if self.rows else None
+        return SimpleNamespace(data=list(self.rows), count=len(self.rows))
+
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+        bucket = SimpleNamespace(create_signed_url=lambda path, expires: {"signedURL": f"https://signed/{path}"})
+        self.storage = SimpleNamespace(from_=lambda name: bucket)
+
+    def table(self, name):
+        return FakeQuery(self.tables.get(name, []))
+
+
+ATTACHMENT = {"id": "att-1", "filename": "quote.pdf", "storage_path": "po/quote.pdf", "uploaded_by": "u3"}
+
+
+def test_purchase_order_actors_and_uploaders_resolve_once(calls):
+    supabase = FakeSupabase({
+        "pms_purchase_orders": [{
+            "id": "po-1", "po_number": "PO-1", "status": "received", "yacht_id": YACHT,
+            "ordered_by": "u1", "approved_by": "u2", "received_by": "u1",
+        }],
+        "pms_attachments": [ATTACHMENT],
+    })
+    po = asyncio.run(EntityLensHandlers(supabase).get_purchase_order_entity("po-1", YACHT, {"role": "captain"}))
+
+    assert calls["users"] == [["u1", "u2", "u3"]]
+    assert po["ordered_by_actor"] == {"id": "u1", "name": "Alice", "role": "captain"}
+    assert po["approved_by_actor"]["name"] == "Bob"
+    assert po["received_by_actor"]["name"] == "Alice"
+    assert po["attachments"][0]["uploaded_by_name"] == "Cara"
+
+
+def test_certificate_view_resolves_users_once(calls):
+    supabase = FakeSupabase({
+        "pms_vessel_certificates": [{"id": "cert-1", "yacht_id": YACHT, "created_by": "u1", "properties": {}}],
+        "pms_notes": [{"id": "n1", "text": "ok", "created_by": "u2"}],
+        "pms_audit_log": [{"id": "a1", "action": "update_certificate", "user_id": "u1"}],
+        "pms_attachments": [ATTACHMENT],
+    })
+    cert = asyncio.run(EntityLensHandlers(supabase).get_certificate_entity("cert-1", YACHT, {"role": "captain"}))
+
+    assert calls["users"] == [["u1", "u2", "u3"]]
+    assert cert["created_by_name"] == "Alice"
+    assert cert["notes"][0]["author_name"] == "Bob"
+    assert cert["attachments"][0]["uploaded_by_name"] == "Cara"
@@ -0,0 +1,173 @@
+"""
+Tests for the compiled evaluation plan in services/decision_engine.py.
+
+Contracts exercised:
+
+  * Forbidden contexts, E019 state guards and HOD permission block before
+    scoring, in that order
+  * Intent / entity / situation scoring and explanations follow E018
+  * Changed policy files are recompiled; a broken edit keeps the old plan
+  * The shipped E017/E019 policies evaluate fast enough for every view
+"""
+
+import os
+import sys
+import textwrap
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.decision_engine import DecisionContext, DecisionEngine  # noqa: E402
+
+E017 = """
+version: "1.0.0"
+
+close_work_order:
+  tier: primary
+  requires:
+    intent: [close_work_order, complete_work]
+    entities:
+      min: [work_order]
+    situation: [work_order_in_progress]
+  forbidden: [work_order_closed, no_work_order]
+  explanation_template: "Close {work_order.title}"
+
+cancel_work_order:
+  tier: rare
+  requires:
+    intent: [cancel_work]
+    entities:
+      min: [work_order]
+    situation: [user_is_hod, work_order_active]
+  forbidden: [work_order_closed, unknown_context]
+  explanation_template: "Cancel work order"
+
+show_manual:
+  tier: conditional
+  requires:
+    entities:
+      min_one_of: [equipment, document]
+    situation: [equipment_has_manual]
+  forbidden: [no_entity_context]
+  explanation_template: "Open manual for {equipment.name}"
+"""
+
+E019 = """
+work_order:
+  state_guards:
+    close_work_order:
+      requires_state: in_progress
+    cancel_work_order:
+      requires_state: [open, in_progress]
+"""
+
+
+def _write(policy_dir, e017=E017, e019=E019):
+    (policy_dir / "E017_TRIGGER_CONTRACTS.yaml").write_text(textwrap.dedent(e017))
+    (policy_dir / "E019_STATE_GUARDS.yaml").write_text(textwrap.dedent(e019))
+
+
+def _context(role="deckhand", intents=(), entities=(), environment="at_sea"):
+    return DecisionContext(
+        yacht_id="yacht-1", user_id="user-1", user_role=role,
+        detected_intents=list(intents), entities=list(entities), environment=environment,
+    )
+
+
+def _by_action(engine, context):
+    return {d.action: d.to_dict() for d in engine.evaluate(context)}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    _write(tmp_path)
+    return DecisionEngine(tmp_path, reload_interval=0)
+
+
+def test_blocks_short_circuit_in_order(engine):
+    closed = {"type": "work_order", "id": "wo-1", "status": "closed", "title": "Pump"}
+    decisions = _by_action(engine, _context(role="chief_engineer", entities=[closed]))
+    assert decisions["close_work_order"]["blocked_by"] == {"type": "forbidden", "detail": "Work order is closed"}
+    assert decisions["close_work_order"]["explanation"] == "Close {work_order.title}"
+    assert decisions["show_manual"]["blocked_by"] == {"type": "threshold", "detail": "Score 0.40 < 0.6"}
+
+    open_wo = {"type": "work_order", "id": "wo-1", "status": "Open", "title": "Pump"}
+    decisions = _by_action(engine, _context(entities=[open_wo]))
+    assert decisions["close_work_order"]["blocked_by"] == {
+        "type": "state_guard", "detail": "Work order status must be in_progress, currently open",
+    }
+    assert decisions["cancel_work_order"]["blocked_by"] == {
+        "type": "permission", "detail": "This action requires supervisor permissions",
+    }
+    assert decisions["cancel_work_order"]["confidence"] == 0.0
+
+    decisions = _by_action(engine, _context(role="Captain", intents=["cancel_work"], entities=[open_wo]))
+    assert decisions["cancel_work_order"]["allowed"] is True
+
+
+def test_scoring_and_explanation(engine):
+    wo = {"type": "work_order", "id": "wo-1", "status": "in_progress", "title": "Pump"}
+    decisions = _by_action(engine, _context(intents=["Close_Work_Order"], entities=[wo]))
+    close = decisions["close_work_order"]
+    assert close["allowed"] is True and close["confidence"] == 1.0
+    assert close["reasons"] == [
+        "Intent match: Close_Work_Order",
+        "All required entities with IDs: ['work_order']",
+        "Situation met: work_order_in_progress",
+    ]
+    assert close["explanation"] == "Close Pump"
+
+    decisions = _by_action(engine, _context(intents=["close"], entities=[{"type": "work_order", "status": "in_progress"}]))
+    close = decisions["close_work_order"]
+    assert close["breakdown"] == {"intent": 0.7, "entity": 0.7, "situation": 1.0}
+    assert close["reasons"][0] == "Partial intent match: close ~ close_work_order"
+
+    gen = {"type": "equipment", "id": "eq-1", "name": "Generator", "has_manual": True}
+    manual = _by_action(engine, _context(entities=[gen]))["show_manual"]
+    assert manual["allowed"] is True
+    assert manual["reasons"] == [
+        "No intent requirement (1.0)", "Found one of required entities: ['equipment']", "Situation met: equipment_has_manual",
+    ]
+
+
+def test_changed_policy_is_recompiled(engine, tmp_path):
+    assert [d.action for d in engine.evaluate(_context())] == ["close_work_order", "cancel_work_order", "show_manual"]
+
+    _write(tmp_path, e017=E017.replace("tier: rare", "tier: primary") + "\nextra_action:\n  tier: rare\n")
+    decisions = _by_action(engine, _context())
+    assert "extra_action" in engine.trigger_contracts and decisions["extra_action"]["tier"] == "rare"
+    assert decisions["cancel_work_order"]["tier"] == "primary"
+
+    _write(tmp_path, e017="broken: [unclosed\n")
+    assert engine.maybe_reload() is False
+    assert "extra_action" in _by_action(engine, _context())
+
+
+def test_reload_check_is_throttled(tmp_path):
+    _write(tmp_path)
+    engine = DecisionEngine(tmp_path, reload_interval=3600)
+    _write(tmp_path, e017=E017 + "\nextra_action:\n  tier: rare\n")
+    assert engine.maybe_reload() is False
+    assert "extra_action" not in engine.trigger_contracts
+
+
+def test_shipped_policies_evaluate_quickly():
+    engine = DecisionEngine()
+    assert len(engine.trigger_contracts) >= 30
+    context = _context(
+        role="chief_engineer",
+        intents=["diagnose_fault"],
+        entities=[
+            {"type": "fault", "id": "f-1", "status": "acknowledged", "title": "Leak"},
+            {"type": "equipment", "id": "eq-1", "name": "Watermaker", "has_manual": True},
+        ],
+    )
+    n = 200
+    start = time.perf_counter()
+    for _ in range(n):
+        decisions = engine.evaluate(context)
+    elapsed = (time.perf_counter() - start) / n
+    assert len(decisions) == len(engine.trigger_contracts)
+    assert elapsed < 0.005, f"{elapsed * 1e6:.0f}µs per evaluate"
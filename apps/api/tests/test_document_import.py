@@ -0,0 +1,161 @@
+"""
+Unit tests for apps/api/services/document_import.py
+
+Contracts exercised:
+
+  * scan_zip_members hashes/sizes entries and applies the skip, empty and
+    MIME rules the route always had
+  * find_existing_blobs maps hashes to stored blobs and degrades to None
+    when the lookup is unavailable
+  * upload_import_blobs never exceeds its concurrency bound and reports
+    per-file storage failures without aborting the batch
+  * insert_doc_rows issues one multi-row insert per batch
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from services.document_import import (  # noqa: E402
+    find_existing_blobs,
+    insert_doc_rows,
+    scan_zip_members,
+    upload_import_blobs,
+)
+
+
+YACHT = "yacht-uuid-test"
+ACCEPTED = ("application/pdf", "text/")
+
+
+def _guess(name: str) -> str:
+    return "application/pdf" if name.endswith(".pdf") else (
+        "text/plain" if name.endswith(".txt") else "application/x-msdownload"
+    )
+
+
+def _zip(files: dict) -> zipfile.ZipFile:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    buf.seek(0)
+    return zipfile.ZipFile(buf)
+
+
+def _scan(zf):
+    members = [m for m in zf.infolist() if not m.is_dir()]
+    return scan_zip_members(zf, members, YACHT, _guess, ACCEPTED, lambda s: s.replace(" ", "_"))
+
+
+class FakeStorage:
+    def __init__(self, fail_paths=(), delay=0.0):
+        self.fail_paths = set(fail_paths)
+        self.delay = delay
+        self.uploaded = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def from_(self, _bucket):
+        return self
+
+    def upload(self, path, file, file_options):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if path in self.fail_paths:
+                raise RuntimeError("503")
+            self.uploaded[path] = file.read()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_scan_hashes_and_filters():
+    zf = _zip({
+        "manuals/Main Engine.pdf": b"%PDF-engine",
+        "notes.txt": b"hello",
+        "__MACOSX/._junk": b"x",
+        ".DS_Store": b"x",
+        "empty.pdf": b"",
+        "setup.exe": b"MZ",
+    })
+    accepted, failed = _scan(zf)
+
+    assert [m.original_path for m in accepted] == ["manuals/Main Engine.pdf", "notes.txt"]
+    engine = accepted[0]
+    assert engine.sha256 == hashlib.sha256(b"%PDF-engine").hexdigest()
+    assert engine.size == len(b"%PDF-engine")
+    assert engine.storage_path == f"{YACHT}/documents/{engine.doc_id}/Main_Engine.pdf"
+    assert {f["path"]: f["error"] for f in failed} == {
+        "empty.pdf": "empty_file",
+        "setup.exe": "unsupported_mime:application/x-msdownload",
+    }
+
+
+def test_find_existing_blobs():
+    result = MagicMock(data=[{"content_sha256": "h1", "storage_path": "y/documents/old/a.pdf"}])
+    client = MagicMock()
+    client.table.return_value.select.return_value.eq.return_value.in_.return_value \
+        .is_.return_value.execute.return_value = result
+    assert find_existing_blobs(client, YACHT, ["h1", "h2", "h1"]) == {"h1": "y/documents/old/a.pdf"}
+
+    broken = MagicMock()
+    broken.table.side_effect = RuntimeError("column doc_metadata.content_sha256 does not exist")
+    assert find_existing_blobs(broken, YACHT, ["h1"]) is None
+
+
+async def test_upload_bounded_concurrency_and_failures():
+    files = {f"doc{i}.pdf": f"%PDF-{i}".encode() for i in range(12)}
+    zf = _zip(files)
+    accepted, _ = _scan(zf)
+    storage = FakeStorage(fail_paths={accepted[3].storage_path}, delay=0.02)
+    client = MagicMock(storage=storage)
+
+    uploaded, failed = await upload_import_blobs(zf, client, "documents", accepted, concurrency=3)
+
+    assert storage.max_in_flight <= 3
+    assert storage.max_in_flight > 1
+    assert len(uploaded) == 11
+    assert failed == [{"path": accepted[3].original_path, "error": "storage_failed: 503"}]
+    assert storage.uploaded[accepted[0].storage_path] == b"%PDF-0"
+
+
+def test_insert_doc_rows_batches():
+    client = MagicMock()
+    client.table.return_value.insert.return_value.execute.side_effect = (
+        lambda: MagicMock(data=[{"id": "x"}] * 2)
+    )
+    calls = []
+    client.table.return_value.insert.side_effect = lambda rows: (
+        calls.append(len(rows)) or client.table.return_value.insert.return_value
+    )
+
+    rows = [{"id": str(i)} for i in range(5)]
+    ids = insert_doc_rows(client, rows, batch_size=2)
+    assert calls == [2, 2, 1]
+    assert len(ids) == 6  # fake returns 2 per batch
+
+
+def test_insert_doc_rows_raises_on_empty_result():
+    client = MagicMock()
+    client.table.return_value.insert.return_value.execute.return_value = MagicMock(data=[])
+    with pytest.raises(ValueError):
+        insert_doc_rows(client, [{"id": "1"}])
@@ -0,0 +1,169 @@
+"""
+Unit tests for apps/api/services/document_proxy.py
+
+Storage is faked with an httpx.MockTransport; no network.
+
+Contracts exercised:
+
+  * Range / If-None-Match are forwarded upstream and 206 / 304 relayed
+  * The body is streamed in bounded chunks (never one big buffer)
+  * Missing objects surface as 404
+  * With the on-disk cache enabled, a full download is teed to disk and
+    later (ranged) reads are served locally without touching storage
+  * The cache evicts least-recently-used blobs past its byte budget
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from services import document_proxy as dp  # noqa: E402
+
+
+TENANT = "yPROXY_TEST"
+BLOB = bytes(range(256)) * 1024  # 256 KiB
+
+
+class FakeStorage:
+    def __init__(self, body: bytes = BLOB, etag: str = '"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if "missing" in request.url.path:
+            return httpx.Response(400, json={"statusCode": "404", "error": "not_found"})
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"etag": self.etag})
+        headers = {"etag": self.etag, "accept-ranges": "bytes", "content-type": "application/pdf"}
+        rng = dp.parse_range(request.headers.get("range"), len(self.body))
+        if rng:
+            start, end = rng
+            headers["content-range"] = f"bytes {start}-{end}/{len(self.body)}"
+            return httpx.Response(206, headers=headers, content=self.body[start:end + 1])
+        return httpx.Response(200, headers=headers, content=self.body)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    monkeypatch.setenv(f"{TENANT}_SUPABASE_URL", "https://tenant.example.supabase.co")
+    monkeypatch.setenv(f"{TENANT}_SUPABASE_SERVICE_KEY", "service-key")
+    fake = FakeStorage()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(dp, "_get_http_client", lambda: client)
+    monkeypatch.setattr(dp, "_blob_cache", None)
+    monkeypatch.setattr(dp, "DOCUMENT_CACHE_DIR", "")
+    return fake
+
+
+@pytest.fixture
+def disk_cache(monkeypatch, tmp_path):
+    cache = dp.BlobCache(str(tmp_path), max_bytes=10 * len(BLOB), max_object_bytes=2 * len(BLOB))
+    monkeypatch.setattr(dp, "get_blob_cache", lambda: cache)
+    return cache
+
+
+async def _proxy(headers=None, path="yacht/manual.pdf"):
+    return await dp.proxy_document(
+        TENANT, "documents", path, headers or {},
+        content_type="application/pdf",
+        response_headers={"X-Document-Id": "doc-1"},
+    )
+
+
+async def _body(response):
+    chunks = [chunk async for chunk in response.body_iterator]
+    return chunks, b"".join(chunks)
+
+
+def test_parse_range():
+    assert dp.parse_range(None, 100) is None
+    assert dp.parse_range("bytes=0-9", 100) == (0, 9)
+    assert dp.parse_range("bytes=90-", 100) == (90, 99)
+    assert dp.parse_range("bytes=-10", 100) == (90, 99)
+    assert dp.parse_range("bytes=50-500", 100) == (50, 99)
+    assert dp.parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(ValueError):
+        dp.parse_range("bytes=100-", 100)
+
+
+async def test_full_download_streams_in_bounded_chunks(storage):
+    response = await _proxy()
+    chunks, body = await _body(response)
+
+    assert response.status_code == 200
+    assert body == BLOB
+    assert max(len(c) for c in chunks) <= dp.STREAM_CHUNK_BYTES
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == '"v1"'
+    assert response.headers["x-document-id"] == "doc-1"
+    sent = storage.requests[0]
+    assert sent.url.path == "/storage/v1/object/authenticated/documents/yacht/manual.pdf"
+    assert sent.headers["authorization"] == "Bearer service-key"
+
+
+async def test_range_is_forwarded_and_206_relayed(storage):
+    response = await _proxy({"range": "bytes=1024-2047"})
+    _, body = await _body(response)
+
+    assert storage.requests[0].headers["range"] == "bytes=1024-2047"
+    assert response.status_code == 206
+    assert body == BLOB[1024:2048]
+    assert response.headers["content-range"] == f"bytes 1024-2047/{len(BLOB)}"
+    assert response.headers["content-length"] == "1024"
+
+
+async def test_if_none_match_returns_304(storage):
+    response = await _proxy({"if-none-match": '"v1"'})
+    assert response.status_code == 304
+    assert response.body == b""
+
+
+async def test_missing_object_is_404(storage):
+    with pytest.raises(HTTPException) as exc:
+        await _proxy(path="yacht/missing.pdf")
+    assert exc.value.status_code == 404
+
+
+async def test_cache_tees_full_download_then_serves_ranges_locally(storage, disk_cache):
+    first = await _proxy()
+    await _body(first)
+    assert first.headers["x-document-cache"] == "miss"
+    assert len(storage.requests) == 1
+
+    ranged = await _proxy({"range": "bytes=10-19"})
+    _, body = await _body(ranged)
+    assert ranged.status_code == 206
+    assert body == BLOB[10:20]
+    assert ranged.headers["x-document-cache"] == "hit"
+    assert len(storage.requests) == 1  # served from disk
+
+    not_modified = await _proxy({"if-none-match": '"v1"'})
+    assert not_modified.status_code == 304
+    assert len(storage.requests) == 1
+
+
+async def test_cache_lru_eviction(tmp_path):
+    cache = dp.BlobCache(str(tmp_path), max_bytes=25, max_object_bytes=100)
+    for key in ("a", "b", "c"):
+        temp = cache.new_temp_path(key)
+        Path(temp).write_bytes(b"x" * 10)
+        cache.commit(key, temp, {"size": 10})
+        if key == "b":
+            assert cache.get("a") is not None  # touch "a" so "b" is now LRU
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert not (tmp_path / "b.blob").exists()
@@ -0,0 +1,78 @@
+"""
+Tests for the compiled domain / intent detectors in services/domain_microactions.py.
+
+Contracts exercised:
+
+  * Representative queries keep their domain, intent, filters and vagueness
+  * Every domain that anchors is reported, and priority picks between them
+  * Detection writes nothing to stdout; tracing goes to the DEBUG logger
+  * Benchmark: detection context over the corpus stays well under a millisecond
+"""
+
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import services.domain_microactions as dm  # noqa: E402
+
+# (query, domain, domain_confidence, intent, intent_confidence, filters, is_vague)
+CORPUS = [
+    ("show me open work orders", "work_order", 0.9, "READ", 0.95, {"status": "open"}, False),
+    ("log my hrs for today", "hours_of_rest", 0.9, "CREATE", 0.85, None, False),
+    ("pls sign my monthly hrs", "hours_of_rest", 0.9, "APPROVE", 0.85, None, False),
+    ("hours of rest violations", "hours_of_rest", 0.9, "READ", 0.9, {"compliance_state": "violation"}, False),
+    ("acknowledge rest violation", "hours_of_rest", 0.9, "APPROVE", 0.9, {"compliance_state": "violation"}, False),
+    ("draft deliveries", "receiving", 0.9, "READ", 0.95, {"status": "draft"}, False),
+    ("add oil filter to shopping list", "shopping_list", 0.7, "CREATE", 0.85, None, False),
+    ("work order note for generator", "work_order_note", 0.7, "READ", 0.7, None, False),
+    ("cancel work order 1234", "work_order", 0.9, "DELETE", 0.85, None, False),
+    ("main engine", "equipment", 0.9, "READ", 0.7, None, False),
+    ("what is the status of the watermaker manual", "equipment", 0.7, "READ", 0.85, None, False),
+    ("export certificate list", None, 0.0, "EXPORT", 0.85, None, False),
+    ("warning", None, 0.0, "READ", 0.7, None, True),
+]
+
+
+@pytest.mark.parametrize("query,domain,domain_conf,intent,intent_conf,filters,vague", CORPUS)
+def test_detection_context(query, domain, domain_conf, intent, intent_conf, filters, vague):
+    context = dm.get_detection_context(query)
+    assert (context["domain"], context["domain_confidence"]) == (domain, domain_conf)
+    assert (context["intent"], context["intent_confidence"]) == (intent, intent_conf)
+    assert context["filters"] == filters
+    assert context["is_vague"] is vague
+    assert context["mode"] == ("focused" if domain else "explore")
+    assert dm.is_vague_query(query) is vague
+    assert dm.detect_domain_with_confidence(query) == (domain, domain_conf)
+
+
+def test_all_anchored_domains_are_reported():
+    matches = dm.match_domains("add the work order note to the shopping list")
+    assert [m.domain for m in matches] == ["work_order", "work_order_note", "shopping_list"]
+    assert matches[1].matched == "work order note"
+    assert dm.detect_domain_from_query("Add the WORK ORDER NOTE to the shopping list") == ("work_order_note", 0.7)
+
+
+def test_no_stdout_and_debug_trace(capsys, caplog):
+    dm.get_detection_context("show me open work orders")
+    dm.get_microactions_for_query("log my hours", role="crew")
+    assert capsys.readouterr().out == ""
+
+    with caplog.at_level(logging.DEBUG, logger=dm.__name__):
+        dm.detect_domain_from_query("log my hours")
+    assert "[DETECT_DOMAIN]" in caplog.text and "hours_of_rest" in caplog.text
+
+
+def test_detection_benchmark():
+    queries = [row[0] for row in CORPUS]
+    n = 200
+    start = time.perf_counter()
+    for _ in range(n):
+        for query in queries:
+            dm.get_detection_context(query)
+    per_query = (time.perf_counter() - start) / (n * len(queries))
+    assert per_query < 0.001, f"get_detection_context: {per_query * 1e6:.1f}µs/query over {len(queries)} queries"
@@ -0,0 +1,134 @@
+"""
+Tests for the batched email embedding pipeline
+(services/email_embedding_service.py).
+
+Contracts exercised:
+
+  * embed_batch embeds each distinct signal text once, in multi-input
+    requests packed by input count and estimated tokens
+  * Recently embedded texts are served from the cache without an API call
+  * The queue drains in batches and writes one bulk RPC per yacht, falling
+    back to per-row updates when the RPC is missing
+  * Sync only enqueues — no embedding call on the sync path
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import services.email_embedding_service as emb  # noqa: E402
+from services.email_embedding_service import (  # noqa: E402
+    EmailEmbeddingJob, EmailEmbeddingQueue, EmailEmbeddingService, EmailEmbeddingUpdater,
+)
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.requests = []
+        self.embeddings = self
+
+    def create(self, model, input):
+        self.requests.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), 1.0]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(emb, "OPENAI_AVAILABLE", True)
+    svc = EmailEmbeddingService(api_key="sk-test")
+    svc._client = FakeOpenAI()
+    monkeypatch.setattr(emb, "get_embedding_service", lambda: svc)
+    return svc
+
+
+async def test_embed_batch_dedupes_texts_into_one_request(service):
+    emails = [
+        {"subject": "Re: WO-1234", "sender_name": "Chief Engineer", "attachment_names": []},
+        {"subject": "Re: WO-1234", "sender_name": "Chief Engineer", "attachment_names": []},
+        {"subject": "Parts shipped", "sender_name": "Chief Engineer", "attachment_names": ["inv.pdf"]},
+    ]
+    results = await service.embed_batch(emails)
+
+    assert len(service.client.requests) == 1
+    # 2 subjects + 1 sender + 2 meta texts
+    assert len(service.client.requests[0]) == 5
+    assert results[0].meta_embedding == results[1].meta_embedding
+    assert results[2].meta_embedding == [float(len("Subject: Parts shipped | From: Chief Engineer | Attachments: inv.pdf")), 1.0]
+    assert all(r.has_embeddings() for r in results)
+
+    # Served from the recent-vector cache next time
+    again = await service.embed_email("Re: WO-1234", "Chief Engineer")
+    assert len(service.client.requests) == 1
+    assert again.subject_embedding == results[0].subject_embedding
+
+
+async def test_requests_are_packed_by_token_budget(service, monkeypatch):
+    monkeypatch.setattr(emb, "EMAIL_EMBED_MAX_TOKENS", 40)
+    texts = [f"{i} " + "x" * 60 for i in range(5)]  # ~21 tokens each
+    vectors = await service.embed_texts(texts + [None, ""])
+
+    assert [len(r) for r in service.client.requests] == [1, 1, 1, 1, 1]
+    assert vectors[-2:] == [None, None]
+    assert all(v is not None for v in vectors[:5])
+
+
+async def test_queue_flush_writes_one_rpc_per_yacht(service):
+    sb = MagicMock()
+    sb.rpc.return_value.execute.side_effect = lambda: MagicMock(data=len(sb.rpc.call_args.args[1]["p_rows"]))
+    queue = EmailEmbeddingQueue(maxsize=10)
+    for i in range(3):
+        assert queue.enqueue(EmailEmbeddingJob(sb, "yacht-a", f"a{i}", subject=f"S{i}", sender_name="Bosun"))
+    queue.enqueue(EmailEmbeddingJob(sb, "yacht-b", "b0", subject="Hello"))
+
+    batch = await queue.next_batch(max_items=10, linger=0)
+    assert [job.email_id for job in batch] == ["a0", "a1", "a2", "b0"]
+    await queue.flush(batch)
+
+    calls = [c.args[1] for c in sb.rpc.call_args_list if c.args[0] == "update_email_embeddings_bulk"]
+    assert [(c["p_yacht_id"], len(c["p_rows"])) for c in calls] == [("yacht-a", 3), ("yacht-b", 1)]
+    assert set(calls[0]["p_rows"][0]) == {"id", "subject_embedding", "sender_embedding", "meta_embedding"}
+    assert queue.stats["embedded"] == 4
+    sb.table.assert_not_called()
+
+
+async def test_bulk_rpc_missing_falls_back_per_row(service, monkeypatch):
+    monkeypatch.setattr(EmailEmbeddingUpdater, "_bulk_rpc_missing", False)
+    sb = MagicMock()
+    sb.rpc.return_value.execute.side_effect = Exception(
+        "{'code': 'PGRST202', 'message': 'Could not find the function public.update_email_embeddings_bulk'}"
+    )
+    updater = EmailEmbeddingUpdater(sb, "yacht-a")
+    stats = await updater.update_embeddings_batch([
+        {"id": "m1", "subject": "A", "sender_name": "", "attachment_names": []},
+        {"id": "m2", "subject": "B", "sender_name": "", "attachment_names": []},
+    ])
+
+    assert stats == {"processed": 2, "success": 2, "failed": 0}
+    assert sb.table.return_value.update.call_count == 2
+    assert EmailEmbeddingUpdater._bulk_rpc_missing
+
+
+def test_queue_drops_when_full():
+    queue = EmailEmbeddingQueue(maxsize=1)
+    assert queue.enqueue(EmailEmbeddingJob(None, "y", "m1"))
+    assert not queue.enqueue(EmailEmbeddingJob(None, "y", "m2"))
+    assert queue.stats == {"queued": 1, "dropped": 1, "embedded": 0, "failed": 0}
+
+
+async def test_sync_only_enqueues(service, monkeypatch):
+    import services.email_sync_service as email_sync
+
+    queue = EmailEmbeddingQueue()
+    monkeypatch.setattr(email_sync, "get_embedding_queue", lambda: queue)
+    sync = email_sync.EmailSyncService(MagicMock(), "token")
+    await sync._embed_message("yacht-a", "m1", "Survey", "Captain", [{"name": "report.pdf"}, {"id": "x"}])
+
+    assert service.client.requests == []
+    job = (await queue.next_batch(linger=0))[0]
+    assert (job.email_id, job.attachment_names) == ("m1", ["report.pdf"])
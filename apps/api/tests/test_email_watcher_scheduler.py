@@ -0,0 +1,245 @@
+"""
+Tests for the concurrent email watcher scheduler and the in-memory Graph
+call budget (services/ms_graph_rate_limiter.py).
+
+Contracts exercised:
+
+  * can_make_call reads the DB counter once per mailbox, then stays in memory
+  * record_call is in-memory; checkpoint() flushes one RPC per mailbox
+  * A mailbox's burst plus an hour of refill never exceeds the hourly limit
+  * Retry-After blocks a mailbox (or the whole app) until it elapses
+  * The worker syncs mailboxes concurrently, most recently active first,
+    never schedules a mailbox twice, and a slow mailbox holds only one slot
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.ms_graph_rate_limiter import (  # noqa: E402
+    GraphCallBudget, MicrosoftRateLimiter, parse_retry_after,
+)
+
+
+def _supabase(calls_this_hour=0):
+    sb = MagicMock()
+    sb.table.return_value.select.return_value.eq.return_value.eq.return_value.single.return_value \
+        .execute.return_value = MagicMock(data={"api_calls_this_hour": calls_this_hour})
+    return sb
+
+
+def _limiter(sb, limit=100):
+    return MicrosoftRateLimiter(sb, budget=GraphCallBudget(limit, app_burst=1000, app_rate=1000))
+
+
+async def test_budget_seeds_once_and_records_in_memory():
+    sb = _supabase(calls_this_hour=95)
+    limiter = _limiter(sb)
+
+    assert await limiter.can_make_call("u1", "y1")
+    assert await limiter.can_make_call("u1", "y1")
+    assert sb.table.call_count == 1  # seeded once, then in-memory
+
+    await limiter.record_call("u1", "y1", 5)
+    assert not await limiter.can_make_call("u1", "y1")
+    assert limiter.seconds_until_allowed("u1", "y1") > 0
+    # nothing persisted until a checkpoint
+    assert all(c.args[0] != "record_email_api_calls" for c in sb.rpc.call_args_list)
+
+
+async def test_checkpoint_flushes_one_rpc_per_mailbox():
+    sb = _supabase()
+    limiter = _limiter(sb)
+    for _ in range(7):
+        await limiter.record_call("u1", "y1")
+    await limiter.record_call("u2", "y1", 3)
+
+    assert await limiter.checkpoint() == 2
+    recorded = {
+        c.args[1]["p_user_id"]: c.args[1]["p_call_count"]
+        for c in sb.rpc.call_args_list if c.args[0] == "record_email_api_calls"
+    }
+    assert recorded == {"u1": 7, "u2": 3}
+    assert await limiter.checkpoint() == 0
+
+
+async def test_record_call_never_checkpoints_inline(monkeypatch):
+    import services.ms_graph_rate_limiter as module
+    monkeypatch.setattr(module, "GRAPH_RATE_CHECKPOINT_SECONDS", 0)
+    sb = _supabase()
+    limiter = _limiter(sb)
+    await limiter.record_call("u1", "y1", 2)
+    assert sb.rpc.call_count == 0
+    assert limiter.budget.mailbox(("u1", "y1")).pending == 2
+
+
+def test_mailbox_budget_holds_over_a_rolling_hour():
+    budget = GraphCallBudget(9_500, app_burst=1000, app_rate=1000)
+    bucket = budget.mailbox(("u1", "y1")).bucket
+    assert bucket.capacity + bucket.refill_rate * 3600 <= 9_500
+
+    budget.seed(("u2", "y1"), calls_this_hour=0)
+    assert budget.mailbox(("u2", "y1")).bucket.tokens == bucket.capacity
+    budget.seed(("u3", "y1"), calls_this_hour=9_450)
+    assert budget.mailbox(("u3", "y1")).bucket.tokens == 50
+
+
+async def test_checkpoint_keeps_counts_when_rpc_fails():
+    sb = _supabase()
+    sb.rpc.return_value.execute.side_effect = [None, RuntimeError("down"), None, None]
+    limiter = _limiter(sb)
+    await limiter.record_call("u1", "y1", 4)
+    await limiter.checkpoint()
+    assert limiter.budget.mailbox(("u1", "y1")).pending == 4
+
+
+async def test_retry_after_blocks_mailbox_and_app():
+    limiter = _limiter(_supabase())
+    assert await limiter.can_make_call("u1", "y1")
+
+    limiter.note_retry_after("u1", "y1", "2")
+    assert not await limiter.can_make_call("u1", "y1")
+    assert await limiter.can_make_call("u2", "y1")
+
+    limiter.note_retry_after(None, None, "5")
+    assert not await limiter.can_make_call("u2", "y1")
+
+    limiter.budget._app_blocked_until = time.monotonic() - 1
+    limiter.budget.mailbox(("u1", "y1")).blocked_until = time.monotonic() - 1
+    assert await limiter.can_make_call("u1", "y1")
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None, default=30) == 30
+    assert parse_retry_after("garbage", default=7) == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class FakeThreads:
+    """email_threads rows behind the select/in_/order/limit chain the worker uses."""
+
+    def __init__(self, rows):
+        self.rows, self.queries = rows, []
+
+    def table(self, name):
+        query = SimpleNamespace(name=name, filters={}, columns=None, ordering=None, limit_to=None)
+        self.queries.append(query)
+
+        class Chain:
+            def select(chain, columns):
+                query.columns = columns
+                return chain
+
+            def in_(chain, column, values):
+                query.filters[column] = set(values)
+                return chain
+
+            def order(chain, column, desc=False):
+                query.ordering = (column, desc)
+                return chain
+
+            def limit(chain, n):
+                query.limit_to = n
+                return chain
+
+            def execute(chain):
+                assert name == "email_threads"
+                rows = [r for r in self.rows if r["watcher_id"] in query.filters["watcher_id"]]
+                column, desc = query.ordering
+                rows.sort(key=lambda r: r[column], reverse=desc)
+                return SimpleNamespace(data=[
+                    {c.strip(): r[c.strip()] for c in query.columns.split(",")} for r in rows[:query.limit_to]
+                ])
+
+        return Chain()
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "http://supabase.test")
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "key")
+    import workers.email_watcher_worker as module
+    monkeypatch.setattr(module, "create_client", lambda url, key: MagicMock())
+    monkeypatch.setattr(module, "WATCHER_CONCURRENCY", 2)
+    w = module.EmailWatcherWorker()
+    w.rate_limiter = _limiter(MagicMock())
+    return module, w
+
+
+async def test_worker_syncs_concurrently_by_activity(worker):
+    module, w = worker
+    watchers = [
+        {"id": "old", "user_id": "u-old", "yacht_id": "y"},
+        {"id": "slow", "user_id": "u-slow", "yacht_id": "y"},
+        {"id": "new", "user_id": "u-new", "yacht_id": "y"},
+    ]
+    w.supabase = FakeThreads([
+        {"watcher_id": "old", "last_activity_at": "2026-01-01T00:00:00Z"},
+        {"watcher_id": "slow", "last_activity_at": "2026-09-01T00:00:00Z"},
+        {"watcher_id": "slow", "last_activity_at": "2026-10-01T00:00:00Z"},
+        {"watcher_id": "new", "last_activity_at": "2026-10-18T00:00:00Z"},
+        {"watcher_id": "other", "last_activity_at": "2026-10-18T01:00:00Z"},
+    ])
+    w._get_watchers_due_for_sync = MagicMock(side_effect=lambda: asyncio.sleep(0, watchers))
+    started = []
+    release_slow = asyncio.Event()
+
+    async def fake_sync(watcher):
+        started.append(watcher["id"])
+        if watcher["id"] == "slow":
+            await release_slow.wait()
+
+    w.sync_single_watcher = fake_sync
+    await w.process_pending_syncs()
+    await w.process_pending_syncs()  # already scheduled — not queued again
+    assert w._queue.qsize() == 3
+    [query] = w.supabase.queries  # ranked once, from email_threads
+    assert query.name == "email_threads" and query.filters == {"watcher_id": {"old", "slow", "new"}}
+
+    w._sync_tasks = [asyncio.create_task(w._sync_loop()) for _ in range(2)]
+    try:
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # "slow" holds one slot; the other slot finished "new" and moved on to "old"
+        assert started == ["new", "slow", "old"]
+        assert w._scheduled == {"slow"}
+        release_slow.set()
+        await asyncio.wait_for(w._queue.join(), 1)
+        assert w._scheduled == set()
+        assert w.stats["watchers_synced"] == 3
+    finally:
+        for task in w._sync_tasks:
+            task.cancel()
+        await asyncio.gather(*w._sync_tasks, return_exceptions=True)
+
+
+async def test_worker_skips_throttled_mailbox_and_times_out(worker, monkeypatch):
+    module, w = worker
+    monkeypatch.setattr(module, "WATCHER_SYNC_TIMEOUT", 0.01)
+    w.rate_limiter.note_retry_after("u-throttled", "y", "60")
+    watchers = [
+        {"id": "throttled", "user_id": "u-throttled", "yacht_id": "y"},
+        {"id": "hung", "user_id": "u-hung", "yacht_id": "y"},
+    ]
+    w._get_watchers_due_for_sync = MagicMock(side_effect=lambda: asyncio.sleep(0, watchers))
+    w.sync_single_watcher = lambda watcher: asyncio.sleep(10)
+    marked = []
+    w._mark_watcher_error = lambda watcher_id, error: asyncio.sleep(0, marked.append((watcher_id, error)))
+
+    await w.process_pending_syncs()
+    assert w._scheduled == {"hung"}
+    task = asyncio.create_task(w._sync_loop())
+    try:
+        await asyncio.wait_for(w._queue.join(), 1)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    assert marked == [("hung", "sync_timeout")]
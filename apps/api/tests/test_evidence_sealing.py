@@ -0,0 +1,497 @@
+"""
+Tests for the warm sealing context (evidence/sealing.py) and the sealing
+queue (services/seal_queue.py, workers/sealing_worker.py).
+
+Everything runs against a local CA: a self-signed root issues the signing
+cert and the TSA cert, publishes a CRL, and pyHanko's DummyTimeStamper
+stands in for the RFC 3161 service. Nothing touches the network.
+
+Contracts exercised:
+
+  * A context is built once and seals many documents (signer loaded once)
+  * Sealed output is PDF/A-3 tagged, signature intact and trusted, and with
+    a CA chain configured embeds the CRL (B-LT)
+  * CRLs are reused until nextUpdate, then refetched; a slow fetch holds
+    up only lookups of the same key
+  * The worker seals a claimed job from storage and records the result;
+    TSA failures are retried, other failures are final
+  * A sealed ledger export goes through the queue and is never uploaded
+    where a download URL could reach it before sealing
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pyhanko")
+pytest.importorskip("fitz")
+
+from asn1crypto import keys as asn1_keys  # noqa: E402
+from asn1crypto import x509 as asn1_x509  # noqa: E402
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec, rsa  # noqa: E402
+from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID  # noqa: E402
+from pyhanko.pdf_utils.reader import PdfFileReader  # noqa: E402
+from pyhanko.sign.timestamps import DummyTimeStamper  # noqa: E402
+from pyhanko.sign.validation import validate_pdf_signature  # noqa: E402
+from pyhanko_certvalidator import ValidationContext  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import evidence.sealing as sealing  # noqa: E402
+from evidence.sealing import RevocationCache, build_sealing_context, seal_export  # noqa: E402
+from services.ledger_export import render_ledger_pdf  # noqa: E402
+
+CRL_URL = "http://crl.test/root.crl"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Local CA
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _name(cn):
+    return x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, cn)])
+
+
+def _issue(subject, key, issuer, issuer_key, *, ca=False, eku=None, crl_url=None):
+    now = datetime.now(timezone.utc)
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(_name(subject)).issuer_name(_name(issuer))
+        .public_key(key.public_key()).serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1)).not_valid_after(now + timedelta(days=30))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+        .add_extension(x509.KeyUsage(
+            digital_signature=not ca, content_commitment=not ca, key_encipherment=False,
+            data_encipherment=False, key_agreement=False, key_cert_sign=ca, crl_sign=ca,
+            encipher_only=False, decipher_only=False,
+        ), critical=True)
+    )
+    if eku:
+        builder = builder.add_extension(x509.ExtendedKeyUsage([eku]), critical=True)
+    if crl_url:
+        builder = builder.add_extension(x509.CRLDistributionPoints([x509.DistributionPoint(
+            full_name=[x509.UniformResourceIdentifier(crl_url)], relative_name=None, reasons=None, crl_issuer=None,
+        )]), critical=False)
+    return builder.sign(issuer_key, hashes.SHA256())
+
+
+def _pem(obj):
+    if isinstance(obj, x509.Certificate):
+        return obj.public_bytes(serialization.Encoding.PEM)
+    return obj.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                             serialization.NoEncryption())
+
+
+class LocalCA:
+    def __init__(self, tmp_path: Path):
+        self.root_key = ec.generate_private_key(ec.SECP256R1())
+        self.root = _issue("Test Root", self.root_key, "Test Root", self.root_key, ca=True)
+        self.signer_key = ec.generate_private_key(ec.SECP256R1())
+        self.signer = _issue("Evidence Signer", self.signer_key, "Test Root", self.root_key, crl_url=CRL_URL)
+        self.tsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)  # DummyTimeStamper is RSA-only
+        self.tsa = _issue("Test TSA", self.tsa_key, "Test Root", self.root_key,
+                          eku=ExtendedKeyUsageOID.TIME_STAMPING, crl_url=CRL_URL)
+
+        self.cert_path, self.key_path, self.chain_path = (
+            tmp_path / "signer.pem", tmp_path / "signer.key", tmp_path / "chain.pem",
+        )
+        self.cert_path.write_bytes(_pem(self.signer))
+        self.key_path.write_bytes(_pem(self.signer_key))
+        self.chain_path.write_bytes(_pem(self.root))
+
+    def crl(self, next_update: datetime) -> bytes:
+        now = datetime.now(timezone.utc)
+        return (
+            x509.CertificateRevocationListBuilder()
+            .issuer_name(self.root.subject)
+            .last_update(now - timedelta(minutes=1)).next_update(next_update)
+            .sign(self.root_key, hashes.SHA256())
+            .public_bytes(serialization.Encoding.DER)
+        )
+
+    def timestamper(self) -> DummyTimeStamper:
+        return DummyTimeStamper(
+            tsa_cert=asn1_x509.Certificate.load(self.tsa.public_bytes(serialization.Encoding.DER)),
+            tsa_key=asn1_keys.PrivateKeyInfo.load(self.tsa_key.private_bytes(
+                serialization.Encoding.DER, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+            )),
+        )
+
+    def config(self, with_chain=True):
+        return sealing._SealingConfig(
+            cert_path=self.cert_path, key_path=self.key_path, key_version="test",
+            tsa_primary="http://tsa.test/primary", tsa_fallback="http://tsa.test/fallback",
+            ca_chain_path=self.chain_path if with_chain else None,
+        )
+
+    def validation_context(self):
+        return ValidationContext(
+            trust_roots=[asn1_x509.Certificate.load(self.root.public_bytes(serialization.Encoding.DER))],
+            allow_fetching=False,
+        )
+
+
+class FakeCRLServer:
+    def __init__(self, ca: LocalCA, lifetime=timedelta(hours=1)):
+        self.ca, self.lifetime, self.requests = ca, lifetime, []
+
+    def __call__(self, url, body):
+        self.requests.append(url)
+        assert url == CRL_URL and body is None
+        return self.ca.crl(datetime.now(timezone.utc) + self.lifetime)
+
+
+@pytest.fixture(scope="module")
+def raw_pdf(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("render")
+    json_path, pdf_path = workdir / "events.json", workdir / "export.pdf"
+    json_path.write_text(json.dumps([{"action": "add_note", "actor_ref": "abc"}]), encoding="utf-8")
+    render_ledger_pdf(str(json_path), str(pdf_path), {
+        "vessel_name": "M/Y Test", "date_from": "2026-03-01", "date_to": "2026-03-31",
+        "scope_label": "All crew", "export_id": "ref", "event_count": 1,
+    })
+    return pdf_path.read_bytes()
+
+
+@pytest.fixture
+def ca(tmp_path):
+    return LocalCA(tmp_path)
+
+
+def _signature(pdf_bytes):
+    import io
+    reader = PdfFileReader(io.BytesIO(pdf_bytes))
+    [sig] = reader.embedded_signatures
+    return reader, sig
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Warm context
+# ──────────────────────────────────────────────────────────────────────────────
+
+def test_context_seals_repeatedly_with_one_signer_load(ca, raw_pdf, monkeypatch):
+    loads = []
+    real_load = sealing.signers.SimpleSigner.load
+    monkeypatch.setattr(sealing.signers.SimpleSigner, "load",
+                        staticmethod(lambda *a, **kw: loads.append(1) or real_load(*a, **kw)))
+    crl_server = FakeCRLServer(ca)
+    context = build_sealing_context(ca.config(), timestamper=ca.timestamper(),
+                                    revocation=RevocationCache(fetch=crl_server))
+
+    results = [seal_export(raw_pdf, context) for _ in range(3)]
+
+    assert len(loads) == 1
+    assert len(crl_server.requests) == 1
+    for sealed, info in results:
+        reader, sig = _signature(sealed)
+        status = validate_pdf_signature(sig, ca.validation_context())
+        assert status.intact and status.valid and status.trusted
+        assert sig.field_name == sealing.SIG_FIELD_NAME
+        assert "/DSS" in reader.root and "/CRLs" in reader.root["/DSS"]
+        assert b"<pdfaid:part>3</pdfaid:part>" in sealed
+        assert info.key_version == "test" and info.tsa_authority == "DummyTimeStamper"
+        assert info.cert_fingerprint == sealing._cert_fingerprint(ca.cert_path)
+
+
+def test_self_signed_context_skips_validation_info(ca, raw_pdf):
+    context = build_sealing_context(ca.config(with_chain=False), timestamper=ca.timestamper(),
+                                    revocation=RevocationCache(fetch=FakeCRLServer(ca)))
+    assert context.validation_context() is None
+
+    reader, sig = _signature(seal_export(raw_pdf, context)[0])
+    assert validate_pdf_signature(sig, ca.validation_context()).intact
+    assert "/DSS" not in reader.root
+
+
+def test_crl_reused_until_next_update(ca):
+    now = [1_000.0]
+    crl_server = FakeCRLServer(ca, lifetime=timedelta(minutes=10))
+    cache = RevocationCache(fetch=crl_server, clock=lambda: now[0])
+    now[0] = datetime.now(timezone.utc).timestamp()
+
+    first = cache.crl(CRL_URL)
+    assert cache.crl(CRL_URL) is first
+    now[0] += 11 * 60
+    assert cache.crl(CRL_URL) != first
+    assert len(crl_server.requests) == 2
+
+    crls, ocsps = cache.collect([ca.signer, ca.root])
+    assert len(crls) == 1 and ocsps == []
+
+
+def test_slow_fetch_blocks_only_its_own_key(ca):
+    crl_server = FakeCRLServer(ca)
+    started, release = threading.Event(), threading.Event()
+
+    def fetch(url, body):
+        if url == "http://slow.test/root.crl":
+            started.set()
+            release.wait(5)
+        return crl_server(CRL_URL, body)
+
+    cache = RevocationCache(fetch=fetch)
+    slow = threading.Thread(target=cache.crl, args=("http://slow.test/root.crl",))
+    slow.start()
+    assert started.wait(5)
+    results = []
+    fast = threading.Thread(target=lambda: results.append(cache.crl(CRL_URL)))
+    fast.start()
+    fast.join(2)
+    finished = not fast.is_alive()
+    release.set()
+    slow.join(5)
+    fast.join(5)
+    assert finished and results[0] is not None  # not queued behind the slow responder
+
+
+def test_tsa_probed_once_per_ttl(ca, monkeypatch):
+    probes = []
+    monkeypatch.setattr(sealing, "_tsa_reachable", lambda url: probes.append(url) or url.endswith("fallback"))
+    context = build_sealing_context(ca.config(with_chain=False))
+
+    for _ in range(3):
+        timestamper, url = context.get_timestamper()
+    assert url == "http://tsa.test/fallback"
+    assert probes == ["http://tsa.test/primary", "http://tsa.test/fallback"]
+
+    context.invalidate_timestamper()
+    context.get_timestamper()
+    assert len(probes) == 4
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Sealing worker
+# ──────────────────────────────────────────────────────────────────────────────
+
+class FakeBucket:
+    """Storage for the worker (download/upload/delete) and the API (from_)."""
+
+    def __init__(self):
+        self.objects, self.signed = {}, []
+
+    # worker side
+    def download(self, bucket, path):
+        return self.objects[path]
+
+    def upload(self, *args, **kwargs):
+        if "file" in kwargs:  # supabase-py storage (API side)
+            self.objects[kwargs["path"]] = kwargs["file"].read()
+        else:
+            bucket, path, data = args
+            self.objects[path] = data
+
+    def delete(self, bucket, path):
+        self.objects.pop(path, None)
+
+    # API side
+    def from_(self, bucket):
+        return self
+
+    def create_signed_url(self, path, expires_in):
+        self.signed.append(path)
+        return {"signedURL": f"https://storage.test/{path}?token=x"}
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.conn.updates.append((sql, params))
+
+
+class FakeConn:
+    def __init__(self):
+        self.updates, self.commits = [], 0
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def last_update(self):
+        sql, params = self.updates[-1]
+        names = [a.split(" = ")[0].strip() for a in sql.split("SET ")[1].split(",\n")[0].split(", ")]
+        return dict(zip(names, params)), params[-2]
+
+
+def _job(**overrides):
+    job = {"id": "job-1", "storage_bucket": "ledger-exports", "source_path": "v/_sealing/e.pdf",
+           "dest_path": "v/e.pdf", "attempts": 1}
+    job.update(overrides)
+    return job
+
+
+@pytest.fixture
+def worker():
+    return pytest.importorskip("workers.sealing_worker")
+
+
+def test_worker_seals_staged_pdf_into_place(worker, ca, raw_pdf):
+    context = build_sealing_context(ca.config(), timestamper=ca.timestamper(),
+                                    revocation=RevocationCache(fetch=FakeCRLServer(ca)))
+    storage, conn = FakeBucket(), FakeConn()
+    storage.objects["v/_sealing/e.pdf"] = raw_pdf
+
+    assert worker.process_job(conn, _job(), context, storage)
+
+    assert list(storage.objects) == ["v/e.pdf"]
+    _, sig = _signature(storage.objects["v/e.pdf"])
+    assert validate_pdf_signature(sig, ca.validation_context()).valid
+    columns, retry_in = conn.last_update()
+    assert columns["status"] == "completed" and retry_in == 0
+    assert columns["file_size_bytes"] == len(storage.objects["v/e.pdf"])
+    assert columns["tsa_authority"] == "DummyTimeStamper"
+
+
+@pytest.mark.parametrize("attempts, status", [(1, "pending"), (5, "failed")])
+def test_worker_retries_tsa_failures(worker, attempts, status, monkeypatch):
+    def tsa_down(raw, context):
+        raise sealing.TimestampError("both TSAs unreachable")
+
+    monkeypatch.setattr(worker, "seal_export", tsa_down)
+    storage, conn = FakeBucket(), FakeConn()
+    storage.objects["v/_sealing/e.pdf"] = b"%PDF"
+
+    assert not worker.process_job(conn, _job(attempts=attempts), None, storage)
+
+    columns, retry_in = conn.last_update()
+    assert columns["status"] == status
+    assert retry_in == (worker.RETRY_BASE_SECONDS if status == "pending" else 0)
+    assert "v/_sealing/e.pdf" in storage.objects and "v/e.pdf" not in storage.objects
+
+
+def test_worker_fails_invalid_input_without_retry(worker, ca):
+    context = build_sealing_context(ca.config(with_chain=False), timestamper=ca.timestamper())
+    storage, conn = FakeBucket(), FakeConn()
+    storage.objects["v/_sealing/e.pdf"] = b"not a pdf"
+
+    assert not worker.process_job(conn, _job(), context, storage)
+    columns, _ = conn.last_update()
+    assert columns["status"] == "failed"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Ledger export through the queue
+# ──────────────────────────────────────────────────────────────────────────────
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db, self.table, self.ops = db, table, []
+
+    def __getattr__(self, name):
+        def op(*args, **kwargs):
+            self.ops.append((name, args))
+            return self
+        return op
+
+    def execute(self):
+        self.db.queries.append(self)
+        is_select = any(name == "select" for name, _ in self.ops)
+        return SimpleNamespace(data=self.db.events if self.table == "ledger_events" and is_select else [])
+
+
+class FakeDB:
+    def __init__(self, n_events):
+        self.events = [
+            {"id": f"ev-{i}", "yacht_id": "yacht-1", "user_id": "user-0", "entity_id": f"wo-{i}",
+             "action": "add_note", "created_at": f"2026-03-01T00:00:{i:02d}Z"}
+            for i in range(n_events)
+        ]
+        self.queries, self.storage = [], FakeBucket()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def _spec():
+    from services.ledger_export import LedgerExportSpec
+    return LedgerExportSpec(
+        yacht_id="yacht-1", user_id="user-0", user_role="captain", department="deck",
+        requester_name="captain@example.com", scope="all", scope_label="All crew",
+        date_from="2026-03-01", date_to="2026-03-31", vessel_name="M/Y Test", export_secret="test-secret",
+    )
+
+async def test_sealed_ledger_export_goes_through_queue(ca, monkeypatch):
+    pytest.importorskip("fitz")
+    import services.ledger_export as ledger_export
+
+    async def inline_render(fn, *args):
+        return fn(*args)
+
+    context = build_sealing_context(ca.config(), timestamper=ca.timestamper(),
+                                    revocation=RevocationCache(fetch=FakeCRLServer(ca)))
+    storage = FakeBucket()
+    queue = {}
+
+    async def enqueue(db, **job):
+        assert set(storage.objects) == {job["source_path"]}  # only the staged copy exists
+        queue["job"] = dict(job, id="job-1", attempts=1, storage_bucket=job["bucket"])
+        return queue["job"]
+
+    async def wait(db, job_id):
+        result = await asyncio.to_thread(sealing_worker.seal_job, queue["job"], context, storage)
+        return {"id": job_id, "status": "completed", **result}
+
+    sealing_worker = pytest.importorskip("workers.sealing_worker")
+    monkeypatch.setattr(ledger_export, "run_render", inline_render)
+    monkeypatch.setattr(ledger_export, "enqueue_seal_job", enqueue)
+    monkeypatch.setattr(ledger_export, "wait_for_seal_job", wait)
+    monkeypatch.setenv("LEDGER_EXPORT_SEAL", "true")
+
+    db = FakeDB(5)
+    db.storage = storage
+    job = ledger_export.LedgerExportJob(export_id="0f0e0d0c-0000-4000-8000-000000000002",
+                                        yacht_id="yacht-1", user_id="user-0")
+    await ledger_export.run_ledger_export(job, db, _spec())
+
+    assert job.status == "completed", job.error
+    dest = queue["job"]["dest_path"]
+    assert queue["job"]["source_path"] == dest.replace("/", "/_sealing/")
+    assert list(storage.objects) == [dest] and storage.signed == [dest]
+    assert job.to_dict()["sealed"] and job.seal_job_id == "job-1"
+    assert job.to_dict()["file_size_bytes"] == len(storage.objects[dest])
+
+
+async def test_failed_seal_stores_nothing_public(monkeypatch):
+    pytest.importorskip("fitz")
+    import services.ledger_export as ledger_export
+
+    async def inline_render(fn, *args):
+        return fn(*args)
+
+    async def enqueue(db, **job):
+        return {"id": "job-1"}
+
+    async def wait(db, job_id):
+        return {"id": job_id, "status": "failed", "error": "Input validation failed"}
+
+    monkeypatch.setattr(ledger_export, "run_render", inline_render)
+    monkeypatch.setattr(ledger_export, "enqueue_seal_job", enqueue)
+    monkeypatch.setattr(ledger_export, "wait_for_seal_job", wait)
+    monkeypatch.setenv("LEDGER_EXPORT_SEAL", "true")
+
+    db = FakeDB(3)
+    job = ledger_export.LedgerExportJob(export_id="0f0e0d0c-0000-4000-8000-000000000003",
+                                        yacht_id="yacht-1", user_id="user-0")
+    await ledger_export.run_ledger_export(job, db, _spec())
+
+    assert job.status == "failed" and "Input validation failed" in job.error
+    assert db.storage.signed == []
+    assert not [q for q in db.queries if q.table == "ledger_exports"]
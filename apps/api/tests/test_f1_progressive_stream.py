@@ -0,0 +1,145 @@
+"""
+F1 Progressive Streaming Tests
+
+Covers the helpers behind ?progressive=true on /api/f1/search/stream:
+
+  * build_result_update produces a reconcilable diff (order/added/removed/moved/patched)
+  * apply_role_gate hides other users' HoR sign-offs from non-HOD roles
+  * attach_snippets moves search_text into payload['snippet'] without
+    mutating the shared payload dict (it is also held by the result cache)
+  * generate_snippet picks the densest window and bolds whole-word matches
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from routes.f1_search_streaming import (  # noqa: E402
+    apply_role_gate,
+    attach_snippets,
+    build_result_update,
+    generate_snippet,
+    get_snippet_matcher,
+    result_key,
+)
+from services.types import UserContext  # noqa: E402
+
+
+def _item(object_id: str, score: float = 0.5, object_type: str = "part", **payload):
+    return {
+        "object_type": object_type,
+        "object_id": object_id,
+        "fused_score": score,
+        "payload": dict(payload) or {"name": object_id},
+    }
+
+
+def _ctx(role: str = "crew", user_id: str = "user-a") -> UserContext:
+    return UserContext(user_id=user_id, org_id="org", yacht_id="yacht", role=role)
+
+
+class TestBuildResultUpdate:
+
+    def test_identical_lists_produce_empty_diff(self):
+        items = [_item("a"), _item("b")]
+        update = build_result_update(items, [dict(i) for i in items])
+        assert update["order"] == ["part:a", "part:b"]
+        assert update["added"] == []
+        assert update["removed"] == []
+        assert update["moved"] == []
+        assert update["patched"] == []
+
+    def test_reorder_reports_moves(self):
+        prev = [_item("a"), _item("b"), _item("c")]
+        curr = [prev[2], prev[0], prev[1]]
+        update = build_result_update(prev, curr)
+        assert update["order"] == ["part:c", "part:a", "part:b"]
+        assert {"key": "part:c", "from": 2, "to": 0} in update["moved"]
+        assert update["patched"] == []
+
+    def test_vector_only_hits_are_added_and_dropped_hits_removed(self):
+        prev = [_item("a"), _item("b")]
+        curr = [_item("a"), _item("v", object_type="document")]
+        update = build_result_update(prev, curr)
+        assert update["added"] == [curr[1]]
+        assert update["removed"] == ["part:b"]
+
+    def test_score_change_is_patched(self):
+        prev = [_item("a", score=0.016)]
+        curr = [_item("a", score=0.032)]
+        update = build_result_update(prev, curr)
+        assert update["patched"] == curr
+        assert update["moved"] == []
+
+    def test_client_can_rebuild_current_list(self):
+        prev = [_item("a"), _item("b"), _item("c")]
+        curr = [_item("c", score=0.9), _item("d"), _item("a")]
+        update = build_result_update(prev, curr)
+
+        client = {result_key(i): i for i in prev}
+        for key in update["removed"]:
+            client.pop(key)
+        for it in update["added"] + update["patched"]:
+            client[result_key(it)] = it
+        assert [client[k] for k in update["order"]] == curr
+
+
+class TestApplyRoleGate:
+
+    def test_crew_sees_only_own_signoffs(self):
+        items = [
+            _item("s1", object_type="hours_of_rest_signoff", user_id="user-a"),
+            _item("s2", object_type="hours_of_rest_signoff", user_id="user-b"),
+            _item("p1"),
+        ]
+        gated = apply_role_gate(items, _ctx("crew", "user-a"))
+        assert [i["object_id"] for i in gated] == ["s1", "p1"]
+
+    def test_hod_sees_all(self):
+        items = [_item("s2", object_type="hours_of_rest_signoff", user_id="user-b")]
+        assert apply_role_gate(items, _ctx("captain", "user-a")) == items
+
+
+class TestAttachSnippets:
+
+    def test_snippet_added_without_mutating_shared_payload(self):
+        shared_payload = {"name": "Oil filter"}
+        item = {
+            "object_type": "part",
+            "object_id": "p1",
+            "payload": shared_payload,
+            "search_text": "Oil filter element for main engine",
+        }
+        [out] = attach_snippets([item], "oil filter")
+        assert "search_text" not in out
+        assert "**Oil**" in out["payload"]["snippet"]
+        assert "snippet" not in shared_payload
+
+
+class TestGenerateSnippet:
+
+    def test_picks_window_where_terms_cluster(self):
+        text = ("Oil change log. " + "Routine inspection of the hull and deck fittings. " * 6
+                + "Replaced the caterpillar oil filter on the port main engine.")
+        snippet = generate_snippet(text, "caterpillar oil filter", max_length=80)
+        assert snippet.startswith("...")
+        assert "**caterpillar** **oil** **filter**" in snippet
+
+    def test_highlights_whole_words_only(self):
+        snippet = generate_snippet("Foil wrap, oil_can, OIL and oil.", "oil")
+        assert snippet == "Foil wrap, oil_can, **OIL** and **oil**."
+
+    def test_short_text_and_no_terms(self):
+        assert generate_snippet("Oil", "oil") == "**Oil**"
+        assert generate_snippet("Oil filter", "a") is None
+        assert generate_snippet("Hull survey", "pump") == "Hull survey"
+
+    def test_matcher_prepared_once_per_query(self):
+        assert get_snippet_matcher("oil filter") is get_snippet_matcher("oil filter")
+        assert get_snippet_matcher("oil filter oil").terms == ["filter", "oil"]
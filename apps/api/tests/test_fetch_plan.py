@@ -0,0 +1,80 @@
+"""
+Unit tests for apps/api/lib/fetch_plan.py
+
+Contracts exercised:
+
+  * Sections run concurrently (wall time ≈ slowest section, not the sum)
+  * A section that raises degrades to its default and is reported as failed
+  * A section that overruns its budget is cancelled, defaulted and reported
+  * Results come back in declaration order regardless of completion order
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lib.fetch_plan import run_fetch_plan  # noqa: E402
+
+
+def _after(delay: float, value):
+    async def _section():
+        await asyncio.sleep(delay)
+        return value
+    return _section
+
+
+async def test_sections_run_concurrently():
+    start = time.monotonic()
+    values, meta = await run_fetch_plan({
+        "a": (_after(0.1, 1), 0),
+        "b": (_after(0.1, 2), 0),
+        "c": (_after(0.1, 3), 0),
+    })
+    elapsed = time.monotonic() - start
+    assert values == {"a": 1, "b": 2, "c": 3}
+    assert elapsed < 0.25
+    assert not meta.partial
+
+
+async def test_failing_section_uses_default():
+    async def boom():
+        raise RuntimeError("relation does not exist")
+
+    values, meta = await run_fetch_plan({
+        "ok": (_after(0, ["row"]), []),
+        "bad": (boom, {"count": 0, "items": []}),
+    })
+    assert values["ok"] == ["row"]
+    assert values["bad"] == {"count": 0, "items": []}
+    assert meta.partial
+    assert meta.failed == ["bad"]
+    assert meta.timed_out == []
+
+
+async def test_slow_section_times_out():
+    values, meta = await run_fetch_plan(
+        {
+            "fast": (_after(0, "x"), None),
+            "slow": (_after(5, "late"), None),
+        },
+        timeout_s=0.05,
+    )
+    assert values == {"fast": "x", "slow": None}
+    assert meta.timed_out == ["slow"]
+    assert meta.total_ms < 1000
+
+
+async def test_declaration_order_preserved():
+    values, _ = await run_fetch_plan({
+        "first": (_after(0.05, 1), 0),
+        "second": (_after(0, 2), 0),
+    })
+    assert list(values) == ["first", "second"]
@@ -331,3 +331,59 @@ class TestSimilarity:
     def test_dissimilar(self):
         sim = FileReferenceResolver._simple_similarity("abc", "xyz")
         assert sim < 0.3
+
+
+# =============================================================================
+# Tests: Indexed matching agrees with a linear scan
+# =============================================================================
+
+class TestIndexedMatching:
+    def _linear_fuzzy(self, docs, reference):
+        stem = os.path.splitext(reference)[0]
+        candidates = []
+        for doc in docs:
+            sim = FileReferenceResolver._simple_similarity(stem, os.path.splitext(doc["filename"])[0])
+            if sim >= FUZZY_THRESHOLD:
+                candidates.append((sim, doc))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        return candidates[0] if candidates else None
+
+    def test_fuzzy_index_matches_linear_scan(self):
+        import random
+        rng = random.Random(7)
+        words = ["pump", "engine", "gen", "main", "dwg", "manual", "valve", "spec", "mtu", "oil"]
+
+        def name():
+            return "_".join(rng.choice(words) for _ in range(rng.randint(1, 4))) + f"-{rng.randint(0, 99)}.pdf"
+
+        docs = [{"id": f"doc-{i}", "filename": name(), "storage_path": f"/d/{i}", "document_type": "manual"}
+                for i in range(300)]
+        resolver = FileReferenceResolver(make_mock_supabase(docs), TEST_YACHT_ID)
+        resolver._load_doc_cache()
+
+        for reference in [name() for _ in range(200)] + ["x.pdf", "pmup_manaul.pdf"]:
+            expected = self._linear_fuzzy(docs, reference)
+            got = resolver._match_fuzzy(reference, None)
+            if expected is None:
+                assert got is None
+            else:
+                assert got[1]["id"] == expected[1]["id"]
+                assert got[0] == pytest.approx(expected[0])
+
+    def test_path_suffix_prefers_first_document(self):
+        docs = [
+            {"id": "doc-1", "filename": "a.pdf", "storage_path": "y/x/pump_manual.pdf", "document_type": "manual"},
+            {"id": "doc-2", "filename": "b.pdf", "storage_path": "y/z/manual.pdf", "document_type": "manual"},
+        ]
+        resolver = FileReferenceResolver(make_mock_supabase(docs), TEST_YACHT_ID)
+        # Plain string suffix, not path component — doc-1 also ends with "manual.pdf"
+        assert resolver.resolve("manual.pdf").document_id == "doc-1"
+        assert resolver.resolve("z/manual.pdf").document_id == "doc-2"
+
+    def test_repeated_references_are_memoised(self):
+        sb = make_mock_supabase(ALL_DOCS)
+        resolver = FileReferenceResolver(sb, TEST_YACHT_ID)
+        refs = [{"raw_reference": "cat3516_maintenance.pdf", "csv_row": i} for i in range(50)]
+        results = resolver.resolve_batch(refs)
+        assert [r.csv_row for r in results] == list(range(50))
+        assert len(resolver._memo) == 1
@@ -0,0 +1,150 @@
+"""
+Tests for Graph JSON $batch support (integrations/graph_client.py) and its
+use for attachment metadata in services/email_sync_service.py.
+
+Contracts exercised:
+
+  * graph_batch sends at most 20 sub-requests per call and returns results
+    in request order
+  * Throttled sub-requests are retried on their own after Retry-After; a
+    failed $batch call raises GraphApiError
+  * A delta page with attachments costs one $batch call instead of one
+    request per message
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import services.email_sync_service as email_sync  # noqa: E402
+from integrations.graph_client import (  # noqa: E402
+    GraphApiError, GraphReadClient, TokenPurposeMismatchError, graph_batch,
+)
+from services.ms_graph_rate_limiter import GraphCallBudget, MicrosoftRateLimiter  # noqa: E402
+
+
+def _batch_transport(calls, throttle_once=()):
+    throttled = set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if not request.url.path.endswith("/$batch"):
+            return httpx.Response(404)
+        responses = []
+        for sub in json.loads(request.content)["requests"]:
+            if sub["id"] in throttle_once and sub["id"] not in throttled:
+                throttled.add(sub["id"])
+                responses.append({"id": sub["id"], "status": 429, "headers": {"Retry-After": "0"}})
+            else:
+                responses.append({"id": sub["id"], "status": 200, "body": {"url": sub["url"]}})
+        return httpx.Response(200, json={"responses": list(reversed(responses))})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def test_graph_batch_chunks_and_keeps_order():
+    calls = []
+    client = _batch_transport(calls, throttle_once={"3"})
+    requests = [{"method": "GET", "url": f"/me/messages/m{i}"} for i in range(45)]
+
+    results = await graph_batch(
+        lambda payload: client.post("https://graph.test/v1.0/$batch", json=payload), requests
+    )
+
+    assert [r["body"]["url"] for r in results] == [r["url"] for r in requests]
+    assert all(r["status"] == 200 for r in results)
+    sizes = [len(json.loads(c.content)["requests"]) for c in calls]
+    assert sizes == [20, 20, 5, 1]  # 3 chunks + the throttled sub-request alone
+
+
+async def test_graph_batch_raises_on_failed_call():
+    async def post(payload):
+        return httpx.Response(400, text="bad batch")
+
+    with pytest.raises(GraphApiError) as exc:
+        await graph_batch(post, [{"method": "GET", "url": "/me"}])
+    assert exc.value.status_code == 400
+
+
+async def test_read_client_batch_is_get_only():
+    client = GraphReadClient(MagicMock(), "u1", "y1")
+    with pytest.raises(TokenPurposeMismatchError):
+        await client.batch([{"method": "POST", "url": "/me/sendMail"}])
+
+
+async def test_sync_folder_batches_attachment_metadata(monkeypatch):
+    page = {
+        "value": [
+            {"id": f"m{i}", "conversationId": "c", "hasAttachments": i != 1} for i in range(3)
+        ],
+        "@odata.deltaLink": "https://graph.microsoft.com/v1.0/delta?token=next",
+    }
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path.endswith("/$batch"):
+            return httpx.Response(200, json={"responses": [
+                {"id": sub["id"], "status": 200, "body": {"value": [
+                    {"id": "a1", "name": "manual.pdf", "contentType": "application/pdf", "size": 10},
+                ]}}
+                for sub in json.loads(request.content)["requests"]
+            ]})
+        return httpx.Response(200, json=page)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(email_sync, "get_graph_http_client", lambda: client)
+
+    sb = MagicMock()
+    service = email_sync.EmailSyncService(sb, "token")
+    service.rate_limiter = MicrosoftRateLimiter(sb, budget=GraphCallBudget(100, app_burst=1000, app_rate=1000))
+    fetched = {}
+
+    async def process(yacht_id, watcher_id, msg, folder, prefetched=None):
+        if msg.get("hasAttachments"):
+            fetched[msg["id"]] = await service._fetch_attachment_metadata(msg["id"], prefetched)
+        return "thread-1"
+
+    service._process_message = process
+    result = await service.sync_folder("u1", "y1", "w1", "inbox")
+
+    assert result["synced"] == 3 and result["api_calls"] == 2
+    assert [c.url.path.rsplit("/", 1)[-1] for c in calls] == ["delta", "$batch"]
+    assert fetched["m2"] == [{"id": "a1", "name": "manual.pdf", "contentType": "application/pdf", "size": 10}]
+    assert set(fetched) == {"m0", "m2"}
+
+
+async def test_prefetch_skips_stored_messages_and_returns_page_map():
+    batched = []
+
+    async def post(payload):
+        batched.extend(sub["url"] for sub in payload["requests"])
+        return httpx.Response(200, json={"responses": [
+            {"id": sub["id"], "status": 200, "body": {"value": [{"id": "a", "name": sub["url"].split("/")[3]}]}}
+            for sub in payload["requests"]
+        ]})
+
+    sb = MagicMock()
+    sb.table.return_value.select.return_value.eq.return_value.in_.return_value.execute.return_value = \
+        MagicMock(data=[{"provider_message_id": "m0"}])
+    service = email_sync.EmailSyncService(sb, "token")
+    service.rate_limiter = MicrosoftRateLimiter(sb, budget=GraphCallBudget(100, app_burst=1000, app_rate=1000))
+    client = MagicMock(post=lambda url, **kw: post(kw["json"]))
+
+    inbox = [{"id": "m0", "hasAttachments": True}, {"id": "m1", "hasAttachments": True}]
+    calls, inbox_map = await service._prefetch_attachment_metadata(client, "u1", "y1", "w1", inbox)
+    assert calls == 1
+    assert [url.split("/")[3] for url in batched] == ["m1"]
+
+    # Another folder's page (synced concurrently) leaves the inbox page's map intact
+    _, sent_map = await service._prefetch_attachment_metadata(
+        client, "u1", "y1", "w1", [{"id": "m2", "hasAttachments": True}]
+    )
+    assert set(inbox_map) == {"m1"} and set(sent_map) == {"m2"}
+    assert (await service._fetch_attachment_metadata("m1", inbox_map))[0]["name"] == "m1"
@@ -0,0 +1,156 @@
+"""
+Unit tests for services/import_bulk.py and the import_service dispatch to it.
+
+Contracts exercised:
+
+  * COPY text encoding escapes tabs/newlines/backslashes, drops NUL and
+    writes NULL as \\N; CopyStream serves lines lazily in read(size) chunks
+  * commit_domain with a DSN stages rows via COPY and inserts/indexes them
+    set-based in one transaction, mapping file refs to the inserted ids
+  * set_rollback is one soft-delete UPDATE plus set-based cleanup
+  * The PostgREST fallback resolves faults' equipment_ref and skips rows
+    that do not match any equipment
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import services.import_bulk as import_bulk  # noqa: E402
+from services.import_bulk import CopyStream, copy_field  # noqa: E402
+from services.import_service import commit_domain, rollback_domain  # noqa: E402
+
+YACHT = "85fe1119-b04c-41ac-80f1-829d23322598"
+SESSION = "0b7f6c1e-0000-4000-8000-000000000001"
+
+
+def _fake_conn(fetchall=None, rowcount=0):
+    conn = MagicMock()
+    conn.__enter__.return_value = conn
+    cur = MagicMock()
+    cur.__enter__.return_value = cur
+    cur.rowcount = rowcount
+    cur.fetchall.return_value = fetchall or []
+    copied = []
+
+    def copy_expert(statement, stream):
+        copied.append(stream.read(7) + stream.read())
+        cur.rowcount = copied[-1].count(b"\n")
+
+    cur.copy_expert.side_effect = copy_expert
+    conn.cursor.return_value = cur
+    return conn, cur, copied
+
+
+def _statements(cur):
+    return [" ".join(str(c.args[0]).split()) for c in cur.execute.call_args_list]
+
+
+def test_copy_field_encoding():
+    assert copy_field(None) == "\\N"
+    assert copy_field(True) == "t" and copy_field(False) == "f"
+    assert copy_field(12.5) == "12.5"
+    assert copy_field("a\tb\nc\\d\r\x00e") == "a\\tb\\nc\\\\d\\re"
+
+
+def test_copy_stream_reads_lazily():
+    produced = []
+
+    def lines():
+        for i in range(3):
+            produced.append(i)
+            yield f"row{i}\n"
+
+    stream = CopyStream(lines())
+    assert stream.read(4) == b"row0"
+    assert produced == [0]
+    assert stream.read() == b"\nrow1\nrow2\n"
+    assert stream.read(10) == b""
+
+
+def test_commit_domain_uses_copy_path(monkeypatch):
+    rows = [{"equip_name": "Main Engine", "doc": "manual.pdf"}, {"equip_name": "Watermaker", "doc": ""}]
+    column_map = [
+        {"source": "equip_name", "target": "name", "action": "map"},
+        {"source": "doc", "target": "_file_ref:doc", "action": "map"},
+    ]
+    captured_ids = []
+
+    def fake_bulk(dsn, table, object_type, rows_iter, yacht_id, session_id, search_text_fn):
+        staged = list(rows_iter)
+        captured_ids.extend(r["id"] for r in staged)
+        assert table == "pms_equipment" and object_type == "equipment"
+        assert search_text_fn(staged[0]) == "Main Engine"
+        return {staged[0]["id"]}  # second row "failed"
+
+    resolution = MagicMock(resolved=True, csv_row=0, column="doc", document_id="doc-1",
+                           storage_path="y/manual.pdf", filename="manual.pdf",
+                           raw_reference="manual.pdf", match_type="exact", confidence=1.0)
+    sb = MagicMock()
+    with patch("services.import_service.bulk_commit", side_effect=fake_bulk), \
+         patch("services.import_service.resolve_file_references", return_value=[resolution]):
+        count, ids = commit_domain(rows, column_map, "equipment", "generic", YACHT, SESSION, sb,
+                                   db_dsn="postgresql://x")
+
+    assert count == 1 and ids == [captured_ids[0]]
+    # No PostgREST inserts for entities; the link goes in one batch
+    tables = [c.args[0] for c in sb.table.call_args_list]
+    assert "pms_equipment" not in tables and tables.count("pms_attachments") == 1
+    link = sb.table.return_value.insert.call_args.args[0]
+    assert link[0]["entity_id"] == captured_ids[0]
+
+
+def test_bulk_commit_sql_sequence(monkeypatch):
+    conn, cur, copied = _fake_conn(fetchall=[("id-1",)])
+    monkeypatch.setattr(import_bulk.psycopg2, "connect", lambda dsn: conn)
+    monkeypatch.setattr(import_bulk.sql.Composed, "as_string", lambda self, ctx: repr(self))
+    rows = iter([
+        {"id": "id-1", "yacht_id": YACHT, "title": "Leak\tnear pump", "equipment_ref": "ME-1"},
+        {"id": "id-2", "yacht_id": YACHT, "title": "Noise", "equipment_ref": "unknown"},
+    ])
+    inserted = import_bulk.bulk_commit("dsn", "pms_faults", "fault", rows, YACHT, SESSION, lambda r: r["title"])
+
+    assert inserted == {"id-1"}
+    assert copied[0].split(b"\n")[0] == f"id-1\t{YACHT}\tLeak\\tnear pump\t\\N\tME-1\tLeak\\tnear pump".encode()
+    statements = " | ".join(_statements(cur))
+    order = ["statement_timeout", "CREATE TEMP TABLE", "ALTER TABLE", "UPDATE",
+             "INSERT INTO", "SAVEPOINT search_index", "search_index", "RELEASE"]
+    positions = [statements.index(token) for token in order]
+    assert positions == sorted(positions)
+    assert "equipment_id IS NOT NULL" in statements
+    conn.close.assert_called_once()
+
+
+def test_rollback_domain_set_based(monkeypatch):
+    conn, cur, _ = _fake_conn(rowcount=8)
+    monkeypatch.setattr(import_bulk.psycopg2, "connect", lambda dsn: conn)
+    assert rollback_domain("equipment", SESSION, YACHT, MagicMock(), db_dsn="dsn") == 8
+    statements = _statements(cur)
+    assert sum(1 for s in statements if "SAVEPOINT cleanup" in s and "RELEASE" not in s) == 3
+    # One statement per table, not one per rolled-back id
+    assert len(statements) == 2 + 3 * 3
+
+
+def test_rest_fallback_resolves_equipment_ref():
+    sb = MagicMock()
+    equipment = sb.table.return_value.select.return_value.eq.return_value.is_.return_value
+    equipment.range.return_value.execute.return_value = MagicMock(data=[
+        {"id": "eq-1", "code": "ME-1", "source_id": None, "name": "Main Engine"},
+        {"id": "eq-2", "code": "GEN", "source_id": "me-1", "name": "Generator"},
+    ])
+    sb.table.return_value.insert.return_value.execute.side_effect = lambda: MagicMock(
+        data=sb.table.return_value.insert.call_args.args[0]
+    )
+    rows = [{"t": "Leak", "eq": "me-1"}, {"t": "Noise", "eq": "Generator"}, {"t": "Smoke", "eq": "Nope"}]
+    column_map = [
+        {"source": "t", "target": "title", "action": "map"},
+        {"source": "eq", "target": "equipment_ref", "action": "map"},
+    ]
+    count, _ = commit_domain(rows, column_map, "faults", "generic", YACHT, SESSION, sb, db_dsn=None)
+
+    assert count == 2
+    inserted = sb.table.return_value.insert.call_args_list[0].args[0]
+    assert [r["equipment_id"] for r in inserted] == ["eq-1", "eq-2"]  # code wins over source_id
+    assert all("equipment_ref" not in r for r in inserted)
@@ -0,0 +1,118 @@
+"""
+Tests for decode_jwt in middleware/auth.py: verified-token cache and
+single-pass secret selection.
+
+Contracts exercised:
+
+  * A repeat token is served from the cache; a new token costs exactly one
+    full verification, whichever secret signed it
+  * Cache entries end at exp and the cache is bounded
+  * Bad signatures and expired tokens still fail with 401 and are not cached
+"""
+
+import os
+import sys
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import middleware.auth as auth  # noqa: E402
+
+MASTER, TENANT = "master-secret-" + "m" * 32, "tenant-secret-" + "t" * 32
+TENANT_ISS = "https://tenant-ref.supabase.co/auth/v1"
+
+
+def _token(secret, sub="user-1", iss=TENANT_ISS, exp_in=3600, **claims):
+    payload = {"sub": sub, "aud": "authenticated", "iss": iss, "exp": int(time.time()) + exp_in, **claims}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+@pytest.fixture
+def attempts(monkeypatch):
+    monkeypatch.setattr(auth, "MASTER_SUPABASE_JWT_SECRET", MASTER)
+    monkeypatch.setattr(auth, "TENANT_SUPABASE_JWT_SECRET", TENANT)
+    monkeypatch.setattr(auth, "SUPABASE_JWT_SECRET", MASTER)
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(token, key=None, *args, **kwargs):
+        calls.append(key)
+        return real_decode(token, key, *args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    auth.clear_jwt_cache()
+    yield calls
+    auth.clear_jwt_cache()
+
+
+def test_repeat_token_is_served_from_cache(attempts):
+    token = _token(MASTER, iss=auth.MASTER_SUPABASE_URL + "/auth/v1")
+
+    first = auth.decode_jwt(token)
+    assert auth.decode_jwt(token) == first and first["sub"] == "user-1"
+    assert attempts == [MASTER]
+
+
+def test_only_the_signing_secret_is_verified(attempts):
+    assert auth.decode_jwt(_token(TENANT, sub="a"))["sub"] == "a"
+    assert attempts == [TENANT]
+
+    with pytest.raises(HTTPException):
+        auth.decode_jwt(_token(TENANT, sub="a") + "x")  # tampered: every secret tried, as before
+    assert attempts[1:] == [MASTER, TENANT]
+
+
+def test_entries_end_at_exp_and_cache_is_bounded(attempts, monkeypatch):
+    token = _token(MASTER, exp_in=60)
+    auth.decode_jwt(token)
+    digest = auth.hashlib.sha256(token.encode()).digest()
+    assert auth._cached_claims(digest) is not None
+
+    real_time = time.time
+    with monkeypatch.context() as later:
+        later.setattr(auth.time, "time", lambda: real_time() + 61)
+        assert auth._cached_claims(digest) is None
+
+    monkeypatch.setattr(auth, "JWT_CACHE_MAX_SIZE", 2)
+    tokens = [_token(MASTER, sub=f"u{i}") for i in range(3)]
+    for t in tokens:
+        auth.decode_jwt(t)
+    assert len(auth._verified_tokens) == 2
+    assert auth._cached_claims(auth.hashlib.sha256(tokens[0].encode()).digest()) is None
+
+
+def test_invalid_tokens_are_rejected_and_not_cached(attempts):
+    forged = _token("wrong-secret-" + "x" * 32)
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            auth.decode_jwt(forged)
+        assert exc.value.status_code == 401
+    assert len(attempts) == 4  # MASTER + TENANT, twice
+
+    with pytest.raises(HTTPException) as exc:
+        auth.decode_jwt(_token(MASTER, exp_in=-10))
+    assert exc.value.detail == "Token expired"
+    assert not auth._verified_tokens
+
+
+def test_cached_decode_is_faster(attempts):
+    token = _token(TENANT)
+    n = 2000
+
+    start = time.perf_counter()
+    for _ in range(n):
+        auth.clear_jwt_cache()
+        auth.decode_jwt(token)
+    uncached = time.perf_counter() - start
+
+    auth.decode_jwt(token)
+    start = time.perf_counter()
+    for _ in range(n):
+        auth.decode_jwt(token)
+    cached = time.perf_counter() - start
+
+    assert cached * 3 < uncached, f"cached {cached / n * 1e6:.1f}µs vs uncached {uncached / n * 1e6:.1f}µs"
@@ -0,0 +1,167 @@
+"""
+Tests for ledger evidence export jobs (services/ledger_export.py) and the
+render process pool (services/render_pool.py).
+
+Contracts exercised:
+
+  * Events are fetched in keyset pages (created_at, id), never in one select
+  * The spooled JSON is byte-identical to the old in-memory json.dumps
+  * A job runs fetch → render → upload → record and reports progress; raw
+    IDs never reach the embedded JSON
+  * Renders run in a separate process
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import services.ledger_export as ledger_export  # noqa: E402
+from services.ledger_export import (  # noqa: E402
+    JsonArrayWriter, LedgerExportJob, LedgerExportSpec, iter_event_pages, mask_event, run_ledger_export,
+)
+from services.render_pool import run_render, shutdown_render_pool  # noqa: E402
+
+SECRET = "test-secret"
+
+
+def _events(n):
+    return [
+        {
+            "id": f"ev-{i:04d}",
+            "yacht_id": "yacht-1",
+            "user_id": f"user-{i % 3}",
+            "entity_id": f"wo-{i}",
+            "actor_name": "Chief Engineer · Müller",
+            "action": "add_note",
+            "created_at": f"2026-03-01T00:{i // 60:02d}:{i % 60:02d}Z",
+            "metadata": {"note": f"line {i}\nsecond line"},
+        }
+        for i in range(n)
+    ]
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db, self.table, self.ops = db, table, []
+
+    def __getattr__(self, name):
+        def op(*args, **kwargs):
+            self.ops.append((name, args))
+            return self
+        return op
+
+    def execute(self):
+        self.db.queries.append(self)
+        if self.table != "ledger_events" or not any(name == "select" for name, _ in self.ops):
+            return SimpleNamespace(data=[])
+        limit = next((args[0] for name, args in self.ops if name == "limit"), None)
+        rows = self.db.events
+        seek = next((args[0] for name, args in self.ops if name == "or_"), None)
+        if seek:
+            last = next(i for i, e in enumerate(rows) if f'"{e["id"]}"' in seek)
+            rows = rows[last + 1:]
+        rng = next((args for name, args in self.ops if name == "range"), None)
+        if rng:
+            rows = rows[rng[0]:rng[1] + 1]
+        return SimpleNamespace(data=rows[:limit] if limit else rows)
+
+
+class FakeStorage:
+    def __init__(self):
+        self.uploads = {}
+
+    def from_(self, bucket):
+        return self
+
+    def upload(self, path, file, file_options):
+        self.uploads[path] = file.read()
+
+    def create_signed_url(self, path, expires_in):
+        return {"signedURL": f"https://storage.test/{path}?token=x"}
+
+
+class FakeDB:
+    def __init__(self, events):
+        self.events = events
+        self.queries = []
+        self.storage = FakeStorage()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def _spec(**overrides):
+    values = dict(
+        yacht_id="yacht-1", user_id="user-0", user_role="captain", department="deck",
+        requester_name="captain@example.com", scope="all", scope_label="All crew",
+        date_from="2026-03-01", date_to="2026-03-31", vessel_name="M/Y Test", export_secret=SECRET,
+    )
+    values.update(overrides)
+    return LedgerExportSpec(**values)
+
+
+async def test_events_are_fetched_in_keyset_pages():
+    db = FakeDB(_events(25))
+    pages = [page async for page in iter_event_pages(db, _spec(), page_size=10)]
+
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert [e["id"] for p in pages for e in p] == [e["id"] for e in db.events]
+    event_queries = [q for q in db.queries if q.table == "ledger_events"]
+    assert not any(name == "or_" for name, _ in event_queries[0].ops)
+    assert all(any(name == "or_" for name, _ in q.ops) for q in event_queries[1:])
+
+
+@pytest.mark.parametrize("count", [0, 1, 4])
+def test_spooled_json_matches_json_dumps(tmp_path, count):
+    masked = [mask_event(e, SECRET) for e in _events(count)]
+    path = tmp_path / "events.json"
+    with open(path, "w", encoding="utf-8") as fh:
+        writer = JsonArrayWriter(fh)
+        for item in masked:
+            writer.write(item)
+        writer.close()
+
+    expected = json.dumps(masked, sort_keys=True, ensure_ascii=False, indent=2)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+async def test_export_job_runs_end_to_end(monkeypatch):
+    fitz = pytest.importorskip("fitz")
+
+    async def inline_render(fn, *args):
+        return fn(*args)
+
+    monkeypatch.setattr(ledger_export, "run_render", inline_render)
+    monkeypatch.setattr(ledger_export, "LEDGER_EXPORT_PAGE_SIZE", 7)
+    monkeypatch.delenv("LEDGER_EXPORT_SEAL", raising=False)
+
+    db = FakeDB(_events(20))
+    job = LedgerExportJob(export_id="0f0e0d0c-0000-4000-8000-000000000001", yacht_id="yacht-1", user_id="user-0")
+    await run_ledger_export(job, db, _spec())
+
+    assert job.status == "completed", job.error
+    assert job.to_dict()["event_count"] == 20
+    assert job.to_dict()["download_url"].startswith("https://storage.test/")
+
+    [(path, pdf_bytes)] = db.storage.uploads.items()
+    assert "yacht-1" not in path
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    embedded = json.loads(doc.embfile_get("ledger_events.json"))
+    assert [e["event_timestamp"] for e in embedded] == sorted(e["created_at"] for e in db.events)
+    assert not any(key in e for e in embedded for key in ("id", "user_id", "yacht_id", "entity_id"))
+
+    recorded = [q for q in db.queries if q.table == "ledger_exports"]
+    assert recorded and recorded[0].ops[0][1][0]["event_count"] == 20
+
+
+async def test_render_runs_in_separate_process():
+    try:
+        child_pid = await run_render(os.getpid)
+    finally:
+        shutdown_render_pool()
+    assert child_pid != os.getpid()
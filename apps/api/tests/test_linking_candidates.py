@@ -0,0 +1,104 @@
+"""
+Tests for batched candidate lookups and the concurrent linking ladder
+(services/candidate_finder.py, services/linking_ladder.py).
+
+Contracts exercised:
+
+  * Each token type is looked up with one OR-filtered query, not one query
+    per token value
+  * Rows matched by several tokens are returned once
+  * A confident L1 match returns without waiting for the slower rungs
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.candidate_finder import CandidateFinder, _ilike_any  # noqa: E402
+from services.linking_ladder import LinkingLadder  # noqa: E402
+
+
+def _supabase(rows_by_table):
+    sb = MagicMock()
+
+    def table(name):
+        query = MagicMock()
+        for method in ("select", "eq", "neq", "or_", "in_", "order", "limit", "ilike"):
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=rows_by_table.get(name, []))
+        return query
+
+    sb.table.side_effect = table
+    sb.queries = lambda name: [c for c in sb.table.call_args_list if c.args[0] == name]
+    return sb
+
+
+def test_ilike_any_quotes_values():
+    assert _ilike_any("wo_number", ["WO-1", 'a"b']) == 'wo_number.ilike."%WO-1%",wo_number.ilike."%a\\"b%"'
+
+
+async def test_work_orders_use_one_query_and_dedupe():
+    row = {"id": "wo-1", "wo_number": "WO-1234", "title": "Pump", "status": "open"}
+    sb = _supabase({"pms_work_orders": [row, row]})
+    finder = CandidateFinder(sb)
+
+    candidates = await finder.find_work_order_candidates(
+        "yacht-a", {"wo_id": ["1234"], "wo_number": ["WO-1234", "WO-1234"]}, {}
+    )
+
+    assert len(sb.queries("pms_work_orders")) == 1
+    assert [c["object_id"] for c in candidates] == ["wo-1"]
+    assert candidates[0]["match_value"] == "1234"
+
+
+async def test_parts_classify_part_and_oem_matches():
+    sb = _supabase({"pms_parts": [
+        {"id": "p1", "part_number": "AB-100", "name": "Filter", "manufacturer": "X"},
+        {"id": "p2", "part_number": "ZZ-9", "name": "Seal", "manufacturer": "Y"},
+    ]})
+    finder = CandidateFinder(sb)
+
+    candidates = await finder.find_part_candidates(
+        "yacht-a", {"part_number": ["AB-100"], "oem_number": ["ZZ-9"]}
+    )
+
+    assert len(sb.queries("pms_parts")) == 1
+    reasons = {c["object_id"]: c["match_reason"] for c in candidates}
+    assert reasons == {"p1": "part_number_match", "p2": "oem_number_match"}
+
+
+async def test_l1_match_returns_without_waiting_for_other_rungs():
+    ladder = LinkingLadder(MagicMock())
+    slow_started = asyncio.Event()
+    slow_cancelled = asyncio.Event()
+
+    async def slow(*args, **kwargs):
+        slow_started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            slow_cancelled.set()
+            raise
+
+    async def l1(yacht_id, tokens):
+        await slow_started.wait()
+        return {"candidate": {"label": "WO-1234: Pump", "score": 135}, "all_candidates": [], "action": "auto_link"}
+
+    async def save(*args):
+        return None
+
+    ladder._save_extracted_tokens = save
+    ladder._check_l1_explicit_ids = l1
+    ladder._check_l2_procurement = slow
+    ladder._check_l25_hybrid = slow
+    ladder._check_l3_parts_equipment = slow
+
+    result = await asyncio.wait_for(
+        ladder.determine_primary("yacht-a", "thread-1", "Re: WO-1234", "chief@example.com"), 1
+    )
+
+    assert result["level"] == "L1"
+    assert slow_cancelled.is_set()
@@ -0,0 +1,184 @@
+"""
+Unit tests for apps/api/lib/pagination.py and its use in handlers/list_handlers.py
+
+Contracts exercised:
+
+  * Cursors round-trip and are rejected when tampered with or minted for a
+    different sort order
+  * A cursor page seeks with an (sort_col, id) keyset filter and no offset
+  * next_cursor is only emitted for a full page with a non-null sort key
+  * Estimated totals are fetched once and served from cache afterwards
+  * ListHandlers return next_cursor and surface a bad cursor as a
+    VALIDATION_ERROR instead of a 500
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lib.pagination import (  # noqa: E402
+    InvalidCursor,
+    PageRequest,
+    clear_count_cache,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    total_count_key,
+)
+from handlers.list_handlers import ListHandlers  # noqa: E402
+
+
+YACHT = "yacht-uuid-test"
+
+
+class RecordingQuery:
+    """Chainable builder that records every call and returns canned rows."""
+
+    def __init__(self, rows=None, count=None):
+        self.calls = []
+        self._rows = rows or []
+        self._count = count
+
+    def __getattr__(self, name):
+        def _method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return _method
+
+    @property
+    def not_(self):
+        return self
+
+    def execute(self):
+        response = MagicMock()
+        response.data = self._rows
+        response.count = self._count
+        return response
+
+    def names(self):
+        return [c[0] for c in self.calls]
+
+
+class RecordingClient:
+    def __init__(self, query: RecordingQuery):
+        self.query = query
+
+    def table(self, _name):
+        return self.query
+
+
+@pytest.fixture(autouse=True)
+def _fresh_count_cache():
+    clear_count_cache()
+    yield
+    clear_count_cache()
+
+
+def _rows(n, start=0):
+    return [
+        {"id": f"id-{i:03d}", "created_at": f"2026-01-01T00:00:{i:02d}+00:00", "name": f"n{i}"}
+        for i in range(start, start + n)
+    ]
+
+
+def test_cursor_round_trip():
+    token = encode_cursor("created_at", True, "2026-01-01T00:00:00+00:00", "abc")
+    assert "=" not in token
+    assert decode_cursor(token) == {"c": "created_at", "d": True, "v": "2026-01-01T00:00:00+00:00", "id": "abc"}
+
+
+@pytest.mark.parametrize("bad", ["not-base64!!", encode_cursor("created_at", True, None, "x")[:-3] + "zzz"])
+def test_malformed_cursor_rejected(bad):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(bad)
+
+
+def test_cursor_for_other_sort_order_rejected():
+    token = encode_cursor("created_at", True, "2026-01-01", "abc")
+    with pytest.raises(InvalidCursor):
+        PageRequest.from_params({"cursor": token, "order_by": "name", "order_dir": "asc"})
+
+
+def test_keyset_filter_quotes_values():
+    expr = keyset_filter("created_at", True, "2026-01-01T00:00:00+00:00", "abc")
+    assert expr == (
+        'created_at.lt."2026-01-01T00:00:00+00:00",'
+        'and(created_at.eq."2026-01-01T00:00:00+00:00",id.lt."abc")'
+    )
+    assert keyset_filter("name", False, "x", "1").startswith('name.gt."x"')
+
+
+def test_cursor_page_seeks_without_offset():
+    token = encode_cursor("created_at", True, "2026-01-01T00:00:09+00:00", "id-009")
+    page = PageRequest.from_params({"cursor": token, "limit": 10, "offset": 500})
+    query = page.apply(RecordingQuery())
+
+    assert page.offset == 0
+    assert ("order", ("created_at",), {"desc": True}) in query.calls
+    assert ("order", ("id",), {"desc": True}) in query.calls
+    assert "or_" in query.names()
+    assert "range" not in query.names()
+    assert ("limit", (10,), {}) in query.calls
+
+
+def test_offset_page_still_supported():
+    page = PageRequest.from_params({"limit": 10, "offset": 20})
+    query = page.apply(RecordingQuery())
+    assert ("range", (20, 29), {}) in query.calls
+    assert "or_" not in query.names()
+
+
+def test_next_cursor_only_for_full_pages():
+    page = PageRequest.from_params({"limit": 3})
+    assert page.next_cursor(_rows(2)) is None
+    token = page.next_cursor(_rows(3))
+    assert decode_cursor(token)["id"] == "id-002"
+    assert page.next_cursor([{"id": "x", "created_at": None}] * 3) is None
+
+
+def test_estimated_total_is_cached():
+    key = total_count_key("pms_work_orders", YACHT, {"status": "open"})
+    page = PageRequest.from_params({"limit": 10})
+    assert page.count_method(key) == "estimated"
+
+    result = MagicMock(count=1234)
+    assert page.total(key, result, _rows(10)) == 1234
+
+    # Second page: no count requested, cached total reused
+    assert page.count_method(key) is None
+    assert page.total(key, MagicMock(count=None), _rows(10)) == 1234
+
+
+def test_include_total_false_skips_count():
+    page = PageRequest.from_params({"include_total": False})
+    key = total_count_key("ledger_events", YACHT)
+    assert page.count_method(key) is None
+    assert page.total(key, MagicMock(count=None), []) is None
+
+
+async def test_list_handler_returns_next_cursor():
+    query = RecordingQuery(rows=_rows(2), count=7)
+    handlers = ListHandlers(RecordingClient(query))
+    out = await handlers.list_work_orders(YACHT, {}, {"limit": 2})
+
+    data = out["data"] if "data" in out else out
+    assert data["total_count"] == 7
+    assert data["has_more"] is True
+    assert decode_cursor(data["next_cursor"])["id"] == "id-001"
+    select = next(c for c in query.calls if c[0] == "select")
+    assert select[2]["count"] == "estimated"
+
+
+async def test_list_handler_bad_cursor_is_validation_error():
+    handlers = ListHandlers(RecordingClient(RecordingQuery()))
+    out = await handlers.list_work_orders(YACHT, {}, {"cursor": "garbage"})
+    assert "VALIDATION_ERROR" in str(out)
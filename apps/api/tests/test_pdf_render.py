@@ -0,0 +1,124 @@
+"""
+Tests for the shared PDF rendering service (services/pdf_render.py) and the
+document builders that use it.
+
+Contracts exercised:
+
+  * Inter is loaded once per process and embedded once per document
+  * Page chrome is one XObject shared by every page
+  * Receiving labels render into one document in a single call, off the
+    event loop (through run_render)
+  * Shopping list / ledger builders still produce readable, Inter-only PDFs
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+fitz = pytest.importorskip("fitz")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import routes.receiving_label_routes as label_routes  # noqa: E402
+from routes.shopping_list_pdf_route import _build_shopping_list_pdf  # noqa: E402
+from services.ledger_export import render_ledger_pdf  # noqa: E402
+from services.pdf_render import PdfCanvas, get_fonts, page_chrome  # noqa: E402
+
+TEAL = (0.17, 0.48, 0.64)
+
+
+def _label_items(n):
+    return [
+        {"description": f"Oil filter {i}", "quantity_accepted": 2,
+         "pms_parts": {"part_number": f"OF-{i:03d}", "location": "ER-3"}}
+        for i in range(n)
+    ]
+
+
+def _font_names(doc):
+    return {font[3].split("+")[-1] for page in doc for font in page.get_fonts()}
+
+
+def test_fonts_and_chrome_are_cached():
+    assert get_fonts() is get_fonts()
+    assert page_chrome(595, 842, TEAL) is page_chrome(595, 842, TEAL)
+
+
+def test_pages_share_chrome_xobject_and_fonts():
+    canvas = PdfCanvas(595, 842, chrome=page_chrome(595, 842, TEAL), footer="Generated · test")
+    for i in range(3):
+        canvas.new_page()
+        canvas.text(40, 100, f"Body {i}", bold=i % 2 == 0)
+    doc = fitz.open("pdf", canvas.to_bytes())
+
+    xobjects = [{x[0] for x in page.get_xobjects()} for page in doc]
+    assert all(x == xobjects[0] for x in xobjects)
+    font_xrefs = {font[0] for page in doc for font in page.get_fonts()}
+    assert len(font_xrefs) == 2
+    assert _font_names(doc) == {"Inter Regular", "Inter Bold"}
+    assert all("Generated · test" in page.get_text() for page in doc)
+
+
+def test_labels_render_into_one_document():
+    w, h = label_routes._resolve_dims("label_62", None, None)
+    recv = {"received_date": "2026-03-01", "vendor_reference": "INV-9"}
+    pdf = label_routes.render_labels_pdf(_label_items(40), recv, "M/Y Test", False, w, h)
+
+    doc = fitz.open("pdf", pdf)
+    assert doc.page_count == 40
+    assert "OF-039" in doc[39].get_text()
+    assert len({font[0] for page in doc for font in page.get_fonts()}) == 1  # regular only, embedded once
+
+
+def test_label_route_renders_through_pool(monkeypatch):
+    rendered = []
+
+    async def inline_render(fn, *args):
+        rendered.append(fn)
+        return fn(*args)
+
+    monkeypatch.setattr(label_routes, "run_render", inline_render)
+    monkeypatch.setattr(label_routes, "get_service_db", lambda yacht_id: None)
+    monkeypatch.setattr(label_routes, "fetch_label_data", lambda *args: {
+        "items": _label_items(3), "recv": {}, "yacht_name": "M/Y Test",
+    })
+
+    app = FastAPI()
+    app.include_router(label_routes.router)
+    response = TestClient(app).get("/v1/receiving/abcdef12-0000/labels", params={"yacht_id": "y1", "size": "label_36"})
+
+    assert response.status_code == 200
+    assert rendered == [label_routes.render_labels_pdf]
+    assert fitz.open("pdf", response.content).page_count == 3
+
+
+def test_shopping_list_pdf_paginates_with_footer_on_every_page():
+    sl = {"list_number": "SL-0042", "status": "submitted", "name": "Engine spares", "currency": "EUR",
+          "notes": "Needed before charter. " * 20}
+    items = [{"part_name": f"Impeller kit {i}", "quantity_requested": 2, "estimated_unit_price": 12.5,
+              "status": "approved", "is_candidate_part": i == 3} for i in range(80)]
+    doc = fitz.open("pdf", _build_shopping_list_pdf(sl, items, "M/Y Test"))
+
+    assert doc.page_count > 1
+    assert all("Requisition SL-0042" in page.get_text() for page in doc)
+    assert "⚠ Impeller kit 3" in doc[0].get_text()
+    assert _font_names(doc) == {"Inter Regular", "Inter Bold"}
+
+
+def test_ledger_pdf_embeds_json(tmp_path):
+    json_path, pdf_path = tmp_path / "events.json", tmp_path / "out.pdf"
+    json_path.write_text(json.dumps([{"action": "add_note"}]), encoding="utf-8")
+    cover = {"vessel_name": "M/Y Test", "date_from": "2026-03-01", "date_to": "2026-03-31",
+             "scope_label": "All crew", "export_id": "ref-1", "event_count": 1}
+
+    size = render_ledger_pdf(str(json_path), str(pdf_path), cover)
+
+    doc = fitz.open(str(pdf_path))
+    assert size == pdf_path.stat().st_size
+    assert json.loads(doc.embfile_get("ledger_events.json")) == [{"action": "add_note"}]
+    assert "Ledger Evidence Export" in doc[0].get_text()
+    assert _font_names(doc) == {"Inter Regular", "Inter Bold"}
@@ -0,0 +1,203 @@
+"""
+Tests for the async RAG answer pipeline (routes/rag_endpoint.py, rag/).
+
+Contracts exercised:
+
+  * /answer/stream emits citations before any answer token, then a final
+    payload, and the answer lands in the shared cache
+  * A cached answer is replayed without retrieval
+  * The local fallback cache is bounded (LRU)
+  * stream_answer yields deltas from the async client, then the RAGAnswer
+  * The verifier's bit-parallel LCS agrees with the DP table, and date /
+    number / token support is unchanged
+
+Auth injected via app.dependency_overrides; retrieval and generation patched.
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import rag.answer_generator as answer_generator  # noqa: E402
+import routes.rag_endpoint as rag_endpoint  # noqa: E402
+from middleware.auth import get_authenticated_user  # noqa: E402
+from rag import Citation, ContextChunk, RAGAnswer, RAGContext  # noqa: E402
+
+YACHT_ID = "85fe1119-b04c-41ac-80f1-829d23322598"
+
+
+def _context(query="hours of rest", chunks=1):
+    return RAGContext(
+        query=query,
+        query_hash="h",
+        chunks=[
+            ContextChunk(text=f"Rest period {i}", citation=Citation(doc_id=f"doc-{i}", doc_type="document"), score=0.9)
+            for i in range(chunks)
+        ],
+        total_tokens=10,
+        yacht_id=YACHT_ID,
+        role="crew",
+        lens="default",
+        domain=None,
+        mode="explore",
+    )
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = {"retrieve": 0}
+
+    async def retrieve_context(*args, **kwargs):
+        calls["retrieve"] += 1
+        return _context()
+
+    async def stream_answer(context):
+        for delta in ("Ten hours ", "of rest [1]."):
+            yield delta
+        yield answer_generator.finalize_answer(context, "Ten hours of rest [1].", "gpt-4o-mini", 12, 0.0)
+
+    async def no_redis():
+        return None
+
+    monkeypatch.setattr(rag_endpoint, "retrieve_context", retrieve_context)
+    monkeypatch.setattr(rag_endpoint, "stream_answer", stream_answer)
+    monkeypatch.setattr(rag_endpoint, "get_redis", no_redis)
+    monkeypatch.setattr(rag_endpoint, "_cache", rag_endpoint.OrderedDict())
+
+    app = FastAPI()
+    app.include_router(rag_endpoint.router)
+    app.dependency_overrides[get_authenticated_user] = lambda: {"yacht_id": YACHT_ID, "role": "crew"}
+    test_client = TestClient(app)
+    test_client.calls = calls
+    return test_client
+
+
+def test_stream_emits_citations_then_tokens_then_done(client):
+    response = client.post("/api/rag/answer/stream", json={"query": "hours of rest"})
+    assert response.status_code == 200
+    events = _events(response.text)
+
+    assert [name for name, _ in events] == ["citations", "token", "token", "done"]
+    assert events[0][1]["citations"][0]["doc_id"] == "doc-0"
+    assert "".join(data["text"] for name, data in events if name == "token") == "Ten hours of rest [1]."
+    assert events[-1][1]["used_doc_ids"] == ["doc-0"]
+
+    # Second request is replayed from the cache
+    again = _events(client.post("/api/rag/answer/stream", json={"query": "hours of rest"}).text)
+    assert again[0][1]["cached"] is True
+    assert again[-1][1]["answer"] == "Ten hours of rest [1]."
+    assert client.calls["retrieve"] == 1
+
+
+async def test_local_cache_is_bounded(monkeypatch):
+    async def no_redis():
+        return None
+
+    monkeypatch.setattr(rag_endpoint, "get_redis", no_redis)
+    monkeypatch.setattr(rag_endpoint, "_cache", rag_endpoint.OrderedDict())
+    monkeypatch.setattr(rag_endpoint, "LOCAL_CACHE_MAX_SIZE", 2)
+
+    for key in ("a", "b"):
+        await rag_endpoint.set_cached_response(key, {"answer": key})
+    assert await rag_endpoint.get_cached_response("a") == {"answer": "a"}  # a is now most recent
+    await rag_endpoint.set_cached_response("c", {"answer": "c"})
+
+    assert list(rag_endpoint._cache) == ["a", "c"]
+    assert await rag_endpoint.get_cached_response("b") is None
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+async def test_stream_answer_uses_async_client(monkeypatch):
+    def chunk(text=None, usage=None):
+        choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if usage is None else []
+        return SimpleNamespace(choices=choices, usage=usage)
+
+    requests = []
+
+    async def create(**kwargs):
+        requests.append(kwargs)
+        return _FakeStream([chunk("See "), chunk("[1]"), chunk(None), chunk(usage=SimpleNamespace(total_tokens=42))])
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(answer_generator, "get_async_openai_client", lambda: fake)
+
+    items = [item async for item in answer_generator.stream_answer(_context())]
+
+    assert items[:2] == ["See ", "[1]"]
+    final = items[-1]
+    assert isinstance(final, RAGAnswer)
+    assert (final.answer, final.tokens_used, final.used_doc_ids) == ("See [1]", 42, ["doc-0"])
+    assert requests[0]["stream"] is True
+
+
+def test_verifier_matches_reference_lcs():
+    from rag.verifier import compute_rouge_l, lcs_length, word_masks
+
+    def reference(a, b):
+        dp = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+        for i in range(1, len(a) + 1):
+            for j in range(1, len(b) + 1):
+                dp[i][j] = dp[i - 1][j - 1] + 1 if a[i - 1] == b[j - 1] else max(dp[i - 1][j], dp[i][j - 1])
+        return dp[-1][-1]
+
+    a = "oil filter replaced on the port generator after 500 hours".split()
+    b = "the port generator oil filter was replaced at 500 running hours on survey".split()
+    assert lcs_length(word_masks(b), len(b), a) == reference(a, b)
+    assert compute_rouge_l("", "x") == 0.0
+
+
+def test_verify_answer_supports_dates_numbers_and_tokens():
+    from rag import verify_answer
+
+    context = RAGContext(
+        query="q", query_hash="h", total_tokens=0, yacht_id=YACHT_ID, role="crew", lens="default",
+        domain=None, mode="explore",
+        chunks=[
+            ContextChunk(text="Annual survey completed January 5, 2026 by the class surveyor.",
+                         citation=Citation(doc_id="d1", doc_type="document"), score=1.0),
+            ContextChunk(text="Main engine running hours: 12450.",
+                         citation=Citation(doc_id="d2", doc_type="equipment"), score=1.0),
+        ],
+    )
+    answer = SimpleNamespace(answer=(
+        "The annual survey was completed on 2026-01-05 [1].\n"
+        "The main engine has 12450 running hours [2].\n"
+        "The anchor windlass was replaced with a titanium unit [1]."
+    ))
+
+    result = verify_answer(answer, context)
+    types = [r.support_type for r in result.sentence_results]
+    assert types == ["date", "number", "none"]
+    assert result.supported_sentences == 2 and result.factual_sentences == 3
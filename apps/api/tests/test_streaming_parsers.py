@@ -0,0 +1,159 @@
+"""
+Tests for the streaming import parsers and the per-session row spill.
+
+Contracts exercised:
+
+  * stream_csv / stream_xlsx yield the same rows as the legacy parse_* in
+    fixed-size batches, with detection computed from the leading rows
+  * stream_sql parses interleaved INSERT/COPY tables in one pass, keeps the
+    COPY-over-INSERT precedence, and ignores ';' inside quoted values
+  * Spill files round-trip row batches and are only published when complete
+  * _session_rows serves dry-run/commit from the spill and only downloads
+    and re-parses when the spill is missing
+"""
+
+import io
+import os
+import sys
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from parsers.csv_parser import parse_csv, stream_csv  # noqa: E402
+from parsers.row_spill import (  # noqa: E402
+    SpillWriter, read_spill, session_spill_dir, spill_path, spill_stream, tee_to_spill,
+)
+from parsers.sql_parser import stream_sql  # noqa: E402
+from parsers.zip_handler import list_zip_members, open_zip, stream_zip_member  # noqa: E402
+
+
+def _csv(n: int) -> bytes:
+    lines = ["Exported by PMS;;", "equip_name;maker;running_hours"]
+    lines += [f"Engine {i};MTU;{i}" for i in range(n)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def test_stream_csv_matches_parse_csv_in_batches():
+    raw = _csv(23)
+    stream = stream_csv(io.BytesIO(raw), "eq.csv", batch_size=10)
+
+    assert stream.meta.header_row == 1
+    assert stream.meta.domain_hint == "equipment"
+    assert stream.meta.columns[0].sample_values == [f"Engine {i}" for i in range(5)]
+
+    batches = list(stream)
+    assert [len(b) for b in batches] == [10, 10, 3]
+    assert stream.meta.row_count == 23
+    assert [r for b in batches for r in b] == parse_csv(raw, "eq.csv").rows
+
+
+def test_stream_csv_warns_on_null_bytes_past_the_sample():
+    raw = _csv(2000) + b"Broken\x00;X;1\n"
+    stream = stream_csv(raw, "eq.csv")
+    rows = list(stream.rows())
+    assert rows[-1]["equip_name"] == "Broken"
+    assert any("null bytes" in w.message for w in stream.meta.warnings)
+
+
+def test_stream_sql_single_pass_interleaved_tables(tmp_path):
+    raw = (
+        b"-- it's a dump; quotes in comments are ignored\n"
+        b"INSERT INTO equipment (name, notes) VALUES ('Engine', 'a;b'), ('Pump', 'It''s ok');\n"
+        b"INSERT INTO faults (title, severity) VALUES ('replaced by COPY', 'low');\n"
+        b"COPY faults (title, severity) FROM stdin;\n"
+        b"Oil leak\thigh\n"
+        b"Vibration\t\\N\n"
+        b"\\.\n"
+        b"INSERT INTO equipment (name, notes) VALUES ('Generator', NULL);\n"
+    )
+    streams = stream_sql(raw, "dump.sql", spill_dir=str(tmp_path), batch_size=2)
+    by_name = {s.filename: s for s in streams}
+
+    equipment = by_name["dump.sql:equipment"]
+    assert equipment.meta.row_count == 3
+    assert equipment.spill_path == spill_path(str(tmp_path), "dump.sql:equipment")
+    assert list(equipment.rows()) == [
+        {"name": "Engine", "notes": "a;b"},
+        {"name": "Pump", "notes": "It's ok"},
+        {"name": "Generator", "notes": ""},
+    ]
+
+    faults = by_name["dump.sql:faults"]
+    assert [r["title"] for r in faults.rows()] == ["Oil leak", "Vibration"]
+    assert faults.meta.columns[0].sample_values == ["Oil leak", "Vibration"]
+
+
+def test_spill_round_trip_and_atomic_publish(tmp_path):
+    path = spill_path(str(tmp_path), "a.csv")
+    with SpillWriter(path, "a.csv") as writer:
+        writer.write_batch([{"a": "1", "b": "x"}, {"a": "2"}])
+        writer.write_batch([{"b": "y"}])
+    assert [r for b in read_spill(path) for r in b] == [{"a": "1", "b": "x"}, {"a": "2"}, {"b": "y"}]
+
+    # A partially consumed tee never publishes a spill
+    other = spill_path(str(tmp_path), "b.csv")
+    tee = tee_to_spill(iter([[{"a": "1"}], [{"a": "2"}]]), other, "b.csv")
+    next(tee)
+    tee.close()
+    assert read_spill(other) is None
+    assert not os.path.exists(other + ".part")
+
+
+def test_stream_zip_member_csv_and_xlsx(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["part_number", "part_name", "rob_qty"])
+    for i in range(7):
+        ws.append([f"P-{i}", "Filter", i])
+    xlsx = io.BytesIO()
+    wb.save(xlsx)
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("Equipment/eq.csv", _csv(12))
+        zf.writestr("Parts/parts.xlsx", xlsx.getvalue())
+        zf.writestr("manuals/engine.pdf", b"%PDF-1.4")
+    buf.seek(0)
+
+    zf, warnings = open_zip(buf, "export.zip")
+    assert warnings == []
+    with zf:
+        members = list_zip_members(zf)
+        assert members["documents"][0].archive_path == "manuals/engine.pdf"
+        assert members["documents"][0].data is None
+        counts = {}
+        for basename, ext, info in members["data_files"]:
+            for stream in stream_zip_member(zf, info, basename, ext, spill_dir=str(tmp_path)):
+                counts[stream.filename] = spill_stream(stream, spill_path(str(tmp_path), stream.filename))
+                assert stream.meta.row_count == counts[stream.filename]
+    assert counts == {"eq.csv": 12, "parts.xlsx": 7}
+
+
+def test_session_rows_prefers_spill_then_reparses(tmp_path, monkeypatch):
+    import parsers.row_spill as row_spill
+    import routes.import_routes as import_routes
+
+    monkeypatch.setattr(import_routes, "session_spill_dir", lambda sid: str(tmp_path / sid))
+    session_id = "0b7f6c1e-0000-4000-8000-000000000001"
+    sb = MagicMock()
+    sb.storage.from_.return_value.download.return_value = _csv(4)
+    paths = [f"yacht/{session_id}/eq.csv"]
+
+    # No spill yet: downloads, re-parses and spills for the next phase
+    rows = list(import_routes._session_rows(session_id, "eq.csv", paths, sb))
+    assert len(rows) == 4
+    assert sb.storage.from_.return_value.download.call_count == 1
+
+    # Second phase reads the spill — no download
+    rows = list(import_routes._session_rows(session_id, "eq.csv", paths, sb))
+    assert len(rows) == 4
+    assert sb.storage.from_.return_value.download.call_count == 1
+
+    assert import_routes._nonempty(iter([])) is None
+    assert session_spill_dir(session_id, root=str(tmp_path)).endswith(session_id)
+    with pytest.raises(ValueError):
+        row_spill.session_spill_dir("../etc")
@@ -0,0 +1,188 @@
+"""
+Tests for async tenant resolution in middleware/auth.py.
+
+MASTER and TENANT clients are in-memory fakes whose queries block the
+calling thread, like the sync supabase client does.
+
+Contracts exercised:
+
+  * Concurrent misses for one user run a single lookup, off the event loop
+  * Users without a tenant are cached (negative), transient failures are not
+  * The Redis tier serves a worker whose local cache is cold
+  * Invalidation clears every tier and wins over a lookup in flight
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import integrations.supabase as supabase_integration  # noqa: E402
+import middleware.auth as auth  # noqa: E402
+
+USER = "a1b2c3d4-0000-4000-8000-000000000001"
+YACHT = "yacht-1"
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db, self.table, self.filters, self.single = db, table, {}, False
+
+    def select(self, *args):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def maybe_single(self):
+        self.single = True
+        return self
+
+    def execute(self):
+        with self.db.lock:
+            self.db.queries.append(self.table)
+        time.sleep(self.db.delay)
+        if self.db.fail:
+            raise RuntimeError("connection reset")
+        rows = [r for r in self.db.rows.get(self.table, [])
+                if all(r.get(k) == v for k, v in self.filters.items())]
+        if self.single:
+            return SimpleNamespace(data=rows[0]) if rows else None
+        return SimpleNamespace(data=rows)
+
+
+class FakeDB:
+    def __init__(self, rows, delay=0.0):
+        self.rows, self.delay, self.fail = rows, delay, False
+        self.queries, self.lock = [], threading.Lock()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values, self.published = {}, []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def dbs(monkeypatch):
+    master = FakeDB({
+        "user_accounts": [{"id": USER, "yacht_id": YACHT, "status": "active", "fleet_vessel_ids": None}],
+        "fleet_registry": [{"yacht_id": YACHT, "yacht_name": "M/Y Test", "active": True,
+                            "tenant_key_alias": "yTEST", "subscription_status": "paid"}],
+    }, delay=0.05)
+    tenant = FakeDB({
+        "auth_users_roles": [{"user_id": USER, "yacht_id": YACHT, "is_active": True,
+                              "role": "chief_engineer", "department": "engineering", "valid_from": "2026-01-01"}],
+    }, delay=0.05)
+    monkeypatch.setattr(auth, "get_master_client", lambda: master)
+    monkeypatch.setattr(supabase_integration, "get_tenant_client", lambda alias: tenant)
+    monkeypatch.setattr(auth, "REDIS_URL", None)
+    auth.clear_tenant_cache()
+    yield master, tenant
+    auth.clear_tenant_cache()
+
+
+async def test_concurrent_misses_share_one_lookup_off_the_loop(dbs):
+    master, tenant = dbs
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    results = await asyncio.gather(*(auth.resolve_tenant_for_user(USER) for _ in range(20)))
+    ticking.cancel()
+
+    assert all(r is results[0] for r in results)
+    assert results[0]["role"] == "chief_engineer" and results[0]["tenant_key_alias"] == "yTEST"
+    assert master.queries == ["user_accounts", "fleet_registry"]
+    assert tenant.queries == ["auth_users_roles"]
+    assert ticks >= 5  # the loop kept running during the ~150ms lookup
+    assert auth.get_tenant_cache_stats()["coalesced"] >= 19
+
+    assert await auth.resolve_tenant_for_user(USER) is results[0]
+    assert len(master.queries) == 2
+
+
+async def test_user_without_tenant_is_negatively_cached(dbs):
+    master, _ = dbs
+    stranger = "ffffffff-0000-4000-8000-000000000000"
+
+    assert await auth.resolve_tenant_for_user(stranger) is None
+    assert await auth.resolve_tenant_for_user(stranger) is None
+    assert auth.lookup_tenant_for_user(stranger) is None
+    assert master.queries == ["user_accounts"]
+
+    auth.clear_tenant_cache(stranger)
+    assert await auth.resolve_tenant_for_user(stranger) is None
+    assert master.queries == ["user_accounts", "user_accounts"]
+
+
+async def test_transient_failures_are_not_cached(dbs):
+    master, tenant = dbs
+    tenant.fail = True
+    assert await auth.resolve_tenant_for_user(USER) is None
+
+    tenant.fail = False
+    tenant_info = await auth.resolve_tenant_for_user(USER)
+    assert tenant_info["role"] == "chief_engineer"
+    assert master.queries.count("user_accounts") == 2
+
+
+async def test_redis_tier_serves_cold_worker(dbs, monkeypatch):
+    master, _ = dbs
+    redis = FakeRedis()
+
+    async def get_redis():
+        return redis
+
+    monkeypatch.setattr(auth, "_get_tenant_redis", get_redis)
+
+    first = await auth.resolve_tenant_for_user(USER)
+    assert json.loads(redis.values[f"tenant:{USER}"]) == first
+
+    auth.clear_tenant_cache()  # another worker: local tier cold
+    assert await auth.resolve_tenant_for_user(USER) == first
+    assert len(master.queries) == 2
+    assert auth.get_tenant_cache_stats()["redis_hits"] == 1
+
+    await auth.invalidate_tenant_cache(USER)
+    assert f"tenant:{USER}" not in redis.values
+    assert redis.published == [("tenant_cache_invalidate", USER)]
+
+
+async def test_invalidation_during_lookup_is_not_overwritten(dbs):
+    master, tenant = dbs
+    pending = asyncio.create_task(auth.resolve_tenant_for_user(USER))
+    await asyncio.sleep(0.02)  # lookup is in its thread
+    tenant.rows["auth_users_roles"][0]["role"] = "captain"
+    auth.clear_tenant_cache(USER)  # role changed while we were reading it
+
+    assert (await pending)["role"] in ("chief_engineer", "captain")
+    assert (await auth.resolve_tenant_for_user(USER))["role"] == "captain"
+    assert master.queries.count("user_accounts") == 2
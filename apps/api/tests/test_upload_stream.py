@@ -0,0 +1,190 @@
+"""
+Unit tests for apps/api/lib/upload_stream.py and middleware/upload_limits.py
+
+Contracts exercised:
+
+  * spool_upload hashes/sizes incrementally and stops at the first chunk
+    past the cap (413) without draining the rest
+  * Executables are rejected from the first chunk regardless of the
+    declared type; octet-stream is upgraded to the sniffed type
+  * Resumable sessions append at the committed offset, reject a mismatched
+    offset with 409 and resume after an interrupted chunk
+  * Storage forwarding retries and treats "already exists" on retry as done
+  * UploadSizeLimitMiddleware refuses an oversized Content-Length before the
+    route runs, and a chunked body as soon as it crosses the limit
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+HERE = Path(__file__).resolve()
+APP_ROOT = HERE.parents[1]
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from lib.upload_stream import (  # noqa: E402
+    ResumableUploadStore,
+    resolve_content_type,
+    sniff_mime,
+    spool_chunks,
+    upload_spooled_to_storage,
+)
+from middleware.upload_limits import UploadSizeLimitMiddleware  # noqa: E402
+
+
+async def _chunks(parts, consumed=None):
+    for part in parts:
+        if consumed is not None:
+            consumed.append(part)
+        yield part
+
+
+def test_sniff_mime():
+    assert sniff_mime(b"%PDF-1.7\n") == "application/pdf"
+    assert sniff_mime(b"\xff\xd8\xff\xe0....") == "image/jpeg"
+    assert sniff_mime(b"\x00\x00\x00\x18ftypheic") == "image/heic"
+    assert sniff_mime(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_mime(b"MZ\x90\x00") == "application/x-msdownload"
+    assert sniff_mime(b"hello") is None
+
+
+async def test_spool_hashes_incrementally():
+    parts = [b"%PDF-1.7 ", b"a" * 1000, b"end"]
+    spooled = await spool_chunks(_chunks(parts), max_bytes=10_000)
+    try:
+        data = b"".join(parts)
+        assert spooled.size == len(data)
+        assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+        assert spooled.sniffed_type == "application/pdf"
+        with spooled.open() as fh:
+            assert fh.read() == data
+    finally:
+        spooled.cleanup()
+    assert not Path(spooled.path).exists()
+
+
+async def test_spool_rejects_at_first_chunk_over_limit():
+    consumed = []
+    with pytest.raises(HTTPException) as exc:
+        await spool_chunks(_chunks([b"x" * 60, b"x" * 60, b"x" * 60, b"x" * 60], consumed), max_bytes=100)
+    assert exc.value.status_code == 413
+    assert len(consumed) == 2  # stopped early, never drained the rest
+
+
+async def test_spool_rejects_executable_and_empty():
+    with pytest.raises(HTTPException) as exc:
+        await spool_chunks(_chunks([b"MZ\x90\x00rest"]), max_bytes=100)
+    assert exc.value.status_code == 415
+    with pytest.raises(HTTPException) as exc:
+        await spool_chunks(_chunks([]), max_bytes=100)
+    assert exc.value.status_code == 400
+
+
+def test_resolve_content_type():
+    accepted = {"image/heic", "application/pdf", "application/octet-stream"}
+    assert resolve_content_type("application/octet-stream", "image/heic", accepted) == "image/heic"
+    assert resolve_content_type("application/pdf", "application/pdf", accepted) == "application/pdf"
+    assert resolve_content_type(None, None, accepted) == "application/octet-stream"
+    with pytest.raises(HTTPException):
+        resolve_content_type("image/jpeg", "application/x-executable", accepted)
+
+
+async def test_resumable_session_append_and_resume(tmp_path):
+    store = ResumableUploadStore(str(tmp_path))
+    session = store.create(owner="u:y", size=10, filename="a.pdf", content_type="application/pdf")
+
+    session = await store.append(session, 0, _chunks([b"%PDF-"]))
+    assert session.offset == 5 and not session.complete
+
+    # Client reconnects and asks where to resume
+    resumed = store.get(session.upload_id, owner="u:y")
+    assert resumed.offset == 5
+
+    with pytest.raises(HTTPException) as exc:
+        await store.append(resumed, 0, _chunks([b"xxxxx"]))
+    assert exc.value.status_code == 409
+
+    resumed = await store.append(resumed, 5, _chunks([b"12345"]))
+    assert resumed.complete
+    spooled = store.finish(resumed)
+    assert spooled.sha256 == hashlib.sha256(b"%PDF-12345").hexdigest()
+    assert spooled.sniffed_type == "application/pdf"
+    spooled.cleanup()
+
+
+async def test_resumable_session_is_owner_scoped_and_capped(tmp_path):
+    store = ResumableUploadStore(str(tmp_path))
+    session = store.create(owner="u:y", size=4, filename="a", content_type="text/plain")
+    with pytest.raises(HTTPException) as exc:
+        store.get(session.upload_id, owner="other:y")
+    assert exc.value.status_code == 404
+    with pytest.raises(HTTPException) as exc:
+        await store.append(session, 0, _chunks([b"12345"]))
+    assert exc.value.status_code == 413
+    with pytest.raises(HTTPException) as exc:
+        store.create(owner="u:y", size=200, filename="a", content_type="text/plain", max_bytes=100)
+    assert exc.value.status_code == 413
+
+
+async def test_storage_upload_retries(tmp_path):
+    spooled = await spool_chunks(_chunks([b"data"]), max_bytes=100)
+    bucket = MagicMock()
+    bucket.upload.side_effect = [RuntimeError("502 Bad Gateway"), RuntimeError("The resource already exists (Duplicate)")]
+    client = MagicMock()
+    client.storage.from_.return_value = bucket
+    try:
+        upload_spooled_to_storage(client, "documents", "y/a.pdf", spooled, "application/pdf", attempts=2)
+        assert bucket.upload.call_count == 2
+
+        bucket.upload.reset_mock()
+        bucket.upload.side_effect = RuntimeError("503")
+        with pytest.raises(RuntimeError):
+            upload_spooled_to_storage(client, "documents", "y/a.pdf", spooled, "application/pdf", attempts=2)
+        assert bucket.upload.call_count == 2
+    finally:
+        spooled.cleanup()
+
+
+def _limited_app():
+    app = FastAPI()
+    seen = {"route_ran": False}
+
+    @app.post("/v1/attachments/upload")
+    async def upload(request: Request):
+        seen["route_ran"] = True
+        body = await request.body()
+        return {"size": len(body)}
+
+    app.add_middleware(UploadSizeLimitMiddleware, limits=((r"^/v1/attachments/upload$", 100),))
+    return app, seen
+
+
+def test_middleware_rejects_content_length_before_route():
+    app, seen = _limited_app()
+    client = TestClient(app)
+    response = client.post("/v1/attachments/upload", content=b"x" * 101)
+    assert response.status_code == 413
+    assert seen["route_ran"] is False
+
+    ok = client.post("/v1/attachments/upload", content=b"x" * 100)
+    assert ok.status_code == 200 and ok.json() == {"size": 100}
+
+
+def test_middleware_rejects_chunked_body_mid_stream():
+    app, _ = _limited_app()
+    client = TestClient(app)
+
+    def body():
+        for _ in range(5):
+            yield b"x" * 40
+
+    response = client.post("/v1/attachments/upload", content=body())
+    assert response.status_code == 413
@@ -1,15 +1,31 @@
 """
 Email Watcher Background Worker
 
-Phase 5: Runs continuously on Render, syncing mailboxes in rotation.
+Phase 5: Runs continuously on Render, syncing mailboxes concurrently.
 Respects rate limits and sync intervals.
 
+Scheduling: every poll enqueues the watchers due for sync into a priority
+queue (mailboxes with the latest email_threads activity first) that a fixed
+pool of sync tasks drains. A mailbox is never queued twice or synced by two
+tasks at once, each sync is time-boxed, and mailboxes backing off from Graph
+throttling are left out until their in-memory budget allows a call again.
+A slow tenant holds one slot instead of delaying every inbox behind it.
+
+The Supabase client is synchronous, so concurrency overlaps the Graph HTTP
+round-trips; DB writes still run one at a time on the event loop.
+
+Embeddings: sync only enqueues new messages; a separate task drains the
+embedding queue in batched OpenAI requests with bulk writes
+(services/email_embedding_service.py).
+
 Usage:
     python -m workers.email_watcher_worker
 
 Environment Variables:
     EMAIL_WATCHER_ENABLED=true
     EMAIL_WATCHER_POLL_INTERVAL=30  (seconds between poll cycles)
+    EMAIL_WATCHER_CONCURRENCY=8     (mailboxes synced at once)
+    EMAIL_WATCHER_ACTIVITY_SCAN_ROWS=1000  (recent threads read to rank mailboxes)
     SUPABASE_URL=...
     SUPABASE_SERVICE_KEY=...
 """
@@ -17,9 +33,10 @@ Environment Variables:
 import os
 import sys
 import asyncio
+import itertools
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -29,8 +46,10 @@ from integrations.graph_client import (
     get_valid_token,
     refresh_expiring_tokens,
     acquire_refresh_lock,
-    release_refresh_lock
+    release_refresh_lock,
+    close_graph_http_clients,
 )
+from services.email_embedding_service import get_embedding_queue
 from services.email_sync_service import EmailSyncService
 from services.ms_graph_rate_limiter import MicrosoftRateLimiter
 
@@ -44,7 +63,10 @@ logger = logging.getLogger('EmailWatcher')
 
 # Configuration
 POLL_INTERVAL = int(os.getenv('EMAIL_WATCHER_POLL_INTERVAL', '30'))  # Changed from 60 to 30 seconds
-WATCHER_BATCH_SIZE = int(os.getenv('EMAIL_WATCHER_BATCH_SIZE', '10'))
+WATCHER_BATCH_SIZE = int(os.getenv('EMAIL_WATCHER_BATCH_SIZE', '100'))
+WATCHER_CONCURRENCY = int(os.getenv('EMAIL_WATCHER_CONCURRENCY', '8'))
+WATCHER_SYNC_TIMEOUT = float(os.getenv('EMAIL_WATCHER_SYNC_TIMEOUT_SECONDS', '120'))
+WATCHER_ACTIVITY_SCAN_ROWS = int(os.getenv('EMAIL_WATCHER_ACTIVITY_SCAN_ROWS', '1000'))  # threads read to rank watchers
 ENABLED = os.getenv('EMAIL_WATCHER_ENABLED', 'false').lower() == 'true'
 
 # Token refresh heartbeat configuration
@@ -62,10 +84,10 @@ class EmailWatcherWorker:
     Background worker that syncs email for all active watchers.
 
     Runs in a continuous loop:
-    1. Query watchers due for sync
-    2. For each watcher, refresh token and sync
-    3. Update sync status
-    4. Sleep and repeat
+    1. Query watchers due for sync and enqueue them by priority
+    2. A pool of sync tasks refreshes tokens and syncs each watcher
+    3. Update sync status; checkpoint Graph call counters
+    4. Sleep and repeat (syncs keep running across polls)
     """
 
     def __init__(self):
@@ -85,25 +107,51 @@ class EmailWatcherWorker:
             'messages_synced': 0,
             'errors': 0,
         }
+        # (priority, seq, watcher); seq keeps equal priorities FIFO
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._scheduled: set = set()  # watcher ids queued or in flight
+        self._seq = itertools.count()
+        self._sync_tasks: List[asyncio.Task] = []
+        self._embedding_task: Optional[asyncio.Task] = None
 
     async def run(self):
         """Main worker loop."""
         logger.info("=" * 60)
         logger.info("Email Watcher Worker Starting")
         logger.info(f"Poll Interval: {POLL_INTERVAL}s")
-        logger.info(f"Batch Size: {WATCHER_BATCH_SIZE}")
+        logger.info(f"Batch Size: {WATCHER_BATCH_SIZE}, Concurrency: {WATCHER_CONCURRENCY}")
         logger.info(f"Token Refresh Heartbeat: {'Enabled' if TOKEN_REFRESH_ENABLED else 'Disabled'}")
         if TOKEN_REFRESH_ENABLED:
             logger.info(f"  Interval: Every {TOKEN_REFRESH_INTERVAL_CYCLES} cycles")
             logger.info(f"  Lookahead: {TOKEN_REFRESH_LOOKAHEAD}s, Cooldown: {TOKEN_REFRESH_COOLDOWN}s")
         logger.info("=" * 60)
 
+        self._sync_tasks = [
+            asyncio.create_task(self._sync_loop(), name=f"email-sync-{i}")
+            for i in range(WATCHER_CONCURRENCY)
+        ]
+        self._embedding_task = asyncio.create_task(get_embedding_queue().run(), name="email-embed")
+
+        try:
+            await self._poll_loop()
+        finally:
+            tasks = self._sync_tasks + [self._embedding_task]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.rate_limiter.checkpoint()
+            await close_graph_http_clients()
+
+    async def _poll_loop(self):
         while self.running:
             try:
-                # Process pending watcher syncs
+                # Enqueue watchers due for sync
                 await self.process_pending_syncs()
                 self.stats['cycles'] += 1
 
+                if self.rate_limiter.budget.checkpoint_due():
+                    await self.rate_limiter.checkpoint()
+
                 # Token refresh heartbeat (every N cycles)
                 if TOKEN_REFRESH_ENABLED and self.stats['cycles'] % TOKEN_REFRESH_INTERVAL_CYCLES == 0:
                     await self.run_token_refresh_heartbeat()
@@ -162,7 +210,7 @@ class EmailWatcherWorker:
             await release_refresh_lock(self.supabase)
 
     async def process_pending_syncs(self):
-        """Find and process watchers due for sync."""
+        """Find watchers due for sync and queue them for the sync pool."""
 
         # Get watchers due for sync
         watchers = await self._get_watchers_due_for_sync()
@@ -171,13 +219,59 @@ class EmailWatcherWorker:
             logger.debug("No watchers due for sync")
             return
 
-        logger.info(f"Found {len(watchers)} watcher(s) due for sync")
+        fresh = [w for w in watchers if w['id'] not in self._scheduled]
+        activity = self._last_activity(fresh)
+        queued = 0
+        for watcher in fresh:
+            # Leave throttled mailboxes for a later poll
+            if self.rate_limiter.seconds_until_allowed(watcher['user_id'], watcher['yacht_id']) > 0:
+                continue
+            # Recently active mailboxes first
+            priority = -activity.get(watcher['id'], 0.0)
+            self._scheduled.add(watcher['id'])
+            self._queue.put_nowait((priority, next(self._seq), watcher))
+            queued += 1
+
+        logger.info(
+            f"Found {len(watchers)} watcher(s) due for sync: {queued} queued, "
+            f"{len(watchers) - len(fresh)} already scheduled"
+        )
+
+    def _last_activity(self, watchers: List[Dict[str, Any]]) -> Dict[str, float]:
+        """
+        watcher id → latest email_threads.last_activity_at as a timestamp
+        (0 when unknown). One query over the most recently active threads;
+        a watcher absent from them ranks with the inactive ones.
+        """
+        activity: Dict[str, float] = {}
+        if not watchers:
+            return activity
+        try:
+            result = self.supabase.table('email_threads').select(
+                'watcher_id, last_activity_at'
+            ).in_(
+                'watcher_id', [w['id'] for w in watchers]
+            ).order('last_activity_at', desc=True).limit(WATCHER_ACTIVITY_SCAN_ROWS).execute()
+            for row in result.data or []:
+                # Rows are newest first, so the first one per watcher is its latest
+                activity.setdefault(row['watcher_id'], _timestamp(row.get('last_activity_at')))
+        except Exception as e:
+            logger.warning(f"Could not load watcher activity for prioritisation: {e}")
+        return activity
 
-        for watcher in watchers:
+    async def _sync_loop(self):
+        """One slot of the sync pool: drain the queue until cancelled."""
+        while True:
+            _, _, watcher = await self._queue.get()
             try:
-                await self.sync_single_watcher(watcher)
+                await asyncio.wait_for(self.sync_single_watcher(watcher), WATCHER_SYNC_TIMEOUT)
                 self.stats['watchers_synced'] += 1
 
+            except asyncio.TimeoutError:
+                logger.error(f"Sync timed out for watcher {watcher['id']} after {WATCHER_SYNC_TIMEOUT:.0f}s")
+                self.stats['errors'] += 1
+                await self._mark_watcher_error(watcher['id'], 'sync_timeout')
+
             except Exception as e:
                 logger.error(f"Error syncing watcher {watcher['id']}: {e}")
                 self.stats['errors'] += 1
@@ -185,6 +279,10 @@ class EmailWatcherWorker:
                 # Mark watcher as degraded
                 await self._mark_watcher_error(watcher['id'], str(e))
 
+            finally:
+                self._scheduled.discard(watcher['id'])
+                self._queue.task_done()
+
     async def sync_single_watcher(self, watcher: Dict[str, Any]):
         """
         Sync a single watcher's mailbox.
@@ -251,10 +349,8 @@ class EmailWatcherWorker:
 
         self.stats['messages_synced'] += total
 
-        # Record API calls for rate limiting
+        # Calls are recorded against the rate limit by the sync service as they happen
         api_calls = result.get('api_calls', 0)
-        if api_calls > 0:
-            await self.rate_limiter.record_call(user_id, yacht_id, api_calls)
 
         logger.info(
             f"Synced: inbox={inbox_count}, sent={sent_count}, "
@@ -319,7 +415,9 @@ class EmailWatcherWorker:
             f"Stats: cycles={self.stats['cycles']}, "
             f"watchers={self.stats['watchers_synced']}, "
             f"messages={self.stats['messages_synced']}, "
-            f"errors={self.stats['errors']}"
+            f"errors={self.stats['errors']}, "
+            f"queued={self._queue.qsize()}, scheduled={len(self._scheduled)}, "
+            f"embed_queued={get_embedding_queue().qsize()}"
         )
 
     def stop(self):
@@ -328,6 +426,15 @@ class EmailWatcherWorker:
         self.running = False
 
 
+def _timestamp(value: Optional[str]) -> float:
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
 async def main():
     """Entry point."""
     if not ENABLED:
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Sealing Worker — claims evidence_seal_jobs rows, seals the staged PDF with
+a warm signing context and uploads the sealed artifact.
+
+The signer, certificate chain, timestamper and revocation data are loaded
+once at startup (evidence.sealing.get_sealing_context) instead of on every
+export, so a seal costs the PDF/A-3 upgrade, one signature and one TSA
+round trip.
+
+Pattern follows extraction_worker.py: poll loop, batch claiming with
+FOR UPDATE SKIP LOCKED, graceful shutdown, connection recovery.
+
+Environment:
+    DATABASE_URL            - PostgreSQL connection string (required)
+    SUPABASE_URL            - Storage API base URL (required)
+    SUPABASE_SERVICE_KEY    - Service role key (required)
+    SEALING_BATCH_SIZE      - Jobs claimed per poll (default: 4)
+    SEALING_POLL_INTERVAL   - Seconds to wait when queue empty (default: 2)
+    SEALING_MAX_ATTEMPTS    - TSA failures before a job fails (default: 5)
+    CELESTE_SIGNING_*       - see evidence/sealing.py
+"""
+
+import logging
+import os
+import signal
+import sys
+import time
+
+import psycopg2
+import psycopg2.extras
+import requests
+
+# ── sys.path fix (same pattern as projection_worker.py) ─────────────────
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evidence.sealing import SealingError, TimestampError, get_sealing_context, seal_export
+
+# ── Configuration from environment ──────────────────────────────────────
+DB_DSN = os.environ.get("DATABASE_URL", "")
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "").rstrip("/")
+SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
+BATCH_SIZE = int(os.environ.get("SEALING_BATCH_SIZE", "4"))
+POLL_INTERVAL = int(os.environ.get("SEALING_POLL_INTERVAL", "2"))
+MAX_ATTEMPTS = int(os.environ.get("SEALING_MAX_ATTEMPTS", "5"))
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+RETRY_BASE_SECONDS = 30  # TSA retry backoff: 30s, 60s, 120s, ...
+ORPHAN_TIMEOUT_MINUTES = 10
+
+# ── Logging ─────────────────────────────────────────────────────────────
+logging.basicConfig(
+    level=getattr(logging, LOG_LEVEL, logging.INFO),
+    format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    stream=sys.stdout,
+)
+logger = logging.getLogger("sealing_worker")
+
+# ── Graceful shutdown ───────────────────────────────────────────────────
+_shutdown = False
+
+
+def _signal_handler(signum, frame):
+    global _shutdown
+    logger.info("Received signal %d, shutting down after current job...", signum)
+    _shutdown = True
+
+
+signal.signal(signal.SIGINT, _signal_handler)
+signal.signal(signal.SIGTERM, _signal_handler)
+
+
+# ── Storage ─────────────────────────────────────────────────────────────
+
+class StorageError(Exception):
+    pass
+
+
+class SupabaseStorage:
+    """Minimal Storage REST client (service role) with a pooled session."""
+
+    def __init__(self, base_url: str = SUPABASE_URL, service_key: str = SUPABASE_SERVICE_KEY):
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {service_key}",
+            "apikey": service_key,
+        })
+
+    def download(self, bucket: str, path: str) -> bytes:
+        url = f"{self.base_url}/storage/v1/object/authenticated/{bucket}/{path}"
+        resp = self.session.get(url, timeout=120)
+        if resp.status_code != 200:
+            raise StorageError(f"download {bucket}/{path} failed {resp.status_code}: {resp.text[:200]}")
+        return resp.content
+
+    def upload(self, bucket: str, path: str, data: bytes) -> None:
+        url = f"{self.base_url}/storage/v1/object/{bucket}/{path}"
+        resp = self.session.post(url, data=data, timeout=120, headers={
+            "Content-Type": "application/pdf",
+            "Cache-Control": "no-store",
+            "x-upsert": "true",
+        })
+        if resp.status_code not in (200, 201):
+            raise StorageError(f"upload {bucket}/{path} failed {resp.status_code}: {resp.text[:200]}")
+
+    def delete(self, bucket: str, path: str) -> None:
+        url = f"{self.base_url}/storage/v1/object/{bucket}/{path}"
+        self.session.delete(url, timeout=30)
+
+
+# ── Queue ───────────────────────────────────────────────────────────────
+
+def reset_orphans(conn):
+    """Reset jobs stuck in 'sealing' for >10 minutes (crash recovery)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE evidence_seal_jobs
+            SET status = 'pending', updated_at = now()
+            WHERE status = 'sealing'
+              AND updated_at < now() - interval '%s minutes'
+            """,
+            (ORPHAN_TIMEOUT_MINUTES,),
+        )
+        count = cur.rowcount
+        conn.commit()
+        if count:
+            logger.info("Reset %d orphaned 'sealing' jobs to 'pending'", count)
+
+
+def claim_batch(conn) -> list:
+    """Claim runnable pending jobs using FOR UPDATE SKIP LOCKED."""
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.execute(
+            """
+            SELECT id, yacht_id, kind, subject_id, storage_bucket,
+                   source_path, dest_path, attempts
+            FROM evidence_seal_jobs
+            WHERE status = 'pending' AND run_after <= now()
+            ORDER BY run_after ASC
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (BATCH_SIZE,),
+        )
+        rows = cur.fetchall()
+
+        if rows:
+            ids = [r["id"] for r in rows]
+            cur.execute(
+                """
+                UPDATE evidence_seal_jobs
+                SET status = 'sealing', attempts = attempts + 1, updated_at = now()
+                WHERE id = ANY(%s)
+                """,
+                (ids,),
+            )
+            conn.commit()
+            for row in rows:
+                row["attempts"] += 1
+
+        return rows
+
+
+def seal_job(job: dict, context, storage: SupabaseStorage) -> dict:
+    """Seal one staged PDF into dest_path. Returns the provenance columns."""
+    bucket = job["storage_bucket"]
+    raw_pdf = storage.download(bucket, job["source_path"])
+    sealed_bytes, info = seal_export(raw_pdf, context)
+    storage.upload(bucket, job["dest_path"], sealed_bytes)
+
+    try:
+        storage.delete(bucket, job["source_path"])
+    except requests.RequestException as exc:
+        logger.warning("Could not remove staged PDF %s: %s", job["source_path"], exc)
+
+    return {
+        "pdf_sha256": info.pdf_sha256,
+        "file_size_bytes": len(sealed_bytes),
+        "tsa_authority": info.tsa_authority,
+        "cert_fingerprint": info.cert_fingerprint,
+        "key_version": info.key_version,
+        "signed_at": info.signed_at,
+    }
+
+
+def process_job(conn, job: dict, context, storage: SupabaseStorage) -> bool:
+    """Seal one claimed job and record the outcome. Returns True on success."""
+    job_id = job["id"]
+    started = time.monotonic()
+    try:
+        result = seal_job(job, context, storage)
+    except TimestampError as exc:
+        # TSA outage — transient; retry later unless attempts are exhausted
+        if job["attempts"] < MAX_ATTEMPTS:
+            delay = RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+            logger.warning("Job %s: TSA unavailable (%s) — retry in %ds", job_id, exc, delay)
+            _update(conn, job_id, status="pending", error=str(exc), retry_in=delay)
+            return False
+        logger.error("Job %s: TSA unavailable after %d attempts: %s", job_id, job["attempts"], exc)
+        _update(conn, job_id, status="failed", error=f"Timestamp authority unavailable: {exc}")
+        return False
+    except (SealingError, StorageError) as exc:
+        logger.error("Job %s: sealing failed: %s", job_id, exc)
+        _update(conn, job_id, status="failed", error=str(exc))
+        return False
+
+    _update(conn, job_id, status="completed", error=None, **result)
+    logger.info(
+        "Job %s sealed in %.2fs — sha256=%s… tsa=%s",
+        job_id, time.monotonic() - started, result["pdf_sha256"][:16], result["tsa_authority"],
+    )
+    return True
+
+
+def _update(conn, job_id, *, status: str, retry_in: int = 0, **columns) -> None:
+    columns["status"] = status
+    assignments = ", ".join(f"{name} = %s" for name in columns)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            UPDATE evidence_seal_jobs
+            SET {assignments},
+                run_after = now() + make_interval(secs => %s),
+                updated_at = now()
+            WHERE id = %s
+            """,
+            (*columns.values(), retry_in, job_id),
+        )
+        conn.commit()
+
+
+def run_worker():
+    """Main worker loop with connection recovery."""
+    if not DB_DSN:
+        logger.error("DATABASE_URL not set — exiting")
+        sys.exit(1)
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        logger.error("SUPABASE_URL or SUPABASE_SERVICE_KEY not set — exiting")
+        sys.exit(1)
+
+    # Load signer, chain and timestamper once — a broken key is fatal here,
+    # not on the first export
+    try:
+        context = get_sealing_context()
+    except SealingError as exc:
+        logger.error("Sealing context unavailable: %s — exiting", exc)
+        sys.exit(1)
+    storage = SupabaseStorage()
+
+    logger.info(
+        "Sealing worker started — batch_size=%d, poll_interval=%ds, key_version=%s, cert=%s…",
+        BATCH_SIZE, POLL_INTERVAL, context.config.key_version, context.cert_fingerprint[:16],
+    )
+
+    reconnect_delay = 5
+    max_reconnect_attempts = 10
+    reconnect_attempts = 0
+    conn = None
+
+    while not _shutdown:
+        try:
+            # Connect / reconnect
+            if conn is None or conn.closed:
+                logger.info("Connecting to database...")
+                conn = psycopg2.connect(DB_DSN)
+                conn.autocommit = False
+                reconnect_attempts = 0
+                reconnect_delay = 5
+                logger.info("Connected to database")
+
+                # Reset orphaned jobs on startup/reconnect
+                reset_orphans(conn)
+
+            # Claim batch
+            jobs = claim_batch(conn)
+
+            if not jobs:
+                # Nothing to do — sleep
+                for _ in range(POLL_INTERVAL):
+                    if _shutdown:
+                        break
+                    time.sleep(1)
+                continue
+
+            for job in jobs:
+                if _shutdown:
+                    break
+                try:
+                    process_job(conn, job, context, storage)
+                except psycopg2.OperationalError:
+                    raise
+                except Exception as exc:
+                    logger.error("Error processing job %s: %s", job.get("id"), exc, exc_info=True)
+                    try:
+                        conn.rollback()
+                        _update(conn, job["id"], status="failed", error=f"Unexpected error: {exc}")
+                    except Exception:
+                        logger.error("Failed to mark job %s as failed", job.get("id"))
+
+        except psycopg2.OperationalError as e:
+            reconnect_attempts += 1
+            logger.error(
+                "Connection lost: %s (attempt %d/%d)",
+                e, reconnect_attempts, max_reconnect_attempts,
+            )
+
+            if reconnect_attempts >= max_reconnect_attempts:
+                logger.error("Max reconnect attempts reached, exiting")
+                break
+
+            logger.info("Reconnecting in %ds...", reconnect_delay)
+            time.sleep(reconnect_delay)
+            reconnect_delay = min(reconnect_delay * 2, 120)
+            conn = None
+
+        except Exception as e:
+            logger.error("Unexpected error: %s", e, exc_info=True)
+            time.sleep(5)
+
+    # Cleanup
+    if conn and not conn.closed:
+        conn.close()
+    logger.info("Sealing worker stopped")
+
+
+if __name__ == "__main__":
+    run_worker()
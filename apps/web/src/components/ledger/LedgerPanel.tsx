@@ -202,7 +202,10 @@ export function LedgerPanel({ isOpen, onClose }: LedgerPanelProps) {
   const [exportError, setExportError] = useState<string | null>(null);
   const scrollRef = useRef<HTMLDivElement>(null);
   const sentinelRef = useRef<HTMLDivElement>(null);
+  const exportAbortRef = useRef<AbortController | null>(null);
   const LIMIT = 50;
+  const EXPORT_POLL_INTERVAL_MS = 1500;
+  const EXPORT_POLL_TIMEOUT_MS = 5 * 60 * 1000;
 
   const handleItemClick = useCallback((event: LedgerEvent) => {
     if (!event.entity_type || !event.entity_id) return;
@@ -260,8 +263,15 @@ export function LedgerPanel({ isOpen, onClose }: LedgerPanelProps) {
     setExpandedDays(prev => { const n = new Set(prev); n.has(date) ? n.delete(date) : n.add(date); return n; });
   };
 
+  // Stop polling an export job once the panel unmounts
+  useEffect(() => () => exportAbortRef.current?.abort(), []);
+
   const handleExport = useCallback(async () => {
     if (!exportDateFrom || !exportDateTo) return;
+    exportAbortRef.current?.abort();
+    const controller = new AbortController();
+    exportAbortRef.current = controller;
+    const { signal } = controller;
     setExportLoading(true);
     setExportError(null);
     try {
@@ -272,17 +282,38 @@ export function LedgerPanel({ isOpen, onClose }: LedgerPanelProps) {
         method: 'POST',
         headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${token}` },
         body: JSON.stringify({ date_from: exportDateFrom, date_to: exportDateTo, scope: exportScope }),
+        signal,
       });
       if (!res.ok) {
         const err = await res.json().catch(() => ({}));
         throw new Error(err.detail || `Export failed (${res.status})`);
       }
-      const data = await res.json();
+      // Export runs as a background job — poll its status until it finishes
+      const deadline = Date.now() + EXPORT_POLL_TIMEOUT_MS;
+      let data = await res.json();
+      while (data.status !== 'completed') {
+        if (data.status === 'failed') throw new Error(data.error || 'Export failed');
+        if (Date.now() >= deadline) throw new Error('Export is taking too long — try a shorter date range');
+        await new Promise<void>((resolve, reject) => {
+          const timer = setTimeout(resolve, EXPORT_POLL_INTERVAL_MS);
+          signal.addEventListener('abort', () => { clearTimeout(timer); reject(signal.reason); }, { once: true });
+        });
+        const statusRes = await fetch(`${RENDER_API_URL}/v1/ledger/export/${data.export_id}`, {
+          headers: { Authorization: `Bearer ${token}` },
+          signal,
+        });
+        if (!statusRes.ok) {
+          const err = await statusRes.json().catch(() => ({}));
+          throw new Error(err.detail || `Export failed (${statusRes.status})`);
+        }
+        data = await statusRes.json();
+      }
       setExportResult({ url: data.download_url, count: data.event_count, sealed: data.sealed });
     } catch (e) {
+      if (signal.aborted) return;
       setExportError(e instanceof Error ? e.message : 'Export failed');
     } finally {
-      setExportLoading(false);
+      if (!signal.aborted) setExportLoading(false);
     }
   }, [exportDateFrom, exportDateTo, exportScope]);
 
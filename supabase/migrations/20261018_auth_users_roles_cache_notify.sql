@@ -0,0 +1,32 @@
+-- auth_users_roles: notify tenant cache invalidation on role changes
+-- Applied to TENANT DB.
+--
+-- API workers cache each user's resolved tenant + role (middleware/auth.py:
+-- per-worker TTLCache and a shared Redis entry, 15 min). Without this, a
+-- role change or revocation took up to the TTL to apply.
+--
+-- Every change to a user's roles raises pg_notify('tenant_cache_invalidate',
+-- user_id); cache/invalidation_listener.py deletes the Redis entry and
+-- publishes the user_id to all API workers, which drop their local copy.
+
+CREATE OR REPLACE FUNCTION public.notify_tenant_cache_invalidate()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('tenant_cache_invalidate', OLD.user_id::text);
+    ELSE
+        PERFORM pg_notify('tenant_cache_invalidate', NEW.user_id::text);
+        IF TG_OP = 'UPDATE' AND OLD.user_id IS DISTINCT FROM NEW.user_id THEN
+            PERFORM pg_notify('tenant_cache_invalidate', OLD.user_id::text);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_auth_users_roles_tenant_cache ON public.auth_users_roles;
+CREATE TRIGGER trg_auth_users_roles_tenant_cache
+    AFTER INSERT OR UPDATE OR DELETE ON public.auth_users_roles
+    FOR EACH ROW EXECUTE FUNCTION public.notify_tenant_cache_invalidate();
@@ -0,0 +1,16 @@
+-- doc_metadata.content_sha256: content hash for bulk-import deduplication
+-- Applied to TENANT DB.
+--
+-- POST /v1/documents/import (apps/api/services/document_import.py) hashes
+-- every zip member and links files whose hash already exists for the yacht
+-- to the stored blob instead of uploading it again. Until this column exists
+-- the import falls back to uploading everything and omits the column.
+--
+-- Existing rows stay NULL (never matched); only new imports populate it.
+
+ALTER TABLE public.doc_metadata
+    ADD COLUMN IF NOT EXISTS content_sha256 text;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_doc_metadata_yacht_content_sha256
+    ON public.doc_metadata (yacht_id, content_sha256)
+    WHERE content_sha256 IS NOT NULL AND deleted_at IS NULL;
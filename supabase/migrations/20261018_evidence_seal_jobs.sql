@@ -0,0 +1,48 @@
+-- evidence_seal_jobs: durable queue for PAdES sealing of evidence exports
+-- Applied to TENANT DB.
+--
+-- Sealing (PDF/A-3 upgrade + PAdES-B-LT signature + RFC 3161 timestamp) no
+-- longer runs inside the API worker. The API stages the unsealed PDF in a
+-- private storage path and inserts a row here; workers/sealing_worker.py
+-- claims rows with FOR UPDATE SKIP LOCKED, seals with a warm signing
+-- context, uploads the sealed PDF to dest_path and records the provenance.
+-- Status is polled through the owning export (GET /v1/ledger/export/{id}).
+--
+-- TSA failures are retried with backoff (attempts / run_after); any other
+-- sealing failure is final. Rows stuck in 'sealing' are reset by the worker.
+
+CREATE TABLE IF NOT EXISTS public.evidence_seal_jobs (
+    id               uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    yacht_id         uuid NOT NULL,
+    kind             text NOT NULL DEFAULT 'ledger_export',
+    subject_id       uuid,                          -- e.g. ledger_exports.id
+    storage_bucket   text NOT NULL,
+    source_path      text NOT NULL,                 -- unsealed PDF, removed once sealed
+    dest_path        text NOT NULL,                 -- sealed PDF
+    status           text NOT NULL DEFAULT 'pending'
+                     CHECK (status IN ('pending', 'sealing', 'completed', 'failed')),
+    attempts         integer NOT NULL DEFAULT 0,
+    run_after        timestamptz NOT NULL DEFAULT now(),
+    error            text,
+    pdf_sha256       text,
+    file_size_bytes  bigint,
+    tsa_authority    text,
+    cert_fingerprint text,
+    key_version      text,
+    signed_at        timestamptz,
+    requested_by     uuid,
+    created_at       timestamptz NOT NULL DEFAULT now(),
+    updated_at       timestamptz NOT NULL DEFAULT now()
+);
+
+-- Worker claim: oldest runnable pending job first
+CREATE INDEX IF NOT EXISTS idx_evidence_seal_jobs_pending
+    ON public.evidence_seal_jobs (run_after)
+    WHERE status = 'pending';
+
+-- Status lookups from the owning export
+CREATE INDEX IF NOT EXISTS idx_evidence_seal_jobs_subject
+    ON public.evidence_seal_jobs (subject_id);
+
+-- Service role only (API + sealing worker); no client access
+ALTER TABLE public.evidence_seal_jobs ENABLE ROW LEVEL SECURITY;
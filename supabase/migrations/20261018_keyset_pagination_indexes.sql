@@ -0,0 +1,40 @@
+-- Composite indexes backing keyset (cursor) pagination — apps/api/lib/pagination.py
+-- Applied to TENANT DB.
+--
+-- List endpoints now page with
+--     WHERE yacht_id = $1 AND (sort_col, id) < ($cursor_value, $cursor_id)
+--     ORDER BY sort_col DESC, id DESC LIMIT n
+-- (ascending variants for name-sorted lists). Each index below matches one
+-- default ordering so every page is a single index range scan instead of an
+-- OFFSET walk, regardless of depth.
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block; apply this
+-- file statement-by-statement (psql -f works; the SQL editor wraps in a txn).
+
+-- /v1/ledger/events, /v1/ledger/timeline
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ledger_events_yacht_created_id
+    ON public.ledger_events (yacht_id, created_at DESC, id DESC);
+
+-- "Me" view: /v1/ledger/events?user_id=…
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ledger_events_yacht_user_created_id
+    ON public.ledger_events (yacht_id, user_id, created_at DESC, id DESC);
+
+-- list_work_orders (default created_at desc)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pms_work_orders_yacht_created_id
+    ON public.pms_work_orders (yacht_id, created_at DESC, id DESC);
+
+-- list_faults (default detected_at desc)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pms_faults_yacht_detected_id
+    ON public.pms_faults (yacht_id, detected_at DESC, id DESC);
+
+-- list_parts / list_equipment (default name asc)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pms_parts_yacht_name_id
+    ON public.pms_parts (yacht_id, name, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pms_equipment_yacht_name_id
+    ON public.pms_equipment (yacht_id, name, id);
+
+-- Verify (expect "Index Scan using idx_ledger_events_yacht_created_id", no Sort):
+-- EXPLAIN SELECT * FROM ledger_events
+--  WHERE yacht_id = '<yacht>' AND (created_at < now() OR (created_at = now() AND id < gen_random_uuid()))
+--  ORDER BY created_at DESC, id DESC LIMIT 50;
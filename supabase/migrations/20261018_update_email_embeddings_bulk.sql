@@ -0,0 +1,39 @@
+-- update_email_embeddings_bulk: write a batch of email embeddings in one call
+-- Applied to TENANT DB.
+--
+-- The email embedding queue (apps/api/services/email_embedding_service.py)
+-- embeds synced messages in batches and stores each batch with this RPC
+-- instead of one PATCH per message. Until it exists the service falls back
+-- to per-row updates.
+--
+-- p_rows: [{"id": uuid, "subject_embedding": [...], "sender_embedding": [...],
+--           "meta_embedding": [...]}, ...] — missing vectors keep their value.
+
+CREATE OR REPLACE FUNCTION public.update_email_embeddings_bulk(
+    p_yacht_id uuid,
+    p_rows jsonb
+) RETURNS integer
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH updated AS (
+        UPDATE public.email_messages m
+           SET subject_embedding = COALESCE(r.subject_embedding::vector, m.subject_embedding),
+               sender_embedding  = COALESCE(r.sender_embedding::vector, m.sender_embedding),
+               meta_embedding    = COALESCE(r.meta_embedding::vector, m.meta_embedding)
+          FROM jsonb_to_recordset(p_rows) AS r(
+                   id uuid,
+                   subject_embedding text,
+                   sender_embedding text,
+                   meta_embedding text
+               )
+         WHERE m.id = r.id
+           AND m.yacht_id = p_yacht_id
+        RETURNING 1
+    )
+    SELECT count(*)::integer FROM updated;
+$$;
+
+REVOKE ALL ON FUNCTION public.update_email_embeddings_bulk(uuid, jsonb) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.update_email_embeddings_bulk(uuid, jsonb) TO service_role;